@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+📡 CAPTURE METRICS
+==================
+Shared readers for captured request files plus an incremental aggregator for the dashboards.
+Capture sources are tailed from per-source byte offsets, so serving a metrics request only
+reads lines appended since the previous one and page loads never re-parse whole captures.
+"""
+
+import bisect
+import gzip
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from url_normalizer import classify_url
+
+CAPTURE_GLOBS = ['firebase_playwright_capture_*.ndjson.gz', 'requests.jsonl']
+SETTLE_SECONDS = 5  # a file untouched this long has no half-written last line
+FINGERPRINT_BYTES = 4096  # leading bytes hashed to tell a rewrite from an append
+
+# Upper bounds (seconds) of the response time histogram buckets; the last bucket is open-ended
+RESPONSE_TIME_BUCKETS = [0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+
+def source_fingerprint(path: Path, offset: int = FINGERPRINT_BYTES) -> Optional[str]:
+    """Hash of the first min(4KB, offset) bytes - changes when a capture file is rewritten rather than appended.
+
+    Pass the offset read up to: bytes past it may still be appended, so hashing them
+    would make a growing small file look rewritten. Like offsets, bytes are uncompressed.
+    None if the file no longer holds that many bytes.
+    """
+    opener = gzip.open if str(path).endswith('.gz') else open
+    try:
+        with opener(path, 'rb') as f:
+            return hashlib.sha1(f.read(min(FINGERPRINT_BYTES, offset))).hexdigest()
+    except EOFError:
+        return None
+
+def iter_capture_lines(path: Path, start_offset: int = 0):
+    """Yield (line, offset after line) from a plain or gzip capture, starting at start_offset.
+
+    Offsets are in uncompressed bytes. A trailing line without a newline is treated as
+    still being written and left for the next run, unless the file has been quiet for
+    SETTLE_SECONDS.
+    """
+    settled = time.time() - path.stat().st_mtime > SETTLE_SECONDS
+    opener = gzip.open if str(path).endswith('.gz') else open
+    with opener(path, 'rb') as f:
+        if start_offset:
+            f.seek(start_offset)
+        offset = start_offset
+        try:
+            for raw in f:
+                if not raw.endswith(b'\n') and not settled:
+                    break
+                offset += len(raw)
+                yield raw.decode('utf-8', errors='replace'), offset
+        except EOFError:
+            # gzip member still being written by a live capture
+            return
+
+def parse_capture_line(line: str) -> Optional[Dict]:
+    """Turn one breakdown URL, fetch() line or JSON capture record into a request record.
+
+    Status, response time and timestamp are None unless the line actually recorded them.
+    """
+    line = line.strip()
+    if not line:
+        return None
+
+    if line.startswith('{'):
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(data, dict) or not data.get('url'):
+            return None
+        return {
+            'url': data['url'],
+            'method': data.get('method', 'GET'),
+            'status_code': data.get('status_code', data.get('response_status')),
+            'timestamp': data.get('timestamp'),
+            'response_time': data.get('response_time')
+        }
+
+    if line.startswith('fetch("'):
+        match = re.match(r'fetch\("([^"]+)"', line)
+        if not match:
+            return None
+        line = match.group(1)
+    elif not line.startswith('http'):
+        return None
+
+    return {
+        'url': line,
+        'method': 'GET',  # Assume GET for captured URLs
+        'status_code': None,  # URL lines carry no response
+        'timestamp': None,
+        'response_time': None
+    }
+
+def discover_capture_sources(breakdown_file: Path, directory='.') -> List[Path]:
+    """Breakdown file plus any JSONL/NDJSON request captures, oldest first"""
+    sources = [breakdown_file] if breakdown_file.is_file() else []
+    for pattern in CAPTURE_GLOBS:
+        sources.extend(sorted(Path(directory).glob(pattern), key=lambda p: p.stat().st_mtime))
+    return sources
+
+def file_signature(path: Path) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, size) of a file, or None if it doesn't exist"""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+class CaptureMetricsAggregator:
+    """Running request counters over a set of capture files.
+
+    ``refresh`` stats every source (at most once per ``refresh_interval``) and reads only
+    the bytes appended since the last refresh. A truncated, replaced or removed source
+    can't be subtracted back out, so that triggers a rebuild from scratch. Whole-file JSON
+    captures (a dict of request records) are re-read whenever they change. ``version``
+    increases each time the counters change and makes a cheap ETag.
+    """
+
+    def __init__(self, sources: Optional[Iterable[Path]] = None,
+                 breakdown_file: Path = Path("macbid_breakdown"),
+                 extra_sources: Optional[Iterable[Path]] = None,
+                 refresh_interval: float = 1.0):
+        self.sources = [Path(source) for source in sources] if sources is not None else None
+        self.breakdown_file = Path(breakdown_file)
+        self.extra_sources = [Path(source) for source in extra_sources] if extra_sources else []
+        self.refresh_interval = refresh_interval
+        self.epoch = f"{int(time.time()):x}"
+        self.version = 0
+        self.last_refresh = 0.0
+        self.lock = threading.Lock()
+        self.positions = {}  # source -> {'offset', 'fingerprint', 'signature'}
+        self._reset()
+
+    def _reset(self):
+        self.positions.clear()
+        self.total_requests = 0
+        self.requests_with_status = 0
+        self.successful_requests = 0
+        self.endpoint_groups = Counter()
+        self.endpoint_patterns = Counter()
+        self.status_ranges = Counter()
+        self.response_time_counts = [0] * (len(RESPONSE_TIME_BUCKETS) + 1)
+        self.response_time_total = 0.0
+        self.last_capture = None
+
+    def _source_paths(self) -> List[Path]:
+        if self.sources is not None:
+            paths = [source for source in self.sources if source.is_file()]
+        else:
+            paths = discover_capture_sources(self.breakdown_file)
+        return paths + [source for source in self.extra_sources if source.is_file()]
+
+    def refresh(self, force: bool = False) -> bool:
+        """Fold newly appended capture lines into the counters; True if anything changed"""
+        with self.lock:
+            now = time.time()
+            if not force and now - self.last_refresh < self.refresh_interval:
+                return False
+            self.last_refresh = now
+
+            paths = {str(path): path for path in self._source_paths()}
+            if any(key not in paths for key in self.positions) or self._rewritten(paths):
+                self._reset()
+
+            changed = False
+            for key, path in paths.items():
+                signature = file_signature(path)
+                position = self.positions.get(key)
+                if signature is None or (position and position['signature'] == signature):
+                    continue
+                changed = self._consume_source(key, path, signature) or changed
+
+            if changed:
+                self.version += 1
+            return changed
+
+    def _rewritten(self, paths: Dict[str, Path]) -> bool:
+        """True if a source was truncated, replaced, or is a whole-file JSON that changed"""
+        for key, position in self.positions.items():
+            path = paths[key]
+            signature = file_signature(path)
+            if signature is None or signature == position['signature']:
+                continue
+            if path.suffix == '.json':
+                return True
+            if not str(path).endswith('.gz') and signature[1] < position['offset']:
+                return True
+            if source_fingerprint(path, position['offset']) != position['fingerprint']:
+                return True
+        return False
+
+    def _consume_source(self, key: str, path: Path, signature: Tuple[int, int]) -> bool:
+        start_offset = self.positions.get(key, {}).get('offset', 0)
+        offset = start_offset
+        consumed = 0
+
+        if path.suffix == '.json':
+            for record in self._iter_json_records(path):
+                self._add(record)
+                consumed += 1
+            offset = signature[1]
+        else:
+            for line, offset in iter_capture_lines(path, start_offset):
+                record = parse_capture_line(line)
+                if record is not None:
+                    self._add(record)
+                    consumed += 1
+
+        # Only remember the signature once the file is fully read; a half-written last
+        # line (or a live gzip member) is picked up again on the next refresh
+        settled = time.time() - signature[0] / 1e9 > SETTLE_SECONDS
+        complete = settled or (not str(path).endswith('.gz') and offset >= signature[1])
+        self.positions[key] = {
+            'offset': offset,
+            'fingerprint': source_fingerprint(path, offset),
+            'signature': signature if complete else None
+        }
+
+        if consumed:
+            captured_at = datetime.fromtimestamp(signature[0] / 1e9).isoformat()
+            self.last_capture = max(self.last_capture or captured_at, captured_at)
+        return consumed > 0
+
+    def _iter_json_records(self, path: Path):
+        """Request records from a JSON dict capture; status is only counted when present"""
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+        if not isinstance(data, dict):
+            return
+        for request_data in data.values():
+            if isinstance(request_data, dict):
+                yield {
+                    'url': request_data.get('url', ''),
+                    'status_code': request_data.get('status_code'),
+                    'response_time': request_data.get('response_time')
+                }
+
+    def _add(self, record: Dict):
+        self.total_requests += 1
+        classification = classify_url(record.get('url', ''))
+        self.endpoint_groups[classification.group] += 1
+        self.endpoint_patterns[classification.endpoint] += 1
+
+        status = record.get('status_code')
+        if isinstance(status, int):
+            self.requests_with_status += 1
+            if status < 400:
+                self.successful_requests += 1
+        self.status_ranges[f"{status//100}xx" if isinstance(status, int) and status > 0 else 'Unknown'] += 1
+
+        response_time = record.get('response_time')
+        if isinstance(response_time, (int, float)):
+            self.response_time_counts[bisect.bisect_left(RESPONSE_TIME_BUCKETS, response_time)] += 1
+            self.response_time_total += response_time
+
+    @property
+    def etag(self) -> str:
+        return f"{self.epoch}-{self.version}"
+
+    def success_rate(self) -> float:
+        """Percentage of requests with a status code that returned < 400"""
+        if not self.requests_with_status:
+            return 0
+        return (self.successful_requests / self.requests_with_status) * 100
+
+    def response_time_histogram(self) -> Dict[str, int]:
+        labels = [f"<={bound}s" for bound in RESPONSE_TIME_BUCKETS] + [f">{RESPONSE_TIME_BUCKETS[-1]}s"]
+        return dict(zip(labels, self.response_time_counts))
+
+    def snapshot(self) -> Dict:
+        """Current counters; cost depends on the number of distinct endpoints, not requests"""
+        with self.lock:
+            timed_requests = sum(self.response_time_counts)
+            return {
+                'version': self.version,
+                'total_requests': self.total_requests,
+                'requests_with_status': self.requests_with_status,
+                'success_rate': self.success_rate(),
+                'endpoint_groups': dict(self.endpoint_groups),
+                'endpoint_patterns': dict(self.endpoint_patterns),
+                'status_ranges': dict(self.status_ranges),
+                'response_time_histogram': self.response_time_histogram(),
+                'average_response_time': self.response_time_total / timed_requests if timed_requests else 0,
+                'last_capture': self.last_capture,
+                'sources': len(self.positions)
+            }
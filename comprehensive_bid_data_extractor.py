@@ -26,7 +26,8 @@ import sys
 import os
 
 # Import existing authentication systems
-sys.path.append('organized_system/core_systems')
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'organized_system', 'core_systems'))
+from product_classifier import extractor_brand_classifier
 try:
     from macbid_auth_config import MACBID_HEADERS, MACBID_CUSTOMER_ID, MACBID_BASE_URL, FIREBASE_SESSION_ID, SESSION_ID
     AUTH_AVAILABLE = True
@@ -603,17 +604,7 @@ class ComprehensiveBidDataExtractor:
 
     def extract_brand(self, product_name: str) -> str:
         """Extract brand from product name"""
-        if not product_name:
-            return ""
-            
-        brands = ['Apple', 'Samsung', 'Sony', 'LG', 'Dell', 'HP', 'Canon', 'Nikon', 
-                 'Nintendo', 'Microsoft', 'Dyson', 'Bose', 'DeWalt', 'Milwaukee']
-        
-        for brand in brands:
-            if brand.lower() in product_name.lower():
-                return brand
-                
-        return ""
+        return extractor_brand_classifier.classify(product_name)
 
     def log_api_performance(self, api_name: str, endpoint: str, response_time: int, 
                           status_code: int, success: bool, data_points: int):
@@ -29,7 +29,8 @@ import os
 import re
 
 # Import existing authentication systems
-sys.path.append('organized_system/core_systems')
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'organized_system', 'core_systems'))
+from product_classifier import extended_brand_classifier
 try:
     from macbid_auth_config import MACBID_HEADERS, MACBID_CUSTOMER_ID, MACBID_BASE_URL, FIREBASE_SESSION_ID, SESSION_ID
     AUTH_AVAILABLE = True
@@ -858,23 +859,7 @@ class EnhancedBidDataMaximizer:
 
     def extract_brand(self, product_name: str) -> str:
         """Extract brand from product name with enhanced brand list"""
-        if not product_name:
-            return ""
-            
-        brands = [
-            'Apple', 'Samsung', 'Sony', 'LG', 'Dell', 'HP', 'Canon', 'Nikon', 
-            'Nintendo', 'Microsoft', 'Dyson', 'Bose', 'DeWalt', 'Milwaukee',
-            'Makita', 'Ryobi', 'Black+Decker', 'Craftsman', 'Stanley', 'Husky',
-            'KitchenAid', 'Cuisinart', 'Hamilton Beach', 'Ninja', 'Vitamix',
-            'Instant Pot', 'Keurig', 'Nespresso', 'Breville', 'All-Clad'
-        ]
-        
-        product_upper = product_name.upper()
-        for brand in brands:
-            if brand.upper() in product_upper:
-                return brand
-                
-        return ""
+        return extended_brand_classifier.classify(product_name)
 
     async def save_to_database(self, lots: List[Dict]):
         """Save enhanced lots to database"""
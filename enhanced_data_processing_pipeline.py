@@ -7,30 +7,283 @@ Processes 155+ requests to extract auction patterns, timing insights, and biddin
 """
 
 import json
+import random
 import sqlite3
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from pathlib import Path
 import re
+import sys
 import asyncio
 import aiohttp
 from typing import Dict, List, Optional, Tuple, Any
 import logging
-from collections import defaultdict, Counter
+from collections import defaultdict, Counter, deque
 import matplotlib.pyplot as plt
 import seaborn as sns
+from url_normalizer import classify_url, endpoint_pattern, url_location
+from capture_metrics import FINGERPRINT_BYTES, discover_capture_sources, iter_capture_lines, parse_capture_line, source_fingerprint
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+CHECKPOINT_EVERY = 5000  # records between checkpoint writes
+CHECKPOINT_FORMAT = 2  # bump when parsed records change, so older analyzer state is rebuilt
+
+class RunningStats:
+    """Constant-memory mean/std/min/max with a reservoir sample for the median"""
+    
+    RESERVOIR_SIZE = 1024
+    
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+        self.reservoir = []
+        self.rng = random.Random(7)
+        
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        
+        if len(self.reservoir) < self.RESERVOIR_SIZE:
+            self.reservoir.append(value)
+        else:
+            slot = self.rng.randrange(self.count)
+            if slot < self.RESERVOIR_SIZE:
+                self.reservoir[slot] = value
+                
+    def summary(self) -> Dict:
+        return {
+            'average': self.mean,
+            'median': float(np.median(self.reservoir)) if self.reservoir else 0,
+            'min': self.min,
+            'max': self.max,
+            'std_dev': (self.m2 / self.count) ** 0.5 if self.count else 0
+        }
+        
+    def state(self) -> Dict:
+        return {'count': self.count, 'mean': self.mean, 'm2': self.m2,
+                'min': self.min, 'max': self.max, 'reservoir': self.reservoir}
+        
+    def load(self, state: Dict):
+        self.count = state.get('count', 0)
+        self.mean = state.get('mean', 0.0)
+        self.m2 = state.get('m2', 0.0)
+        self.min = state.get('min')
+        self.max = state.get('max')
+        self.reservoir = list(state.get('reservoir', []))
+        self.rng.seed(7 + self.count)
+
+class RequestPatternAnalyzer:
+    """Endpoint, method, status, location and auth patterns, one request at a time"""
+    
+    name = 'request_patterns'
+    RECENT_LIMIT = 200  # timing/auth samples kept for the report
+    
+    def __init__(self, processor):
+        self.endpoint_frequency = defaultdict(int)
+        self.method_distribution = defaultdict(int)
+        self.status_patterns = defaultdict(int)
+        self.geographic_patterns = defaultdict(int)
+        self.timing_patterns = deque(maxlen=self.RECENT_LIMIT)
+        self.authentication_patterns = deque(maxlen=self.RECENT_LIMIT)
+        
+    def consume(self, request_data: Dict):
+        url = request_data.get('url', '')
+        method = request_data.get('method', 'GET')
+        status = request_data.get('status_code')
+        timestamp = request_data.get('timestamp', '')
+        
+        classification = classify_url(url)
+        endpoint_pattern = classification.endpoint
+        self.endpoint_frequency[endpoint_pattern] += 1
+        self.method_distribution[method] += 1
+        if status is not None:
+            self.status_patterns[status] += 1
+        
+        if timestamp:
+            self.timing_patterns.append({
+                'timestamp': timestamp,
+                'endpoint': endpoint_pattern,
+                'response_time': request_data.get('response_time', 0)
+            })
+            
+        location = classification.location
+        if location:
+            self.geographic_patterns[location] += 1
+            
+        if 'auth' in url.lower() or 'session' in url.lower():
+            self.authentication_patterns.append({
+                'url': url,
+                'method': method,
+                'status': status,
+                'timestamp': timestamp
+            })
+            
+    def result(self) -> Dict:
+        return {
+            'endpoint_frequency': dict(self.endpoint_frequency),
+            'method_distribution': dict(self.method_distribution),
+            'status_patterns': dict(self.status_patterns),
+            'timing_patterns': list(self.timing_patterns),
+            'data_flow_patterns': [],
+            'authentication_patterns': list(self.authentication_patterns),
+            'geographic_patterns': dict(self.geographic_patterns)
+        }
+        
+    def state(self) -> Dict:
+        state = self.result()
+        state['status_patterns'] = [[status, count] for status, count in self.status_patterns.items()]
+        return state
+        
+    def load(self, state: Dict):
+        self.endpoint_frequency.update(state.get('endpoint_frequency', {}))
+        self.method_distribution.update(state.get('method_distribution', {}))
+        self.status_patterns.update({status: count for status, count in state.get('status_patterns', [])})
+        self.geographic_patterns.update(state.get('geographic_patterns', {}))
+        self.timing_patterns.extend(state.get('timing_patterns', []))
+        self.authentication_patterns.extend(state.get('authentication_patterns', []))
+
+class AuctionActivityAnalyzer:
+    """Auction/bid request counts per location"""
+    
+    name = 'auction_activity'
+    
+    def __init__(self, processor):
+        self.total_auction_requests = 0
+        self.location_activity = defaultdict(int)
+        
+    def consume(self, request_data: Dict):
+        url = request_data.get('url', '')
+        if 'auction' not in url.lower() and 'bid' not in url.lower():
+            return
+        self.total_auction_requests += 1
+        location = url_location(url)
+        if location:
+            self.location_activity[location] += 1
+            
+    def result(self) -> Dict:
+        return {
+            'total_auctions_detected': self.total_auction_requests,
+            'active_locations': list(self.location_activity.keys()),
+            'activity_levels': dict(self.location_activity),
+            'peak_activity_times': [],
+            'category_distribution': {}
+        }
+        
+    def state(self) -> Dict:
+        return {'total_auction_requests': self.total_auction_requests,
+                'location_activity': dict(self.location_activity)}
+        
+    def load(self, state: Dict):
+        self.total_auction_requests = state.get('total_auction_requests', 0)
+        self.location_activity.update(state.get('location_activity', {}))
+
+class TimingAnalyzer:
+    """Session span and response time distribution"""
+    
+    name = 'timing'
+    
+    def __init__(self, processor):
+        self.first_seen = None
+        self.last_seen = None
+        self.response_times = RunningStats()
+        
+    def consume(self, request_data: Dict):
+        timestamp = request_data.get('timestamp', '')
+        response_time = request_data.get('response_time', 0)
+        
+        if timestamp:
+            try:
+                seen = datetime.fromisoformat(str(timestamp).replace('Z', '+00:00')).timestamp()
+            except ValueError:
+                seen = None
+            if seen is not None:
+                self.first_seen = seen if self.first_seen is None else min(self.first_seen, seen)
+                self.last_seen = seen if self.last_seen is None else max(self.last_seen, seen)
+        if response_time:
+            self.response_times.add(response_time)
+            
+    def result(self) -> Dict:
+        timing = {
+            'request_frequency': {},
+            'peak_hours': [],
+            'response_time_patterns': {},
+            'session_duration_estimate': 0
+        }
+        if self.first_seen is not None:
+            timing['session_duration_estimate'] = self.last_seen - self.first_seen
+        if self.response_times.count:
+            timing['response_time_patterns'] = self.response_times.summary()
+        return timing
+        
+    def state(self) -> Dict:
+        return {'first_seen': self.first_seen, 'last_seen': self.last_seen,
+                'response_times': self.response_times.state()}
+        
+    def load(self, state: Dict):
+        self.first_seen = state.get('first_seen')
+        self.last_seen = state.get('last_seen')
+        self.response_times.load(state.get('response_times', {}))
+
+class CompetitionAnalyzer:
+    """Server load indicators from response times"""
+    
+    name = 'competition'
+    
+    def __init__(self, processor):
+        self.response_times = RunningStats()
+        self.timeouts = 0
+        
+    def consume(self, request_data: Dict):
+        response_time = request_data.get('response_time', 0)
+        if response_time:
+            self.response_times.add(response_time)
+            if response_time > 10:
+                self.timeouts += 1
+                
+    def result(self) -> Dict:
+        competition = {
+            'concurrent_users_estimate': 0,
+            'server_load_indicators': {},
+            'popular_endpoints': {},
+            'traffic_patterns': {}
+        }
+        if self.response_times.count:
+            avg_response_time = self.response_times.mean
+            competition['server_load_indicators'] = {
+                'average_response_time': avg_response_time,
+                'load_level': 'high' if avg_response_time > 2.0 else 'medium' if avg_response_time > 1.0 else 'low',
+                'timeout_rate': self.timeouts / self.response_times.count * 100
+            }
+        return competition
+        
+    def state(self) -> Dict:
+        return {'response_times': self.response_times.state(), 'timeouts': self.timeouts}
+        
+    def load(self, state: Dict):
+        self.response_times.load(state.get('response_times', {}))
+        self.timeouts = state.get('timeouts', 0)
+
+STREAM_ANALYZERS = [RequestPatternAnalyzer, AuctionActivityAnalyzer, TimingAnalyzer, CompetitionAnalyzer]
+
 class EnhancedDataProcessor:
     """Advanced data processing pipeline for Mac.bid intelligence"""
     
-    def __init__(self):
+    def __init__(self, sources: Optional[List[Path]] = None):
         self.base_dir = Path.home() / ".macbid_scraper"
         self.breakdown_file = Path("macbid_breakdown")
+        self.sources = [Path(source) for source in sources] if sources else None
+        self.pipeline_name = 'enhanced_data_processing'
         self.intelligence_db = self.base_dir / "market_intelligence.db"
         self.processed_data = {}
         self.market_insights = {}
@@ -100,6 +353,123 @@ class EnhancedDataProcessor:
                 )
             """)
             
+            # Streaming ingest checkpoints: per-source offsets plus analyzer state
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS ingest_checkpoints (
+                    pipeline TEXT PRIMARY KEY,
+                    offsets TEXT,
+                    analyzer_state TEXT,
+                    records_processed INTEGER,
+                    updated_at TEXT
+                )
+            """)
+            
+    def _capture_sources(self) -> List[Path]:
+        """Breakdown file plus any JSONL/NDJSON request captures, oldest first"""
+        if self.sources is not None:
+            return [source for source in self.sources if source.is_file()]
+            
+        return discover_capture_sources(self.breakdown_file)
+        
+    def _load_checkpoint(self) -> Dict:
+        with sqlite3.connect(self.intelligence_db) as conn:
+            row = conn.execute(
+                "SELECT offsets, analyzer_state, records_processed FROM ingest_checkpoints WHERE pipeline = ?",
+                (self.pipeline_name,)
+            ).fetchone()
+        if not row:
+            return {}
+            
+        state = json.loads(row[1])
+        if state.get('_format') != CHECKPOINT_FORMAT:
+            logger.info("🔄 Checkpoint predates the current record format - reprocessing all sources")
+            return {}
+        return {'offsets': json.loads(row[0]), 'state': state, 'records': row[2]}
+        
+    def _save_checkpoint(self, offsets: Dict, analyzers: List, records: int):
+        with sqlite3.connect(self.intelligence_db) as conn:
+            conn.execute("""
+                INSERT OR REPLACE INTO ingest_checkpoints
+                (pipeline, offsets, analyzer_state, records_processed, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, (
+                self.pipeline_name,
+                json.dumps(offsets),
+                json.dumps({'_format': CHECKPOINT_FORMAT,
+                            **{analyzer.name: analyzer.state() for analyzer in analyzers}}),
+                records,
+                datetime.now().isoformat()
+            ))
+            
+    def _sources_rewritten(self, sources: Dict[str, Path], offsets: Dict) -> bool:
+        """True if a checkpointed source was truncated or replaced instead of appended to"""
+        for key, position in offsets.items():
+            path = sources.get(key)
+            if path is None:
+                continue
+            if not str(path).endswith('.gz') and path.stat().st_size < position['offset']:
+                return True
+            if source_fingerprint(path, position['offset']) != position['fingerprint']:
+                return True
+        return False
+        
+    async def stream_ingest(self, full_rescan: bool = False) -> Tuple[Dict, int, int]:
+        """Single pass over unseen capture lines, feeding every analyzer as it goes.
+        
+        Returns (analyzers by name, total records analyzed, records new this run).
+        Analyzer state and per-source offsets are checkpointed, so a re-run only reads
+        lines appended since the last one.
+        """
+        analyzers = [analyzer_class(self) for analyzer_class in STREAM_ANALYZERS]
+        sources = {str(path): path for path in self._capture_sources()}
+        checkpoint = {} if full_rescan else self._load_checkpoint()
+        offsets = checkpoint.get('offsets', {})
+        
+        # A rewritten source can't be subtracted back out, so rebuild from scratch
+        if checkpoint and self._sources_rewritten(sources, offsets):
+            logger.info("🔄 Capture source was rewritten - reprocessing all sources")
+            checkpoint, offsets = {}, {}
+            
+        for analyzer in analyzers:
+            analyzer.load(checkpoint.get('state', {}).get(analyzer.name, {}))
+        previous_records = checkpoint.get('records', 0)
+        new_records = 0
+        
+        for key, path in sources.items():
+            start_offset = offsets.get(key, {}).get('offset', 0)
+            fingerprint = None
+            
+            for line, offset in iter_capture_lines(path, start_offset):
+                # Only the bytes read so far are hashed, so the fingerprint settles after 4KB
+                if fingerprint is None or offset <= FINGERPRINT_BYTES:
+                    fingerprint = source_fingerprint(path, offset)
+                offsets[key] = {'offset': offset, 'fingerprint': fingerprint}
+                record = parse_capture_line(line)
+                if record is None:
+                    continue
+                    
+                for analyzer in analyzers:
+                    analyzer.consume(record)
+                new_records += 1
+                
+                if new_records % CHECKPOINT_EVERY == 0:
+                    self._save_checkpoint(offsets, analyzers, previous_records + new_records)
+                    
+        self._save_checkpoint(offsets, analyzers, previous_records + new_records)
+        
+        logger.info(f"✅ Streamed {new_records} new requests from {len(sources)} sources "
+                    f"({previous_records + new_records} total)")
+        return {analyzer.name: analyzer for analyzer in analyzers}, previous_records + new_records, new_records
+        
+    def _run_analyzers(self, records, analyzer_classes=None) -> Dict:
+        """Feed already-loaded request records through fresh analyzers"""
+        analyzers = [analyzer_class(self) for analyzer_class in (analyzer_classes or STREAM_ANALYZERS)]
+        for request_data in records:
+            if isinstance(request_data, dict):
+                for analyzer in analyzers:
+                    analyzer.consume(request_data)
+        return {analyzer.name: analyzer for analyzer in analyzers}
+            
     async def load_breakdown_data(self) -> Dict:
         """Load and parse breakdown data from captured requests"""
         try:
@@ -107,21 +477,12 @@ class EnhancedDataProcessor:
                 logger.warning("⚠️ No breakdown file found")
                 return {}
                 
-            with open(self.breakdown_file, 'r') as f:
-                urls = f.readlines()
-                
             # Convert URL list to structured data
             breakdown_data = {}
-            for i, url in enumerate(urls):
-                url = url.strip()
-                if url:
-                    breakdown_data[f"request_{i}"] = {
-                        'url': url,
-                        'method': 'GET',  # Assume GET for captured URLs
-                        'status_code': 200,  # Assume success for captured URLs
-                        'timestamp': datetime.now().isoformat(),
-                        'response_time': 0.5  # Default response time
-                    }
+            for i, (line, _) in enumerate(iter_capture_lines(self.breakdown_file)):
+                request_data = parse_capture_line(line)
+                if request_data:
+                    breakdown_data[f"request_{i}"] = request_data
                 
             logger.info(f"✅ Loaded {len(breakdown_data)} captured requests")
             return breakdown_data
@@ -134,52 +495,9 @@ class EnhancedDataProcessor:
         """Analyze patterns in captured API requests"""
         logger.info("🔍 Analyzing request patterns...")
         
-        patterns = {
-            'endpoint_frequency': defaultdict(int),
-            'method_distribution': defaultdict(int),
-            'status_patterns': defaultdict(int),
-            'timing_patterns': [],
-            'data_flow_patterns': [],
-            'authentication_patterns': [],
-            'geographic_patterns': defaultdict(int)
-        }
+        analyzers = self._run_analyzers(breakdown_data.values(), [RequestPatternAnalyzer])
+        patterns = analyzers['request_patterns'].result()
         
-        for request_id, request_data in breakdown_data.items():
-            if isinstance(request_data, dict):
-                # Endpoint analysis
-                url = request_data.get('url', '')
-                method = request_data.get('method', 'GET')
-                status = request_data.get('status_code', 0)
-                
-                # Extract endpoint pattern
-                endpoint_pattern = self._extract_endpoint_pattern(url)
-                patterns['endpoint_frequency'][endpoint_pattern] += 1
-                patterns['method_distribution'][method] += 1
-                patterns['status_patterns'][status] += 1
-                
-                # Timing analysis
-                timestamp = request_data.get('timestamp', '')
-                if timestamp:
-                    patterns['timing_patterns'].append({
-                        'timestamp': timestamp,
-                        'endpoint': endpoint_pattern,
-                        'response_time': request_data.get('response_time', 0)
-                    })
-                
-                # Geographic patterns
-                location = self._extract_location_from_url(url)
-                if location:
-                    patterns['geographic_patterns'][location] += 1
-                    
-                # Authentication patterns
-                if 'auth' in url.lower() or 'session' in url.lower():
-                    patterns['authentication_patterns'].append({
-                        'url': url,
-                        'method': method,
-                        'status': status,
-                        'timestamp': timestamp
-                    })
-                    
         # Calculate pattern insights
         insights = await self._calculate_pattern_insights(patterns)
         
@@ -188,49 +506,11 @@ class EnhancedDataProcessor:
         
     def _extract_endpoint_pattern(self, url: str) -> str:
         """Extract meaningful endpoint pattern from URL"""
-        if not url:
-            return 'unknown'
-            
-        # Remove query parameters and extract path
-        base_url = url.split('?')[0]
-        
-        # Common patterns
-        if 'analytics.google.com' in url:
-            return 'google_analytics'
-        elif 'doubleclick.net' in url:
-            return 'advertising_doubleclick'
-        elif 'facebook.com/tr' in url:
-            return 'facebook_pixel'
-        elif 'youtube.com/api' in url:
-            return 'youtube_api'
-        elif 'mac.bid/_next/static' in url:
-            return 'nextjs_static'
-        elif 'mac.bid/api' in url:
-            return 'macbid_api'
-        elif 'mac.bid/auctions' in url:
-            return 'auctions_page'
-        elif 'mac.bid/locations' in url:
-            return 'location_page'
-        elif 'typesense.net' in url:
-            return 'typesense_search'
-        elif 'visualwebsiteoptimizer.com' in url:
-            return 'ab_testing'
-        elif 'stackadapt.com' in url:
-            return 'advertising_stack'
-        elif 'bing.com/action' in url:
-            return 'bing_tracking'
-        else:
-            return 'other'
+        return endpoint_pattern(url)
             
     def _extract_location_from_url(self, url: str) -> Optional[str]:
         """Extract location information from URL"""
-        locations = ['spartanburg', 'greenville', 'rock-hill', 'gastonia', 'anderson']
-        
-        for location in locations:
-            if location in url.lower():
-                return location.replace('-', ' ').title()
-                
-        return None
+        return url_location(url)
         
     async def _calculate_pattern_insights(self, patterns: Dict) -> List[Dict]:
         """Calculate insights from identified patterns"""
@@ -283,26 +563,19 @@ class EnhancedDataProcessor:
         """Extract market intelligence from captured data"""
         logger.info("🧠 Extracting market intelligence...")
         
+        analyzers = self._run_analyzers(breakdown_data.values())
+        return await self._assemble_market_intelligence(analyzers)
+        
+    async def _assemble_market_intelligence(self, analyzers: Dict) -> Dict:
+        """Combine analyzer results into the market intelligence structure"""
         intelligence = {
-            'auction_activity': {},
+            'auction_activity': analyzers['auction_activity'].result(),
             'bidding_patterns': {},
-            'timing_intelligence': {},
-            'competition_analysis': {},
+            'timing_intelligence': analyzers['timing'].result(),
+            'competition_analysis': analyzers['competition'].result(),
             'opportunity_scoring': {}
         }
         
-        # Analyze auction activity
-        auction_data = await self._analyze_auction_activity(breakdown_data)
-        intelligence['auction_activity'] = auction_data
-        
-        # Analyze timing patterns
-        timing_data = await self._analyze_timing_patterns(breakdown_data)
-        intelligence['timing_intelligence'] = timing_data
-        
-        # Competition analysis
-        competition_data = await self._analyze_competition_patterns(breakdown_data)
-        intelligence['competition_analysis'] = competition_data
-        
         # Generate opportunity scores
         opportunities = await self._generate_opportunity_scores(intelligence)
         intelligence['opportunity_scoring'] = opportunities
@@ -310,114 +583,6 @@ class EnhancedDataProcessor:
         logger.info("✅ Market intelligence extraction complete")
         return intelligence
         
-    async def _analyze_auction_activity(self, breakdown_data: Dict) -> Dict:
-        """Analyze auction activity patterns"""
-        activity = {
-            'total_auctions_detected': 0,
-            'active_locations': [],
-            'activity_levels': {},
-            'peak_activity_times': [],
-            'category_distribution': {}
-        }
-        
-        # Extract auction-related requests
-        auction_requests = []
-        for request_id, request_data in breakdown_data.items():
-            if isinstance(request_data, dict):
-                url = request_data.get('url', '')
-                if 'auction' in url.lower() or 'bid' in url.lower():
-                    auction_requests.append(request_data)
-                    
-        activity['total_auctions_detected'] = len(auction_requests)
-        
-        # Analyze by location
-        location_activity = defaultdict(int)
-        for request in auction_requests:
-            location = self._extract_location_from_url(request.get('url', ''))
-            if location:
-                location_activity[location] += 1
-                
-        activity['active_locations'] = list(location_activity.keys())
-        activity['activity_levels'] = dict(location_activity)
-        
-        return activity
-        
-    async def _analyze_timing_patterns(self, breakdown_data: Dict) -> Dict:
-        """Analyze timing patterns in requests"""
-        timing = {
-            'request_frequency': {},
-            'peak_hours': [],
-            'response_time_patterns': {},
-            'session_duration_estimate': 0
-        }
-        
-        timestamps = []
-        response_times = []
-        
-        for request_data in breakdown_data.values():
-            if isinstance(request_data, dict):
-                timestamp = request_data.get('timestamp', '')
-                response_time = request_data.get('response_time', 0)
-                
-                if timestamp:
-                    timestamps.append(timestamp)
-                if response_time:
-                    response_times.append(response_time)
-                    
-        # Calculate session duration
-        if timestamps:
-            timestamps.sort()
-            start_time = datetime.fromisoformat(timestamps[0].replace('Z', '+00:00'))
-            end_time = datetime.fromisoformat(timestamps[-1].replace('Z', '+00:00'))
-            duration = (end_time - start_time).total_seconds()
-            timing['session_duration_estimate'] = duration
-            
-        # Response time analysis
-        if response_times:
-            timing['response_time_patterns'] = {
-                'average': np.mean(response_times),
-                'median': np.median(response_times),
-                'min': min(response_times),
-                'max': max(response_times),
-                'std_dev': np.std(response_times)
-            }
-            
-        return timing
-        
-    async def _analyze_competition_patterns(self, breakdown_data: Dict) -> Dict:
-        """Analyze competition patterns from request data"""
-        competition = {
-            'concurrent_users_estimate': 0,
-            'server_load_indicators': {},
-            'popular_endpoints': {},
-            'traffic_patterns': {}
-        }
-        
-        # Analyze server response patterns for load indicators
-        status_codes = []
-        response_times = []
-        
-        for request_data in breakdown_data.values():
-            if isinstance(request_data, dict):
-                status = request_data.get('status_code', 0)
-                response_time = request_data.get('response_time', 0)
-                
-                if status:
-                    status_codes.append(status)
-                if response_time:
-                    response_times.append(response_time)
-                    
-        # Server load indicators
-        if response_times:
-            avg_response_time = np.mean(response_times)
-            competition['server_load_indicators'] = {
-                'average_response_time': avg_response_time,
-                'load_level': 'high' if avg_response_time > 2.0 else 'medium' if avg_response_time > 1.0 else 'low',
-                'timeout_rate': len([rt for rt in response_times if rt > 10]) / len(response_times) * 100
-            }
-            
-        return competition
-        
     async def _generate_opportunity_scores(self, intelligence: Dict) -> Dict:
         """Generate opportunity scores based on intelligence data"""
         opportunities = {
@@ -584,37 +749,40 @@ class EnhancedDataProcessor:
             
         return "\n".join(report)
         
-    async def process_all_data(self) -> Dict:
-        """Main processing pipeline - analyze all available data"""
+    async def process_all_data(self, full_rescan: bool = False) -> Dict:
+        """Main processing pipeline - stream new capture lines through every analyzer"""
         logger.info("🚀 Starting enhanced data processing pipeline...")
         
-        # Load breakdown data
-        breakdown_data = await self.load_breakdown_data()
-        if not breakdown_data:
+        # Single streaming pass over new lines, resumed from the last checkpoint
+        analyzers, total_records, new_records = await self.stream_ingest(full_rescan)
+        if not total_records:
             return {'error': 'No data available for processing'}
             
         # Analyze request patterns
-        pattern_analysis = await self.analyze_request_patterns(breakdown_data)
+        patterns = analyzers['request_patterns'].result()
+        pattern_analysis = {'patterns': patterns, 'insights': await self._calculate_pattern_insights(patterns)}
         
         # Extract market intelligence
-        market_intelligence = await self.extract_market_intelligence(breakdown_data)
+        market_intelligence = await self._assemble_market_intelligence(analyzers)
         
         # Combine all analysis
         complete_analysis = {
             'processing_timestamp': datetime.now().isoformat(),
-            'data_points_processed': len(breakdown_data),
+            'data_points_processed': total_records,
+            'new_data_points': new_records,
             'pattern_analysis': pattern_analysis,
             'market_intelligence': market_intelligence,
             'summary': {
-                'total_requests': len(breakdown_data),
+                'total_requests': total_records,
                 'unique_endpoints': len(pattern_analysis['patterns']['endpoint_frequency']),
                 'opportunity_score': market_intelligence['opportunity_scoring']['overall_score'],
                 'processing_status': 'complete'
             }
         }
         
-        # Store intelligence data
-        await self.store_intelligence_data(market_intelligence)
+        # Store intelligence data (nothing changed if no new lines arrived)
+        if new_records:
+            await self.store_intelligence_data(market_intelligence)
         
         # Generate report
         report = await self.generate_intelligence_report(market_intelligence)
@@ -630,8 +798,8 @@ async def main():
     
     processor = EnhancedDataProcessor()
     
-    # Process all available data
-    results = await processor.process_all_data()
+    # Process new capture data ('--full' reprocesses everything)
+    results = await processor.process_all_data(full_rescan='--full' in sys.argv)
     
     if 'error' in results:
         print(f"❌ Error: {results['error']}")
@@ -639,7 +807,7 @@ async def main():
         
     # Display results
     print(f"\n📈 Processing Results:")
-    print(f"   Data Points Processed: {results['summary']['total_requests']}")
+    print(f"   Data Points Processed: {results['summary']['total_requests']} ({results['new_data_points']} new)")
     print(f"   Unique Endpoints: {results['summary']['unique_endpoints']}")
     print(f"   Opportunity Score: {results['summary']['opportunity_score']:.1f}/100")
     print(f"   Status: {results['summary']['processing_status'].upper()}")
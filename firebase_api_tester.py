@@ -11,9 +11,14 @@ import random
 import string
 import aiohttp
 import asyncio
+import os
+import sys
 from pathlib import Path
 from datetime import datetime
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'organized_system', 'core_systems'))
+from capture_sink import iter_capture
+
 class FirebaseAPITester:
     def __init__(self):
         self.session_file = "firebase_playwright_session_1749444354.json"
@@ -27,6 +32,13 @@ class FirebaseAPITester:
                 return data.get('session_data', {})
         return {}
     
+    def _iter_captured_requests(self, data):
+        """Stream requests from the NDJSON capture file, falling back to the inline sample"""
+        capture_path = data.get('capture_file')
+        if capture_path and Path(capture_path).exists():
+            return iter_capture(capture_path)
+        return iter(data.get('captured_requests', []))
+    
     def _generate_zx(self):
         """Generate zx parameter like in successful requests"""
         return ''.join(random.choices(string.ascii_lowercase + string.digits, k=12))
@@ -162,7 +174,7 @@ class FirebaseAPITester:
         with open(self.session_file, 'r') as f:
             data = json.load(f)
         
-        captured_requests = data.get('captured_requests', [])
+        captured_requests = self._iter_captured_requests(data)
         successful_gsessions = []
         
         # Extract all successful gsessionid values
@@ -230,7 +242,7 @@ class FirebaseAPITester:
         with open(self.session_file, 'r') as f:
             data = json.load(f)
         
-        captured_requests = data.get('captured_requests', [])
+        captured_requests = self._iter_captured_requests(data)
         
         # Find first successful request
         for i, req in enumerate(captured_requests):
@@ -13,12 +13,24 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'organized_system', 'core_systems'))
+from capture_sink import CaptureSink, capture_file, iter_capture
 
 class FirebasePlaywrightCapturer:
     def __init__(self):
         self.firebase_data = {}
         self.session_data = {}
-        self.captured_requests = []
+        # Bounded ring of Firebase requests, streamed to a compressed NDJSON capture file;
+        # POST bodies go to the stream whole because the breakdown file replays them
+        self.captured_requests = CaptureSink(
+            output_path=capture_file('firebase_playwright_capture'),
+            url_patterns=['firestore.googleapis.com'],
+            capacity=500,
+            max_body_chars=1000,
+            full_fields=['post_data']
+        )
         self.auth_config_file = Path("organized_system/core_systems/macbid_auth_config.py")
         self.breakdown_file = Path("macbid_breakdown/macbid_breakdown")
         
@@ -219,6 +231,9 @@ class FirebasePlaywrightCapturer:
                 'error': str(e),
                 'phase': 'automation_setup'
             }
+            
+        finally:
+            self.captured_requests.close()
 
     async def _setup_network_interception(self, context):
         """Setup network request/response interception"""
@@ -226,7 +241,7 @@ class FirebasePlaywrightCapturer:
         
         async def handle_request(request):
             # Capture Firebase requests
-            if 'firestore.googleapis.com' in request.url:
+            if self.captured_requests.wants(request.url):
                 print(f"🔥 Intercepted Firebase request: {request.method} {request.url[:100]}...")
                 
                 firebase_request = {
@@ -250,7 +265,7 @@ class FirebasePlaywrightCapturer:
                 except:
                     pass
                 
-                self.captured_requests.append(firebase_request)
+                self.captured_requests.add(firebase_request)
             
             # Also capture other important Mac.bid requests
             elif 'mac.bid' in request.url and any(endpoint in request.url for endpoint in ['/api/', '/_next/data/']):
@@ -261,18 +276,19 @@ class FirebasePlaywrightCapturer:
                 print(f"✅ Firebase response: {response.status} for {response.url[:100]}...")
                 
                 # Store response data
-                for req in self.captured_requests:
-                    if req.get('url') == response.url and not req.get('response_captured'):
-                        req['response_status'] = response.status
-                        req['response_headers'] = dict(response.headers)
-                        req['response_captured'] = True
-                        
-                        try:
-                            if response.status == 200:
-                                response_text = await response.text()
-                                req['response_body'] = response_text[:1000]  # Limit size
-                        except:
-                            pass
+                req = self.captured_requests.take_pending(response.url)
+                if req is not None:
+                    req['response_status'] = response.status
+                    req['response_headers'] = dict(response.headers)
+                    req['response_captured'] = True
+                    
+                    try:
+                        if response.status == 200:
+                            req['response_body'] = self.captured_requests.trim_body(await response.body())
+                    except:
+                        pass
+                    
+                    self.captured_requests.complete(req)
         
         context.on('request', handle_request)
         context.on('response', handle_response)
@@ -716,19 +732,27 @@ class FirebasePlaywrightCapturer:
             # Create breakdown directory if it doesn't exist
             self.breakdown_file.parent.mkdir(exist_ok=True)
             
-            # Append fresh Firebase requests to breakdown file
+            # The browser is closed by now; finish the capture so every request is on disk
+            self.captured_requests.close()
+            if not self.captured_requests.output_path.exists():
+                print("⚠️ No Firebase requests captured - breakdown file left unchanged")
+                return False
+            
+            # Append fresh Firebase requests to breakdown file, streamed from the full capture
+            written = 0
             with open(self.breakdown_file, 'a') as f:
                 f.write(f'\n// Playwright automation session: {datetime.now().isoformat()}\n')
-                for request in self.captured_requests:
+                for request in iter_capture(self.captured_requests.output_path):
                     # Convert to breakdown file format
                     f.write(f'fetch("{request["url"]}", {{\n')
                     f.write(f'    "headers": {json.dumps(request["headers"], indent=6)},\n')
                     f.write(f'    "method": "{request["method"]}",\n')
                     if request.get('post_data'):
-                        f.write(f'    "body": "{request["post_data"]}",\n')
+                        f.write(f'    "body": {json.dumps(request["post_data"])},\n')
                     f.write(f'}}); // {request["timestamp"]}\n')
+                    written += 1
             
-            print(f"✅ Breakdown file updated with {len(self.captured_requests)} requests")
+            print(f"✅ Breakdown file updated with {written} requests")
             return True
             
         except Exception as e:
@@ -742,7 +766,10 @@ class FirebasePlaywrightCapturer:
             
             output_data = {
                 'session_data': self.session_data,
-                'captured_requests': self.captured_requests,
+                # Full capture lives in the NDJSON stream; keep the JSON small
+                'captured_requests': self.captured_requests.records(20),
+                'capture_file': str(self.captured_requests.output_path),
+                'capture_stats': self.captured_requests.summary(),
                 'timestamp': datetime.now().isoformat(),
                 'automation_success': True
             }
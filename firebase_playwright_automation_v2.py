@@ -17,6 +17,8 @@ import asyncio
 import json
 import re
 import os
+import subprocess
+import sys
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
@@ -24,6 +26,21 @@ from playwright.async_api import async_playwright, Browser, BrowserContext, Page
 import time
 import random
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'organized_system', 'core_systems'))
+from capture_sink import CaptureSink, capture_file
+
+# Shared with the Selenium bidding pool (which merges its saves into ours) so either side can warm the other's login
+STORAGE_STATE_FILE = Path.home() / '.macbid_scraper' / 'browser_storage_state.json'
+CHROME_PROFILE_DIR = Path.home() / '.macbid_scraper' / 'chrome_profile'
+
+FIREBASE_PATTERNS = [
+    'firestore.googleapis.com',
+    'firebase.googleapis.com',
+    'firebase.com',
+    'firebaseio.com',
+    'google.firestore'
+]
+
 class EnhancedFirebasePlaywrightCapturer:
     """Phase 2 Enhanced Firebase Playwright automation with bulletproof reliability"""
     
@@ -31,15 +48,26 @@ class EnhancedFirebasePlaywrightCapturer:
         self.email = None
         self.password = None
         self.customer_id = None
-        self.captured_requests = []
+        # Bounded ring of recent requests; every record is also streamed to a compressed NDJSON file
+        self.captured_requests = CaptureSink(
+            output_path=capture_file('firebase_playwright_capture'),
+            url_patterns=FIREBASE_PATTERNS + ['mac.bid', 'macbid'],
+            capacity=500,
+            max_body_chars=1000
+        )
         self.session_pool = []  # Phase 2: Multiple session management
+        self.firebase_ready = None  # Set once a gsessionid-bearing Firebase request is seen
+        self.capture_context = None
+        self.browser_reused = False
         self.performance_metrics = {
             'start_time': None,
             'requests_captured': 0,
             'successful_requests': 0,
             'failed_requests': 0,
             'session_rotations': 0,
-            'error_recoveries': 0
+            'error_recoveries': 0,
+            'storage_state_reused': False,
+            'browser_reused': False
         }
         
         # Phase 2: Enhanced configuration
@@ -52,6 +80,17 @@ class EnhancedFirebasePlaywrightCapturer:
             'navigation_timeout': 60000,  # 60 seconds for navigation
             'element_timeout': 30000,  # 30 seconds for element operations
             'success_threshold': 0.95,  # 95% success rate target
+            'storage_state_file': STORAGE_STATE_FILE,
+            # Long-lived Chrome shared across cron runs; set MACBID_BROWSER_CDP_URL to attach elsewhere.
+            # The DevTools port has no authentication: any local process that can reach it drives
+            # the logged-in profile. It is bound to loopback only; set MACBID_REUSE_BROWSER=0 on
+            # hosts shared with other users.
+            'reuse_browser': os.getenv('MACBID_REUSE_BROWSER', '1') != '0',
+            'cdp_port': int(os.getenv('MACBID_BROWSER_CDP_PORT', '9222')),
+            'cdp_endpoint': os.getenv('MACBID_BROWSER_CDP_URL',
+                                      f"http://127.0.0.1:{os.getenv('MACBID_BROWSER_CDP_PORT', '9222')}"),
+            'firebase_wait_timeout': 15000,  # Max wait for Firebase traffic after a navigation
+            'interaction_wait_timeout': 5000,  # Max wait after nudging the page
         }
         
         print("🚀 FIREBASE PLAYWRIGHT AUTOMATION V2 - PHASE 2 ENHANCED")
@@ -112,6 +151,7 @@ class EnhancedFirebasePlaywrightCapturer:
     async def enhanced_firebase_capture(self) -> Dict:
         """Phase 2: Enhanced Firebase capture with improved reliability"""
         self.performance_metrics['start_time'] = time.time()
+        self.firebase_ready = asyncio.Event()
         print("🎭 ENHANCED FIREBASE PLAYWRIGHT AUTOMATION")
         print("=" * 60)
         
@@ -140,6 +180,10 @@ class EnhancedFirebasePlaywrightCapturer:
                     # Enhanced data processing with validation
                     process_result = await self._enhanced_data_processing()
                     
+                    if self.capture_context is not None:
+                        await self._save_storage_state(self.capture_context)
+                    
+                    # Disconnects (leaving Chrome running) when attached over CDP
                     await browser.close()
                     
                     if process_result['success']:
@@ -175,13 +219,31 @@ class EnhancedFirebasePlaywrightCapturer:
                 'phase': 'enhanced_automation_setup',
                 'performance': self._calculate_performance_metrics()
             }
+            
+        finally:
+            self.captured_requests.close()
 
     async def _launch_enhanced_browser(self, playwright) -> Browser:
         """Phase 2: Enhanced browser launch with optimized settings"""
+        if self.config['reuse_browser']:
+            browser = await self._connect_long_lived_browser(playwright)
+            if browser:
+                return browser
+        
         print("🚀 Launching enhanced browser with optimized settings...")
         
-        # Phase 2: Enhanced browser arguments for stability
-        browser_args = [
+        browser = await playwright.chromium.launch(
+            headless=True,  # Phase 2: Start headless for performance
+            args=self._browser_args(),
+            timeout=self.config['browser_timeout']
+        )
+        
+        print("✅ Enhanced browser launched successfully")
+        return browser
+
+    def _browser_args(self) -> List[str]:
+        """Phase 2: Enhanced browser arguments for stability"""
+        return [
             '--no-sandbox',
             '--disable-setuid-sandbox',
             '--disable-dev-shm-usage',
@@ -197,35 +259,122 @@ class EnhancedFirebasePlaywrightCapturer:
             '--memory-pressure-off',
             '--max_old_space_size=4096'
         ]
+
+    async def _connect_long_lived_browser(self, playwright) -> Optional[Browser]:
+        """Attach to the long-lived Chrome over CDP, starting it if nobody has yet"""
+        endpoint = self.config['cdp_endpoint']
         
-        browser = await playwright.chromium.launch(
-            headless=True,  # Phase 2: Start headless for performance
-            args=browser_args,
-            timeout=self.config['browser_timeout']
-        )
+        try:
+            browser = await playwright.chromium.connect_over_cdp(endpoint, timeout=3000)
+            self.browser_reused = True
+            self.performance_metrics['browser_reused'] = True
+            print(f"♻️ Attached to running browser at {endpoint}")
+            return browser
+        except Exception:
+            pass
         
-        print("✅ Enhanced browser launched successfully")
-        return browser
+        # Only spawn a browser for the default local endpoint; a custom one is managed elsewhere
+        if 'MACBID_BROWSER_CDP_URL' in os.environ:
+            print(f"⚠️ No browser answering at {endpoint} - launching a private one")
+            return None
+        
+        try:
+            print(f"🚀 Starting long-lived browser on port {self.config['cdp_port']}...")
+            CHROME_PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+            CHROME_PROFILE_DIR.chmod(0o700)  # Logged-in profile; keep other users out
+            subprocess.Popen(
+                [
+                    playwright.chromium.executable_path,
+                    '--headless=new',
+                    '--remote-debugging-address=127.0.0.1',
+                    f"--remote-debugging-port={self.config['cdp_port']}",
+                    f'--user-data-dir={CHROME_PROFILE_DIR}',
+                    *self._browser_args()
+                ],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True  # Outlives this cron run
+            )
+            
+            deadline = time.time() + 15
+            while time.time() < deadline:
+                try:
+                    browser = await playwright.chromium.connect_over_cdp(endpoint, timeout=2000)
+                    print("✅ Long-lived browser started")
+                    return browser
+                except Exception:
+                    await asyncio.sleep(0.25)
+                    
+            print("⚠️ Long-lived browser did not come up - launching a private one")
+            
+        except Exception as e:
+            print(f"⚠️ Could not start long-lived browser: {e}")
+        
+        return None
+
+    def _load_storage_state(self) -> Optional[str]:
+        """Path to a saved storage state (cookies, localStorage, IndexedDB) if one exists"""
+        state_file = Path(self.config['storage_state_file'])
+        if not state_file.exists():
+            return None
+        
+        try:
+            with open(state_file, 'r') as f:
+                json.load(f)
+            return str(state_file)
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable storage state {state_file}: {e}")
+            return None
+
+    async def _save_storage_state(self, context: BrowserContext) -> bool:
+        """Persist the context's login so the next run starts warm"""
+        state_file = Path(self.config['storage_state_file'])
+        try:
+            state_file.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                # Firebase keeps its auth tokens in IndexedDB (Playwright 1.51+)
+                await context.storage_state(path=str(state_file), indexed_db=True)
+            except TypeError:
+                await context.storage_state(path=str(state_file))
+            state_file.chmod(0o600)
+            print(f"💾 Storage state saved to {state_file}")
+            return True
+        except Exception as e:
+            print(f"⚠️ Could not save storage state: {e}")
+            return False
 
     async def _create_session_pool(self, browser: Browser) -> List[BrowserContext]:
         """Phase 2: Create multiple browser contexts for session redundancy"""
         print(f"🔄 Creating session pool with {self.config['max_sessions']} contexts...")
         
+        storage_state = self._load_storage_state()
+        if storage_state:
+            print(f"♻️ Reusing saved storage state from {storage_state}")
+            self.performance_metrics['storage_state_reused'] = True
+        
         contexts = []
         for i in range(self.config['max_sessions']):
             try:
-                context = await browser.new_context(
+                context_options = dict(
                     viewport={'width': 1920, 'height': 1080},
                     user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
                     extra_http_headers={
                         'Accept-Language': 'en-US,en;q=0.9',
                         'Accept-Encoding': 'gzip, deflate, br',
-                        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                        'Cache-Control': 'no-cache',
-                        'Pragma': 'no-cache'
+                        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8'
                     }
                 )
                 
+                try:
+                    context = await browser.new_context(storage_state=storage_state, **context_options)
+                except Exception as state_error:
+                    if not storage_state:
+                        raise
+                    print(f"⚠️ Saved storage state rejected ({state_error}) - starting cold")
+                    storage_state = None
+                    self.performance_metrics['storage_state_reused'] = False
+                    context = await browser.new_context(**context_options)
+                
                 # Setup enhanced network interception for each context
                 await self._setup_enhanced_network_interception(context, f"session_{i+1}")
                 
@@ -248,13 +397,7 @@ class EnhancedFirebasePlaywrightCapturer:
         
         async def handle_enhanced_request(request):
             # Enhanced Firebase request capture - broader detection
-            firebase_patterns = [
-                'firestore.googleapis.com',
-                'firebase.googleapis.com', 
-                'firebase.com',
-                'firebaseio.com',
-                'google.firestore'
-            ]
+            firebase_patterns = FIREBASE_PATTERNS
             
             # Also capture Mac.bid internal requests that might contain Firebase data
             macbid_patterns = [
@@ -262,6 +405,9 @@ class EnhancedFirebasePlaywrightCapturer:
                 'macbid'
             ]
             
+            if not self.captured_requests.wants(request.url):
+                return
+            
             is_firebase = any(pattern in request.url for pattern in firebase_patterns)
             is_macbid = any(pattern in request.url for pattern in macbid_patterns)
             
@@ -293,9 +439,14 @@ class EnhancedFirebasePlaywrightCapturer:
                     if 'AID' in query_part:
                         firebase_request['aid'] = self._extract_parameter(query_part, 'AID')
                 
-                self.captured_requests.append(firebase_request)
+                self.captured_requests.add(firebase_request)
                 self.performance_metrics['requests_captured'] += 1
                 
+                if 'gsessionid' in request.url and self.firebase_ready is not None:
+                    if self.capture_context is None:
+                        self.capture_context = context
+                    self.firebase_ready.set()
+                
             elif is_macbid and any(keyword in request.url.lower() for keyword in ['api', 'data', 'auction', 'lot']):
                 print(f"📊 [{session_id}] Mac.bid API: {request.method} {request.url[:80]}...")
                 
@@ -309,7 +460,7 @@ class EnhancedFirebasePlaywrightCapturer:
                 }
                 
                 # Capture all Mac.bid API requests (we'll extract session data later)
-                self.captured_requests.append(macbid_request)
+                self.captured_requests.add(macbid_request, pending=False)
                 self.performance_metrics['requests_captured'] += 1
         
         async def handle_enhanced_response(response):
@@ -326,32 +477,31 @@ class EnhancedFirebasePlaywrightCapturer:
                 status_emoji = "✅" if response.status == 200 else "❌"
                 print(f"{status_emoji} [{session_id}] Firebase response: {response.status}")
                 
-                # Enhanced response data capture
-                for req in self.captured_requests:
-                    if (req.get('url') == response.url and 
-                        req.get('session_id') == session_id and 
-                        not req.get('response_captured')):
-                        
-                        req['response_status'] = response.status
-                        req['response_captured'] = True
+                # Enhanced response data capture - bodies are only read for requests we kept
+                req = self.captured_requests.take_pending(response.url, session_id=session_id)
+                if req is not None:
+                    req['response_status'] = response.status
+                    req['response_captured'] = True
+                    
+                    if response.status == 200:
+                        self.performance_metrics['successful_requests'] += 1
                         
-                        if response.status == 200:
-                            self.performance_metrics['successful_requests'] += 1
-                            
-                            # Try to extract response data for session information
-                            try:
-                                response_text = await response.text()
-                                if response_text and len(response_text) > 0:
-                                    req['response_body'] = response_text[:1000]
+                        # Try to extract response data for session information
+                        try:
+                            response_text = self.captured_requests.trim_body(await response.body())
+                            if response_text and len(response_text) > 0:
+                                req['response_body'] = response_text
+                                
+                                # Look for session data in response
+                                if any(keyword in response_text for keyword in ['gsessionid', 'SID', 'session']):
+                                    req['contains_session_data'] = True
                                     
-                                    # Look for session data in response
-                                    if any(keyword in response_text for keyword in ['gsessionid', 'SID', 'session']):
-                                        req['contains_session_data'] = True
-                                        
-                            except Exception as e:
-                                req['response_error'] = str(e)
-                        else:
-                            self.performance_metrics['failed_requests'] += 1
+                        except Exception as e:
+                            req['response_error'] = str(e)
+                    else:
+                        self.performance_metrics['failed_requests'] += 1
+                    
+                    self.captured_requests.complete(req)
         
         context.on('request', handle_enhanced_request)
         context.on('response', handle_enhanced_response)
@@ -402,16 +552,16 @@ class EnhancedFirebasePlaywrightCapturer:
                         print(f"🔍 [{session_id}] Visiting: {url}")
                         await page.goto(url, timeout=30000, wait_until='domcontentloaded')
                         
-                        # Enhanced Firebase activity triggering
-                        await page.wait_for_timeout(2000)
+                        # Warm sessions usually open the Firebase channel straight away
+                        if await self._wait_for_firebase_activity(self.config['firebase_wait_timeout']):
+                            successful_sessions += 1
+                            break
                         
                         # Trigger additional page interactions to generate Firebase requests
                         try:
                             # Scroll to trigger lazy loading
                             await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                            await page.wait_for_timeout(1000)
                             await page.evaluate("window.scrollTo(0, 0)")
-                            await page.wait_for_timeout(1000)
                             
                             # Try to interact with common elements that might trigger Firebase
                             search_selectors = ['input[type="search"]', '.search-input', '#search']
@@ -419,7 +569,6 @@ class EnhancedFirebasePlaywrightCapturer:
                                 try:
                                     if await page.locator(selector).count() > 0:
                                         await page.fill(selector, 'test')
-                                        await page.wait_for_timeout(500)
                                         break
                                 except:
                                     continue
@@ -438,9 +587,9 @@ class EnhancedFirebasePlaywrightCapturer:
                                 try:
                                     if await page.locator(selector).count() > 0:
                                         await page.locator(selector).first.click(timeout=5000)
-                                        await page.wait_for_timeout(2000)
-                                        await page.go_back(timeout=10000)
-                                        await page.wait_for_timeout(1000)
+                                        if await self._wait_for_firebase_activity(self.config['interaction_wait_timeout']):
+                                            break
+                                        await page.go_back(timeout=10000, wait_until='domcontentloaded')
                                         break
                                 except:
                                     continue
@@ -448,10 +597,12 @@ class EnhancedFirebasePlaywrightCapturer:
                         except Exception as interaction_error:
                             print(f"   [{session_id}] Interaction error (continuing): {interaction_error}")
                         
-                        # Final wait for any delayed Firebase requests
-                        await page.wait_for_timeout(2000)
                         successful_sessions += 1
                         
+                        # Final wait for any delayed Firebase requests
+                        if await self._wait_for_firebase_activity(self.config['interaction_wait_timeout']):
+                            break
+                        
                     except Exception as url_error:
                         print(f"⚠️ [{session_id}] Error with {url}: {url_error}")
                         continue
@@ -461,6 +612,10 @@ class EnhancedFirebasePlaywrightCapturer:
             except Exception as session_error:
                 print(f"❌ [{session_id}] Session failed: {session_error}")
                 continue
+            
+            if self.firebase_ready.is_set():
+                print(f"⚡ [{session_id}] Firebase session captured - skipping remaining sessions")
+                break
         
         success_rate = successful_sessions / total_attempts if total_attempts > 0 else 0
         
@@ -475,6 +630,16 @@ class EnhancedFirebasePlaywrightCapturer:
             'phase': 'enhanced_browsing'
         }
 
+    async def _wait_for_firebase_activity(self, timeout_ms: int) -> bool:
+        """Wait until a Firebase request carrying a gsessionid has been captured"""
+        if self.firebase_ready is None:
+            return False
+        try:
+            await asyncio.wait_for(self.firebase_ready.wait(), timeout_ms / 1000)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
     async def _attempt_session_recovery(self, browser: Browser) -> Dict:
         """Phase 2: Attempt to recover from session failures"""
         print("🔄 Attempting session recovery...")
@@ -486,7 +651,11 @@ class EnhancedFirebasePlaywrightCapturer:
             
             page = await recovery_context.new_page()
             await page.goto('https://www.mac.bid', timeout=30000)
-            await page.wait_for_timeout(5000)
+            await self._wait_for_firebase_activity(5000)
+            
+            if self.capture_context is recovery_context:
+                await self._save_storage_state(recovery_context)
+                self.capture_context = None
             
             await page.close()
             await recovery_context.close()
@@ -875,7 +1044,8 @@ class EnhancedFirebasePlaywrightCapturer:
                     'failed_requests': self.performance_metrics['failed_requests'],
                     'performance_metrics': self.performance_metrics
                 },
-                'captured_requests': self.captured_requests[:5]  # Sample of requests
+                'captured_requests': self.captured_requests.records(5),  # Sample of requests
+                'capture_file': str(self.captured_requests.output_path)
             }
             
             with open(session_file, 'w') as f:
@@ -906,6 +1076,9 @@ class EnhancedFirebasePlaywrightCapturer:
             'success_rate': round(success_rate, 3),
             'session_rotations': self.performance_metrics['session_rotations'],
             'error_recoveries': self.performance_metrics['error_recoveries'],
+            'storage_state_reused': self.performance_metrics['storage_state_reused'],
+            'browser_reused': self.performance_metrics['browser_reused'],
+            'capture': self.captured_requests.summary(),
             'phase': 'enhanced_v2'
         }
 
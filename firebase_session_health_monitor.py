@@ -13,10 +13,10 @@ import time
 import logging
 from datetime import datetime, timedelta
 from pathlib import Path
-import subprocess
 import sys
 from typing import Dict, List, Optional, Tuple
 import sqlite3
+from health_timeseries import HealthTimeSeries
 
 # Configure logging
 logging.basicConfig(
@@ -29,6 +29,95 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Probe targets checked on every validation pass
+HEALTH_ENDPOINTS = {
+    'main_page': 'https://www.mac.bid',
+    'auctions_page': 'https://www.mac.bid/auctions'
+}
+
+def _latency_bucket_bounds(limit_ms: int = 60000, growth: float = 1.25) -> List[int]:
+    """Log-spaced bucket upper bounds in milliseconds, starting at 1ms"""
+    bounds = []
+    bound = 1.0
+    while bound < limit_ms:
+        bounds.append(int(round(bound)))
+        bound = max(bound * growth, bound + 1)
+    bounds.append(limit_ms)
+    return bounds
+
+class LatencyHistogram:
+    """Fixed log-scale latency histogram with cheap percentile queries.
+
+    Buckets grow by ~25% from 1ms up to 60s, so any percentile is reported
+    to within one bucket width no matter how many samples were recorded.
+    Probes that never got a response are only counted in ``failed`` so a
+    timeout doesn't show up as a 5s response.
+    """
+    
+    BUCKET_BOUNDS_MS = _latency_bucket_bounds()
+    
+    def __init__(self):
+        self.counts = [0] * len(self.BUCKET_BOUNDS_MS)
+        self.pending = [0] * len(self.BUCKET_BOUNDS_MS)
+        self.total = 0
+        self.failed = 0
+        
+    def bucket_for(self, latency_ms: float) -> int:
+        """Index of the first bucket whose upper bound covers latency_ms"""
+        low, high = 0, len(self.BUCKET_BOUNDS_MS) - 1
+        while low < high:
+            mid = (low + high) // 2
+            if self.BUCKET_BOUNDS_MS[mid] >= latency_ms:
+                high = mid
+            else:
+                low = mid + 1
+        return low
+        
+    def record(self, latency_seconds: float):
+        """Add one sample; it is also queued for the next database flush"""
+        index = self.bucket_for(latency_seconds * 1000)
+        self.counts[index] += 1
+        self.pending[index] += 1
+        self.total += 1
+        
+    def record_failure(self):
+        """Count a probe that errored or timed out before any response"""
+        self.failed += 1
+        
+    def load(self, bucket_counts: Dict[int, int]):
+        """Seed counts from persisted (bucket upper bound ms -> count) rows"""
+        for bound_ms, count in bucket_counts.items():
+            index = self.bucket_for(bound_ms)
+            self.counts[index] += count
+            self.total += count
+            
+    def drain_pending(self) -> List[Tuple[int, int]]:
+        """Return and clear (bucket upper bound ms, count) deltas since last flush"""
+        deltas = [(self.BUCKET_BOUNDS_MS[i], count) for i, count in enumerate(self.pending) if count]
+        self.pending = [0] * len(self.BUCKET_BOUNDS_MS)
+        return deltas
+        
+    def percentile(self, pct: float) -> float:
+        """Latency in seconds below which pct percent of samples fall"""
+        if not self.total:
+            return 0.0
+        rank = max(1, int(round(self.total * pct / 100.0)))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return self.BUCKET_BOUNDS_MS[index] / 1000.0
+        return self.BUCKET_BOUNDS_MS[-1] / 1000.0
+        
+    def summary(self) -> Dict:
+        return {
+            'samples': self.total,
+            'failed': self.failed,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99)
+        }
+
 class SessionHealthMonitor:
     """Advanced session health monitoring and management system"""
     
@@ -39,14 +128,30 @@ class SessionHealthMonitor:
         self.health_db = self.base_dir / "session_health.db"
         self.session_data = {}
         self.health_metrics = {}
+        self.endpoints = dict(HEALTH_ENDPOINTS)
+        self.http_session = None
+        self.head_unsupported = set()
+        self.latency_histograms = {name: LatencyHistogram() for name in self.endpoints}
         
         # Health thresholds
         self.SESSION_EXPIRY_WARNING = 3600  # 1 hour before expiry
         self.MAX_FAILED_REQUESTS = 3
         self.HEALTH_CHECK_INTERVAL = 1800  # 30 minutes
         self.CRITICAL_FAILURE_THRESHOLD = 0.7  # 70% success rate minimum
+        self.PROBE_TIMEOUT = 5
+        self.PROBE_READ_BYTES = 1024  # GET fallback reads this much, then drops the body
+        self.FAST_CHECK_INTERVAL = 5  # seconds between probes in watch mode
+        self.REFRESH_TIMEOUT = 300
+        self.REFRESH_COOLDOWN = 120  # watch mode waits this long after a refresh before another
+        self.MAX_REFRESH_BACKOFF = 3600  # cooldown doubles per consecutive failure up to this
+        self.ALERT_COOLDOWN = 900  # an alert type that stays raised is re-recorded at most this often
+        self.refresh_failures = 0
+        self.next_refresh_at = 0.0
+        self.alert_raised_at: Dict[str, float] = {}  # alert type -> when it was last recorded
         
         self._init_health_database()
+        self._load_latency_histograms()
+        self.health_series = HealthTimeSeries(self.health_db)
         
     def _init_health_database(self):
         """Initialize session health tracking database"""
@@ -82,6 +187,53 @@ class SessionHealthMonitor:
                 )
             """)
             
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS endpoint_latency_histogram (
+                    endpoint TEXT NOT NULL,
+                    bucket_ms INTEGER NOT NULL,
+                    count INTEGER NOT NULL DEFAULT 0,
+                    updated_at TEXT,
+                    PRIMARY KEY (endpoint, bucket_ms)
+                )
+            """)
+            
+    def _load_latency_histograms(self):
+        """Restore cumulative per-endpoint latency histograms from the database"""
+        try:
+            with sqlite3.connect(self.health_db) as conn:
+                rows = conn.execute(
+                    "SELECT endpoint, bucket_ms, count FROM endpoint_latency_histogram"
+                ).fetchall()
+                
+            buckets = {}
+            for endpoint, bucket_ms, count in rows:
+                buckets.setdefault(endpoint, {})[bucket_ms] = count
+                
+            for endpoint, bucket_counts in buckets.items():
+                self.latency_histograms.setdefault(endpoint, LatencyHistogram()).load(bucket_counts)
+                
+        except Exception as e:
+            logger.error(f"❌ Error loading latency histograms: {e}")
+            
+    def get_latency_percentiles(self) -> Dict:
+        """p50/p95/p99 latency per endpoint across every recorded probe"""
+        return {name: histogram.summary() for name, histogram in self.latency_histograms.items()}
+        
+    async def get_http_session(self) -> aiohttp.ClientSession:
+        """Shared keep-alive session used by every endpoint probe"""
+        if self.http_session is None or self.http_session.closed:
+            self.http_session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.PROBE_TIMEOUT),
+                connector=aiohttp.TCPConnector(ssl=False, limit_per_host=4, keepalive_timeout=60)
+            )
+        return self.http_session
+        
+    async def close(self):
+        """Close the pooled probe session"""
+        if self.http_session is not None and not self.http_session.closed:
+            await self.http_session.close()
+        self.http_session = None
+        
     async def load_current_session(self) -> Dict:
         """Load current session data from auth config"""
         try:
@@ -115,12 +267,19 @@ class SessionHealthMonitor:
         if not self.session_data.get('session_id'):
             return False, {'error': 'No session data available'}
             
-        # Test session with multiple endpoints
-        test_results = {
-            'main_page': await self._test_endpoint('https://www.mac.bid'),
-            'auctions_page': await self._test_endpoint('https://www.mac.bid/auctions'),
-            'timestamp': datetime.now().isoformat()
-        }
+        # Test session with all endpoints concurrently over the shared pool
+        names = list(self.endpoints)
+        results = await asyncio.gather(*(self._test_endpoint(self.endpoints[name]) for name in names))
+        test_results = dict(zip(names, results))
+        
+        for name, result in test_results.items():
+            histogram = self.latency_histograms.setdefault(name, LatencyHistogram())
+            if 'status_code' in result:
+                histogram.record(result['response_time'])
+            else:
+                histogram.record_failure()
+            
+        test_results['timestamp'] = datetime.now().isoformat()
         
         # Calculate health metrics
         successful_tests = sum(1 for result in test_results.values() if isinstance(result, dict) and result.get('success', False))
@@ -141,6 +300,7 @@ class SessionHealthMonitor:
             'success_rate': success_rate,
             'avg_response_time': avg_response_time,
             'test_results': test_results,
+            'latency_percentiles': self.get_latency_percentiles(),
             'status': self._determine_status(health_score, success_rate),
             'needs_refresh': success_rate < self.CRITICAL_FAILURE_THRESHOLD
         }
@@ -158,33 +318,53 @@ class SessionHealthMonitor:
         return is_healthy, health_data
         
     async def _test_endpoint(self, url: str) -> Dict:
-        """Test a specific endpoint with current session"""
-        start_time = time.time()
+        """Test a specific endpoint with current session.
+
+        Sends HEAD where the server allows it; otherwise GETs, reads only the
+        first chunk of the body and closes the response instead of
+        downloading the whole page.
+        """
+        start_time = time.perf_counter()
         
         try:
             headers = self.session_data.get('headers', {})
             cookies = self.session_data.get('cookies', {})
+            session = await self.get_http_session()
             
-            async with aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=10),
-                connector=aiohttp.TCPConnector(ssl=False)
-            ) as session:
-                async with session.get(url, headers=headers, cookies=cookies) as response:
-                    response_time = time.time() - start_time
-                    
-                    return {
-                        'success': response.status == 200,
-                        'status_code': response.status,
-                        'response_time': response_time,
-                        'url': url,
-                        'content_length': len(await response.text()) if response.status == 200 else 0
-                    }
-                    
+            if url not in self.head_unsupported:
+                async with session.head(url, headers=headers, cookies=cookies, allow_redirects=True) as response:
+                    if response.status not in (405, 501):
+                        return {
+                            'success': response.status == 200,
+                            'status_code': response.status,
+                            'response_time': time.perf_counter() - start_time,
+                            'url': url,
+                            'method': 'HEAD',
+                            'content_length': response.content_length or 0
+                        }
+                self.head_unsupported.add(url)
+                
+            async with session.get(url, headers=headers, cookies=cookies) as response:
+                if response.status == 200:
+                    await response.content.read(self.PROBE_READ_BYTES)
+                response_time = time.perf_counter() - start_time
+                content_length = response.content_length or 0
+                response.close()
+                
+                return {
+                    'success': response.status == 200,
+                    'status_code': response.status,
+                    'response_time': response_time,
+                    'url': url,
+                    'method': 'GET',
+                    'content_length': content_length
+                }
+                
         except Exception as e:
-            response_time = time.time() - start_time
+            response_time = time.perf_counter() - start_time
             return {
                 'success': False,
-                'error': str(e),
+                'error': str(e) or type(e).__name__,
                 'response_time': response_time,
                 'url': url
             }
@@ -221,6 +401,20 @@ class SessionHealthMonitor:
                     json.dumps(health_data['test_results'])
                 ))
                 
+                now = datetime.now().isoformat()
+                for endpoint, histogram in self.latency_histograms.items():
+                    deltas = histogram.drain_pending()
+                    conn.executemany("""
+                        INSERT INTO endpoint_latency_histogram (endpoint, bucket_ms, count, updated_at)
+                        VALUES (?, ?, ?, ?)
+                        ON CONFLICT(endpoint, bucket_ms) DO UPDATE SET
+                            count = count + excluded.count,
+                            updated_at = excluded.updated_at
+                    """, [(endpoint, bucket_ms, count, now) for bucket_ms, count in deltas])
+            
+            # Fold the new row into the chart rollups and age out old raw rows
+            self.health_series.rollup()
+                
         except Exception as e:
             logger.error(f"❌ Error storing health data: {e}")
             
@@ -252,8 +446,19 @@ class SessionHealthMonitor:
                 'message': f"High response time: {health_data['avg_response_time']:.2f}s"
             })
             
+        # Alerts that cleared re-arm; ones still raised repeat only after the cooldown
+        raised = {alert['type'] for alert in alerts}
+        for alert_type in list(self.alert_raised_at):
+            if alert_type not in raised:
+                del self.alert_raised_at[alert_type]
+                
         # Store and log alerts
+        now = time.monotonic()
         for alert in alerts:
+            last_raised = self.alert_raised_at.get(alert['type'])
+            if last_raised is not None and now - last_raised < self.ALERT_COOLDOWN:
+                continue
+            self.alert_raised_at[alert['type']] = now
             await self._store_alert(alert, health_data['session_id'])
             logger.warning(f"🚨 {alert['severity']}: {alert['message']}")
             
@@ -281,13 +486,22 @@ class SessionHealthMonitor:
         logger.info("🔄 Triggering session refresh...")
         
         try:
-            # Run Phase 2 automation
-            result = subprocess.run([
-                sys.executable, 
-                "firebase_playwright_automation_v2.py"
-            ], capture_output=True, text=True, timeout=300)
+            # Run Phase 2 automation without blocking the event loop
+            process = await asyncio.create_subprocess_exec(
+                sys.executable,
+                "firebase_playwright_automation_v2.py",
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            try:
+                _, stderr = await asyncio.wait_for(process.communicate(), timeout=self.REFRESH_TIMEOUT)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                logger.error("❌ Session refresh timed out")
+                return False
             
-            if result.returncode == 0:
+            if process.returncode == 0:
                 logger.info("✅ Session refresh completed successfully")
                 
                 # Reload session data
@@ -305,15 +519,42 @@ class SessionHealthMonitor:
                     return False
                     
             else:
-                logger.error(f"❌ Session refresh failed: {result.stderr}")
+                logger.error(f"❌ Session refresh failed: {stderr.decode(errors='replace')}")
                 return False
                 
-        except subprocess.TimeoutExpired:
-            logger.error("❌ Session refresh timed out")
-            return False
         except Exception as e:
             logger.error(f"❌ Error during session refresh: {e}")
             return False
+            
+    async def refresh_with_backoff(self) -> bool:
+        """Refresh, then hold off further refreshes - longer after each consecutive failure"""
+        if await self.trigger_session_refresh():
+            self.refresh_failures = 0
+            cooldown = self.REFRESH_COOLDOWN
+        else:
+            self.refresh_failures += 1
+            cooldown = min(self.MAX_REFRESH_BACKOFF, self.REFRESH_COOLDOWN * 2 ** self.refresh_failures)
+            logger.warning(f"⏳ Next refresh attempt in {cooldown}s ({self.refresh_failures} consecutive failures)")
+            
+        self.next_refresh_at = time.monotonic() + cooldown
+        return self.refresh_failures == 0
+        
+    async def watch(self, interval: Optional[float] = None):
+        """Probe continuously every few seconds over the pooled session"""
+        interval = interval or self.FAST_CHECK_INTERVAL
+        await self.load_current_session()
+        
+        try:
+            while True:
+                started = time.perf_counter()
+                is_healthy, health_data = await self.validate_session()
+                
+                if health_data.get('needs_refresh') and time.monotonic() >= self.next_refresh_at:
+                    await self.refresh_with_backoff()
+                    
+                await asyncio.sleep(max(0, interval - (time.perf_counter() - started)))
+        finally:
+            await self.close()
 
 async def main():
     """Main function for session health monitoring"""
@@ -337,13 +578,22 @@ async def main():
             print(f"   Status: {health_data.get('status', 'UNKNOWN')}")
             print(f"   Needs Refresh: {'Yes' if health_data.get('needs_refresh', False) else 'No'}")
             
+            for endpoint, latency in health_data.get('latency_percentiles', {}).items():
+                print(f"   {endpoint}: p50 {latency['p50']*1000:.0f}ms | p95 {latency['p95']*1000:.0f}ms | "
+                      f"p99 {latency['p99']*1000:.0f}ms ({latency['samples']} probes, {latency['failed']} failed)")
+            
         elif command == "refresh":
             # Manual refresh
             success = await monitor.trigger_session_refresh()
             print(f"Session refresh: {'✅ Success' if success else '❌ Failed'}")
             
+        elif command == "watch":
+            # Continuous fast health checks
+            interval = float(sys.argv[2]) if len(sys.argv) > 2 else None
+            await monitor.watch(interval)
+                
         else:
-            print("Usage: python firebase_session_health_monitor.py [check|refresh]")
+            print("Usage: python firebase_session_health_monitor.py [check|refresh|watch [seconds]]")
             
     else:
         # Default: single health check
@@ -354,6 +604,8 @@ async def main():
         print(f"   Status: {'✅ Healthy' if is_healthy else '❌ Unhealthy'}")
         print(f"   Health Score: {health_data.get('health_score', 0):.1f}/100")
         print(f"   Success Rate: {health_data.get('success_rate', 0)*100:.1f}%")
+        
+    await monitor.close()
 
 if __name__ == "__main__":
     asyncio.run(main()) 
\ No newline at end of file
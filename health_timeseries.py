@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+📉 HEALTH TIME SERIES
+=====================
+Downsampled storage for session health charts. Raw ``session_health`` rows are rolled up
+into 1-minute and 1-hour buckets, old raw rows and minute buckets age out, and chart
+queries are reduced to a fixed number of points with Largest-Triangle-Three-Buckets.
+"""
+
+import sqlite3
+import time
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+METRICS = ['health_score', 'success_rate', 'response_time']
+
+# Rollup tiers: name -> (bucket seconds, length of the ISO timestamp prefix that identifies a bucket, suffix)
+ROLLUP_TIERS = {
+    '1m': (60, 16, ':00'),
+    '1h': (3600, 13, ':00:00'),
+}
+
+def lttb(points: Sequence[Tuple[float, float]], threshold: int) -> List[Tuple[float, float]]:
+    """Largest-Triangle-Three-Buckets downsampling of (x, y) points sorted by x.
+
+    Keeps the first and last point and, from each of ``threshold - 2`` equal buckets,
+    the point forming the largest triangle with the previously kept point and the
+    average of the next bucket - so peaks and dips survive the reduction.
+    """
+    count = len(points)
+    if threshold >= count or threshold < 3:
+        return list(points)
+
+    sampled = [points[0]]
+    bucket_size = (count - 2) / (threshold - 2)
+    anchor = 0
+
+    for i in range(threshold - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+
+        next_start = end
+        next_end = min(int((i + 2) * bucket_size) + 1, count)
+        next_bucket = points[next_start:next_end] or [points[-1]]
+        avg_x = sum(x for x, _ in next_bucket) / len(next_bucket)
+        avg_y = sum(y for _, y in next_bucket) / len(next_bucket)
+
+        anchor_x, anchor_y = points[anchor]
+        best_area = -1.0
+        best = start
+        for j in range(start, end):
+            x, y = points[j]
+            area = abs((anchor_x - avg_x) * (y - anchor_y) - (anchor_x - x) * (avg_y - anchor_y))
+            if area > best_area:
+                best_area = area
+                best = j
+
+        sampled.append(points[best])
+        anchor = best
+
+    sampled.append(points[-1])
+    return sampled
+
+def count_health_samples(conn: sqlite3.Connection) -> int:
+    """All-time number of health checks, including raw rows already aged out.
+
+    Hour buckets are never pruned, so their samples plus the raw rows past the rollup
+    watermark cover every check ever stored. Falls back to counting raw rows in a
+    database that has never been rolled up.
+    """
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    if 'health_rollup_state' not in tables:
+        return conn.execute("SELECT COUNT(*) FROM session_health").fetchone()[0]
+
+    row = conn.execute("SELECT last_row_id FROM health_rollup_state WHERE name = 'session_health'").fetchone()
+    watermark = row[0] if row else 0
+    rolled = conn.execute("SELECT COALESCE(SUM(samples), 0) FROM health_rollups WHERE resolution = '1h'").fetchone()[0]
+    pending = conn.execute("SELECT COUNT(*) FROM session_health WHERE id > ?", (watermark,)).fetchone()[0]
+    return rolled + pending
+
+class HealthTimeSeries:
+    """Rollups, retention and downsampled queries over ``session_health``.
+
+    ``rollup`` folds raw rows added since the last call into the 1m/1h buckets (tracked
+    by a row-id watermark, so it is safe to call from both the monitor and the dashboard)
+    and then ages out raw rows and minute buckets past their retention.
+    """
+
+    RAW_RETENTION = timedelta(days=2)  # covers the dashboards' 24h summaries
+    MINUTE_RETENTION = timedelta(days=30)
+    MAX_SOURCE_POINTS = 5000  # finest tier with at most this many rows in range is used
+    PRUNE_INTERVAL = 600  # seconds between retention sweeps
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.last_prune = 0.0
+        self._init_tables()
+
+    def _init_tables(self):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS health_rollups (
+                    resolution TEXT NOT NULL,
+                    bucket_start TEXT NOT NULL,
+                    samples INTEGER NOT NULL,
+                    health_score_sum REAL, health_score_min REAL, health_score_max REAL,
+                    success_rate_sum REAL, success_rate_min REAL, success_rate_max REAL,
+                    response_time_sum REAL, response_time_min REAL, response_time_max REAL,
+                    health_score_count INTEGER, success_rate_count INTEGER, response_time_count INTEGER,
+                    PRIMARY KEY (resolution, bucket_start)
+                )
+            """)
+
+            # Buckets rolled up before per-metric counts existed assume every sample had a value
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(health_rollups)")}
+            for metric in METRICS:
+                if f"{metric}_count" not in columns:
+                    conn.execute(f"ALTER TABLE health_rollups ADD COLUMN {metric}_count INTEGER")
+                    conn.execute(f"UPDATE health_rollups SET {metric}_count = samples")
+
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS health_rollup_state (
+                    name TEXT PRIMARY KEY,
+                    last_row_id INTEGER NOT NULL
+                )
+            """)
+
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_session_health_timestamp ON session_health (timestamp)")
+
+    def rollup(self) -> int:
+        """Roll new raw rows into every tier and apply retention; returns rows rolled up"""
+        with sqlite3.connect(self.db_path) as conn:
+            # Watermark read and advance must not interleave with another process
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT last_row_id FROM health_rollup_state WHERE name = 'session_health'").fetchone()
+            watermark = row[0] if row else 0
+            newest = conn.execute("SELECT MAX(id) FROM session_health").fetchone()[0] or 0
+
+            rolled = 0
+            if newest > watermark:
+                for resolution, (_, prefix, suffix) in ROLLUP_TIERS.items():
+                    conn.execute(self._rollup_sql(), (resolution, prefix, suffix, watermark, newest))
+                rolled = conn.execute(
+                    "SELECT COUNT(*) FROM session_health WHERE id > ? AND id <= ?", (watermark, newest)
+                ).fetchone()[0]
+                conn.execute("""
+                    INSERT INTO health_rollup_state (name, last_row_id) VALUES ('session_health', ?)
+                    ON CONFLICT(name) DO UPDATE SET last_row_id = excluded.last_row_id
+                """, (newest,))
+
+            if time.time() - self.last_prune > self.PRUNE_INTERVAL:
+                self._prune(conn, newest)
+                self.last_prune = time.time()
+
+        return rolled
+
+    def _rollup_sql(self) -> str:
+        # COUNT(metric) skips NULLs, so a bucket mean only averages samples that had a value
+        sums = ', '.join(f"SUM({metric}), MIN({metric}), MAX({metric}), COUNT({metric})" for metric in METRICS)
+        columns = ', '.join(f"{metric}_sum, {metric}_min, {metric}_max, {metric}_count" for metric in METRICS)
+        merges = ', '.join(
+            f"{metric}_sum = COALESCE({metric}_sum, 0) + COALESCE(excluded.{metric}_sum, 0), "
+            f"{metric}_min = MIN(COALESCE({metric}_min, excluded.{metric}_min), COALESCE(excluded.{metric}_min, {metric}_min)), "
+            f"{metric}_max = MAX(COALESCE({metric}_max, excluded.{metric}_max), COALESCE(excluded.{metric}_max, {metric}_max)), "
+            f"{metric}_count = {metric}_count + excluded.{metric}_count"
+            for metric in METRICS
+        )
+        return f"""
+            INSERT INTO health_rollups (resolution, bucket_start, samples, {columns})
+            SELECT ?1, substr(timestamp, 1, ?2) || ?3 AS bucket, COUNT(*), {sums}
+            FROM session_health
+            WHERE id > ?4 AND id <= ?5
+            GROUP BY bucket
+            ON CONFLICT(resolution, bucket_start) DO UPDATE SET
+                samples = samples + excluded.samples, {merges}
+        """
+
+    def _prune(self, conn: sqlite3.Connection, rolled_up_to: int):
+        """Drop raw rows (only once rolled up) and minute buckets past their retention"""
+        raw_cutoff = (datetime.now() - self.RAW_RETENTION).isoformat()
+        minute_cutoff = (datetime.now() - self.MINUTE_RETENTION).isoformat()
+
+        raw_deleted = conn.execute(
+            "DELETE FROM session_health WHERE timestamp < ? AND id <= ?", (raw_cutoff, rolled_up_to)
+        ).rowcount
+        minute_deleted = conn.execute(
+            "DELETE FROM health_rollups WHERE resolution = '1m' AND bucket_start < ?", (minute_cutoff,)
+        ).rowcount
+
+        if raw_deleted or minute_deleted:
+            logger.info(f"🧹 Aged out {raw_deleted} raw health rows and {minute_deleted} minute buckets")
+
+    def _pick_tier(self, conn: sqlite3.Connection, since: datetime, until: datetime) -> str:
+        """Finest tier that still covers ``since`` with at most MAX_SOURCE_POINTS rows"""
+        now = datetime.now()
+        if since >= now - self.RAW_RETENTION:
+            raw_rows = conn.execute(
+                "SELECT COUNT(*) FROM session_health WHERE timestamp >= ? AND timestamp <= ?",
+                (since.isoformat(), until.isoformat())
+            ).fetchone()[0]
+            if raw_rows <= self.MAX_SOURCE_POINTS:
+                return 'raw'
+
+        span = (until - since).total_seconds()
+        if since >= now - self.MINUTE_RETENTION and span / ROLLUP_TIERS['1m'][0] <= self.MAX_SOURCE_POINTS:
+            return '1m'
+        return '1h'
+
+    def query(self, metrics: Optional[List[str]] = None, since: Optional[datetime] = None,
+              until: Optional[datetime] = None, max_points: int = 300) -> Dict:
+        """Per-metric [(timestamp, value), ...] series with at most ``max_points`` points each.
+
+        Rollup buckets report the bucket mean at the bucket start time.
+        """
+        metrics = metrics or METRICS
+        until = until or datetime.now()
+        since = since or until - timedelta(hours=24)
+
+        with sqlite3.connect(self.db_path) as conn:
+            tier = self._pick_tier(conn, since, until)
+            if tier == 'raw':
+                rows = conn.execute(f"""
+                    SELECT timestamp, {', '.join(metrics)}
+                    FROM session_health
+                    WHERE timestamp >= ? AND timestamp <= ?
+                    ORDER BY timestamp
+                """, (since.isoformat(), until.isoformat())).fetchall()
+            else:
+                rows = conn.execute(f"""
+                    SELECT bucket_start, {', '.join(f'{metric}_sum / NULLIF({metric}_count, 0)' for metric in metrics)}
+                    FROM health_rollups
+                    WHERE resolution = ? AND bucket_start >= ? AND bucket_start <= ?
+                    ORDER BY bucket_start
+                """, (tier, self._bucket_floor(since, tier), until.isoformat())).fetchall()
+
+        stamps = [datetime.fromisoformat(row[0]) for row in rows]
+        series = {}
+        for index, metric in enumerate(metrics, start=1):
+            points = [(stamp.timestamp(), row[index]) for stamp, row in zip(stamps, rows) if row[index] is not None]
+            series[metric] = [
+                (datetime.fromtimestamp(x).isoformat(), y) for x, y in lttb(points, max_points)
+            ]
+
+        return {'resolution': tier, 'source_points': len(rows), 'series': series}
+
+    def _bucket_floor(self, moment: datetime, tier: str) -> str:
+        _, prefix, suffix = ROLLUP_TIERS[tier]
+        return moment.isoformat()[:prefix] + suffix
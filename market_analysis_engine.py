@@ -48,6 +48,42 @@ class MarketAnalysisEngine:
                     )
                 """)
                 
+                # Indexes backing the per-category/per-location window queries
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_price_history_category_timestamp
+                    ON price_history (category, timestamp)
+                """)
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_price_history_location_timestamp
+                    ON price_history (location, timestamp)
+                """)
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_price_history_timestamp
+                    ON price_history (timestamp)
+                """)
+                
+                # Hourly trend buckets materialized from price_history
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS price_trend_buckets (
+                        bucket_hour TEXT NOT NULL,
+                        category TEXT NOT NULL,
+                        location TEXT NOT NULL,
+                        volume INTEGER NOT NULL,
+                        price_sum REAL NOT NULL,
+                        min_price REAL NOT NULL,
+                        max_price REAL NOT NULL,
+                        PRIMARY KEY (bucket_hour, category, location)
+                    )
+                """)
+                
+                # Watermark of the last price_history row folded into the buckets
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS trend_refresh_state (
+                        name TEXT PRIMARY KEY,
+                        last_row_id INTEGER NOT NULL
+                    )
+                """)
+                
                 # Market trends table
                 cursor.execute("""
                     CREATE TABLE IF NOT EXISTS market_trends (
@@ -118,35 +154,74 @@ class MarketAnalysisEngine:
             logger.error(f"Error analyzing market trends: {e}")
             return {"error": str(e)}
     
+    def _refresh_trend_buckets(self, conn: sqlite3.Connection):
+        """Fold price_history rows added since the last refresh into the hourly trend buckets"""
+        cursor = conn.cursor()
+        
+        cursor.execute("SELECT last_row_id FROM trend_refresh_state WHERE name = 'price_history'")
+        row = cursor.fetchone()
+        last_row_id = row[0] if row else 0
+        
+        cursor.execute("SELECT COALESCE(MAX(id), 0) FROM price_history")
+        max_row_id = cursor.fetchone()[0]
+        
+        if max_row_id <= last_row_id:
+            return
+        
+        cursor.execute("""
+            INSERT INTO price_trend_buckets
+                (bucket_hour, category, location, volume, price_sum, min_price, max_price)
+            SELECT strftime('%Y-%m-%d %H:00:00', timestamp), category, location,
+                   COUNT(*), SUM(price), MIN(price), MAX(price)
+            FROM price_history
+            WHERE id > ? AND id <= ?
+            GROUP BY 1, 2, 3
+            ON CONFLICT (bucket_hour, category, location) DO UPDATE SET
+                volume = volume + excluded.volume,
+                price_sum = price_sum + excluded.price_sum,
+                min_price = MIN(min_price, excluded.min_price),
+                max_price = MAX(max_price, excluded.max_price)
+        """, (last_row_id, max_row_id))
+        
+        cursor.execute("""
+            INSERT INTO trend_refresh_state (name, last_row_id) VALUES ('price_history', ?)
+            ON CONFLICT (name) DO UPDATE SET last_row_id = excluded.last_row_id
+        """, (max_row_id,))
+        
+        conn.commit()
+    
+    def _bucket_cutoff(self, delta: timedelta) -> str:
+        """Hour bucket key for the start of a trailing window"""
+        return (datetime.now() - delta).strftime('%Y-%m-%d %H:00:00')
+    
     def _calculate_overall_trend(self) -> Dict[str, Any]:
         """Calculate overall market trend"""
         try:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
-                # Get price data from last 30 days
-                thirty_days_ago = datetime.now() - timedelta(days=30)
-                cursor.execute("""
-                    SELECT AVG(price) as avg_price, COUNT(*) as volume
-                    FROM price_history 
-                    WHERE timestamp >= ?
-                """, (thirty_days_ago,))
-                
-                current_data = cursor.fetchone()
-                current_avg = current_data[0] or 0
-                current_volume = current_data[1] or 0
+                self._refresh_trend_buckets(conn)
                 
-                # Get previous 30 days for comparison
-                sixty_days_ago = datetime.now() - timedelta(days=60)
+                # Current and previous 30-day windows in one pass over the buckets
+                thirty_days_ago = self._bucket_cutoff(timedelta(days=30))
+                sixty_days_ago = self._bucket_cutoff(timedelta(days=60))
                 cursor.execute("""
-                    SELECT AVG(price) as avg_price, COUNT(*) as volume
-                    FROM price_history 
-                    WHERE timestamp >= ? AND timestamp < ?
-                """, (sixty_days_ago, thirty_days_ago))
-                
-                previous_data = cursor.fetchone()
-                previous_avg = previous_data[0] or 0
-                previous_volume = previous_data[1] or 0
+                    SELECT
+                        SUM(CASE WHEN bucket_hour >= :current THEN price_sum END)
+                            / SUM(CASE WHEN bucket_hour >= :current THEN volume END),
+                        SUM(CASE WHEN bucket_hour >= :current THEN volume END),
+                        SUM(CASE WHEN bucket_hour < :current THEN price_sum END)
+                            / SUM(CASE WHEN bucket_hour < :current THEN volume END),
+                        SUM(CASE WHEN bucket_hour < :current THEN volume END)
+                    FROM price_trend_buckets
+                    WHERE bucket_hour >= :previous
+                """, {"current": thirty_days_ago, "previous": sixty_days_ago})
+                
+                current_avg, current_volume, previous_avg, previous_volume = cursor.fetchone()
+                current_avg = current_avg or 0
+                current_volume = current_volume or 0
+                previous_avg = previous_avg or 0
+                previous_volume = previous_volume or 0
                 
                 # Calculate trend
                 price_change = 0
@@ -190,29 +265,25 @@ class MarketAnalysisEngine:
             
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
+                self._refresh_trend_buckets(conn)
+                
+                # All categories in one grouped query over the last 7 days of buckets
+                seven_days_ago = self._bucket_cutoff(timedelta(days=7))
+                cursor.execute("""
+                    SELECT category, SUM(price_sum) / SUM(volume), SUM(volume),
+                           MIN(min_price), MAX(max_price)
+                    FROM price_trend_buckets
+                    WHERE bucket_hour >= ?
+                    GROUP BY category
+                """, (seven_days_ago,))
+                
+                stats = {row[0]: row[1:] for row in cursor.fetchall()}
+                total_volume = sum(row[1] for row in stats.values()) or 1
                 
                 for category in categories:
-                    # Get recent data
-                    seven_days_ago = datetime.now() - timedelta(days=7)
-                    cursor.execute("""
-                        SELECT AVG(price), COUNT(*), MIN(price), MAX(price)
-                        FROM price_history 
-                        WHERE category = ? AND timestamp >= ?
-                    """, (category, seven_days_ago))
-                    
-                    data = cursor.fetchone()
-                    avg_price = data[0] or 0
-                    volume = data[1] or 0
-                    min_price = data[2] or 0
-                    max_price = data[3] or 0
+                    avg_price, volume, min_price, max_price = stats.get(category, (0, 0, 0, 0))
                     
                     # Calculate market share
-                    cursor.execute("""
-                        SELECT COUNT(*) FROM price_history 
-                        WHERE timestamp >= ?
-                    """, (seven_days_ago,))
-                    
-                    total_volume = cursor.fetchone()[0] or 1
                     market_share = (volume / total_volume) * 100
                     
                     # Simulate trend calculation
@@ -220,12 +291,12 @@ class MarketAnalysisEngine:
                     
                     category_trends.append({
                         "category": category,
-                        "avg_price": round(avg_price, 2),
+                        "avg_price": round(avg_price or 0, 2),
                         "volume": volume,
                         "market_share": round(market_share, 1),
                         "price_range": {
-                            "min": round(min_price, 2),
-                            "max": round(max_price, 2)
+                            "min": round(min_price or 0, 2),
+                            "max": round(max_price or 0, 2)
                         },
                         "trend_percent": trend_percent,
                         "trend_direction": "rising" if trend_percent > 0 else "falling" if trend_percent < 0 else "stable"
@@ -246,17 +317,22 @@ class MarketAnalysisEngine:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
+                self._refresh_trend_buckets(conn)
+                
+                # All locations in one grouped query over the last 7 days of buckets
+                seven_days_ago = self._bucket_cutoff(timedelta(days=7))
+                cursor.execute("""
+                    SELECT location, SUM(price_sum) / SUM(volume), SUM(volume)
+                    FROM price_trend_buckets
+                    WHERE bucket_hour >= ?
+                    GROUP BY location
+                """, (seven_days_ago,))
+                
+                stats = {row[0]: row[1:] for row in cursor.fetchall()}
+                
                 for location in locations:
-                    seven_days_ago = datetime.now() - timedelta(days=7)
-                    cursor.execute("""
-                        SELECT AVG(price), COUNT(*)
-                        FROM price_history 
-                        WHERE location = ? AND timestamp >= ?
-                    """, (location, seven_days_ago))
-                    
-                    data = cursor.fetchone()
-                    avg_price = data[0] or 0
-                    volume = data[1] or 0
+                    avg_price, volume = stats.get(location, (0, 0))
+                    avg_price = avg_price or 0
                     
                     # Simulate activity level
                     activity_level = "high" if volume > 50 else "medium" if volume > 20 else "low"
@@ -280,17 +356,24 @@ class MarketAnalysisEngine:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
-                # Get price data from last 24 hours
+                # Successive changes over the last 24 hours computed in SQL with LAG
                 yesterday = datetime.now() - timedelta(hours=24)
                 cursor.execute("""
-                    SELECT price FROM price_history 
-                    WHERE timestamp >= ?
-                    ORDER BY timestamp
+                    SELECT COUNT(*), MIN(price), MAX(price),
+                           AVG(change), AVG(ABS(change))
+                    FROM (
+                        SELECT price,
+                               (price - LAG(price) OVER w) * 100.0
+                                   / NULLIF(LAG(price) OVER w, 0) AS change
+                        FROM price_history
+                        WHERE timestamp >= ?
+                        WINDOW w AS (ORDER BY timestamp, id)
+                    )
                 """, (yesterday,))
                 
-                prices = [row[0] for row in cursor.fetchall()]
+                count, min_price, max_price, mean_change, mean_abs_change = cursor.fetchone()
                 
-                if len(prices) < 2:
+                if count < 2:
                     return {
                         "volatility": "low",
                         "price_range": {"min": 0, "max": 0},
@@ -298,26 +381,20 @@ class MarketAnalysisEngine:
                     }
                 
                 # Calculate volatility
-                price_changes = []
-                for i in range(1, len(prices)):
-                    change = ((prices[i] - prices[i-1]) / prices[i-1]) * 100
-                    price_changes.append(change)
-                
                 volatility = "low"
-                if price_changes:
-                    avg_change = statistics.mean([abs(change) for change in price_changes])
-                    if avg_change > 10:
+                if mean_abs_change is not None:
+                    if mean_abs_change > 10:
                         volatility = "high"
-                    elif avg_change > 5:
+                    elif mean_abs_change > 5:
                         volatility = "medium"
                 
                 return {
                     "volatility": volatility,
                     "price_range": {
-                        "min": round(min(prices), 2),
-                        "max": round(max(prices), 2)
+                        "min": round(min_price, 2),
+                        "max": round(max_price, 2)
                     },
-                    "average_change": round(statistics.mean(price_changes) if price_changes else 0, 2)
+                    "average_change": round(mean_change or 0, 2)
                 }
                 
         except Exception as e:
@@ -8,14 +8,23 @@ import asyncio
 import aiohttp
 import ssl
 import json
+import os
+import sys
 import sqlite3
 from datetime import datetime, timedelta
 from collections import defaultdict
+from functools import lru_cache
 import re
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core_systems.lot_index import LotIndex
+from core_systems.search_gateway import get_search_gateway
+
 class AdvancedProductSearch:
     def __init__(self):
         self.session = None
+        self.lot_index = LotIndex()
+        self.search_gateway = get_search_gateway()
         self.sc_locations = ["Spartanburg", "Greenville", "Rock Hill", "Gastonia", "Anderson"]
         self.db_file = "product_search.db"
         self.init_database()
@@ -84,6 +93,14 @@ class AdvancedProductSearch:
             r'autographed'
         ]
         
+        # All rare patterns in one alternation; the lookahead lets matches overlap so
+        # every pattern present in a title is seen, each counted once via its group name
+        self.rare_pattern_regex = re.compile('(?=(?:{}))'.format('|'.join(
+            f'(?P<rare_{i}>{pattern})' for i, pattern in enumerate(self.rare_patterns))))
+        
+        # Title-derived facts are memoized so repeat sightings of a lot cost a lookup
+        self.title_profile = lru_cache(maxsize=65536)(self.build_title_profile)
+        
     def init_database(self):
         """Initialize product search database."""
         conn = sqlite3.connect(self.db_file)
@@ -183,34 +200,36 @@ class AdvancedProductSearch:
             await asyncio.sleep(0.25)
             
     async def search_for_term(self, term, limit=200):
-        """Search for a specific term."""
-        url = f"https://api.macdiscount.com/search?q={term}&limit={limit}"
-        
+        """Search for a specific term, answering from the local lot index when it is fresh."""
+        indexed_hits = self.lot_index.lookup(term, limit, self.sc_locations)
+        if indexed_hits is not None:
+            return indexed_hits
+            
         try:
-            async with self.session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    hits = data.get('hits', [])
-                    
-                    sc_hits = []
-                    for hit in hits:
-                        if hit.get('auction_location') in self.sc_locations:
-                            sc_hits.append(hit)
-                            
-                    return sc_hits
-                else:
-                    return []
+            hits = await self.search_gateway.search(self.session, term, limit)
         except Exception as e:
             return []
             
+        self.lot_index.add_lots(hits, term=term)
+        
+        # Filter to SC locations only
+        sc_hits = []
+        for hit in hits:
+            if hit.get('auction_location') in self.sc_locations:
+                sc_hits.append(hit)
+                
+        return sc_hits
+            
     def extract_brand_model(self, product_name):
         """Extract brand and model from product name."""
         if not product_name:
             return None, None
             
-        product_lower = product_name.lower()
+        _, brand, model = self.title_profile(product_name)
+        return brand, model
         
-        # Check for known brands
+    def match_brand_model(self, product_lower):
+        """Find the first premium brand keyword and model in a lowercased title."""
         for brand, info in self.premium_brands.items():
             for keyword in info['keywords']:
                 if keyword.lower() in product_lower:
@@ -222,18 +241,24 @@ class AdvancedProductSearch:
                     
         return None, None
         
+    def build_title_profile(self, product_name):
+        """Rare-pattern hit count, brand and model for a title (memoized via title_profile)."""
+        product_lower = product_name.lower()
+        
+        rare_hits = {match.lastgroup for match in self.rare_pattern_regex.finditer(product_lower)}
+        brand, model = self.match_brand_model(product_lower)
+        
+        return len(rare_hits), brand, model
+        
     def calculate_rarity_score(self, product_name, retail_price, instant_win_price):
         """Calculate rarity score based on various factors."""
         if not product_name:
             return 0
             
-        score = 0
-        product_lower = product_name.lower()
+        rare_hits, brand, _ = self.title_profile(product_name)
         
         # Check for rare patterns
-        for pattern in self.rare_patterns:
-            if re.search(pattern, product_lower):
-                score += 30
+        score = rare_hits * 30
                 
         # High-value items get points
         if retail_price > 1000:
@@ -250,7 +275,6 @@ class AdvancedProductSearch:
                 score += 15
                 
         # Brand premium
-        brand, _ = self.extract_brand_model(product_name)
         if brand in ['Apple', 'Sony', 'Dyson']:
             score += 15
         elif brand in ['Samsung', 'Bose', 'Nintendo']:
@@ -258,17 +282,24 @@ class AdvancedProductSearch:
             
         return min(score, 100)  # Cap at 100
         
+    def calculate_rarity_scores(self, items):
+        """Rarity scores for a batch of items, profiling each distinct title once."""
+        return [
+            self.calculate_rarity_score(item.get('product_name', ''),
+                                        item.get('retail_price', 0),
+                                        item.get('instant_win_price', 0))
+            for item in items
+        ]
+        
     def detect_valuable_items(self, items):
         """Detect potentially valuable or rare items."""
         valuable_items = []
         
-        for item in items:
+        for item, rarity_score in zip(items, self.calculate_rarity_scores(items)):
             product_name = item.get('product_name', '')
             retail_price = item.get('retail_price', 0)
             instant_win_price = item.get('instant_win_price', 0)
             
-            rarity_score = self.calculate_rarity_score(product_name, retail_price, instant_win_price)
-            
             # High-value threshold
             if rarity_score >= 40 or retail_price >= 500:
                 brand, model = self.extract_brand_model(product_name)
@@ -325,7 +356,6 @@ class AdvancedProductSearch:
                             brand_items.append(result)
                             seen_lot_ids.add(lot_id)
                             
-                await asyncio.sleep(0.15)
                 
             all_items.extend(brand_items)
             print(f"   Found {len(brand_items)} {brand} items")
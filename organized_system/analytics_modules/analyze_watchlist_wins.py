@@ -7,6 +7,7 @@ Check if the 50 watchlist won items are actually your winning bids
 import json
 import os
 import glob
+import sqlite3
 from datetime import datetime
 
 class WatchlistWinAnalyzer:
@@ -57,6 +58,29 @@ class WatchlistWinAnalyzer:
         print(f"   Watchlist Lost: {len(self.watchlist_data.get('lost', []))}")
         print(f"   Bid History: {len(self.bid_history)}")
     
+    def load_tracked_performance(self, db_path="portfolio_tracker.db"):
+        """All-time bids and wins from the portfolio tracker's daily summary, if present."""
+        if not os.path.exists(db_path):
+            return None
+        
+        conn = sqlite3.connect(db_path)
+        try:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT SUM(bids), SUM(wins), MIN(summary_date), MAX(summary_date)
+                FROM portfolio_daily_summary
+            ''')
+            bids, wins, first_date, last_date = cursor.fetchone()
+        except sqlite3.OperationalError:
+            return None
+        finally:
+            conn.close()
+        
+        if not bids:
+            return None
+        
+        return {'bids': bids, 'wins': wins or 0, 'first_date': first_date, 'last_date': last_date}
+    
     def analyze_watchlist_won_items(self):
         """Analyze the watchlist won items in detail."""
         print(f"\n🏆 ANALYZING WATCHLIST WON ITEMS")
@@ -123,6 +147,10 @@ class WatchlistWinAnalyzer:
         print(f"   Watchlist Lost: {len(self.watchlist_data.get('lost', []))}")
         print(f"   Bid History (Losing Bids): {len(self.bid_history)}")
         
+        tracked = self.load_tracked_performance()
+        if tracked:
+            print(f"   Portfolio Tracker: {tracked['bids']} bids, {tracked['wins']} wins")
+        
         # Analyze dates
         print(f"\n📅 DATE ANALYSIS:")
         
@@ -144,6 +172,9 @@ class WatchlistWinAnalyzer:
             bid_dates = [bid.get('date_created', '')[:10] for bid in self.bid_history if bid.get('date_created')]
             if bid_dates:
                 print(f"   Bid history date range: {min(bid_dates)} to {max(bid_dates)}")
+        
+        if tracked:
+            print(f"   Portfolio tracker date range: {tracked['first_date']} to {tracked['last_date']}")
     
     def generate_theory(self):
         """Generate a theory about how the data relates."""
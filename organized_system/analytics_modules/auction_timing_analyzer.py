@@ -8,14 +8,24 @@ import asyncio
 import aiohttp
 import ssl
 import json
+import os
+import sys
 import sqlite3
 from datetime import datetime, timedelta
 from collections import defaultdict
 import statistics
+from timing_rollups import TimingRollupStore, parse_close_time
+
+# Rollup source name for search-result lot timing rows
+ROLLUP_SOURCE = 'search_lot'
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core_systems.search_gateway import get_search_gateway
 
 class AuctionTimingAnalyzer:
     def __init__(self):
         self.session = None
+        self.search_gateway = get_search_gateway()
         self.sc_locations = ["Spartanburg", "Greenville", "Rock Hill", "Gastonia", "Anderson"]
         self.db_file = "timing_analysis.db"
         self.init_database()
@@ -33,6 +43,9 @@ class AuctionTimingAnalyzer:
         # Days of week analysis
         self.weekdays = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
         
+        # Hour × weekday × category × location cubes, updated at ingest
+        self.rollups = TimingRollupStore(self.db_file)
+        
     def init_database(self):
         """Initialize timing analysis database."""
         conn = sqlite3.connect(self.db_file)
@@ -99,52 +112,40 @@ class AuctionTimingAnalyzer:
             
     async def search_for_term(self, term, limit=100):
         """Search for a specific term."""
-        url = f"https://api.macdiscount.com/search?q={term}&limit={limit}"
-        
         try:
-            async with self.session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    hits = data.get('hits', [])
-                    
-                    sc_hits = []
-                    for hit in hits:
-                        if hit.get('auction_location') in self.sc_locations:
-                            sc_hits.append(hit)
-                            
-                    return sc_hits
-                else:
-                    return []
+            hits = await self.search_gateway.search(self.session, term, limit)
         except Exception as e:
             return []
             
+        # Filter to SC locations only
+        sc_hits = []
+        for hit in hits:
+            if hit.get('auction_location') in self.sc_locations:
+                sc_hits.append(hit)
+                
+        return sc_hits
+            
     def parse_closing_time(self, close_date_str):
         """Parse closing date and extract timing info."""
         if not close_date_str or close_date_str == 'Unknown':
             return None, None, None
             
-        try:
-            # Handle different date formats
-            if 'T' in close_date_str:
-                close_date = datetime.fromisoformat(close_date_str.replace('Z', ''))
-            else:
-                close_date = datetime.strptime(close_date_str, '%Y-%m-%d')
-                
-            hour = close_date.hour
-            day_of_week = self.weekdays[close_date.weekday()]
-            
-            # Determine time slot
-            time_slot = None
-            for slot_name, (start_hour, end_hour) in self.time_slots.items():
-                if start_hour <= hour < end_hour:
-                    time_slot = slot_name
-                    break
-                    
-            return hour, day_of_week, time_slot
-            
-        except Exception as e:
+        close_date = parse_close_time(close_date_str)
+        if close_date is None:
             return None, None, None
             
+        hour = close_date.hour
+        day_of_week = self.weekdays[close_date.weekday()]
+        
+        return hour, day_of_week, self.time_slot_for_hour(hour)
+        
+    def time_slot_for_hour(self, hour):
+        """Map an hour of day to its named time slot."""
+        for slot_name, (start_hour, end_hour) in self.time_slots.items():
+            if start_hour <= hour < end_hour:
+                return slot_name
+        return None
+            
     def calculate_competition_score(self, item):
         """Calculate competition score based on various factors."""
         retail_price = item.get('retail_price', 0)
@@ -196,11 +197,12 @@ class AuctionTimingAnalyzer:
         all_items = []
         seen_lot_ids = set()
         
-        for term in search_terms:
+        # Timing stats need every term, so request them together; results stay in term order
+        term_results = await asyncio.gather(*(self.search_for_term(term) for term in search_terms))
+        
+        for term, results in zip(search_terms, term_results):
             print(f"🔍 Searching {term}...")
             
-            results = await self.search_for_term(term)
-            
             for result in results:
                 lot_id = result.get('lot_id')
                 if lot_id and lot_id not in seen_lot_ids:
@@ -228,9 +230,27 @@ class AuctionTimingAnalyzer:
                         all_items.append(result)
                         seen_lot_ids.add(lot_id)
                         
-            await asyncio.sleep(0.2)
-            
         print(f"📈 Collected timing data for {len(all_items)} auctions")
+        
+        # Fold this scan into the timing cube
+        self.rollups.record_lots(ROLLUP_SOURCE, (
+            {
+                'lot_key': item.get('lot_id'),
+                'expected_close_date': item.get('expected_close_date'),
+                'category': item.get('category'),
+                'location': item.get('auction_location'),
+                'competition': item.get('competition_score'),
+                'discount': item.get('discount_percent'),
+                'retail_price': item.get('retail_price')
+            }
+            for item in all_items
+        ))
+        
+        # The cube only describes lots still open; drop ones that have closed since earlier scans
+        expired = self.rollups.expire_closed(ROLLUP_SOURCE)
+        if expired:
+            print(f"🧹 Retired {expired} closed auctions from the timing cube")
+        
         return all_items
         
     def analyze_time_patterns(self, items):
@@ -291,6 +311,55 @@ class AuctionTimingAnalyzer:
                 
         return time_slot_analysis, day_analysis, by_hour
         
+    def rollup_cells(self, category=None, location=None, time_slot=None, day=None):
+        """Hour × weekday cells of open lots from the timing cube, filtered by slot/day."""
+        cells = self.rollups.query(ROLLUP_SOURCE, ['close_hour', 'close_weekday'],
+                                   category=category, location=location)
+        
+        return [
+            cell for cell in cells
+            if (not time_slot or (self.time_slot_for_hour(cell['close_hour']) or '').lower() == time_slot.lower())
+            and (not day or self.weekdays[cell['close_weekday']].lower() == day.lower())
+        ]
+        
+    def analyze_rollup_patterns(self, category=None, location=None, time_slot=None, day=None):
+        """Time slot, day and hour analysis read from the timing cube instead of raw items."""
+        by_time_slot = defaultdict(list)
+        by_day = defaultdict(list)
+        by_hour = defaultdict(list)
+        
+        for cell in self.rollup_cells(category, location, time_slot, day):
+            slot = self.time_slot_for_hour(cell['close_hour'])
+            day_name = self.weekdays[cell['close_weekday']]
+            
+            by_time_slot[slot].append(cell)
+            by_day[day_name].append(cell)
+            by_hour[cell['close_hour']].append(cell)
+            
+        def summarize(groups):
+            analysis = {}
+            for key, group_cells in groups.items():
+                total = sum(cell['lot_count'] for cell in group_cells)
+                if key is None or total < 3:  # Minimum sample size
+                    continue
+                    
+                def weighted(field):
+                    return sum(cell[field] * cell['lot_count'] for cell in group_cells) / total
+                    
+                avg_competition = weighted('avg_competition')
+                avg_discount = weighted('avg_discount')
+                
+                analysis[key] = {
+                    'avg_competition': avg_competition,
+                    'avg_discount': avg_discount,
+                    'avg_retail_value': weighted('avg_retail_price'),
+                    'total_auctions': total,
+                    'opportunity_score': (100 - avg_competition) + (avg_discount / 2)
+                }
+            return analysis
+            
+        return summarize(by_time_slot), summarize(by_day), summarize(by_hour)
+        
     def identify_optimal_times(self, time_slot_analysis, day_analysis):
         """Identify optimal bidding times."""
         optimal_times = []
@@ -327,8 +396,12 @@ class AuctionTimingAnalyzer:
                 
         return optimal_times
         
-    def display_timing_report(self, items, time_slot_analysis, day_analysis, optimal_times):
-        """Display comprehensive timing analysis report."""
+    def display_timing_report(self, items, time_slot_analysis, day_analysis, optimal_times, open_lots=None):
+        """Display comprehensive timing analysis report.
+        
+        Overall statistics describe this scan's ``items``; the slot and day tables come from
+        the timing cube, which covers ``open_lots`` still-open lots across recent scans.
+        """
         print(f"\n⏰ AUCTION TIMING ANALYSIS REPORT")
         print("=" * 80)
         
@@ -337,6 +410,8 @@ class AuctionTimingAnalyzer:
             return
             
         print(f"📊 Analyzed {len(items)} auctions with timing data")
+        if open_lots is not None:
+            print(f"🗂️ Slot and day tables cover {open_lots} open auctions seen across recent scans")
         print()
         
         # Overall statistics
@@ -344,7 +419,7 @@ class AuctionTimingAnalyzer:
         avg_discount = statistics.mean([item.get('discount_percent', 0) for item in items])
         total_retail_value = sum(item.get('retail_price', 0) for item in items)
         
-        print(f"📈 OVERALL MARKET TIMING")
+        print(f"📈 OVERALL MARKET TIMING (this scan)")
         print("-" * 50)
         print(f"🎯 Average Competition Score: {avg_competition:.1f}/100")
         print(f"💰 Average Discount: {avg_discount:.1f}%")
@@ -451,7 +526,8 @@ class AuctionTimingAnalyzer:
                 'summary': {
                     'total_auctions': len(items),
                     'avg_competition': avg_competition,
-                    'avg_discount': avg_discount
+                    'avg_discount': avg_discount,
+                    'open_auctions_in_tables': open_lots
                 },
                 'time_slot_analysis': time_slot_analysis,
                 'day_analysis': day_analysis,
@@ -483,10 +559,13 @@ async def main():
         if args.day:
             items = [item for item in items if item.get('close_day_of_week', '').lower() == args.day.lower()]
             
-        time_slot_analysis, day_analysis, by_hour = analyzer.analyze_time_patterns(items)
+        time_slot_analysis, day_analysis, by_hour = analyzer.analyze_rollup_patterns(
+            time_slot=args.time_slot, day=args.day
+        )
         optimal_times = analyzer.identify_optimal_times(time_slot_analysis, day_analysis)
+        open_lots = sum(cell['lot_count'] for cell in analyzer.rollup_cells(time_slot=args.time_slot, day=args.day))
         
-        analyzer.display_timing_report(items, time_slot_analysis, day_analysis, optimal_times)
+        analyzer.display_timing_report(items, time_slot_analysis, day_analysis, optimal_times, open_lots)
         
     finally:
         await analyzer.close_session()
@@ -4,291 +4,348 @@
 Complete analysis of your auction performance with real data
 """
 
+import os
 import sqlite3
 import json
 from datetime import datetime, timedelta
-from collections import Counter, defaultdict
-import statistics
+
+import numpy as np
+import pandas as pd
+
+# Columns the breakdowns read, with the value a NULL stands for
+FRAME_COLUMNS = {
+    'source': 'unknown',
+    'category': 'Unknown',
+    'brand': 'Unknown',
+    'product_name': 'Unknown',
+    'my_bid_amount': 0.0,
+    'instant_win_price': 0.0,
+    'savings_amount': 0.0,
+    'savings_percent': 0.0,
+    'won_auction': 0,
+    'bid_placed_date': '',
+}
+
+PRICE_RANGES = {
+    '$0-25': (0, 25),
+    '$25-50': (25, 50),
+    '$50-100': (50, 100),
+    '$100-200': (100, 200),
+    '$200+': (200, float('inf'))
+}
+
+def parse_month(date_str):
+    """YYYY-MM of a bid date, or None when it can't be parsed."""
+    if not date_str:
+        return None
+    try:
+        return datetime.fromisoformat(date_str.replace('Z', '+00:00')).strftime('%Y-%m')
+    except (ValueError, TypeError, AttributeError):
+        return None
 
 class ComprehensivePortfolioAnalysis:
-    def __init__(self):
+    def __init__(self, cache_db="databases/portfolio_analysis_cache.db"):
         self.portfolio_db = "portfolio_tracker.db"
+        self.cache_db = cache_db
+        self._all_bids = None
         self.load_all_data()
-        
+    
     def load_all_data(self):
-        """Load all portfolio data."""
+        """Load breakdowns from cache when bids are unchanged, else recompute them."""
+        data_key = self.get_data_key()
+        self.breakdowns = self.load_cached_breakdowns(data_key)
+        
+        if self.breakdowns is None:
+            self.breakdowns = self.compute_breakdowns(self.load_frame())
+            self.save_cached_breakdowns(data_key, self.breakdowns)
+        
+        print(f"📊 Loaded {self.breakdowns['overall']['total_bids']} total bids")
+    
+    @property
+    def all_bids(self):
+        """Raw bid rows as dicts, loaded on first use (only the saved report needs them)."""
+        if self._all_bids is None:
+            conn = sqlite3.connect(self.portfolio_db)
+            cursor = conn.cursor()
+            cursor.execute('SELECT * FROM bids ORDER BY bid_placed_date DESC')
+            columns = [description[0] for description in cursor.description]
+            self._all_bids = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            conn.close()
+        return self._all_bids
+    
+    def get_data_key(self):
+        """Fingerprint of the bids table.
+        
+        Max rowid and row count catch inserts and deletes; the latest
+        result_recorded_date catches outcome updates from the tracker.
+        """
         conn = sqlite3.connect(self.portfolio_db)
         cursor = conn.cursor()
+        cursor.execute("PRAGMA table_info(bids)")
+        columns = {column[1] for column in cursor.fetchall()}
         
-        cursor.execute('''
-            SELECT * FROM bids ORDER BY bid_placed_date DESC
+        recorded = 'MAX(result_recorded_date)' if 'result_recorded_date' in columns else 'NULL'
+        cursor.execute(f'SELECT MAX(rowid), COUNT(*), {recorded} FROM bids')
+        data_key = json.dumps(list(cursor.fetchone()))
+        conn.close()
+        return data_key
+    
+    def load_cached_breakdowns(self, data_key):
+        """Cached breakdowns for this database at ``data_key``, or None."""
+        if not os.path.exists(self.cache_db):
+            return None
+        
+        conn = sqlite3.connect(self.cache_db)
+        try:
+            row = conn.execute('''
+                SELECT breakdowns FROM portfolio_analysis_cache
+                WHERE portfolio_db = ? AND data_key = ?
+            ''', (os.path.abspath(self.portfolio_db), data_key)).fetchone()
+        except sqlite3.OperationalError:
+            row = None
+        conn.close()
+        
+        return json.loads(row[0]) if row else None
+    
+    def save_cached_breakdowns(self, data_key, breakdowns):
+        """Store breakdowns, replacing the previous entry for this database."""
+        os.makedirs(os.path.dirname(self.cache_db) or '.', exist_ok=True)
+        
+        conn = sqlite3.connect(self.cache_db)
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS portfolio_analysis_cache (
+                portfolio_db TEXT PRIMARY KEY,
+                data_key TEXT,
+                breakdowns TEXT,
+                computed_at TEXT
+            )
         ''')
+        conn.execute('''
+            INSERT OR REPLACE INTO portfolio_analysis_cache (portfolio_db, data_key, breakdowns, computed_at)
+            VALUES (?, ?, ?, ?)
+        ''', (os.path.abspath(self.portfolio_db), data_key, json.dumps(breakdowns), datetime.now().isoformat()))
+        conn.commit()
+        conn.close()
+    
+    def load_frame(self):
+        """Bids as a typed columnar frame, newest first."""
+        conn = sqlite3.connect(self.portfolio_db)
+        cursor = conn.cursor()
+        cursor.execute("PRAGMA table_info(bids)")
+        existing = {column[1] for column in cursor.fetchall()}
+        
+        # Older databases predate the source column
+        select = ', '.join(column if column in existing else f"NULL AS {column}" for column in FRAME_COLUMNS)
+        frame = pd.read_sql_query(f'SELECT {select} FROM bids ORDER BY bid_placed_date DESC', conn)
+        conn.close()
+        
+        frame = frame.fillna(FRAME_COLUMNS)
+        for column in ('source', 'category', 'brand', 'product_name', 'bid_placed_date'):
+            frame[column] = frame[column].astype(str)
+        for column in ('my_bid_amount', 'instant_win_price', 'savings_amount', 'savings_percent'):
+            frame[column] = frame[column].astype(float)
+        frame['won'] = frame['won_auction'].astype(int) == 1
+        return frame
+    
+    def compute_breakdowns(self, frame):
+        """Every report section from one set of derived columns and group-bys."""
+        won = frame['won']
+        frame = frame.assign(
+            spent=np.where(won, frame['my_bid_amount'], 0.0),
+            saved=np.where(won, frame['savings_amount'], 0.0),
+            # Average savings only counts wins with a non-zero savings percent
+            win_savings=frame['savings_percent'].where(won & (frame['savings_percent'] != 0)),
+            price_range=pd.cut(frame['my_bid_amount'], bins=[0, 25, 50, 100, 200, float('inf')],
+                               labels=list(PRICE_RANGES), right=False),
+            month=frame['bid_placed_date'].map({date: parse_month(date)
+                                               for date in frame['bid_placed_date'].unique()}),
+        )
+        
+        def grouped(key):
+            # sort=False keeps groups in first-seen (newest bid) order, as the dict walk did
+            stats = frame.groupby(key, sort=False, observed=True).agg(
+                total=('won', 'size'),
+                wins=('won', 'sum'),
+                spent=('spent', 'sum'),
+                savings=('saved', 'sum'),
+                avg_savings=('win_savings', 'mean'),
+            )
+            stats['avg_savings'] = stats['avg_savings'].fillna(0.0)
+            stats['win_rate'] = stats['wins'] / stats['total'] * 100
+            return stats
+        
+        def records(stats, name):
+            return [{name: str(index), 'total': int(row.total), 'wins': int(row.wins),
+                     'win_rate': float(row.win_rate), 'spent': float(row.spent),
+                     'savings': float(row.savings), 'avg_savings': float(row.avg_savings)}
+                    for index, row in stats.iterrows()]
+        
+        total_bids = len(frame)
+        wins = int(won.sum())
+        overall = {
+            'total_bids': total_bids,
+            'wins': wins,
+            'win_rate': (wins / total_bids * 100) if total_bids > 0 else 0,
+            'total_spent': float(frame['spent'].sum()),
+            'total_savings': float(frame['saved'].sum()),
+            'avg_savings': float(frame['win_savings'].mean()) if frame['win_savings'].notna().any() else 0
+        }
         
-        columns = [description[0] for description in cursor.description]
-        self.all_bids = []
+        categories = grouped('category').sort_values('total', ascending=False, kind='mergesort')
+        brands = grouped('brand').sort_values(['total', 'wins'], ascending=False, kind='mergesort')
+        price_ranges = grouped('price_range').reindex(list(PRICE_RANGES)).dropna(subset=['total'])
+        months = grouped(frame['month'].dropna()).sort_index(ascending=False).head(6)
         
-        for row in cursor.fetchall():
-            bid_dict = dict(zip(columns, row))
-            self.all_bids.append(bid_dict)
+        # Strategy and recommendations only look at wins
+        winning = frame[won]
+        ratios = (winning['my_bid_amount'] / winning['instant_win_price'] * 100)[winning['instant_win_price'] > 0]
+        best_deals = winning.sort_values('savings_percent', ascending=False, kind='mergesort').head(5)
         
-        conn.close()
-        print(f"📊 Loaded {len(self.all_bids)} total bids")
+        win_categories = winning.groupby('category', sort=False)['savings_percent'].agg(['size', 'mean'])
+        win_categories = win_categories.sort_values('size', ascending=False, kind='mergesort').head(3)
+        win_brands = winning.groupby('brand', sort=False).size()
+        win_brands = win_brands[win_brands >= 2].sort_values(ascending=False, kind='mergesort').head(5)
+        
+        return {
+            'overall': overall,
+            'by_source': records(grouped('source'), 'source'),
+            'by_category': records(categories, 'category'),
+            'by_brand': records(brands, 'brand'),
+            'by_price_range': records(price_ranges, 'range'),
+            'monthly': records(months, 'month'),
+            'strategy': {
+                'bid_ratios': {
+                    'avg': float(ratios.mean()),
+                    'min': float(ratios.min()),
+                    'max': float(ratios.max())
+                } if len(ratios) else None,
+                'best_deals': [
+                    {'product_name': row.product_name, 'savings_percent': float(row.savings_percent),
+                     'my_bid_amount': float(row.my_bid_amount)}
+                    for row in best_deals.itertuples()
+                ]
+            },
+            'recommendations': {
+                'categories': [
+                    {'category': str(category), 'wins': int(row['size']), 'avg_savings': float(row['mean'])}
+                    for category, row in win_categories.iterrows()
+                ],
+                'avg_amount': float(winning['my_bid_amount'].mean()) if len(winning) else None,
+                'brands': [{'brand': str(brand), 'wins': int(count)} for brand, count in win_brands.items()]
+            }
+        }
     
     def analyze_overall_performance(self):
         """Analyze overall bidding performance."""
         print("\n🏆 COMPLETE PORTFOLIO ANALYSIS")
         print("=" * 60)
         
-        if not self.all_bids:
+        overall = self.breakdowns['overall']
+        if not overall['total_bids']:
             print("❌ No bid data found!")
             return
         
-        # Overall stats
-        total_bids = len(self.all_bids)
-        wins = len([b for b in self.all_bids if b.get('won_auction', 0) == 1])
-        win_rate = (wins / total_bids * 100) if total_bids > 0 else 0
-        
-        # Financial stats
-        total_spent = sum(float(b.get('my_bid_amount', 0)) for b in self.all_bids if b.get('won_auction', 0) == 1)
-        total_savings = sum(float(b.get('savings_amount', 0)) for b in self.all_bids if b.get('won_auction', 0) == 1)
-        avg_savings = statistics.mean([float(b.get('savings_percent', 0)) for b in self.all_bids if b.get('won_auction', 0) == 1 and b.get('savings_percent')])
-        
         print(f"🎯 OVERALL PERFORMANCE")
-        print(f"   Total Bids: {total_bids}")
-        print(f"   Wins: {wins}")
-        print(f"   Win Rate: {win_rate:.1f}%")
-        print(f"   Total Spent: ${total_spent:,.2f}")
-        print(f"   Total Savings: ${total_savings:,.2f}")
-        print(f"   Average Savings: {avg_savings:.1f}%")
-        
-        return {
-            'total_bids': total_bids,
-            'wins': wins,
-            'win_rate': win_rate,
-            'total_spent': total_spent,
-            'total_savings': total_savings,
-            'avg_savings': avg_savings
-        }
+        print(f"   Total Bids: {overall['total_bids']}")
+        print(f"   Wins: {overall['wins']}")
+        print(f"   Win Rate: {overall['win_rate']:.1f}%")
+        print(f"   Total Spent: ${overall['total_spent']:,.2f}")
+        print(f"   Total Savings: ${overall['total_savings']:,.2f}")
+        print(f"   Average Savings: {overall['avg_savings']:.1f}%")
+        
+        return dict(overall)
     
     def analyze_by_source(self):
         """Analyze performance by data source."""
         print(f"\n📋 PERFORMANCE BY DATA SOURCE")
         print("-" * 40)
         
-        sources = defaultdict(list)
-        for bid in self.all_bids:
-            source = bid.get('source', 'unknown')
-            sources[source].append(bid)
-        
-        for source, bids in sources.items():
-            wins = len([b for b in bids if b.get('won_auction', 0) == 1])
-            total = len(bids)
-            win_rate = (wins / total * 100) if total > 0 else 0
-            
-            spent = sum(float(b.get('my_bid_amount', 0)) for b in bids if b.get('won_auction', 0) == 1)
-            savings = sum(float(b.get('savings_amount', 0)) for b in bids if b.get('won_auction', 0) == 1)
-            
-            print(f"📊 {source}:")
-            print(f"   Bids: {total} | Wins: {wins} | Win Rate: {win_rate:.1f}%")
-            print(f"   Spent: ${spent:,.2f} | Savings: ${savings:,.2f}")
+        for stats in self.breakdowns['by_source']:
+            print(f"📊 {stats['source']}:")
+            print(f"   Bids: {stats['total']} | Wins: {stats['wins']} | Win Rate: {stats['win_rate']:.1f}%")
+            print(f"   Spent: ${stats['spent']:,.2f} | Savings: ${stats['savings']:,.2f}")
     
     def analyze_by_category(self):
         """Analyze performance by category."""
         print(f"\n📂 PERFORMANCE BY CATEGORY")
         print("-" * 40)
         
-        categories = defaultdict(list)
-        for bid in self.all_bids:
-            category = bid.get('category', 'Unknown')
-            categories[category].append(bid)
-        
-        # Sort by number of items
-        sorted_categories = sorted(categories.items(), key=lambda x: len(x[1]), reverse=True)
-        
-        for category, bids in sorted_categories:
-            wins = len([b for b in bids if b.get('won_auction', 0) == 1])
-            total = len(bids)
-            win_rate = (wins / total * 100) if total > 0 else 0
-            
-            spent = sum(float(b.get('my_bid_amount', 0)) for b in bids if b.get('won_auction', 0) == 1)
-            
-            if wins > 0:
-                avg_savings = statistics.mean([float(b.get('savings_percent', 0)) for b in bids if b.get('won_auction', 0) == 1 and b.get('savings_percent')])
-            else:
-                avg_savings = 0
-            
-            print(f"📁 {category}: {total} items")
-            print(f"   Win Rate: {win_rate:.1f}% ({wins}/{total})")
-            print(f"   Spent: ${spent:,.2f} | Avg Savings: {avg_savings:.1f}%")
+        # Sorted by number of items
+        for stats in self.breakdowns['by_category']:
+            print(f"📁 {stats['category']}: {stats['total']} items")
+            print(f"   Win Rate: {stats['win_rate']:.1f}% ({stats['wins']}/{stats['total']})")
+            print(f"   Spent: ${stats['spent']:,.2f} | Avg Savings: {stats['avg_savings']:.1f}%")
     
     def analyze_by_brand(self):
         """Analyze performance by brand."""
         print(f"\n🏷️ PERFORMANCE BY BRAND (Top 15)")
         print("-" * 50)
         
-        brands = defaultdict(list)
-        for bid in self.all_bids:
-            brand = bid.get('brand', 'Unknown')
-            brands[brand].append(bid)
-        
-        # Sort by number of items, then by win rate
-        sorted_brands = sorted(brands.items(), key=lambda x: (len(x[1]), len([b for b in x[1] if b.get('won_auction', 0) == 1])), reverse=True)
-        
-        for brand, bids in sorted_brands[:15]:
-            wins = len([b for b in bids if b.get('won_auction', 0) == 1])
-            total = len(bids)
-            win_rate = (wins / total * 100) if total > 0 else 0
-            
-            spent = sum(float(b.get('my_bid_amount', 0)) for b in bids if b.get('won_auction', 0) == 1)
-            
-            if wins > 0:
-                avg_savings = statistics.mean([float(b.get('savings_percent', 0)) for b in bids if b.get('won_auction', 0) == 1 and b.get('savings_percent')])
-            else:
-                avg_savings = 0
-            
-            print(f"🏷️ {brand}: {total} items | Win Rate: {win_rate:.1f}% | Spent: ${spent:,.2f} | Savings: {avg_savings:.1f}%")
+        # Sorted by number of items, then by wins
+        for stats in self.breakdowns['by_brand'][:15]:
+            print(f"🏷️ {stats['brand']}: {stats['total']} items | Win Rate: {stats['win_rate']:.1f}% | Spent: ${stats['spent']:,.2f} | Savings: {stats['avg_savings']:.1f}%")
     
     def analyze_price_ranges(self):
         """Analyze performance by price ranges."""
         print(f"\n💰 PERFORMANCE BY PRICE RANGE")
         print("-" * 40)
         
-        price_ranges = {
-            '$0-25': (0, 25),
-            '$25-50': (25, 50),
-            '$50-100': (50, 100),
-            '$100-200': (100, 200),
-            '$200+': (200, float('inf'))
-        }
-        
-        for range_name, (min_price, max_price) in price_ranges.items():
-            range_bids = [b for b in self.all_bids 
-                         if min_price <= float(b.get('my_bid_amount', 0)) < max_price]
-            
-            if not range_bids:
-                continue
-                
-            wins = len([b for b in range_bids if b.get('won_auction', 0) == 1])
-            total = len(range_bids)
-            win_rate = (wins / total * 100) if total > 0 else 0
-            
-            spent = sum(float(b.get('my_bid_amount', 0)) for b in range_bids if b.get('won_auction', 0) == 1)
-            
-            print(f"💵 {range_name}: {total} bids | Win Rate: {win_rate:.1f}% | Total Spent: ${spent:,.2f}")
+        for stats in self.breakdowns['by_price_range']:
+            print(f"💵 {stats['range']}: {stats['total']} bids | Win Rate: {stats['win_rate']:.1f}% | Total Spent: ${stats['spent']:,.2f}")
     
     def analyze_bidding_strategy(self):
         """Analyze your bidding strategy patterns."""
         print(f"\n🎲 YOUR BIDDING STRATEGY ANALYSIS")
         print("-" * 50)
         
-        winning_bids = [b for b in self.all_bids if b.get('won_auction', 0) == 1]
-        
-        if not winning_bids:
+        if not self.breakdowns['overall']['wins']:
             print("❌ No winning bids to analyze")
             return
         
-        # Calculate bid ratios (bid amount vs instant win price)
-        bid_ratios = []
-        for bid in winning_bids:
-            instant_win = float(bid.get('instant_win_price', 0))
-            my_bid = float(bid.get('my_bid_amount', 0))
-            if instant_win > 0:
-                ratio = (my_bid / instant_win) * 100
-                bid_ratios.append(ratio)
-        
-        if bid_ratios:
-            avg_ratio = statistics.mean(bid_ratios)
-            min_ratio = min(bid_ratios)
-            max_ratio = max(bid_ratios)
-            
+        # Bid amount vs instant win price
+        ratios = self.breakdowns['strategy']['bid_ratios']
+        if ratios:
             print(f"📊 Bid Strategy Insights:")
-            print(f"   Average bid: {avg_ratio:.1f}% of instant win price")
-            print(f"   Range: {min_ratio:.1f}% - {max_ratio:.1f}%")
-            print(f"   Strategy: {'Conservative' if avg_ratio < 70 else 'Aggressive' if avg_ratio > 85 else 'Balanced'}")
-        
-        # Find best deals
-        best_deals = sorted(winning_bids, key=lambda x: float(x.get('savings_percent', 0)), reverse=True)[:5]
+            print(f"   Average bid: {ratios['avg']:.1f}% of instant win price")
+            print(f"   Range: {ratios['min']:.1f}% - {ratios['max']:.1f}%")
+            print(f"   Strategy: {'Conservative' if ratios['avg'] < 70 else 'Aggressive' if ratios['avg'] > 85 else 'Balanced'}")
         
         print(f"\n🏆 YOUR TOP 5 BEST DEALS:")
-        for i, deal in enumerate(best_deals, 1):
-            product = deal.get('product_name', 'Unknown')[:40]
-            savings = float(deal.get('savings_percent', 0))
-            amount = float(deal.get('my_bid_amount', 0))
-            print(f"   {i}. {product}... - {savings:.1f}% savings (${amount:.2f})")
+        for i, deal in enumerate(self.breakdowns['strategy']['best_deals'], 1):
+            print(f"   {i}. {deal['product_name'][:40]}... - {deal['savings_percent']:.1f}% savings (${deal['my_bid_amount']:.2f})")
     
     def analyze_recent_activity(self):
         """Analyze recent bidding activity."""
         print(f"\n📅 RECENT ACTIVITY ANALYSIS")
         print("-" * 40)
         
-        # Group by month
-        monthly_activity = defaultdict(list)
-        
-        for bid in self.all_bids:
-            date_str = bid.get('bid_placed_date', '')
-            if date_str:
-                try:
-                    date = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                    month_key = date.strftime('%Y-%m')
-                    monthly_activity[month_key].append(bid)
-                except:
-                    continue
-        
-        # Show last 6 months
-        sorted_months = sorted(monthly_activity.keys(), reverse=True)[:6]
-        
-        for month in sorted_months:
-            bids = monthly_activity[month]
-            wins = len([b for b in bids if b.get('won_auction', 0) == 1])
-            total = len(bids)
-            spent = sum(float(b.get('my_bid_amount', 0)) for b in bids if b.get('won_auction', 0) == 1)
-            
-            print(f"📆 {month}: {total} bids | {wins} wins | ${spent:,.2f} spent")
+        # Last 6 months
+        for stats in self.breakdowns['monthly']:
+            print(f"📆 {stats['month']}: {stats['total']} bids | {stats['wins']} wins | ${stats['spent']:,.2f} spent")
     
     def generate_recommendations(self):
         """Generate personalized recommendations."""
         print(f"\n🎯 PERSONALIZED RECOMMENDATIONS")
         print("-" * 50)
         
-        winning_bids = [b for b in self.all_bids if b.get('won_auction', 0) == 1]
-        
-        if not winning_bids:
+        if not self.breakdowns['overall']['wins']:
             print("❌ No winning bids to analyze for recommendations")
             return
         
-        # Analyze successful categories
-        category_success = defaultdict(list)
-        for bid in winning_bids:
-            category = bid.get('category', 'Unknown')
-            category_success[category].append(bid)
-        
-        best_categories = sorted(category_success.items(), 
-                               key=lambda x: len(x[1]), reverse=True)[:3]
+        recommendations = self.breakdowns['recommendations']
         
         print(f"🎯 Focus on these categories (your strongest):")
-        for category, bids in best_categories:
-            avg_savings = statistics.mean([float(b.get('savings_percent', 0)) for b in bids])
-            print(f"   • {category}: {len(bids)} wins, {avg_savings:.1f}% avg savings")
-        
-        # Analyze successful price ranges
-        successful_amounts = [float(b.get('my_bid_amount', 0)) for b in winning_bids]
-        if successful_amounts:
-            avg_amount = statistics.mean(successful_amounts)
-            print(f"\n💰 Your sweet spot: Around ${avg_amount:.2f} per bid")
-        
-        # Brand recommendations
-        brand_success = defaultdict(list)
-        for bid in winning_bids:
-            brand = bid.get('brand', 'Unknown')
-            brand_success[brand].append(bid)
-        
-        reliable_brands = [(brand, bids) for brand, bids in brand_success.items() 
-                          if len(bids) >= 2]  # At least 2 wins
-        
-        if reliable_brands:
+        for stats in recommendations['categories']:
+            print(f"   • {stats['category']}: {stats['wins']} wins, {stats['avg_savings']:.1f}% avg savings")
+        
+        if recommendations['avg_amount'] is not None:
+            print(f"\n💰 Your sweet spot: Around ${recommendations['avg_amount']:.2f} per bid")
+        
+        # At least 2 wins
+        if recommendations['brands']:
             print(f"\n🏷️ Stick with these reliable brands:")
-            for brand, bids in sorted(reliable_brands, key=lambda x: len(x[1]), reverse=True)[:5]:
-                print(f"   • {brand}: {len(bids)} wins")
+            for stats in recommendations['brands']:
+                print(f"   • {stats['brand']}: {stats['wins']} wins")
     
     def save_analysis_report(self):
         """Save comprehensive analysis to file."""
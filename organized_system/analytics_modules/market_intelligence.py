@@ -9,11 +9,53 @@ import aiohttp
 import ssl
 import sqlite3
 import json
+import os
+import sys
 from datetime import datetime, timedelta
 import statistics
 from collections import defaultdict, Counter
 import argparse
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core_systems.product_classifier import market_brand_classifier, market_category_classifier
+
+class RunningStats:
+    """Welford running mean/variance that can be merged with other partial results."""
+    
+    def __init__(self, count=0, mean=0.0, m2=0.0):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+        
+    def add(self, value):
+        """Fold a single observation into the running statistics."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        
+    def merge(self, other):
+        """Combine another partial result into this one (Chan et al. parallel update)."""
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            return
+            
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+        
+    @property
+    def stdev(self):
+        return self.variance ** 0.5
+
 class MarketIntelligence:
     def __init__(self, db_path="market_intelligence.db"):
         self.db_path = db_path
@@ -176,9 +218,159 @@ class MarketIntelligence:
             )
         ''')
         
+        # Daily per category/brand/location running aggregates, maintained at ingest
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS market_stats (
+                stat_date DATE,
+                category TEXT,
+                brand TEXT,
+                auction_location TEXT,
+                
+                -- Additive sums over every stored item
+                item_count INTEGER DEFAULT 0,
+                retail_sum REAL DEFAULT 0,
+                instant_win_sum REAL DEFAULT 0,
+                current_bid_sum REAL DEFAULT 0,
+                discount_sum REAL DEFAULT 0,
+                bids_sum REAL DEFAULT 0,
+                bidders_sum REAL DEFAULT 0,
+                
+                -- Welford stats over items with bids (competition analysis)
+                active_count INTEGER DEFAULT 0,
+                active_bids_count INTEGER DEFAULT 0,
+                active_bids_mean REAL DEFAULT 0,
+                active_bids_m2 REAL DEFAULT 0,
+                active_bidders_count INTEGER DEFAULT 0,
+                active_bidders_mean REAL DEFAULT 0,
+                active_bidders_m2 REAL DEFAULT 0,
+                
+                PRIMARY KEY (stat_date, category, brand, auction_location)
+            )
+        ''')
+        
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_market_data_recorded_at ON market_data (recorded_at)
+        ''')
+        
         conn.commit()
+        
+        # Backfill aggregates for databases created before market_stats existed
+        cursor.execute("SELECT EXISTS (SELECT 1 FROM market_stats)")
+        has_stats = cursor.fetchone()[0]
+        cursor.execute("SELECT EXISTS (SELECT 1 FROM market_data)")
+        has_data = cursor.fetchone()[0]
+        
+        if has_data and not has_stats:
+            self.rebuild_market_stats(conn)
+            
         conn.close()
         
+    def new_stats_bucket(self):
+        """Empty per-bucket aggregate used while ingesting items."""
+        return {
+            'item_count': 0,
+            'retail_sum': 0.0,
+            'instant_win_sum': 0.0,
+            'current_bid_sum': 0.0,
+            'discount_sum': 0.0,
+            'bids_sum': 0.0,
+            'bidders_sum': 0.0,
+            'active_count': 0,
+            'active_bids': RunningStats(),
+            'active_bidders': RunningStats()
+        }
+        
+    def accumulate_stats(self, bucket, retail_price, instant_win_price, current_bid, total_bids, unique_bidders):
+        """Fold one stored market_data row into a bucket."""
+        retail_price = retail_price or 0
+        instant_win_price = instant_win_price or 0
+        total_bids = total_bids or 0
+        unique_bidders = unique_bidders or 0
+        
+        bucket['item_count'] += 1
+        bucket['retail_sum'] += retail_price
+        bucket['instant_win_sum'] += instant_win_price
+        bucket['current_bid_sum'] += current_bid or 0
+        bucket['bids_sum'] += total_bids
+        bucket['bidders_sum'] += unique_bidders
+        if retail_price > 0:
+            bucket['discount_sum'] += (retail_price - instant_win_price) / retail_price * 100
+            
+        if total_bids > 0:
+            bucket['active_count'] += 1
+            bucket['active_bids'].add(total_bids)
+            if unique_bidders > 0:
+                bucket['active_bidders'].add(unique_bidders)
+                
+    def write_stats_buckets(self, cursor, buckets):
+        """Merge ingest buckets into the persisted market_stats rows."""
+        for key, bucket in buckets.items():
+            cursor.execute('''
+                SELECT active_bids_count, active_bids_mean, active_bids_m2,
+                       active_bidders_count, active_bidders_mean, active_bidders_m2
+                FROM market_stats
+                WHERE stat_date = ? AND category = ? AND brand = ? AND auction_location = ?
+            ''', key)
+            existing = cursor.fetchone()
+            
+            active_bids = bucket['active_bids']
+            active_bidders = bucket['active_bidders']
+            if existing:
+                active_bids = RunningStats(*existing[0:3])
+                active_bids.merge(bucket['active_bids'])
+                active_bidders = RunningStats(*existing[3:6])
+                active_bidders.merge(bucket['active_bidders'])
+                
+            cursor.execute('''
+                INSERT INTO market_stats (
+                    stat_date, category, brand, auction_location,
+                    item_count, retail_sum, instant_win_sum, current_bid_sum, discount_sum,
+                    bids_sum, bidders_sum, active_count,
+                    active_bids_count, active_bids_mean, active_bids_m2,
+                    active_bidders_count, active_bidders_mean, active_bidders_m2
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (stat_date, category, brand, auction_location) DO UPDATE SET
+                    item_count = item_count + excluded.item_count,
+                    retail_sum = retail_sum + excluded.retail_sum,
+                    instant_win_sum = instant_win_sum + excluded.instant_win_sum,
+                    current_bid_sum = current_bid_sum + excluded.current_bid_sum,
+                    discount_sum = discount_sum + excluded.discount_sum,
+                    bids_sum = bids_sum + excluded.bids_sum,
+                    bidders_sum = bidders_sum + excluded.bidders_sum,
+                    active_count = active_count + excluded.active_count,
+                    active_bids_count = excluded.active_bids_count,
+                    active_bids_mean = excluded.active_bids_mean,
+                    active_bids_m2 = excluded.active_bids_m2,
+                    active_bidders_count = excluded.active_bidders_count,
+                    active_bidders_mean = excluded.active_bidders_mean,
+                    active_bidders_m2 = excluded.active_bidders_m2
+            ''', (
+                *key,
+                bucket['item_count'], bucket['retail_sum'], bucket['instant_win_sum'],
+                bucket['current_bid_sum'], bucket['discount_sum'],
+                bucket['bids_sum'], bucket['bidders_sum'], bucket['active_count'],
+                active_bids.count, active_bids.mean, active_bids.m2,
+                active_bidders.count, active_bidders.mean, active_bidders.m2
+            ))
+            
+    def rebuild_market_stats(self, conn):
+        """Recompute market_stats from market_data, streaming rows instead of loading them all."""
+        cursor = conn.cursor()
+        buckets = defaultdict(self.new_stats_bucket)
+        
+        rows = conn.execute('''
+            SELECT DATE(recorded_at), category, brand, auction_location,
+                   retail_price, instant_win_price, current_bid, total_bids, unique_bidders
+            FROM market_data
+        ''')
+        for row in rows:
+            key = (row[0], row[1] or 'Unknown', row[2] or 'Unknown', row[3] or '')
+            self.accumulate_stats(buckets[key], *row[4:])
+            
+        cursor.execute("DELETE FROM market_stats")
+        self.write_stats_buckets(cursor, buckets)
+        conn.commit()
+        
     async def create_session(self):
         """Create HTTP session for API requests."""
         connector = aiohttp.TCPConnector(
@@ -238,12 +430,19 @@ class MarketIntelligence:
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
-        for item in items:
+        # Rows get recorded_at = CURRENT_TIMESTAMP, so they land in today's UTC bucket
+        stat_date = datetime.utcnow().date().isoformat()
+        buckets = defaultdict(self.new_stats_bucket)
+        
+        # Classify the whole batch in one pass per keyword table
+        product_names = [item.get('product_name', '') for item in items]
+        brands = market_brand_classifier.classify_batch(product_names)
+        categories = market_category_classifier.classify_batch(product_names)
+        
+        for item, product_name, brand, category in zip(items, product_names, brands, categories):
             # Extract and clean data
             lot_id = item.get('lot_id')
-            product_name = item.get('product_name', '')
-            brand = self.extract_brand(product_name)
-            category = self.extract_category(product_name)
+            location = item.get('auction_location', '')
             
             cursor.execute('''
                 INSERT OR REPLACE INTO market_data (
@@ -253,7 +452,7 @@ class MarketIntelligence:
                 ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ''', (
                 lot_id, product_name, brand, category,
-                item.get('auction_location', ''),
+                location,
                 item.get('retail_price', 0),
                 item.get('instant_win_price', 0),
                 item.get('current_bid', 0),
@@ -262,44 +461,24 @@ class MarketIntelligence:
                 item.get('expected_close_date', '')
             ))
             
+            self.accumulate_stats(
+                buckets[(stat_date, category, brand, location or '')],
+                item.get('retail_price', 0), item.get('instant_win_price', 0),
+                item.get('current_bid', 0), item.get('total_bids', 0),
+                item.get('unique_bidders', 0)
+            )
+            
+        self.write_stats_buckets(cursor, buckets)
         conn.commit()
         conn.close()
         
     def extract_brand(self, product_name):
         """Extract brand from product name."""
-        if not product_name:
-            return 'Unknown'
-            
-        brands = ['apple', 'sony', 'samsung', 'nintendo', 'dyson', 'bose', 
-                 'lg', 'canon', 'nikon', 'dewalt', 'milwaukee', 'makita']
-        
-        product_lower = product_name.lower()
-        for brand in brands:
-            if brand in product_lower:
-                return brand.title()
-                
-        return 'Unknown'
+        return market_brand_classifier.classify(product_name)
         
     def extract_category(self, product_name):
         """Extract category from product name."""
-        if not product_name:
-            return 'Unknown'
-            
-        categories = {
-            'Electronics': ['laptop', 'computer', 'tablet', 'phone', 'iphone', 'ipad'],
-            'Audio': ['headphones', 'speaker', 'audio', 'sound', 'airpods'],
-            'Gaming': ['gaming', 'game', 'console', 'xbox', 'playstation', 'nintendo'],
-            'Appliances': ['vacuum', 'kitchen', 'appliance', 'dyson'],
-            'Tools': ['drill', 'saw', 'tool', 'dewalt', 'milwaukee'],
-            'Photography': ['camera', 'lens', 'canon', 'nikon']
-        }
-        
-        product_lower = product_name.lower()
-        for category, keywords in categories.items():
-            if any(keyword in product_lower for keyword in keywords):
-                return category
-                
-        return 'Other'
+        return market_category_classifier.classify(product_name)
         
     def analyze_competitor_patterns(self):
         """Analyze competitor bidding patterns."""
@@ -308,12 +487,13 @@ class MarketIntelligence:
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
-        # Get bidding data (simulated - would need actual bid history)
+        # Read precomputed per-bucket competition stats instead of scanning market_data
         cursor.execute('''
-            SELECT category, brand, auction_location, total_bids, unique_bidders,
-                   retail_price, current_bid, instant_win_price
-            FROM market_data 
-            WHERE total_bids > 0
+            SELECT category, active_count,
+                   active_bids_count, active_bids_mean, active_bids_m2,
+                   active_bidders_count, active_bidders_mean, active_bidders_m2
+            FROM market_stats 
+            WHERE active_count > 0
         ''')
         
         data = cursor.fetchall()
@@ -326,19 +506,23 @@ class MarketIntelligence:
             'optimal_bidding_times': []
         }
         
-        # Group by category for competition analysis
-        by_category = defaultdict(list)
+        # Merge bucket stats by category for competition analysis
+        by_category = defaultdict(lambda: {'items': 0, 'bids': RunningStats(), 'bidders': RunningStats()})
         for row in data:
-            category = row[0]
-            by_category[category].append(row)
+            category_stats = by_category[row[0]]
+            category_stats['items'] += row[1]
+            category_stats['bids'].merge(RunningStats(*row[2:5]))
+            category_stats['bidders'].merge(RunningStats(*row[5:8]))
             
         # Analyze each category
-        for category, items in by_category.items():
-            if len(items) < 5:  # Need minimum sample size
+        for category, stats in by_category.items():
+            if stats['items'] < 5:  # Need minimum sample size
+                continue
+            if stats['bidders'].count == 0:
                 continue
                 
-            avg_bidders = statistics.mean([item[4] for item in items if item[4] > 0])
-            avg_bids = statistics.mean([item[3] for item in items if item[3] > 0])
+            avg_bidders = stats['bidders'].mean
+            avg_bids = stats['bids'].mean
             
             competition_score = (avg_bidders * 0.6) + (avg_bids * 0.4)
             
@@ -347,6 +531,7 @@ class MarketIntelligence:
                     'category': category,
                     'avg_bidders': avg_bidders,
                     'avg_bids': avg_bids,
+                    'bidders_stdev': stats['bidders'].stdev,
                     'competition_score': competition_score
                 })
             elif competition_score < 3:
@@ -354,6 +539,7 @@ class MarketIntelligence:
                     'category': category,
                     'avg_bidders': avg_bidders,
                     'avg_bids': avg_bids,
+                    'bidders_stdev': stats['bidders'].stdev,
                     'competition_score': competition_score
                 })
                 
@@ -367,23 +553,21 @@ class MarketIntelligence:
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
-        since_date = datetime.now() - timedelta(days=days)
+        since_date = (datetime.utcnow() - timedelta(days=days)).date()
         
-        # Get trend data by category
+        # Get trend data by category from the daily aggregates
         cursor.execute('''
             SELECT category, brand, 
-                   AVG(retail_price) as avg_retail,
-                   AVG(current_bid) as avg_bid,
-                   AVG(CASE WHEN retail_price > 0 THEN 
-                       ((retail_price - instant_win_price) / retail_price * 100) 
-                       ELSE 0 END) as avg_discount,
-                   COUNT(*) as total_auctions,
-                   AVG(total_bids) as avg_bids_per_auction,
-                   AVG(unique_bidders) as avg_bidders_per_auction
-            FROM market_data 
-            WHERE recorded_at > ?
+                   SUM(retail_sum) / SUM(item_count) as avg_retail,
+                   SUM(current_bid_sum) / SUM(item_count) as avg_bid,
+                   SUM(discount_sum) / SUM(item_count) as avg_discount,
+                   SUM(item_count) as total_auctions,
+                   SUM(bids_sum) / SUM(item_count) as avg_bids_per_auction,
+                   SUM(bidders_sum) / SUM(item_count) as avg_bidders_per_auction
+            FROM market_stats 
+            WHERE stat_date >= ?
             GROUP BY category, brand
-            HAVING COUNT(*) >= 5
+            HAVING SUM(item_count) >= 5
             ORDER BY total_auctions DESC
         ''', (since_date.isoformat(),))
         
@@ -441,21 +625,21 @@ class MarketIntelligence:
         
         opportunities = []
         
-        # Low competition, high value opportunities
+        # Low competition, high value opportunities from the daily aggregates
         cursor.execute('''
             SELECT category, brand, auction_location,
-                   AVG(retail_price) as avg_retail,
-                   AVG(instant_win_price) as avg_instant_win,
-                   AVG(total_bids) as avg_bids,
-                   AVG(unique_bidders) as avg_bidders,
-                   COUNT(*) as total_items,
-                   AVG(CASE WHEN retail_price > 0 THEN 
-                       ((retail_price - instant_win_price) / retail_price * 100) 
-                       ELSE 0 END) as avg_discount
-            FROM market_data 
-            WHERE recorded_at > datetime('now', '-7 days')
+                   SUM(retail_sum) / SUM(item_count) as avg_retail,
+                   SUM(instant_win_sum) / SUM(item_count) as avg_instant_win,
+                   SUM(bids_sum) / SUM(item_count) as avg_bids,
+                   SUM(bidders_sum) / SUM(item_count) as avg_bidders,
+                   SUM(item_count) as total_items,
+                   SUM(discount_sum) / SUM(item_count) as avg_discount
+            FROM market_stats 
+            WHERE stat_date >= DATE('now', '-7 days')
             GROUP BY category, brand, auction_location
-            HAVING COUNT(*) >= 3 AND AVG(total_bids) < 5 AND AVG(retail_price) > 200
+            HAVING SUM(item_count) >= 3
+               AND SUM(bids_sum) / SUM(item_count) < 5
+               AND SUM(retail_sum) / SUM(item_count) > 200
             ORDER BY avg_discount DESC
         ''')
         
@@ -7,17 +7,40 @@ Advanced analytics for predicting market movements, optimal bidding times, and d
 import sqlite3
 import json
 import numpy as np
+import pandas as pd
+import os
 from datetime import datetime, timedelta
 import statistics
 from collections import defaultdict, Counter
 import argparse
 import math
 
+MARKET_COLUMNS = ['category', 'brand', 'auction_location', 'retail_price', 'instant_win_price',
+                  'current_bid', 'total_bids', 'unique_bidders', 'recorded_at']
+PRICE_COLUMNS = ['category', 'brand', 'retail_price', 'instant_win_price',
+                 'discount_percent', 'value_score', 'recorded_at']
+
+# Grouping levels for demand forecasts; a missing brand/location means "any"
+FORECAST_LEVELS = [
+    ['category', 'brand', 'auction_location'],
+    ['category', 'brand'],
+    ['category', 'auction_location'],
+    ['category'],
+]
+
 class PredictiveAnalytics:
-    def __init__(self, db_path="predictive_analytics.db"):
+    def __init__(self, db_path="predictive_analytics.db",
+                 market_db_path="market_intelligence.db", price_db_path="price_analytics.db"):
         self.db_path = db_path
+        self.market_db_path = market_db_path
+        self.price_db_path = price_db_path
         self.setup_database()
         
+        # Cached history frames and forecasts, rebuilt only when the source databases change
+        self._history_signature = None
+        self._history_frames = None
+        self._forecast_cache = None
+        
     def setup_database(self):
         """Setup predictive analytics database."""
         conn = sqlite3.connect(self.db_path)
@@ -132,87 +155,132 @@ class PredictiveAnalytics:
         conn.commit()
         conn.close()
         
-    def load_historical_data(self):
-        """Load historical data from other system databases."""
-        historical_data = {
-            'market_data': [],
-            'price_data': [],
-            'bid_data': [],
-            'timing_data': []
-        }
+    def get_history_signature(self):
+        """Fingerprint of the source databases used to detect when history must be reloaded."""
+        signature = [datetime.now().date().isoformat()]  # The 90-day window moves daily
         
-        # Load from market intelligence database
-        try:
-            conn = sqlite3.connect("market_intelligence.db")
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT category, brand, auction_location, retail_price, 
-                       instant_win_price, current_bid, total_bids, unique_bidders,
-                       recorded_at
-                FROM market_data 
-                WHERE recorded_at > datetime('now', '-90 days')
-                ORDER BY recorded_at
-            ''')
-            
-            historical_data['market_data'] = cursor.fetchall()
-            conn.close()
-            
-        except sqlite3.OperationalError:
-            print("⚠️ Market intelligence database not found")
+        for path in (self.market_db_path, self.price_db_path):
+            for candidate in (path, path + "-wal"):
+                try:
+                    stat = os.stat(candidate)
+                    signature.append((candidate, stat.st_mtime_ns, stat.st_size))
+                except OSError:
+                    signature.append((candidate, None, None))
+                    
+        return tuple(signature)
+        
+    def read_history_table(self, path, query, columns, label):
+        """Read one history table into a DataFrame with parsed timestamps."""
+        if not os.path.exists(path):
+            print(f"⚠️ {label} database not found")
+            return pd.DataFrame(columns=columns)
             
-        # Load from price analytics database
         try:
-            conn = sqlite3.connect("price_analytics.db")
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT category, brand, retail_price, instant_win_price,
-                       discount_percent, value_score, recorded_at
-                FROM price_analytics 
-                WHERE recorded_at > datetime('now', '-90 days')
-                ORDER BY recorded_at
-            ''')
-            
-            historical_data['price_data'] = cursor.fetchall()
+            conn = sqlite3.connect(path)
+            frame = pd.read_sql_query(query, conn)
             conn.close()
+        except (sqlite3.OperationalError, pd.errors.DatabaseError):
+            print(f"⚠️ {label} database not found")
+            return pd.DataFrame(columns=columns)
             
-        except sqlite3.OperationalError:
-            print("⚠️ Price analytics database not found")
+        timestamps = frame['recorded_at'].astype(str).str.replace('Z', '').str.replace('T', ' ').str.slice(0, 19)
+        frame['recorded_ts'] = pd.to_datetime(timestamps, format='%Y-%m-%d %H:%M:%S', errors='coerce')
+        return frame
+        
+    def load_history_frames(self):
+        """Load 90 days of history into columnar frames, reusing the cache until the sources change."""
+        signature = self.get_history_signature()
+        if self._history_frames is not None and signature == self._history_signature:
+            return self._history_frames
             
-        return historical_data
+        market_frame = self.read_history_table(self.market_db_path, '''
+            SELECT category, brand, auction_location, retail_price, 
+                   instant_win_price, current_bid, total_bids, unique_bidders,
+                   recorded_at
+            FROM market_data 
+            WHERE recorded_at > datetime('now', '-90 days')
+            ORDER BY recorded_at
+        ''', MARKET_COLUMNS, "Market intelligence")
+        
+        price_frame = self.read_history_table(self.price_db_path, '''
+            SELECT category, brand, retail_price, instant_win_price,
+                   discount_percent, value_score, recorded_at
+            FROM price_analytics 
+            WHERE recorded_at > datetime('now', '-90 days')
+            ORDER BY recorded_at
+        ''', PRICE_COLUMNS, "Price analytics")
+        
+        self._history_frames = {
+            'market_data': market_frame,
+            'price_data': price_frame
+        }
+        self._history_signature = signature
+        self._forecast_cache = None
         
-    def calculate_demand_forecast(self, category, brand=None, location=None, days_ahead=7):
-        """Calculate demand forecast for specific category/brand/location."""
-        historical_data = self.load_historical_data()
+        return self._history_frames
         
-        if not historical_data['market_data']:
-            return self.generate_baseline_forecast(category, brand, location, days_ahead)
-            
-        # Filter data for specific category/brand/location
-        filtered_data = []
-        for row in historical_data['market_data']:
-            cat, br, loc, retail, instant_win, current_bid, total_bids, unique_bidders, recorded_at = row
+    def load_historical_data(self):
+        """Load historical data from other system databases."""
+        frames = self.load_history_frames()
+        
+        return {
+            'market_data': list(frames['market_data'][MARKET_COLUMNS].itertuples(index=False, name=None)),
+            'price_data': list(frames['price_data'][PRICE_COLUMNS].itertuples(index=False, name=None)),
+            'bid_data': [],
+            'timing_data': []
+        }
+        
+    def compute_demand_forecasts(self):
+        """Compute demand metrics for every category/brand/location combination in one pass per level."""
+        frames = self.load_history_frames()
+        if self._forecast_cache is not None:
+            return self._forecast_cache
             
-            if cat == category:
-                if brand is None or br == brand:
-                    if location is None or loc == location:
-                        filtered_data.append(row)
-                        
-        if len(filtered_data) < 10:
-            return self.generate_baseline_forecast(category, brand, location, days_ahead)
+        forecasts = {}
+        market = frames['market_data']
+        
+        if not market.empty:
+            market = market.reset_index(drop=True)
+            # Bidder/bid averages ignore zero rows, matching the per-row filters they replace
+            bidders = market['unique_bidders'].where(market['unique_bidders'] > 0)
+            bids = market['total_bids'].where(market['total_bids'] > 0)
             
-        # Calculate demand metrics
-        recent_data = filtered_data[-30:]  # Last 30 data points
-        older_data = filtered_data[-60:-30] if len(filtered_data) >= 60 else []
+            for level in FORECAST_LEVELS:
+                grouped = market.groupby(level, sort=False, dropna=False)
+                group_size = grouped['category'].transform('size')
+                position_from_end = grouped.cumcount(ascending=False)
+                
+                # Last 30 rows are "recent"; the 30 before them are "older" once a group has 60 rows
+                recent = position_from_end < 30
+                older = (position_from_end >= 30) & (position_from_end < 60) & (group_size >= 60)
+                
+                keys = [market[column] for column in level]
+                stats = pd.DataFrame({
+                    'data_points_used': grouped.size(),
+                    'avg_bidders': bidders.where(recent).groupby(keys, sort=False, dropna=False).mean(),
+                    'avg_bids': bids.where(recent).groupby(keys, sort=False, dropna=False).mean(),
+                    'bidder_variance': bidders.where(recent).groupby(keys, sort=False, dropna=False).var(ddof=1),
+                    'avg_bidders_older': bidders.where(older).groupby(keys, sort=False, dropna=False).mean(),
+                    'avg_bids_older': bids.where(older).groupby(keys, sort=False, dropna=False).mean(),
+                })
+                
+                for key, row in stats.iterrows():
+                    key = key if isinstance(key, tuple) else (key,)
+                    values = dict(zip(level, key))
+                    cache_key = (values['category'], values.get('brand'), values.get('auction_location'))
+                    forecasts[cache_key] = self.build_demand_forecast(row)
+                    
+        self._forecast_cache = forecasts
+        return forecasts
         
-        # Demand indicators
-        avg_bidders_recent = statistics.mean([row[7] for row in recent_data if row[7] > 0])
-        avg_bids_recent = statistics.mean([row[6] for row in recent_data if row[6] > 0])
+    def build_demand_forecast(self, stats):
+        """Turn aggregated group statistics into a demand forecast."""
+        avg_bidders_recent = 0 if pd.isna(stats['avg_bidders']) else float(stats['avg_bidders'])
+        avg_bids_recent = 0 if pd.isna(stats['avg_bids']) else float(stats['avg_bids'])
         
-        if older_data:
-            avg_bidders_older = statistics.mean([row[7] for row in older_data if row[7] > 0])
-            avg_bids_older = statistics.mean([row[6] for row in older_data if row[6] > 0])
+        if not pd.isna(stats['avg_bidders_older']) or not pd.isna(stats['avg_bids_older']):
+            avg_bidders_older = 0 if pd.isna(stats['avg_bidders_older']) else float(stats['avg_bidders_older'])
+            avg_bids_older = 0 if pd.isna(stats['avg_bids_older']) else float(stats['avg_bids_older'])
             
             # Calculate trends
             bidder_trend = (avg_bidders_recent - avg_bidders_older) / avg_bidders_older if avg_bidders_older > 0 else 0
@@ -235,7 +303,7 @@ class PredictiveAnalytics:
             demand_trend = "STABLE"
             
         # Calculate confidence based on data consistency
-        bidder_variance = statistics.variance([row[7] for row in recent_data if row[7] > 0]) if len(recent_data) > 1 else 0
+        bidder_variance = 0 if pd.isna(stats['bidder_variance']) else float(stats['bidder_variance'])
         confidence = max(0, min(100, 100 - (bidder_variance * 10)))
         
         return {
@@ -245,9 +313,18 @@ class PredictiveAnalytics:
             'avg_bidders': avg_bidders_recent,
             'avg_bids': avg_bids_recent,
             'trend_strength': abs(bidder_trend + bid_trend) / 2,
-            'data_points_used': len(filtered_data)
+            'data_points_used': int(stats['data_points_used'])
         }
         
+    def calculate_demand_forecast(self, category, brand=None, location=None, days_ahead=7):
+        """Calculate demand forecast for specific category/brand/location."""
+        forecast = self.compute_demand_forecasts().get((category, brand, location))
+        
+        if forecast is None or forecast['data_points_used'] < 10:
+            return self.generate_baseline_forecast(category, brand, location, days_ahead)
+            
+        return dict(forecast)
+        
     def generate_baseline_forecast(self, category, brand, location, days_ahead):
         """Generate baseline forecast when insufficient data."""
         # Category-based baseline scores
@@ -349,29 +426,26 @@ class PredictiveAnalytics:
         
     def analyze_seasonal_patterns(self, category, brand=None):
         """Analyze seasonal patterns for category/brand."""
-        historical_data = self.load_historical_data()
+        market = self.load_history_frames()['market_data']
         
-        if not historical_data['market_data']:
+        if market.empty:
             return self.generate_baseline_seasonal_forecast(category, brand)
             
         # Group data by month
-        monthly_data = defaultdict(list)
-        
-        for row in historical_data['market_data']:
-            cat, br, loc, retail, instant_win, current_bid, total_bids, unique_bidders, recorded_at = row
-            
-            if cat == category and (brand is None or br == brand):
-                try:
-                    date_obj = datetime.fromisoformat(recorded_at.replace('Z', ''))
-                    month = date_obj.month
-                    monthly_data[month].append({
-                        'retail_price': retail,
-                        'instant_win_price': instant_win,
-                        'bidders': unique_bidders,
-                        'bids': total_bids
-                    })
-                except:
-                    continue
+        selected = (market['category'] == category) & market['recorded_ts'].notna()
+        if brand is not None:
+            selected &= market['brand'] == brand
+        matching = market[selected]
+        
+        monthly_data = {
+            month: [
+                {'retail_price': retail, 'instant_win_price': instant_win, 'bidders': bidders, 'bids': bids}
+                for retail, instant_win, bidders, bids in zip(
+                    rows['retail_price'], rows['instant_win_price'], rows['unique_bidders'], rows['total_bids']
+                )
+            ]
+            for month, rows in matching.groupby(matching['recorded_ts'].dt.month)
+        }
                     
         if len(monthly_data) < 6:  # Need at least 6 months of data
             return self.generate_baseline_seasonal_forecast(category, brand)
@@ -8,14 +8,21 @@ import asyncio
 import aiohttp
 import ssl
 import json
+import os
+import sys
 import sqlite3
 from datetime import datetime, timedelta
 from collections import defaultdict
 import statistics
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core_systems.search_gateway import get_search_gateway
+from core_systems.product_classifier import KeywordClassifier
+
 class PriceAnalyticsTracker:
     def __init__(self):
         self.session = None
+        self.search_gateway = get_search_gateway()
         self.sc_locations = ["Spartanburg", "Greenville", "Rock Hill", "Gastonia", "Anderson"]
         self.db_file = "price_analytics.db"
         self.init_database()
@@ -53,6 +60,9 @@ class PriceAnalyticsTracker:
                 'volatility_threshold': 0.25
             }
         }
+        self.category_classifier = KeywordClassifier(
+            {category: info['terms'] for category, info in self.price_categories.items()},
+            'Other', empty='Unknown')
         
     def init_database(self):
         """Initialize price analytics database."""
@@ -115,38 +125,22 @@ class PriceAnalyticsTracker:
             
     async def search_for_term(self, term, limit=100):
         """Search for a specific term."""
-        url = f"https://api.macdiscount.com/search?q={term}&limit={limit}"
-        
         try:
-            async with self.session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    hits = data.get('hits', [])
-                    
-                    sc_hits = []
-                    for hit in hits:
-                        if hit.get('auction_location') in self.sc_locations:
-                            sc_hits.append(hit)
-                            
-                    return sc_hits
-                else:
-                    return []
+            hits = await self.search_gateway.search(self.session, term, limit)
         except Exception as e:
             return []
             
+        # Filter to SC locations only
+        sc_hits = []
+        for hit in hits:
+            if hit.get('auction_location') in self.sc_locations:
+                sc_hits.append(hit)
+                
+        return sc_hits
+            
     def categorize_product(self, product_name):
         """Categorize product based on name."""
-        if not product_name:
-            return "Unknown"
-            
-        product_lower = product_name.lower()
-        
-        for category, info in self.price_categories.items():
-            for term in info['terms']:
-                if term.lower() in product_lower:
-                    return category
-                    
-        return "Other"
+        return self.category_classifier.classify(product_name)
         
     async def collect_price_data(self):
         """Collect current price data across all categories."""
@@ -157,12 +151,16 @@ class PriceAnalyticsTracker:
         all_items = []
         seen_lot_ids = set()
         
+        # Fan every category's terms out concurrently; the search gateway enforces the rate limit
+        terms = sorted({term for info in self.price_categories.values() for term in info['terms']})
+        term_results = dict(zip(terms, await asyncio.gather(*(self.search_for_term(term) for term in terms))))
+        
         for category, info in self.price_categories.items():
             print(f"📂 Analyzing {category}...")
             
             category_items = []
             for term in info['terms']:
-                results = await self.search_for_term(term)
+                results = term_results[term]
                 
                 for result in results:
                     lot_id = result.get('lot_id')
@@ -174,8 +172,6 @@ class PriceAnalyticsTracker:
                             category_items.append(result)
                             seen_lot_ids.add(lot_id)
                             
-                await asyncio.sleep(0.2)
-                
             all_items.extend(category_items)
             print(f"   Found {len(category_items)} items in {category}")
             
@@ -14,12 +14,19 @@ import statistics
 from collections import defaultdict
 import matplotlib.pyplot as plt
 import pandas as pd
+from timing_rollups import TimingRollupStore, parse_close_time
+
+# Rollup source name for auction-summary timing rows
+ROLLUP_SOURCE = 'auction_summary'
+COMPETITION_SCORES = {'high': 3, 'medium': 2, 'low': 1}
 
 class TimingAnalyzer:
     def __init__(self, db_path="timing_analysis.db"):
         self.db_path = db_path
         self.session = None
         self.init_database()
+        self.rollups = TimingRollupStore(db_path)
+        self.backfill_rollups()
         
     def init_database(self):
         """Initialize database for timing analysis."""
@@ -75,6 +82,37 @@ class TimingAnalyzer:
         conn.commit()
         conn.close()
         
+    def backfill_rollups(self):
+        """Seed the timing cube from auction_timing rows recorded before rollups existed."""
+        if self.rollups.query(ROLLUP_SOURCE, ['close_hour']):
+            return
+            
+        conn = sqlite3.connect(self.db_path)
+        try:
+            rows = conn.execute('''
+                SELECT auction_id, closing_date, location_id, competition_level, final_price, bid_count
+                FROM auction_timing
+                ORDER BY id
+            ''')
+            self.rollups.record_lots(ROLLUP_SOURCE, (
+                self.rollup_record(*row) for row in rows
+            ))
+        except sqlite3.OperationalError:
+            pass  # auction_timing was created with a different schema
+        finally:
+            conn.close()
+            
+    def rollup_record(self, auction_id, closing_date, location_id, competition_level, final_price, bid_count):
+        """Shape an auction timing row for the rollup store."""
+        return {
+            'lot_key': auction_id,
+            'expected_close_date': closing_date,
+            'location': location_id,
+            'competition': COMPETITION_SCORES.get(competition_level, 1),
+            'final_price': final_price,
+            'bid_count': bid_count
+        }
+        
     async def create_session(self):
         """Create HTTP session."""
         ssl_context = ssl.create_default_context()
@@ -127,6 +165,7 @@ class TimingAnalyzer:
         """Analyze timing patterns from auction data."""
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
+        rollup_records = []
         
         for auction in auctions:
             auction_id = auction.get('id')
@@ -140,9 +179,11 @@ class TimingAnalyzer:
                 continue
                 
             try:
-                # Parse dates
-                closing_dt = datetime.fromisoformat(closing_date.replace('Z', '+00:00'))
-                opening_dt = datetime.fromisoformat(opening_date.replace('Z', '+00:00')) if opening_date else None
+                # Parse dates (cached across scans)
+                closing_dt = parse_close_time(closing_date)
+                if closing_dt is None:
+                    raise ValueError(f"Unparseable closing date: {closing_date}")
+                opening_dt = parse_close_time(opening_date) if opening_date else None
                 
                 # Calculate duration
                 duration_hours = 0
@@ -167,12 +208,19 @@ class TimingAnalyzer:
                       closing_date, duration_hours, closing_hour, closing_day_of_week,
                       0.0, 0, competition_level, datetime.now().isoformat()))
                       
+                rollup_records.append(self.rollup_record(
+                    auction_id, closing_date, location_id, competition_level, 0.0, 0
+                ))
+                      
             except Exception as e:
                 print(f"⚠️  Error processing auction {auction_id}: {e}")
                 
         conn.commit()
         conn.close()
         
+        # Keep the hour × weekday cube current at ingest
+        self.rollups.record_lots(ROLLUP_SOURCE, rollup_records)
+        
     def estimate_competition(self, title, location_id):
         """Estimate competition level based on title and location."""
         if not title:
@@ -200,29 +248,16 @@ class TimingAnalyzer:
         # Clear existing patterns
         cursor.execute('DELETE FROM hourly_patterns')
         
-        # Calculate patterns for each hour/day combination
-        for day in range(7):  # 0-6 (Monday-Sunday)
-            for hour in range(24):  # 0-23
-                cursor.execute('''
-                    SELECT AVG(final_price), AVG(bid_count), COUNT(*),
-                           AVG(CASE WHEN competition_level = 'high' THEN 3
-                                   WHEN competition_level = 'medium' THEN 2
-                                   ELSE 1 END) as competition_score
-                    FROM auction_timing
-                    WHERE closing_hour = ? AND closing_day_of_week = ?
-                ''', (hour, day))
-                
-                result = cursor.fetchone()
-                avg_price, avg_bids, count, competition_score = result
-                
-                if count > 0:
-                    cursor.execute('''
-                        INSERT INTO hourly_patterns
-                        (hour, day_of_week, avg_final_price, avg_bid_count, 
-                         auction_count, competition_score, last_updated)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                    ''', (hour, day, avg_price or 0, avg_bids or 0, count,
-                          competition_score or 2, datetime.now().isoformat()))
+        # Read every hour/day combination from the rollup cube in one query
+        for cell in self.rollups.query(ROLLUP_SOURCE, ['close_hour', 'close_weekday']):
+            cursor.execute('''
+                INSERT INTO hourly_patterns
+                (hour, day_of_week, avg_final_price, avg_bid_count, 
+                 auction_count, competition_score, last_updated)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (cell['close_hour'], cell['close_weekday'], cell['avg_final_price'] or 0,
+                  cell['avg_bid_count'] or 0, cell['lot_count'],
+                  cell['avg_competition'] or 2, datetime.now().isoformat()))
         
         conn.commit()
         conn.close()
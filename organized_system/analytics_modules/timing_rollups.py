@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+⏰ Timing Rollups - Pre-parsed close times and hour × weekday aggregate cubes
+Shared by the timing analyzers so optimal-time queries are lookups instead of rescans
+"""
+
+import sqlite3
+from datetime import datetime, timezone
+from functools import lru_cache
+from collections import defaultdict
+
+WEEKDAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# Additive measures kept per lot and per cube cell
+MEASURES = ['competition', 'discount', 'retail_price', 'final_price', 'bid_count']
+
+@lru_cache(maxsize=65536)
+def parse_close_time(close_date_str):
+    """Parse a closing date string once; repeat sightings hit the cache.
+
+    Always returns a naive datetime in UTC: 'Z' and explicit-offset strings are converted,
+    and strings without an offset are taken as UTC already, so results can be subtracted
+    from one another.
+    """
+    if not close_date_str or close_date_str == 'Unknown':
+        return None
+
+    try:
+        if 'T' in close_date_str or ' ' in close_date_str.strip():
+            parsed = datetime.fromisoformat(close_date_str.strip().replace('Z', '+00:00'))
+        else:
+            parsed = datetime.strptime(close_date_str.strip(), '%Y-%m-%d')
+    except ValueError:
+        return None
+
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+class TimingRollupStore:
+    """Incrementally maintained hour × weekday × category × location cubes.
+
+    Each lot's latest contribution is kept in ``timing_close_times``; re-recording a lot
+    subtracts its previous contribution before adding the new one, so repeated scans
+    never double count.
+    """
+
+    def __init__(self, db_path="timing_analysis.db"):
+        self.db_path = db_path
+        self.init_database()
+
+    def init_database(self):
+        """Create rollup tables."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS timing_close_times (
+                lot_key TEXT PRIMARY KEY,
+                source TEXT,
+                expected_close_date TEXT,
+                close_at TEXT,
+                close_hour INTEGER,
+                close_weekday INTEGER,
+                category TEXT,
+                location TEXT,
+                competition REAL,
+                discount REAL,
+                retail_price REAL,
+                final_price REAL,
+                bid_count REAL,
+                updated_at TEXT
+            )
+        ''')
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS timing_cube (
+                source TEXT,
+                close_hour INTEGER,
+                close_weekday INTEGER,
+                category TEXT,
+                location TEXT,
+                lot_count INTEGER DEFAULT 0,
+                competition_sum REAL DEFAULT 0,
+                discount_sum REAL DEFAULT 0,
+                retail_price_sum REAL DEFAULT 0,
+                final_price_sum REAL DEFAULT 0,
+                bid_count_sum REAL DEFAULT 0,
+                PRIMARY KEY (source, close_hour, close_weekday, category, location)
+            )
+        ''')
+
+        conn.commit()
+        conn.close()
+
+    def record_lots(self, source, lots):
+        """Fold lots into the cube.
+
+        ``lots`` is an iterable of dicts with ``lot_key``, ``expected_close_date``, optional
+        ``category``/``location`` and any of the additive measures. Returns the number of
+        lots with a parseable close time.
+        """
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        deltas = defaultdict(lambda: [0] + [0.0] * len(MEASURES))
+        recorded = 0
+        now = datetime.now().isoformat()
+
+        for lot in lots:
+            close_dt = parse_close_time(lot.get('expected_close_date'))
+            if close_dt is None:
+                continue
+
+            lot_key = f"{source}:{lot['lot_key']}"
+            values = [float(lot.get(measure) or 0) for measure in MEASURES]
+            cell = (source, close_dt.hour, close_dt.weekday(),
+                    lot.get('category') or 'Unknown', str(lot.get('location') or 'Unknown'))
+
+            # Retract the lot's previous contribution, if any
+            cursor.execute(f'''
+                SELECT close_hour, close_weekday, category, location, {", ".join(MEASURES)}
+                FROM timing_close_times WHERE lot_key = ?
+            ''', (lot_key,))
+            previous = cursor.fetchone()
+
+            if previous:
+                previous_cell = (source,) + tuple(previous[:4])
+                if previous_cell == cell and list(previous[4:]) == values:
+                    continue
+
+                delta = deltas[previous_cell]
+                delta[0] -= 1
+                for i, value in enumerate(previous[4:], 1):
+                    delta[i] -= value
+
+            delta = deltas[cell]
+            delta[0] += 1
+            for i, value in enumerate(values, 1):
+                delta[i] += value
+
+            cursor.execute(f'''
+                INSERT OR REPLACE INTO timing_close_times
+                (lot_key, source, expected_close_date, close_at, close_hour, close_weekday,
+                 category, location, {", ".join(MEASURES)}, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (lot_key, source, lot.get('expected_close_date'), close_dt.isoformat(),
+                  *cell[1:], *values, now))
+            recorded += 1
+
+        self._apply_deltas(cursor, deltas)
+
+        conn.commit()
+        conn.close()
+        return recorded
+
+    def expire_closed(self, source, before=None):
+        """Retract lots of ``source`` that closed before ``before`` (naive UTC, default now).
+
+        Keeps a cube fed with open listings scoped to lots still open, so it doesn't
+        accumulate every lot ever seen. Returns the number of lots retracted.
+        """
+        before = before or datetime.now(timezone.utc).replace(tzinfo=None)
+
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute(f'''
+            SELECT close_hour, close_weekday, category, location, {", ".join(MEASURES)}
+            FROM timing_close_times WHERE source = ? AND close_at < ?
+        ''', (source, before.isoformat()))
+        expired = cursor.fetchall()
+
+        deltas = defaultdict(lambda: [0] + [0.0] * len(MEASURES))
+        for row in expired:
+            delta = deltas[(source,) + tuple(row[:4])]
+            delta[0] -= 1
+            for i, value in enumerate(row[4:], 1):
+                delta[i] -= value
+
+        self._apply_deltas(cursor, deltas)
+        cursor.execute('DELETE FROM timing_close_times WHERE source = ? AND close_at < ?',
+                       (source, before.isoformat()))
+
+        conn.commit()
+        conn.close()
+        return len(expired)
+
+    def _apply_deltas(self, cursor, deltas):
+        """Add per-cell count/measure deltas to the cube and drop emptied cells."""
+        for cell, delta in deltas.items():
+            cursor.execute('''
+                INSERT INTO timing_cube
+                (source, close_hour, close_weekday, category, location, lot_count,
+                 competition_sum, discount_sum, retail_price_sum, final_price_sum, bid_count_sum)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (source, close_hour, close_weekday, category, location) DO UPDATE SET
+                    lot_count = lot_count + excluded.lot_count,
+                    competition_sum = competition_sum + excluded.competition_sum,
+                    discount_sum = discount_sum + excluded.discount_sum,
+                    retail_price_sum = retail_price_sum + excluded.retail_price_sum,
+                    final_price_sum = final_price_sum + excluded.final_price_sum,
+                    bid_count_sum = bid_count_sum + excluded.bid_count_sum
+            ''', (*cell, *delta))
+
+        cursor.execute('DELETE FROM timing_cube WHERE lot_count <= 0')
+
+    def query(self, source, group_by, category=None, location=None):
+        """Aggregate the cube along ``group_by`` (subset of close_hour, close_weekday,
+        category, location), optionally sliced by category/location.
+
+        Returns a list of dicts with the group columns, ``lot_count`` and ``avg_*`` measures.
+        """
+        allowed = {'close_hour', 'close_weekday', 'category', 'location'}
+        if not set(group_by) <= allowed:
+            raise ValueError(f"Unsupported rollup dimensions: {group_by}")
+
+        conditions = ['source = ?']
+        params = [source]
+        if category is not None:
+            conditions.append('category = ?')
+            params.append(category)
+        if location is not None:
+            conditions.append('location = ?')
+            params.append(str(location))
+
+        columns = ', '.join(group_by)
+        averages = ', '.join(f'SUM({measure}_sum) / SUM(lot_count)' for measure in MEASURES)
+
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute(f'''
+            SELECT {columns}, SUM(lot_count), {averages}
+            FROM timing_cube
+            WHERE {' AND '.join(conditions)}
+            GROUP BY {columns}
+        ''', params)
+        rows = cursor.fetchall()
+        conn.close()
+
+        names = list(group_by) + ['lot_count'] + [f'avg_{measure}' for measure in MEASURES]
+        return [dict(zip(names, row)) for row in rows]
@@ -8,11 +8,16 @@ import asyncio
 import aiohttp
 import ssl
 import json
+import os
+import sys
 import sqlite3
 from datetime import datetime, timedelta
 from collections import defaultdict
 import statistics
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core_systems.product_classifier import KeywordClassifier
+
 class WinningBidAnalyzer:
     def __init__(self):
         self.session = None
@@ -29,6 +34,7 @@ class WinningBidAnalyzer:
             'Gaming': ['xbox', 'playstation', 'nintendo', 'gaming'],
             'Luxury': ['rolex', 'omega', 'diamond', 'gold', 'jewelry']
         }
+        self.category_classifier = KeywordClassifier(self.categories, 'Other', empty='Unknown')
         
     def init_database(self):
         """Initialize bid analysis database."""
@@ -98,17 +104,7 @@ class WinningBidAnalyzer:
             
     def categorize_item(self, product_name):
         """Categorize item based on product name."""
-        if not product_name:
-            return "Unknown"
-            
-        product_lower = product_name.lower()
-        
-        for category, keywords in self.categories.items():
-            for keyword in keywords:
-                if keyword.lower() in product_lower:
-                    return category
-                    
-        return "Other"
+        return self.category_classifier.classify(product_name)
         
     def calculate_bid_metrics(self, item):
         """Calculate comprehensive bid analysis metrics."""
@@ -10,6 +10,11 @@ import os
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 import logging
+import queue
+import threading
+from pathlib import Path
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 
 # Selenium imports
@@ -20,12 +25,259 @@ try:
     from selenium.webdriver.support import expected_conditions as EC
     from selenium.webdriver.chrome.options import Options
     from selenium.webdriver.common.action_chains import ActionChains
-    from selenium.common.exceptions import TimeoutException, NoSuchElementException
+    from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
     SELENIUM_AVAILABLE = True
 except ImportError:
     SELENIUM_AVAILABLE = False
     print("⚠️  Selenium not installed. Run: pip install selenium")
 
+# Session cookies from our working system; used until a saved storage state exists
+SESSION_COOKIES = {
+    '__stripe_mid': 'b1219cc5-9a1f-4e9b-9b3b-ce16a3d90ba32b7fa4',
+    'CookieConsent': 'true',
+    'ab.storage.deviceId.ce8b7722-883a-498b-90ff-0aef9d0f0e62': 'g%3A6557c69b-3239-8d82-7b30-ec5862a4de57%7Ce%3Aundefined%7Cc%3A1747345668914%7Cl%3A1749267987617',
+    'ab.storage.userId.ce8b7722-883a-498b-90ff-0aef9d0f0e62': 'g%3A2710619%7Ce%3Aundefined%7Cc%3A1749188938629%7Cl%3A1749267987617',
+    '__stripe_sid': '82edccd6-9b05-4a36-a118-e155bd9212b7ec69fb',
+    'mp_78faade7af6b4f2ee5e1af36d8ac6232_mixpanel': '%7B%22distinct_id%22%3A%202710619%2C%22%24device_id%22%3A%20%22196d5eae0323e9-06ed80c653d2808-19525636-13c680-196d5eae0323e9%22%2C%22%24initial_referrer%22%3A%20%22%24direct%22%2C%22%24initial_referring_domain%22%3A%20%22%24direct%22%2C%22__mps%22%3A%20%7B%7D%2C%22__mpso%22%3A%20%7B%7D%2C%22__mpus%22%3A%20%7B%7D%2C%22__mpa%22%3A%20%7B%7D%2C%22__mpu%22%3A%20%7B%7D%2C%22__mpr%22%3A%20%5B%5D%2C%22__mpap%22%3A%20%5B%5D%2C%22platform%22%3A%20%22website%22%2C%22selected_locations%22%3A%20%5B%0A%20%20%20%20%22Rock%20Hill%22%2C%0A%20%20%20%20%22Gastonia%22%0A%5D%2C%22%24user_id%22%3A%202710619%2C%22active_items%22%3A%20%5B%0A%20%20%20%20%7B%22id%22%3A%2046608657%2C%22invoice_id%22%3A%2018714030%2C%22box_size%22%3A%20%22large%22%2C%22warehouse_location%22%3A%20%22ANL-D-BIN-55%22%2C%22removal_container%22%3A%20null%2C%22product_name%22%3A%20%22KOKISO%20metal%20%22%2C%22status%22%3A%20%22PENDING-TRANSFER%22%2C%22boxes%22%3A%201%2C%22note%22%3A%20null%2C%22current_location_id%22%3A%2038%2C%22allow_transfers%22%3A%201%2C%22allow_shipping%22%3A%200%2C%22is_turbo%22%3A%200%2C%22free_transfers%22%3A%200%2C%22auction_number%22%3A%20%22ANL2506-05-A2%22%2C%22auction_abandon_date%22%3A%20%222025-06-10T18%3A00%3A00.000Z%22%2C%22abandon_date%22%3A%20null%2C%22lot_number%22%3A%20%221726Z%22%2C%22lot_id%22%3A%2035490378%2C%22has_buyer_assurance%22%3A%200%2C%22item_price%22%3A%205.67%2C%22cover_image%22%3A%20%22https%3A%2F%2Fm.media-amazon.com%2Fimages%2FI%2F71fm%2BEdRyKL.jpg%22%2C%22grand_total%22%3A%205.67%2C%22date_paid%22%3A%20%222025-06-06T09%3A20%3A50.000Z%22%2C%22transfer_id%22%3A%206229971%2C%22start_location_code%22%3A%20%22ANL%22%2C%22dest_location_code%22%3A%20%22RHA%22%2C%22start_location_id%22%3A%2038%2C%22dest_location_id%22%3A%2028%2C%22grouping_id%22%3A%20%2218714030_200_35872237%22%2C%22auction_lot_deadline%22%3A%20null%7D%0A%5D%2C%22mac_bucks_balance%22%3A%200%2C%22mac_bucks_gift_balance%22%3A%200%2C%22active_membership%22%3A%20%7B%22id%22%3A%20123339%2C%22date_created%22%3A%20%222025-05-29T18%3A11%3A59.000Z%22%2C%22membership_plan%22%3A%20%22STANDARD%22%2C%22customer_id%22%3A%202710619%2C%22bill_period%22%3A%20%22MONTHLY%22%2C%22bill_amount%22%3A%209.99%2C%22date_cancelled%22%3A%20null%2C%22external_id%22%3A%20%22sub_1RUFc8DhtPPAHVyel4iCCWV7%22%2C%22cancel_reason%22%3A%20null%2C%22stripe_customer_id%22%3A%20%22cus_S6Y0gK006usyW7%22%2C%22date_updated%22%3A%20null%7D%2C%22watchlist_count%22%3A%207%2C%22onboarding%22%3A%20true%7D',
+    'ab.storage.sessionId.ce8b7722-883a-498b-90ff-0aef9d0f0e62': 'g%3Aa18c4004-ac5d-06ae-84af-39127b94f2a6%7Ce%3A1749269831396%7Cc%3A1749267987616%7Cl%3A1749268031396'
+}
+
+# Saved cookies and localStorage, in Playwright's storage_state layout so either driver can reuse it
+STORAGE_STATE_FILE = Path.home() / ".macbid_scraper" / "browser_storage_state.json"
+
+# Heavy static assets bidding never needs
+BLOCKED_URL_PATTERNS = ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg"]
+
+def build_chrome_options(headless: bool) -> "Options":
+    """Chrome options for automation with images disabled"""
+    chrome_options = Options()
+    
+    if headless:
+        chrome_options.add_argument("--headless")
+    
+    # Optimize for automation
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--window-size=1920,1080")
+    
+    # User agent to match our working system
+    chrome_options.add_argument("--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Safari/537.36")
+    
+    # Disable images for faster loading; fonts are blocked per driver over CDP
+    chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+    chrome_options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    chrome_options.page_load_strategy = "eager"
+    
+    return chrome_options
+
+def block_static_assets(driver):
+    """Stop a driver from downloading fonts and images"""
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    except Exception:
+        pass  # Not a Chromium driver; images are still off via prefs
+
+def save_storage_state(driver, path: Path = STORAGE_STATE_FILE):
+    """Merge the driver's cookies and current-origin localStorage into the saved state.
+    
+    The file is shared with the Playwright automation, whose saves also carry other
+    origins and IndexedDB (Firebase auth); those entries are kept rather than overwritten.
+    """
+    cookies = [{
+        'name': cookie['name'],
+        'value': cookie['value'],
+        'domain': cookie.get('domain', '.mac.bid'),
+        'path': cookie.get('path', '/'),
+        'expires': cookie.get('expiry', -1),
+        'httpOnly': cookie.get('httpOnly', False),
+        'secure': cookie.get('secure', False),
+        'sameSite': cookie.get('sameSite', 'Lax')
+    } for cookie in driver.get_cookies()]
+    
+    local_storage = driver.execute_script(
+        "return Object.keys(localStorage).map(k => ({name: k, value: localStorage.getItem(k)}));"
+    )
+    origin = driver.execute_script("return window.location.origin;")
+    
+    state = {}
+    if path.exists():
+        try:
+            with open(path, 'r') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = {}
+    
+    # Fresh cookies replace saved ones with the same name, domain and path
+    merged_cookies = {(cookie['name'], cookie.get('domain'), cookie.get('path')): cookie
+                      for cookie in state.get('cookies', [])}
+    merged_cookies.update({(cookie['name'], cookie['domain'], cookie['path']): cookie for cookie in cookies})
+    
+    origins = [entry for entry in state.get('origins', []) if entry.get('origin') != origin]
+    previous = next((entry for entry in state.get('origins', []) if entry.get('origin') == origin), {})
+    origins.append({**previous, 'origin': origin, 'localStorage': local_storage})
+    
+    path.parent.mkdir(exist_ok=True)
+    temp_path = path.with_suffix('.tmp')
+    with open(temp_path, 'w') as f:
+        json.dump({**state, 'cookies': list(merged_cookies.values()), 'origins': origins}, f, indent=2)
+    temp_path.chmod(0o600)  # Holds the logged-in session
+    temp_path.replace(path)
+
+def restore_storage_state(driver, base_url: str, path: Path = STORAGE_STATE_FILE) -> bool:
+    """Load saved cookies and localStorage into a driver sitting on ``base_url``.
+    
+    Falls back to SESSION_COOKIES when nothing has been saved yet. Returns True if a
+    saved state was used.
+    """
+    state = None
+    if path.exists():
+        try:
+            with open(path, 'r') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = None
+    
+    if not state:
+        for name, value in SESSION_COOKIES.items():
+            driver.add_cookie({'name': name, 'value': value, 'domain': '.mac.bid'})
+        return False
+    
+    for cookie in state.get('cookies', []):
+        selenium_cookie = {key: cookie[key] for key in ('name', 'value', 'domain', 'path', 'secure', 'httpOnly')
+                           if key in cookie}
+        if cookie.get('expires', -1) > 0:
+            selenium_cookie['expiry'] = int(cookie['expires'])
+        if cookie.get('sameSite') in ('Strict', 'Lax', 'None'):
+            selenium_cookie['sameSite'] = cookie['sameSite']
+        try:
+            driver.add_cookie(selenium_cookie)
+        except WebDriverException:
+            continue  # Cookie for a domain other than the one loaded
+    
+    for origin in state.get('origins', []):
+        if origin.get('origin') and base_url.startswith(origin['origin']):
+            driver.execute_script(
+                "for (const item of arguments[0]) { localStorage.setItem(item.name, item.value); }",
+                origin.get('localStorage', [])
+            )
+    return True
+
+class PooledDriver:
+    def __init__(self, driver, wait):
+        self.driver = driver
+        self.wait = wait
+        self.broken = False
+
+class ChromeDriverPool:
+    """Warm, logged-in Chrome sessions that bids are dispatched to.
+    
+    Each driver is launched once, restored from the saved storage state and left on
+    the site; ``driver()`` checks one out and returns it afterwards. A driver that
+    raises a WebDriverException during use is quit and replaced in the background.
+    """
+    
+    def __init__(self, size: int = 2, headless: bool = True, base_url: str = "https://www.mac.bid",
+                 logger: logging.Logger = None):
+        self.size = size
+        self.headless = headless
+        self.base_url = base_url
+        self.logger = logger or logging.getLogger(__name__)
+        self.idle = queue.Queue()
+        self.all_drivers: List[PooledDriver] = []
+        self.lock = threading.Lock()
+        self.closed = False
+    
+    def launch(self) -> Optional[PooledDriver]:
+        """Start one browser and restore the logged-in session into it"""
+        try:
+            driver = webdriver.Chrome(options=build_chrome_options(self.headless))
+            block_static_assets(driver)
+            
+            driver.get(self.base_url)
+            restored = restore_storage_state(driver, self.base_url)
+            driver.refresh()
+            
+            pooled = PooledDriver(driver, WebDriverWait(driver, 10))
+            with self.lock:
+                self.all_drivers.append(pooled)
+            self.logger.info(f"✅ Warm browser ready ({'saved state' if restored else 'default cookies'})")
+            return pooled
+        except Exception as e:
+            self.logger.error(f"❌ Failed to launch pooled browser: {e}")
+            return None
+    
+    def start(self) -> int:
+        """Launch the pool in parallel; returns how many drivers came up"""
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            launched = [pooled for pooled in executor.map(lambda _: self.launch(), range(self.size)) if pooled]
+        
+        for pooled in launched:
+            self.idle.put(pooled)
+        
+        # Keep the freshest session for the next start
+        if launched:
+            try:
+                save_storage_state(launched[0].driver)
+            except Exception as e:
+                self.logger.warning(f"Could not save browser storage state: {e}")
+        return len(launched)
+    
+    @contextmanager
+    def driver(self, timeout: float = 60):
+        """Check out an idle driver for the duration of the ``with`` block"""
+        pooled = self.idle.get(timeout=timeout)
+        try:
+            yield pooled
+        except WebDriverException:
+            pooled.broken = True
+            raise
+        finally:
+            if pooled.broken:
+                self.replace(pooled)
+            else:
+                self.idle.put(pooled)
+    
+    def replace(self, pooled: PooledDriver):
+        with self.lock:
+            if pooled in self.all_drivers:
+                self.all_drivers.remove(pooled)
+        try:
+            pooled.driver.quit()
+        except Exception:
+            pass
+        
+        def relaunch():
+            fresh = self.launch()
+            if fresh is None:
+                return
+            if not self.closed:
+                self.idle.put(fresh)
+                return
+            
+            # The pool closed while this browser was starting; don't leave it running
+            with self.lock:
+                if fresh in self.all_drivers:
+                    self.all_drivers.remove(fresh)
+            try:
+                fresh.driver.quit()
+            except Exception:
+                pass
+        
+        if not self.closed:
+            threading.Thread(target=relaunch, daemon=True).start()
+    
+    def close(self):
+        self.closed = True
+        with self.lock:
+            drivers, self.all_drivers = self.all_drivers, []
+        for pooled in drivers:
+            try:
+                pooled.driver.quit()
+            except Exception:
+                pass
+
 @dataclass
 class BidRequest:
     lot_id: int
@@ -47,12 +299,18 @@ class BidResult:
     screenshot_path: Optional[str] = None
 
 class BrowserBiddingAutomation:
-    def __init__(self, headless: bool = False, dry_run: bool = True):
+    def __init__(self, headless: bool = False, dry_run: bool = True, pool_size: Optional[int] = None):
         self.headless = headless
         self.dry_run = dry_run
+        self.local = threading.local()  # Each worker thread drives its own browser
         self.driver = None
         self.wait = None
         self.is_logged_in = False
+        # 0 keeps the single-browser session flow; by default only headless runs get a
+        # pool, so a visible run opens one window rather than one per pooled driver
+        self.pool_size = pool_size if pool_size is not None else (2 if headless else 0)
+        self.driver_pool: Optional[ChromeDriverPool] = None
+        self.bid_spacing = 2  # Seconds a driver rests after a bid to avoid rate limiting
         
         # Setup logging
         logging.basicConfig(
@@ -78,6 +336,22 @@ class BrowserBiddingAutomation:
             'total_amount_bid': 0.0,
             'session_start': datetime.now().isoformat()
         }
+    
+    @property
+    def driver(self):
+        return getattr(self.local, 'driver', None)
+    
+    @driver.setter
+    def driver(self, value):
+        self.local.driver = value
+    
+    @property
+    def wait(self):
+        return getattr(self.local, 'wait', None)
+    
+    @wait.setter
+    def wait(self, value):
+        self.local.wait = value
         
     def initialize_browser(self) -> bool:
         """Initialize Chrome browser with appropriate settings"""
@@ -87,24 +361,8 @@ class BrowserBiddingAutomation:
             return False
         
         try:
-            chrome_options = Options()
-            
-            if self.headless:
-                chrome_options.add_argument("--headless")
-            
-            # Optimize for automation
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--window-size=1920,1080")
-            
-            # User agent to match our working system
-            chrome_options.add_argument("--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Safari/537.36")
-            
-            # Disable images for faster loading (optional)
-            # chrome_options.add_argument("--disable-images")
-            
-            self.driver = webdriver.Chrome(options=chrome_options)
+            self.driver = webdriver.Chrome(options=build_chrome_options(self.headless))
+            block_static_assets(self.driver)
             self.wait = WebDriverWait(self.driver, 10)
             
             self.logger.info("✅ Browser initialized successfully")
@@ -124,23 +382,8 @@ class BrowserBiddingAutomation:
             self.driver.get(self.base_url)
             time.sleep(3)
             
-            # Add our session cookies
-            cookies = {
-                '__stripe_mid': 'b1219cc5-9a1f-4e9b-9b3b-ce16a3d90ba32b7fa4',
-                'CookieConsent': 'true',
-                'ab.storage.deviceId.ce8b7722-883a-498b-90ff-0aef9d0f0e62': 'g%3A6557c69b-3239-8d82-7b30-ec5862a4de57%7Ce%3Aundefined%7Cc%3A1747345668914%7Cl%3A1749267987617',
-                'ab.storage.userId.ce8b7722-883a-498b-90ff-0aef9d0f0e62': 'g%3A2710619%7Ce%3Aundefined%7Cc%3A1749188938629%7Cl%3A1749267987617',
-                '__stripe_sid': '82edccd6-9b05-4a36-a118-e155bd9212b7ec69fb',
-                'mp_78faade7af6b4f2ee5e1af36d8ac6232_mixpanel': '%7B%22distinct_id%22%3A%202710619%2C%22%24device_id%22%3A%20%22196d5eae0323e9-06ed80c653d2808-19525636-13c680-196d5eae0323e9%22%2C%22%24initial_referrer%22%3A%20%22%24direct%22%2C%22%24initial_referring_domain%22%3A%20%22%24direct%22%2C%22__mps%22%3A%20%7B%7D%2C%22__mpso%22%3A%20%7B%7D%2C%22__mpus%22%3A%20%7B%7D%2C%22__mpa%22%3A%20%7B%7D%2C%22__mpu%22%3A%20%7B%7D%2C%22__mpr%22%3A%20%5B%5D%2C%22__mpap%22%3A%20%5B%5D%2C%22platform%22%3A%20%22website%22%2C%22selected_locations%22%3A%20%5B%0A%20%20%20%20%22Rock%20Hill%22%2C%0A%20%20%20%20%22Gastonia%22%0A%5D%2C%22%24user_id%22%3A%202710619%2C%22active_items%22%3A%20%5B%0A%20%20%20%20%7B%22id%22%3A%2046608657%2C%22invoice_id%22%3A%2018714030%2C%22box_size%22%3A%20%22large%22%2C%22warehouse_location%22%3A%20%22ANL-D-BIN-55%22%2C%22removal_container%22%3A%20null%2C%22product_name%22%3A%20%22KOKISO%20metal%20%22%2C%22status%22%3A%20%22PENDING-TRANSFER%22%2C%22boxes%22%3A%201%2C%22note%22%3A%20null%2C%22current_location_id%22%3A%2038%2C%22allow_transfers%22%3A%201%2C%22allow_shipping%22%3A%200%2C%22is_turbo%22%3A%200%2C%22free_transfers%22%3A%200%2C%22auction_number%22%3A%20%22ANL2506-05-A2%22%2C%22auction_abandon_date%22%3A%20%222025-06-10T18%3A00%3A00.000Z%22%2C%22abandon_date%22%3A%20null%2C%22lot_number%22%3A%20%221726Z%22%2C%22lot_id%22%3A%2035490378%2C%22has_buyer_assurance%22%3A%200%2C%22item_price%22%3A%205.67%2C%22cover_image%22%3A%20%22https%3A%2F%2Fm.media-amazon.com%2Fimages%2FI%2F71fm%2BEdRyKL.jpg%22%2C%22grand_total%22%3A%205.67%2C%22date_paid%22%3A%20%222025-06-06T09%3A20%3A50.000Z%22%2C%22transfer_id%22%3A%206229971%2C%22start_location_code%22%3A%20%22ANL%22%2C%22dest_location_code%22%3A%20%22RHA%22%2C%22start_location_id%22%3A%2038%2C%22dest_location_id%22%3A%2028%2C%22grouping_id%22%3A%20%2218714030_200_35872237%22%2C%22auction_lot_deadline%22%3A%20null%7D%0A%5D%2C%22mac_bucks_balance%22%3A%200%2C%22mac_bucks_gift_balance%22%3A%200%2C%22active_membership%22%3A%20%7B%22id%22%3A%20123339%2C%22date_created%22%3A%20%222025-05-29T18%3A11%3A59.000Z%22%2C%22membership_plan%22%3A%20%22STANDARD%22%2C%22customer_id%22%3A%202710619%2C%22bill_period%22%3A%20%22MONTHLY%22%2C%22bill_amount%22%3A%209.99%2C%22date_cancelled%22%3A%20null%2C%22external_id%22%3A%20%22sub_1RUFc8DhtPPAHVyel4iCCWV7%22%2C%22cancel_reason%22%3A%20null%2C%22stripe_customer_id%22%3A%20%22cus_S6Y0gK006usyW7%22%2C%22date_updated%22%3A%20null%7D%2C%22watchlist_count%22%3A%207%2C%22onboarding%22%3A%20true%7D',
-                'ab.storage.sessionId.ce8b7722-883a-498b-90ff-0aef9d0f0e62': 'g%3Aa18c4004-ac5d-06ae-84af-39127b94f2a6%7Ce%3A1749269831396%7Cc%3A1749267987616%7Cl%3A1749268031396'
-            }
-            
-            for name, value in cookies.items():
-                self.driver.add_cookie({
-                    'name': name,
-                    'value': value,
-                    'domain': '.mac.bid'
-                })
+            # Restore the saved session (falls back to our session cookies)
+            restore_storage_state(self.driver, self.base_url)
             
             # Refresh to apply cookies
             self.driver.refresh()
@@ -495,11 +738,98 @@ class BrowserBiddingAutomation:
                 error=str(e)
             )
     
+    def start_driver_pool(self) -> bool:
+        """Launch the warm browser pool once; later sessions reuse it"""
+        if self.driver_pool is not None:
+            return True
+        
+        if not SELENIUM_AVAILABLE:
+            self.logger.error("Selenium not available. Cannot start browser pool.")
+            return False
+        
+        self.driver_pool = ChromeDriverPool(self.pool_size, self.headless, self.base_url, self.logger)
+        started = self.driver_pool.start()
+        if not started:
+            self.driver_pool.close()
+            self.driver_pool = None
+            return False
+        
+        self.is_logged_in = True
+        self.logger.info(f"🌐 Browser pool ready: {started} logged-in browsers")
+        return True
+    
+    def dispatch_bid(self, bid_request: BidRequest) -> BidResult:
+        """Place a bid on the next idle pooled browser.
+        
+        Always returns a BidResult, so one stuck bid can't discard the rest of the
+        session's results.
+        """
+        try:
+            with self.driver_pool.driver() as pooled:
+                self.driver, self.wait = pooled.driver, pooled.wait
+                try:
+                    result = self.place_bid(bid_request)
+                    
+                    # place_bid reports errors as results; check the browser survived
+                    if not result.success:
+                        try:
+                            pooled.driver.current_url
+                        except WebDriverException:
+                            pooled.broken = True
+                    
+                    # Let this browser rest before its next bid to avoid rate limiting
+                    time.sleep(self.bid_spacing)
+                finally:
+                    self.driver = None
+                    self.wait = None
+        except queue.Empty:
+            return BidResult(
+                success=False,
+                lot_id=bid_request.lot_id,
+                bid_amount=bid_request.bid_amount,
+                timestamp=datetime.now().isoformat(),
+                message="No pooled browser became free in time",
+                error="Browser pool exhausted"
+            )
+        except WebDriverException as e:
+            # The broken driver has already been handed back for replacement
+            return BidResult(
+                success=False,
+                lot_id=bid_request.lot_id,
+                bid_amount=bid_request.bid_amount,
+                timestamp=datetime.now().isoformat(),
+                message="Browser failed while bidding",
+                error=str(e)
+            )
+        
+        return result
+    
     def execute_bidding_session(self, bid_requests: List[BidRequest]) -> List[BidResult]:
-        """Execute multiple bids in a session"""
+        """Execute multiple bids in a session
+        
+        With a driver pool, bids run concurrently on already logged-in browsers;
+        with ``pool_size=0`` a single browser is launched and bids run in order.
+        """
         
         self.logger.info(f"🎯 Starting bidding session with {len(bid_requests)} bids")
         
+        if self.pool_size > 0:
+            if not self.start_driver_pool():
+                return []
+            
+            with ThreadPoolExecutor(max_workers=self.driver_pool.size) as executor:
+                results = list(executor.map(self.dispatch_bid, bid_requests))
+            
+            for result in results:
+                self.bid_history.append(result)
+                if result.success:
+                    self.logger.info(f"✅ Bid successful: ${result.bid_amount} on lot {result.lot_id}")
+                else:
+                    self.logger.error(f"❌ Bid failed: {result.message}")
+            
+            self.generate_session_report(results)
+            return results
+        
         if not self.initialize_browser():
             return []
         
@@ -573,6 +903,10 @@ class BrowserBiddingAutomation:
     
     def cleanup(self):
         """Clean up browser resources"""
+        if self.driver_pool:
+            self.driver_pool.close()
+            self.driver_pool = None
+            self.logger.info("🧹 Browser pool closed")
         if self.driver:
             self.driver.quit()
             self.logger.info("🧹 Browser cleanup complete")
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+🔕 Alert Throttle - Shared in-memory dedup cache for repeated alerts
+Answers "was this alert sent recently?" from memory and checkpoints the send times to
+SQLite in batches so throttling state survives restarts
+"""
+
+import os
+import time
+import atexit
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+# Matches SQLite's CURRENT_TIMESTAMP, which earlier versions wrote directly
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+def to_timestamp(epoch: float) -> str:
+    """UTC timestamp string for a send time."""
+    return datetime.fromtimestamp(epoch, timezone.utc).strftime(TIMESTAMP_FORMAT)
+
+def from_timestamp(value: str) -> Optional[float]:
+    """Epoch seconds for a stored UTC timestamp, or None if unparseable."""
+    try:
+        parsed = datetime.fromisoformat(str(value).replace('Z', ''))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+class AlertThrottle:
+    """TTL dedup keyed by an alert hash.
+
+    ``should_throttle`` only touches memory. Changed keys are written back to the
+    ``alert_throttling`` table every ``checkpoint_interval`` seconds or
+    ``checkpoint_every`` changes, whichever comes first, and once more at exit.
+    Entries older than ``retention`` seconds are dropped from memory on checkpoint.
+    """
+
+    def __init__(self, db_path: str, table: str = "alert_throttling",
+                 checkpoint_interval: float = 60.0, checkpoint_every: int = 100,
+                 retention: float = 86400.0):
+        self.db_path = db_path
+        self.table = table
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoint_every = checkpoint_every
+        self.retention = retention
+
+        self.entries: Dict[str, List] = {}  # alert_hash -> [last_sent, send_count]
+        self.dirty = set()
+        self.last_checkpoint = time.monotonic()
+        self.stats = {'checked': 0, 'throttled': 0, 'checkpoints': 0}
+        self.lock = threading.Lock()
+
+        self.init_database()
+        self.load()
+        atexit.register(self.checkpoint)
+
+    def init_database(self):
+        """Create the throttle table (same layout the notification system always used)."""
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+
+        conn = sqlite3.connect(self.db_path)
+        conn.execute(f'''
+            CREATE TABLE IF NOT EXISTS {self.table} (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                alert_hash TEXT UNIQUE,
+                last_sent TIMESTAMP,
+                send_count INTEGER DEFAULT 1
+            )
+        ''')
+        conn.commit()
+        conn.close()
+
+    def load(self):
+        """Warm the cache with every entry still inside the retention window."""
+        cutoff = to_timestamp(time.time() - self.retention)
+
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute(f'''
+            SELECT alert_hash, last_sent, send_count FROM {self.table}
+            WHERE last_sent >= ?
+        ''', (cutoff,))
+        rows = cursor.fetchall()
+        conn.close()
+
+        for alert_hash, last_sent, send_count in rows:
+            sent_at = from_timestamp(last_sent)
+            if sent_at is not None:
+                self.entries[alert_hash] = [sent_at, send_count or 1]
+
+    def should_throttle(self, alert_hash: str, min_interval: float) -> bool:
+        """True if ``alert_hash`` was sent within ``min_interval`` seconds.
+
+        Otherwise the alert is recorded as sent now and False is returned.
+        """
+        now = time.time()
+
+        with self.lock:
+            self.stats['checked'] += 1
+            entry = self.entries.get(alert_hash)
+
+            if entry and now - entry[0] < min_interval:
+                self.stats['throttled'] += 1
+                return True
+
+            if entry:
+                entry[0] = now
+                entry[1] += 1
+            else:
+                self.entries[alert_hash] = [now, 1]
+            self.dirty.add(alert_hash)
+
+            due = (len(self.dirty) >= self.checkpoint_every or
+                   time.monotonic() - self.last_checkpoint >= self.checkpoint_interval)
+
+        if due:
+            self.checkpoint()
+        return False
+
+    def filter_alerts(self, alerts: List[Dict], key_fields: Tuple[str, ...],
+                      min_interval: float) -> List[Dict]:
+        """Alerts whose ``key_fields`` combination wasn't sent within ``min_interval``."""
+        return [alert for alert in alerts
+                if not self.should_throttle('_'.join(str(alert.get(field, 'unknown'))
+                                                     for field in key_fields), min_interval)]
+
+    def checkpoint(self):
+        """Write changed entries to SQLite and evict expired ones from memory."""
+        with self.lock:
+            rows = [(alert_hash, to_timestamp(self.entries[alert_hash][0]), self.entries[alert_hash][1])
+                    for alert_hash in self.dirty if alert_hash in self.entries]
+            self.dirty = set()
+            self.last_checkpoint = time.monotonic()
+
+            cutoff = time.time() - self.retention
+            for alert_hash in [key for key, entry in self.entries.items() if entry[0] < cutoff]:
+                del self.entries[alert_hash]
+
+        if not rows:
+            return
+
+        try:
+            conn = sqlite3.connect(self.db_path)
+            conn.executemany(f'''
+                INSERT INTO {self.table} (alert_hash, last_sent, send_count)
+                VALUES (?, ?, ?)
+                ON CONFLICT (alert_hash) DO UPDATE SET
+                    last_sent = excluded.last_sent,
+                    send_count = excluded.send_count
+            ''', rows)
+            conn.commit()
+            conn.close()
+            self.stats['checkpoints'] += 1
+        except sqlite3.Error as e:
+            print(f"⚠️ Could not checkpoint alert throttle to {self.db_path}: {e}")
+            with self.lock:
+                self.dirty.update(row[0] for row in rows)
+
+_throttles: Dict[Tuple[str, str], AlertThrottle] = {}
+
+def get_alert_throttle(db_path: str, table: str = "alert_throttling") -> AlertThrottle:
+    """Process-wide throttle per database/table, shared by every instance using it."""
+    key = (os.path.abspath(db_path), table)
+    if key not in _throttles:
+        _throttles[key] = AlertThrottle(db_path, table)
+    return _throttles[key]
@@ -7,12 +7,28 @@ Centralized authentication system that all scripts must use before starting oper
 import os
 import json
 import time
+import base64
+import hashlib
 import logging
+import weakref
 import aiohttp
 import asyncio
+import requests
+from requests.adapters import HTTPAdapter
 from typing import Dict, Optional, Tuple
 from pathlib import Path
 
+def decode_jwt_expiry(token: Optional[str]) -> Optional[float]:
+    """Expiry (epoch seconds) from a JWT's ``exp`` claim, without verifying the signature"""
+    if not token:
+        return None
+    try:
+        payload = token.split()[-1].split('.')[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+        return float(claims['exp'])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
 class MacBidAuthenticationManager:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
@@ -28,10 +44,22 @@ class MacBidAuthenticationManager:
         self.auth_timestamp = None
         self.auth_expiry = None
         
+        # Verification cache: the token is checked against the API at most once per TTL,
+        # and not at all while its JWT expiry is further away than the TTL
+        self.verify_ttl = 15 * 60
+        self.verified_at = None  # epoch seconds of the last successful check
+        self.credentials_mtimes = None
+        
+        # Shared connection pools; sessions handed to subsystems borrow these
+        self.aiohttp_connectors = {}  # (event loop, verify_ssl) -> TCPConnector
+        self.requests_adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+        self.issued_sessions = weakref.WeakSet()
+        
         # File paths
         self.credentials_dir = Path.home() / ".macbid_scraper"
         self.tokens_file = self.credentials_dir / "api_tokens.json"
         self.session_file = self.credentials_dir / "authenticated_session.json"
+        self.verification_file = self.credentials_dir / "auth_verification.json"
         
         # Ensure credentials directory exists
         self.credentials_dir.mkdir(exist_ok=True)
@@ -50,9 +78,20 @@ class MacBidAuthenticationManager:
             'Pragma': 'no-cache'
         }
     
+    def get_credentials_mtimes(self) -> Tuple:
+        return tuple(path.stat().st_mtime if path.exists() else None
+                     for path in (self.tokens_file, self.session_file))
+    
+    def credentials_changed(self) -> bool:
+        """True if the credential files were written since they were last loaded"""
+        return self.credentials_mtimes != self.get_credentials_mtimes()
+    
     def load_stored_credentials(self) -> bool:
         """Load stored authentication credentials"""
         try:
+            self.credentials_mtimes = self.get_credentials_mtimes()
+            previous_token = self.jwt_token
+            
             # Try to load JWT token
             if self.tokens_file.exists():
                 with open(self.tokens_file, 'r') as f:
@@ -79,10 +118,15 @@ class MacBidAuthenticationManager:
                     
                     self.logger.info(f"✅ Loaded {len(self.session_cookies)} session cookies")
             
+            # A replaced token has not been verified yet
+            if self.jwt_token != previous_token:
+                self.verified_at = None
+            
             # Check if we have minimum required auth
             if self.jwt_token and self.customer_id:
                 self.is_authenticated = True
                 self.auth_timestamp = time.time()
+                self.auth_expiry = decode_jwt_expiry(self.jwt_token)
                 self.logger.info("✅ Authentication credentials loaded successfully")
                 return True
             else:
@@ -110,23 +154,73 @@ class MacBidAuthenticationManager:
             headers['Cookie'] = cookie_string
         
         self.auth_headers = headers
+        self.refresh_session_headers()
         return headers
     
+    def credential_headers(self) -> Dict[str, str]:
+        """The headers that carry credentials, which always override subsystem defaults"""
+        return {key: value for key, value in self.auth_headers.items() if key in ('authorization', 'Cookie')}
+    
+    def token_fingerprint(self) -> str:
+        return hashlib.sha256((self.jwt_token or '').encode()).hexdigest()[:16]
+    
+    def load_verification(self):
+        """Pick up a recent verification of this same token from an earlier process"""
+        try:
+            with open(self.verification_file, 'r') as f:
+                record = json.load(f)
+            if record.get('token') == self.token_fingerprint():
+                self.verified_at = record.get('verified_at')
+        except (OSError, ValueError):
+            pass
+    
+    def record_verification(self):
+        self.verified_at = time.time()
+        try:
+            with open(self.verification_file, 'w') as f:
+                json.dump({'token': self.token_fingerprint(), 'verified_at': self.verified_at}, f)
+        except OSError as e:
+            self.logger.debug(f"Could not record authentication check: {e}")
+    
+    def verification_fresh(self) -> bool:
+        return self.verified_at is not None and time.time() - self.verified_at < self.verify_ttl
+    
     async def verify_authentication(self) -> bool:
-        """Verify that authentication is working"""
+        """Verify that authentication is working
+        
+        An expired JWT fails without a request. A JWT that stays valid beyond the
+        verification TTL, or a token checked within the TTL (by any process), passes
+        without one. Otherwise the customer endpoint is queried.
+        """
         if not self.is_authenticated:
             return False
         
+        if self.auth_expiry is not None:
+            remaining = self.auth_expiry - time.time()
+            if remaining <= 0:
+                self.logger.error("❌ Authentication failed: JWT token has expired")
+                self.is_authenticated = False
+                return False
+            if remaining > self.verify_ttl:
+                self.logger.info(f"✅ JWT token valid for another {remaining / 3600:.1f} hours")
+                return True
+        
+        if self.verified_at is None:
+            self.load_verification()
+        if self.verification_fresh():
+            self.logger.info("✅ Authentication verified recently, skipping check")
+            return True
+        
         try:
             # Test authentication with a simple API call
-            async with aiohttp.ClientSession() as session:
+            async with self.aiohttp_session() as session:
                 # Try to access customer-specific endpoint
                 test_url = f"https://api.macdiscount.com/auctions/customer/{self.customer_id}/active-auctions"
                 
-                async with session.get(test_url, headers=self.auth_headers, timeout=10) as response:
+                async with session.get(test_url, timeout=aiohttp.ClientTimeout(total=10)) as response:
                     if response.status == 200:
-                        data = await response.json()
                         self.logger.info("✅ Authentication verified successfully")
+                        self.record_verification()
                         return True
                     elif response.status == 401:
                         self.logger.error("❌ Authentication failed: Invalid credentials")
@@ -140,8 +234,65 @@ class MacBidAuthenticationManager:
             self.logger.error(f"❌ Error verifying authentication: {e}")
             return False
     
+    def aiohttp_session(self, headers: Dict[str, str] = None, verify_ssl: bool = True,
+                        authenticated: bool = True, **kwargs) -> aiohttp.ClientSession:
+        """New aiohttp session with auth headers and cookies, on the shared connection pool
+        
+        ``headers`` are the caller's defaults; credential headers are applied over them.
+        With ``authenticated=False`` the session only shares the pool and carries the
+        caller's headers, for third-party hosts that must never see Mac.bid credentials.
+        Closing the session leaves the pool open for the rest of the process. Must be
+        called with an event loop running.
+        """
+        loop = asyncio.get_running_loop()
+        key = (loop, verify_ssl)
+        connector = self.aiohttp_connectors.get(key)
+        if connector is None or connector.closed:
+            connector = aiohttp.TCPConnector(limit=50, ssl=None if verify_ssl else False)
+            self.aiohttp_connectors[key] = connector
+        
+        if not authenticated:
+            return aiohttp.ClientSession(connector=connector, connector_owner=False,
+                                         headers=headers, **kwargs)
+        
+        session = aiohttp.ClientSession(
+            connector=connector,
+            connector_owner=False,
+            headers={**self.auth_headers, **(headers or {}), **self.credential_headers()},
+            **kwargs
+        )
+        self.issued_sessions.add(session)
+        return session
+    
+    def requests_session(self, headers: Dict[str, str] = None) -> requests.Session:
+        """New requests session with auth headers and cookies, on the shared connection pool"""
+        session = requests.Session()
+        session.mount('https://', self.requests_adapter)
+        session.mount('http://', self.requests_adapter)
+        session.headers.update({**self.auth_headers, **(headers or {}), **self.credential_headers()})
+        self.issued_sessions.add(session)
+        return session
+    
+    def refresh_session_headers(self):
+        """Push changed credentials into every session already handed out"""
+        for session in list(self.issued_sessions):
+            if not getattr(session, 'closed', False):
+                session.headers.update(self.credential_headers())
+    
+    async def close_sessions(self):
+        """Close the shared aiohttp pools that belong to the running event loop"""
+        loop = asyncio.get_running_loop()
+        for key in [key for key in self.aiohttp_connectors if key[0] is loop]:
+            await self.aiohttp_connectors.pop(key).close()
+    
     async def ensure_authentication(self) -> bool:
         """Ensure authentication is valid before proceeding"""
+        # Already loaded and checked in this process, and nothing on disk changed
+        if self.is_authenticated and not self.credentials_changed() and (
+                self.verification_fresh() or
+                (self.auth_expiry is not None and self.auth_expiry - time.time() > self.verify_ttl)):
+            return True
+        
         self.logger.info("🔐 AUTHENTICATION MANAGER")
         self.logger.info("=" * 40)
         
@@ -198,6 +349,8 @@ class MacBidAuthenticationManager:
                 with open(self.tokens_file, 'w') as f:
                     json.dump(token_data, f, indent=2)
                 
+                self.auth_expiry = decode_jwt_expiry(jwt_token)
+                self.verified_at = None
                 self.logger.info(f"✅ JWT token saved to {self.tokens_file}")
             
             # Save session cookies
@@ -220,12 +373,20 @@ class MacBidAuthenticationManager:
                     json.dump(session_data, f, indent=2)
                 
                 self.logger.info(f"✅ Session cookies saved to {self.session_file}")
+            
+            # Sessions already handed out pick up the new credentials
+            if jwt_token or cookies:
+                self.setup_authenticated_headers()
+                self.credentials_mtimes = self.get_credentials_mtimes()
                 
         except Exception as e:
             self.logger.error(f"❌ Error saving credentials: {e}")
     
     def is_auth_expired(self) -> bool:
         """Check if authentication has expired"""
+        if self.auth_expiry is not None:
+            return time.time() >= self.auth_expiry
+        
         if not self.auth_timestamp:
             return True
         
@@ -241,6 +402,8 @@ class MacBidAuthenticationManager:
             'has_session_cookies': bool(self.session_cookies),
             'auth_timestamp': self.auth_timestamp,
             'is_expired': self.is_auth_expired(),
+            'token_expiry': self.auth_expiry,
+            'last_verified': self.verified_at,
             'headers_configured': bool(self.auth_headers)
         }
 
@@ -264,6 +427,21 @@ def get_authenticated_headers() -> Dict[str, str]:
     
     return auth_manager.auth_headers
 
+def get_authenticated_session(headers: Dict[str, str] = None, verify_ssl: bool = True,
+                              **kwargs) -> aiohttp.ClientSession:
+    """Get a pooled aiohttp session with authentication already applied"""
+    if not auth_manager.is_authenticated:
+        raise Exception("❌ Not authenticated. Call require_authentication() first.")
+    
+    return auth_manager.aiohttp_session(headers, verify_ssl, **kwargs)
+
+def get_authenticated_requests_session(headers: Dict[str, str] = None) -> requests.Session:
+    """Get a pooled requests session with authentication already applied"""
+    if not auth_manager.is_authenticated:
+        raise Exception("❌ Not authenticated. Call require_authentication() first.")
+    
+    return auth_manager.requests_session(headers)
+
 def get_customer_id() -> str:
     """Get the authenticated customer ID"""
     if not auth_manager.is_authenticated:
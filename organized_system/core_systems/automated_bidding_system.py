@@ -22,6 +22,7 @@ import sys
 sys.path.append('.')
 from ml_prediction.predictive_pricing_model import PredictivePricingModel
 from core_systems.realtime_auction_monitor import RealTimeAuctionMonitor
+from core_systems.snipe_scheduler import SnipeScheduler, parse_close_time
 
 class AutomatedBiddingSystem:
     def __init__(self):
@@ -44,6 +45,7 @@ class AutomatedBiddingSystem:
         self.optimal_bid_window = 300  # 5 minutes before close
         self.last_minute_window = 60   # 1 minute before close
         self.bid_check_interval = 30   # Check every 30 seconds
+        self.snipe_offset = 3          # Aggressive bids fire 3 seconds before close
         
         # Authentication for bidding
         self.session_headers = {
@@ -77,6 +79,8 @@ class AutomatedBiddingSystem:
         self.bid_queue = queue.PriorityQueue()
         self.is_bidding_active = False
         self.bidding_thread = None
+        self.snipe_scheduler = None
+        self.scheduled_snipes = {}  # lot_id -> future of the scheduled bid
         
         # Safety features
         self.dry_run_mode = True  # Start in dry run mode for safety
@@ -452,6 +456,9 @@ class AutomatedBiddingSystem:
                     self.logger.warning("Emergency stop activated - halting bidding")
                     break
                 
+                if target['lot_id'] in self.scheduled_snipes:
+                    continue  # Already timed to fire at close
+                
                 # Get current lot data
                 lot_data = await self.auction_monitor.fetch_lot_data(
                     session, target['auction_id'], target['lot_id']
@@ -474,6 +481,10 @@ class AutomatedBiddingSystem:
                     lot_data, current_bid, target['max_bid_amount']
                 )
                 
+                # Aggressive bids wait for the close instead of bidding this round
+                if target['strategy_type'] == 'AGGRESSIVE' and await self.schedule_snipe(lot_data, target, bid_amount):
+                    continue
+                
                 # Place bid
                 result = await self.place_bid(session, lot_data, bid_amount)
                 
@@ -485,6 +496,66 @@ class AutomatedBiddingSystem:
                 # Rate limiting
                 await asyncio.sleep(1)
     
+    async def schedule_snipe(self, lot_data: Dict, target: Dict, bid_amount: float) -> bool:
+        """Time a bid to land ``snipe_offset`` seconds before close; False if it can't be"""
+        close_time = parse_close_time(lot_data.get('expected_close_date'))
+        if close_time is None:
+            return False
+        
+        if self.snipe_scheduler is None:
+            self.snipe_scheduler = SnipeScheduler(
+                headers=self.session_headers,
+                cookies=self.session_cookies,
+                warm_url=None if self.dry_run_mode else "https://www.mac.bid/"
+            )
+        await self.snipe_scheduler.start()
+        
+        fire_time = close_time - self.snipe_offset
+        if fire_time <= self.snipe_scheduler.clock.server_now():
+            return False  # Too close to the end to schedule; bid now
+        
+        async def fire():
+            if self.emergency_stop or not self.is_bidding_active:
+                return {'success': False, 'message': 'Bidding stopped before snipe fired'}
+            
+            # The lot has moved on since scheduling - bid on its state at close, not then
+            session = self.snipe_scheduler.session
+            fresh_lot = await self.auction_monitor.fetch_lot_data(
+                session, target['auction_id'], target['lot_id']
+            )
+            if not fresh_lot:
+                return {'success': False, 'message': 'Could not refresh lot data before snipe'}
+            
+            should_bid, reason = self.should_place_bid(fresh_lot, target)
+            if not should_bid:
+                return {'success': False, 'message': f"Snipe skipped: {reason}"}
+            
+            fresh_amount = self.calculate_optimal_bid_amount(
+                fresh_lot, fresh_lot.get('winning_bid_amount', 0), target['max_bid_amount']
+            )
+            return await self.place_bid(session, fresh_lot, fresh_amount)
+        
+        lot_id = target['lot_id']
+        future = self.snipe_scheduler.schedule(fire_time, fire, label=target['lot_number'])
+        future.add_done_callback(lambda done: self.finish_snipe(lot_id, target['lot_number'], done))
+        self.scheduled_snipes[lot_id] = future
+        
+        self.logger.info(f"⏱️ Snipe scheduled on {target['lot_number']} {self.snipe_offset}s before close "
+                         f"({lot_data.get('expected_close_date')}), currently ${bid_amount:.2f}")
+        return True
+    
+    def finish_snipe(self, lot_id: int, lot_number: str, future: asyncio.Future):
+        self.scheduled_snipes.pop(lot_id, None)
+        
+        if future.cancelled():
+            self.logger.info(f"⏹️ Snipe cancelled: {lot_number}")
+        elif future.exception() is not None:
+            self.logger.error(f"❌ Snipe error on {lot_number}: {future.exception()}")
+        elif future.result().get('success'):
+            self.logger.info(f"✅ Snipe placed: ${future.result().get('bid_amount', 0):.2f} on {lot_number}")
+        else:
+            self.logger.warning(f"❌ Snipe failed: {lot_number} - {future.result().get('message')}")
+    
     async def bidding_loop(self):
         """Main automated bidding loop"""
         session_id = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -498,6 +569,19 @@ class AutomatedBiddingSystem:
             except Exception as e:
                 self.logger.error(f"Error in bidding loop: {e}")
                 await asyncio.sleep(5)  # Short delay before retry
+        
+        await self.close_snipe_scheduler()
+    
+    async def close_snipe_scheduler(self):
+        """Cancel pending snipes and close the scheduler's timer wheel and keep-alive session"""
+        for future in list(self.scheduled_snipes.values()):
+            future.timer.cancel()
+            future.cancel()
+        self.scheduled_snipes.clear()
+        
+        if self.snipe_scheduler is not None:
+            await self.snipe_scheduler.close()
+            self.snipe_scheduler = None
     
     def start_automated_bidding(self):
         """Start automated bidding system"""
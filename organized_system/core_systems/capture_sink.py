@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Capture Sink - Bounded network capture for browser automation
+Filters intercepted traffic by URL pattern before anything is copied, keeps only the most
+recent records in a ring buffer and streams every record to gzip-compressed NDJSON
+"""
+
+import gzip
+import json
+import time
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+class CaptureSink:
+    """Ring buffer of captured request records backed by a compressed NDJSON stream.
+
+    A record stays *pending* while it waits for its response; it is written out when
+    ``complete`` is called, when it is evicted from the ring, or on ``close``. Memory use
+    is bounded by ``capacity`` records of at most ``max_body_chars`` of body each, no
+    matter how long the capture runs. Bodies stored under ``full_fields`` are written to
+    the stream uncut and only clipped in the ring once written, so just the pending
+    records hold full bodies.
+    """
+
+    def __init__(self, output_path=None, url_patterns: Optional[Iterable[str]] = None,
+                 capacity: int = 500, max_body_chars: int = 1000, full_fields: Iterable[str] = ()):
+        self.output_path = Path(output_path) if output_path else None
+        self.url_patterns = [pattern.lower() for pattern in url_patterns] if url_patterns else []
+        self.capacity = capacity
+        self.max_body_chars = max_body_chars
+        self.full_fields = list(full_fields)
+        self.ring = deque()
+        self.pending = {}  # url -> pending records awaiting a response, oldest first
+        self.stream = None
+        self.stats = {
+            'seen': 0,
+            'filtered': 0,
+            'captured': 0,
+            'evicted': 0,
+            'written': 0
+        }
+
+    def wants(self, url: str) -> bool:
+        """Cheap URL check to run before copying headers or bodies"""
+        self.stats['seen'] += 1
+        if not self.url_patterns:
+            return True
+        lowered = url.lower()
+        if any(pattern in lowered for pattern in self.url_patterns):
+            return True
+        self.stats['filtered'] += 1
+        return False
+
+    def trim_body(self, body) -> Optional[str]:
+        """Clip a response or post body to the configured excerpt length"""
+        if body is None:
+            return None
+        if isinstance(body, bytes):
+            body = body[:self.max_body_chars * 4].decode('utf-8', errors='replace')
+        return body[:self.max_body_chars]
+
+    def add(self, record: Dict, pending: bool = True) -> Dict:
+        """Store a record; pending records can later be matched to their response"""
+        if len(self.ring) >= self.capacity:
+            self._evict()
+
+        record['_written'] = False
+        self.ring.append(record)
+        self.stats['captured'] += 1
+
+        if pending and record.get('url'):
+            self.pending.setdefault(record['url'], deque()).append(record)
+        else:
+            self._write(record)
+        return record
+
+    def take_pending(self, url: str, **fields) -> Optional[Dict]:
+        """Oldest record for ``url`` still awaiting a response and matching ``fields``"""
+        waiting = self.pending.get(url)
+        if not waiting:
+            return None
+
+        for record in waiting:
+            if all(record.get(key) == value for key, value in fields.items()):
+                waiting.remove(record)
+                if not waiting:
+                    del self.pending[url]
+                return record
+        return None
+
+    def complete(self, record: Dict):
+        """Write a record whose response has been attached"""
+        self._drop_pending(record)
+        self._write(record)
+
+    def records(self, limit: Optional[int] = None) -> List[Dict]:
+        """Most recent records, oldest first, without internal bookkeeping keys"""
+        selected = list(self.ring)[-limit:] if limit else list(self.ring)
+        return [{key: value for key, value in record.items() if key != '_written'} for record in selected]
+
+    def flush(self):
+        """Write every pending record without waiting for its response"""
+        for waiting in list(self.pending.values()):
+            for record in list(waiting):
+                self._write(record)
+        self.pending.clear()
+        if self.stream:
+            self.stream.flush()
+
+    def close(self):
+        """Flush pending records and finish the compressed stream"""
+        self.flush()
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+    def summary(self) -> Dict:
+        return {
+            **self.stats,
+            'buffered': len(self.ring),
+            'pending': sum(len(waiting) for waiting in self.pending.values()),
+            'output_file': str(self.output_path) if self.output_path else None
+        }
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self.ring)
+
+    def __len__(self) -> int:
+        return len(self.ring)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _evict(self):
+        record = self.ring.popleft()
+        self.stats['evicted'] += 1
+        if not record['_written']:
+            self._drop_pending(record)
+            self._write(record)
+
+    def _drop_pending(self, record: Dict):
+        waiting = self.pending.get(record.get('url'))
+        if waiting is None:
+            return
+        try:
+            waiting.remove(record)
+        except ValueError:
+            return
+        if not waiting:
+            del self.pending[record['url']]
+
+    def _write(self, record: Dict):
+        if record['_written']:
+            return
+        record['_written'] = True
+        if self.output_path:
+            if self.stream is None:
+                self.output_path.parent.mkdir(parents=True, exist_ok=True)
+                self.stream = gzip.open(self.output_path, 'at', encoding='utf-8')
+
+            line = {key: value for key, value in record.items() if key != '_written'}
+            self.stream.write(json.dumps(line, default=str, separators=(',', ':')) + '\n')
+            self.stats['written'] += 1
+
+        for field in self.full_fields:
+            if record.get(field) is not None:
+                record[field] = self.trim_body(record[field])
+
+def capture_file(prefix: str, directory='.') -> Path:
+    """Timestamped ``<prefix>_<epoch>.ndjson.gz`` path for a new capture"""
+    return Path(directory) / f"{prefix}_{int(time.time())}.ndjson.gz"
+
+def iter_capture(path) -> Iterator[Dict]:
+    """Stream records back out of a capture file one at a time"""
+    opener = gzip.open if str(path).endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
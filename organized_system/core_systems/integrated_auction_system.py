@@ -33,6 +33,7 @@ class AuctionOpportunity:
     time_remaining: str
     bidder_count: int
     bid_count: int
+    expected_close_date: str = ""
     
     # ML Predictions
     predicted_final_price: float = 0.0
@@ -118,7 +119,8 @@ class IntegratedAuctionSystem:
             condition=lot_data['condition'],
             time_remaining=lot_data['time_remaining'],
             bidder_count=lot_data['bidder_count'],
-            bid_count=lot_data['bid_count']
+            bid_count=lot_data['bid_count'],
+            expected_close_date=lot_data.get('expected_close_date', '')
         )
         
         # Step 1: ML Price Prediction
@@ -314,7 +316,8 @@ class IntegratedAuctionSystem:
                 opportunity_score=opp.opportunity_score,
                 investment_recommendation=opp.investment_recommendation,
                 max_bid_amount=opp.optimal_bid,
-                priority="HIGH" if opp.opportunity_score >= 80 else "MEDIUM" if opp.opportunity_score >= 65 else "LOW"
+                priority="HIGH" if opp.opportunity_score >= 80 else "MEDIUM" if opp.opportunity_score >= 65 else "LOW",
+                expected_close_date=opp.expected_close_date
             )
             portfolio_lots.append(portfolio_lot)
         
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+🗂️ Local Lot Index - Shared inverted index over discovered lots
+Fed with search API hits so term-search tools can answer repeated terms locally
+and only fall back to the search API for misses or stale entries
+"""
+
+import os
+import re
+import json
+import sqlite3
+from datetime import datetime, timedelta
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+def tokenize(text):
+    """Lowercase alphanumeric tokens of a product name, brand, UPC or search term."""
+    if not text:
+        return []
+    return TOKEN_PATTERN.findall(str(text).lower())
+
+def lot_identifier(lot):
+    """Lot ID across the search API, Typesense and NextJS payload shapes."""
+    lot_id = (lot.get('lot_id') or lot.get('id') or lot.get('inventory_id') or
+              lot.get('mac_lot_id') or '')
+    return str(lot_id) if lot_id else ''
+
+class LotIndex:
+    """Token → lot inverted index plus the numeric columns the tools filter on.
+
+    A term is answered locally when the last API query for that term and the matching
+    lots were both indexed within ``max_age_minutes``; a fresh term with no hits answers
+    with an empty list. Otherwise ``lookup`` returns None and the caller should query the
+    API and hand the hits back through ``add_lots``.
+
+    Only search API hits are indexed. Typesense sweep documents lack the fields the
+    tools filter on (``instant_win_price``, ``total_bids``, ``unique_bidders``) and use
+    a different id, so a sweep is only recorded for the index stats.
+    """
+
+    def __init__(self, db_path="databases/lot_index.db", max_age_minutes=15):
+        self.db_path = db_path
+        self.max_age = timedelta(minutes=max_age_minutes)
+        self.init_database()
+
+    def init_database(self):
+        """Create index tables."""
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS indexed_lots (
+                lot_id TEXT PRIMARY KEY,
+                product_name TEXT,
+                brand TEXT,
+                upc TEXT,
+                auction_location TEXT,
+                retail_price REAL,
+                current_bid REAL,
+                instant_win_price REAL,
+                bid_count INTEGER,
+                expected_close_date TEXT,
+                lot_json TEXT,
+                indexed_at TEXT
+            )
+        ''')
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS lot_tokens (
+                token TEXT,
+                lot_id TEXT,
+                PRIMARY KEY (token, lot_id)
+            ) WITHOUT ROWID
+        ''')
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS term_queries (
+                term TEXT PRIMARY KEY,
+                queried_at TEXT,
+                hit_count INTEGER
+            )
+        ''')
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS sweep_state (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                completed_at TEXT,
+                lot_count INTEGER
+            )
+        ''')
+
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_lot_tokens_lot ON lot_tokens(lot_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_indexed_lots_location ON indexed_lots(auction_location)')
+
+        conn.commit()
+        conn.close()
+
+    def add_lots(self, lots, term=None):
+        """Upsert lots and their tokens; record ``term`` as freshly queried if given.
+
+        Returns the number of lots indexed.
+        """
+        now = datetime.now().isoformat()
+        lot_rows = []
+        token_rows = []
+
+        for lot in lots:
+            lot_id = lot_identifier(lot)
+            if not lot_id:
+                continue
+
+            document = dict(lot)
+            document.setdefault('lot_id', lot_id)
+
+            tokens = set()
+            for field in ('product_name', 'brand', 'upc'):
+                tokens.update(tokenize(lot.get(field)))
+            token_rows.extend((token, lot_id) for token in tokens)
+
+            lot_rows.append((
+                lot_id,
+                lot.get('product_name', ''),
+                lot.get('brand', ''),
+                str(lot.get('upc') or ''),
+                lot.get('auction_location', ''),
+                lot.get('retail_price') or 0,
+                lot.get('current_bid') or 0,
+                lot.get('instant_win_price') or 0,
+                lot.get('bid_count') or lot.get('total_bids') or 0,
+                lot.get('expected_close_date', ''),
+                json.dumps(document, default=str),
+                now
+            ))
+
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.executemany('DELETE FROM lot_tokens WHERE lot_id = ?', [(row[0],) for row in lot_rows])
+        cursor.executemany('''
+            INSERT OR REPLACE INTO indexed_lots
+            (lot_id, product_name, brand, upc, auction_location, retail_price, current_bid,
+             instant_win_price, bid_count, expected_close_date, lot_json, indexed_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', lot_rows)
+        cursor.executemany('INSERT OR IGNORE INTO lot_tokens (token, lot_id) VALUES (?, ?)', token_rows)
+
+        if term is not None:
+            cursor.execute('''
+                INSERT OR REPLACE INTO term_queries (term, queried_at, hit_count)
+                VALUES (?, ?, ?)
+            ''', (term.lower().strip(), now, len(lot_rows)))
+
+        conn.commit()
+        conn.close()
+        return len(lot_rows)
+
+    def record_sweep(self, lots):
+        """Record that a full discovery sweep completed; its documents are not indexed."""
+        lot_count = sum(1 for lot in lots if lot_identifier(lot))
+
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('''
+            INSERT OR REPLACE INTO sweep_state (id, completed_at, lot_count)
+            VALUES (1, ?, ?)
+        ''', (datetime.now().isoformat(), lot_count))
+        conn.commit()
+        conn.close()
+        return lot_count
+
+    def lookup(self, term, limit=100, locations=None):
+        """Lots matching every token of ``term``, or None when the index can't answer.
+
+        None means the term is a miss or stale and the caller should hit the API; a term
+        queried within ``max_age`` that matched nothing returns an empty list.
+        """
+        tokens = sorted(set(tokenize(term)))
+        if not tokens:
+            return None
+
+        cutoff = (datetime.now() - self.max_age).isoformat()
+
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute('SELECT queried_at FROM term_queries WHERE term = ?', (term.lower().strip(),))
+        queried = cursor.fetchone()
+
+        if not (queried and queried[0] >= cutoff):
+            conn.close()
+            return None
+
+        conditions = [f"t.token IN ({', '.join('?' * len(tokens))})", 'l.indexed_at >= ?']
+        params = tokens + [cutoff]
+        if locations:
+            conditions.append(f"l.auction_location IN ({', '.join('?' * len(locations))})")
+            params.extend(locations)
+
+        cursor.execute(f'''
+            SELECT l.lot_json
+            FROM lot_tokens t
+            JOIN indexed_lots l ON l.lot_id = t.lot_id
+            WHERE {' AND '.join(conditions)}
+            GROUP BY l.lot_id
+            HAVING COUNT(*) = ?
+            ORDER BY l.retail_price DESC
+            LIMIT ?
+        ''', params + [len(tokens), limit])
+        rows = cursor.fetchall()
+        conn.close()
+
+        return [json.loads(row[0]) for row in rows]
+
+    def get_index_stats(self):
+        """Lot, token and term counts plus the last sweep time."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute('SELECT COUNT(*) FROM indexed_lots')
+        lot_count = cursor.fetchone()[0]
+        cursor.execute('SELECT COUNT(*) FROM lot_tokens')
+        token_count = cursor.fetchone()[0]
+        cursor.execute('SELECT COUNT(*) FROM term_queries')
+        term_count = cursor.fetchone()[0]
+        cursor.execute('SELECT completed_at FROM sweep_state WHERE id = 1')
+        sweep = cursor.fetchone()
+
+        conn.close()
+        return {
+            'lots': lot_count,
+            'tokens': token_count,
+            'terms': term_count,
+            'last_sweep': sweep[0] if sweep else None
+        }
@@ -15,9 +15,11 @@ import aiohttp
 import time
 from urllib.parse import urlparse, parse_qs
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core_systems.product_classifier import nextjs_brand_classifier
+
 class NextJSIntegrationSystem:
-    def __init__(self):
-        self.session = requests.Session()
+    def __init__(self, session_factory=None):
         self.db_path = "databases/nextjs_integration.db"
         self.setup_database()
         
@@ -29,7 +31,7 @@ class NextJSIntegrationSystem:
         self.nextjs_build_id = "AslxUFb4wF5GgYRFXlpoC"
         
         # Set up session headers for Next.js
-        self.session.headers.update({
+        nextjs_headers = {
             'accept': '*/*',
             'accept-language': 'en-US,en;q=0.6',
             'sec-ch-ua': '"Brave";v="137", "Chromium";v="137", "Not/A)Brand";v="24"',
@@ -41,7 +43,14 @@ class NextJSIntegrationSystem:
             'sec-gpc': '1',
             'user-agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Safari/537.36',
             'x-nextjs-data': '1'
-        })
+        }
+        
+        # A factory such as auth_manager.requests_session shares its pool and credentials
+        if session_factory:
+            self.session = session_factory(headers=nextjs_headers)
+        else:
+            self.session = requests.Session()
+            self.session.headers.update(nextjs_headers)
         
         # Initialize authentication (use cookies for now)
         self.authenticated = True  # Assume cookies work
@@ -250,14 +259,7 @@ class NextJSIntegrationSystem:
     
     def extract_brand(self, product_name):
         """Extract brand from product name"""
-        brands = ["Apple", "Sony", "Samsung", "Nintendo", "Dyson", "Bose", "DeWalt", "Milwaukee", "ECOVACS"]
-        product_upper = product_name.upper()
-        
-        for brand in brands:
-            if brand.upper() in product_upper:
-                return brand
-        
-        return "Unknown"
+        return nextjs_brand_classifier.classify(product_name)
     
     def queue_lots_for_analysis(self, discovered_lots):
         """Queue discovered lots for detailed analysis"""
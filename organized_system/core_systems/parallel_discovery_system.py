@@ -13,6 +13,7 @@ import logging
 from datetime import datetime
 from typing import Dict, List, Set, Tuple
 from concurrent.futures import ThreadPoolExecutor
+import functools
 import sys
 
 # Import authentication manager (REQUIRED FIRST)
@@ -297,27 +298,14 @@ class ParallelDiscoverySystem:
             self.logger.error(f"❌ Authentication failed: {e}")
             raise Exception("Cannot proceed without authentication")
         
-        # STEP 2: Initialize discovery systems with authentication
+        # STEP 2: Initialize discovery systems with authenticated sessions on shared pools
         self.logger.info("🔧 Step 2: Initializing authenticated discovery systems...")
-        self.typesense_scanner = TypesenseAllLotsScanner()
-        self.nextjs_system = NextJSIntegrationSystem()
-        self.warehouse_scanner = ComprehensiveWarehouseScanner()
-        
-        # Configure systems with authenticated headers
-        if hasattr(self.typesense_scanner, 'session') and self.typesense_scanner.session:
-            self.typesense_scanner.session.headers.update(self.authenticated_headers)
-        if hasattr(self.nextjs_system, 'session') and self.nextjs_system.session:
-            self.nextjs_system.session.headers.update(self.authenticated_headers)
-        if hasattr(self.warehouse_scanner, 'session') and self.warehouse_scanner.session:
-            self.warehouse_scanner.session.headers.update(self.authenticated_headers)
-        
-        # Pass authenticated headers to systems that need them
-        if hasattr(self.typesense_scanner, 'headers'):
-            self.typesense_scanner.headers.update(self.authenticated_headers)
-        if hasattr(self.nextjs_system, 'headers'):
-            self.nextjs_system.headers.update(self.authenticated_headers)
-        if hasattr(self.warehouse_scanner, 'headers'):
-            self.warehouse_scanner.headers.update(self.authenticated_headers)
+        # Typesense is a third-party host: pooled connections, but no Mac.bid credentials
+        self.typesense_scanner = TypesenseAllLotsScanner(
+            session_factory=functools.partial(self.auth_manager.aiohttp_session, authenticated=False)
+        )
+        self.nextjs_system = NextJSIntegrationSystem(session_factory=self.auth_manager.requests_session)
+        self.warehouse_scanner = ComprehensiveWarehouseScanner(session_factory=self.auth_manager.aiohttp_session)
         
         self.logger.info("✅ All systems configured with authentication")
         self.logger.info("🚀 Step 3: Running Typesense + NextJS + Warehouse API simultaneously...")
@@ -476,6 +464,8 @@ async def main():
         name = lot.get('product_name') or lot.get('title', 'Unknown')
         price = lot.get('retail_price', 0)
         print(f"   {i}. {name[:50]} (${price:.2f}) - Quality: {quality:.1f} - Sources: {sources}")
+    
+    await discovery_system.auth_manager.close_sessions()
 
 if __name__ == "__main__":
     asyncio.run(main()) 
\ No newline at end of file
@@ -11,7 +11,7 @@ import time
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, replace
 import os
 from collections import defaultdict
 
@@ -19,6 +19,10 @@ from collections import defaultdict
 import sys
 sys.path.append('.')
 from core_systems.real_bidding_system import RealBiddingSystem, BidRequest, BidResult
+from ml_prediction.win_probability_engine import WinProbabilityEngine
+from core_systems.budget_allocator import BudgetAllocator, AllocationConstraints, Allocation
+from core_systems.snipe_scheduler import parse_close_time
+from core_systems.realtime_auction_monitor import RealTimeAuctionMonitor
 
 @dataclass
 class PortfolioLot:
@@ -44,6 +48,7 @@ class PortfolioLot:
     status: str = "ACTIVE"  # ACTIVE, BIDDING, WON, LOST, EXPIRED
     notes: str = ""
     added_at: str = ""
+    expected_close_date: str = ""  # ISO close time from the lot API, if known
     
     def __post_init__(self):
         if not self.added_at:
@@ -61,8 +66,12 @@ class PortfolioConfig:
     preferred_brands: List[str] = None
     auto_bid_enabled: bool = True
     snipe_timing_minutes: int = 5
+    max_category_share: float = 0.5  # Largest share of the bidding budget one category may take
+    risk_budget_shares: Dict[str, float] = None  # Largest share of the bidding budget per risk level
     
     def __post_init__(self):
+        if self.risk_budget_shares is None:
+            self.risk_budget_shares = {"LOW": 1.0, "MEDIUM": 0.6, "HIGH": 0.25}
         if self.preferred_categories is None:
             self.preferred_categories = ["Electronics", "Computers", "Home & Garden"]
         if self.preferred_brands is None:
@@ -99,6 +108,10 @@ class PortfolioManagementSystem:
         
         # Initialize systems
         self.bidding_system = RealBiddingSystem(dry_run=True)  # Start in dry-run mode
+        self.win_probability_engine = WinProbabilityEngine()
+        self.budget_allocator = BudgetAllocator(self.win_probability_engine)
+        self.last_allocation: Optional[Allocation] = None
+        self.auction_monitor: Optional[RealTimeAuctionMonitor] = None  # Created when a timed bid first fires
         
         # Initialize database
         self.init_database()
@@ -149,10 +162,16 @@ class PortfolioManagementSystem:
                 status TEXT DEFAULT 'ACTIVE',
                 notes TEXT,
                 added_at TEXT NOT NULL,
-                updated_at TEXT
+                updated_at TEXT,
+                expected_close_date TEXT
             )
         ''')
         
+        # Databases created before close times were tracked lack the column
+        cursor.execute("PRAGMA table_info(portfolio_lots)")
+        if 'expected_close_date' not in [column[1] for column in cursor.fetchall()]:
+            cursor.execute("ALTER TABLE portfolio_lots ADD COLUMN expected_close_date TEXT")
+        
         # Portfolio performance table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS portfolio_performance (
@@ -264,15 +283,16 @@ class PortfolioManagementSystem:
              predicted_final_price, predicted_roi, confidence_score, risk_level, 
              category, brand, condition, time_remaining, bidder_count, bid_count, 
              opportunity_score, investment_recommendation, max_bid_amount, priority, 
-             status, notes, added_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+             status, notes, added_at, updated_at, expected_close_date)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         ''', (
             lot.lot_id, lot.auction_id, lot.product_name, lot.current_price,
             lot.instant_win_price, lot.predicted_final_price, lot.predicted_roi,
             lot.confidence_score, lot.risk_level, lot.category, lot.brand,
             lot.condition, lot.time_remaining, lot.bidder_count, lot.bid_count,
             lot.opportunity_score, lot.investment_recommendation, lot.max_bid_amount,
-            lot.priority, lot.status, lot.notes, lot.added_at, datetime.now().isoformat()
+            lot.priority, lot.status, lot.notes, lot.added_at, datetime.now().isoformat(),
+            lot.expected_close_date
         ))
         self.conn.commit()
     
@@ -376,7 +396,28 @@ class PortfolioManagementSystem:
                 'action': 'Review and consider removing low-scoring lots'
             })
         
-        # 5. Timing optimization
+        # 5. Budget allocation across active lots
+        if active_lots:
+            allocation = self.allocate_bids(active_lots)
+            unfunded = len(active_lots) - len(allocation.bids)
+            recommendations.append({
+                'type': 'ALLOCATION',
+                'priority': 'MEDIUM' if unfunded else 'LOW',
+                'message': f'Allocator funds {len(allocation.bids)} of {len(active_lots)} active lots: '
+                           f'${allocation.committed:.2f} committed for ${allocation.expected_value:.2f} expected profit',
+                'action': f'Release reserved funds on {unfunded} unfunded lots' if unfunded else 'No action needed'
+            })
+            
+            capped = [lot_id for lot_id, reason in allocation.capped.items() if reason != 'reduced_bid']
+            if capped:
+                recommendations.append({
+                    'type': 'ALLOCATION_CONSTRAINT',
+                    'priority': 'LOW',
+                    'message': f'{len(capped)} positive-value lots skipped by auction, risk or category caps',
+                    'action': 'Review risk_budget_shares and max_category_share if these caps are too tight'
+                })
+        
+        # 6. Timing optimization
         ending_soon = [lot for lot in active_lots if 'hour' in lot.time_remaining.lower()]
         if len(ending_soon) > self.config.max_concurrent_bids:
             recommendations.append({
@@ -400,15 +441,16 @@ class PortfolioManagementSystem:
             self.logger.info("No active lots in portfolio")
             return []
         
-        # Prioritize lots for bidding
-        prioritized_lots = self.prioritize_bidding_opportunities(active_lots)
+        # Choose lots and bid amounts jointly under budget, bid-count, risk and category limits
+        allocation = self.allocate_bids(active_lots)
+        skipped = len(active_lots) - len(allocation.bids)
+        if skipped:
+            self.logger.info(f"⏭️ Skipping {skipped} lots: no positive expected value within budget and limits")
         
         # Create bid requests
         bid_requests = []
-        for lot in prioritized_lots[:self.config.max_concurrent_bids]:
-            
-            # Calculate optimal bid amount
-            optimal_bid = self.calculate_optimal_bid(lot)
+        for lot_id, optimal_bid in allocation.bids.items():
+            lot = self.portfolio_lots[lot_id]
             
             bid_request = BidRequest(
                 lot_id=lot.lot_id,
@@ -417,6 +459,7 @@ class PortfolioManagementSystem:
                 max_bid=lot.max_bid_amount,
                 priority=lot.priority,
                 timing_strategy=self.determine_timing_strategy(lot),
+                expected_close_date=lot.expected_close_date,
                 notes=f"Portfolio bid - Score: {lot.opportunity_score:.1f}, ROI: {lot.predicted_roi:.1f}%"
             )
             
@@ -426,16 +469,49 @@ class PortfolioManagementSystem:
             lot.status = "BIDDING"
             self.active_bids[lot.lot_id] = bid_request
         
-        # Execute bids
-        results = await self.bidding_system.execute_bidding_queue(bid_requests)
+        # Execute bids; timed bids are re-priced when they fire and report back on their own
+        results = await self.bidding_system.execute_bidding_queue(
+            bid_requests,
+            reprice=self.reprice_bid,
+            on_timed_result=lambda result: self.update_portfolio_from_results([result])
+        )
         
         # Update portfolio based on results
         self.update_portfolio_from_results(results)
         
         return results
     
+    async def reprice_bid(self, bid_request: BidRequest) -> Optional[BidRequest]:
+        """Refresh a lot's price at fire time and recompute its bid; None skips the bid"""
+        lot = self.portfolio_lots.get(bid_request.lot_id)
+        if lot is None or lot.status != "BIDDING":
+            return None
+        
+        if self.auction_monitor is None:
+            self.auction_monitor = RealTimeAuctionMonitor()
+        session = await self.bidding_system.get_http_session()
+        lot_data = await self.auction_monitor.fetch_lot_data(session, lot.auction_id, lot.lot_id)
+        
+        if lot_data and lot_data.get('winning_bid_amount') is not None:
+            lot.current_price = float(lot_data['winning_bid_amount'])
+        else:
+            self.logger.warning(f"⚠️ Could not refresh lot {lot.lot_id}; re-pricing from ${lot.current_price:.2f}")
+        
+        # The lot's share of the budget: what it was allotted plus whatever is still uncommitted
+        budget = bid_request.bid_amount + self.get_bidding_budget()
+        if self.last_allocation is not None:
+            budget -= self.last_allocation.committed
+        bid_amount = self.budget_allocator.best_bid(lot, max(0.0, budget))
+        if bid_amount <= 0:
+            self.logger.info(f"⏭️ Lot {lot.lot_id} at ${lot.current_price:.2f} is no longer worth bidding on")
+            return None
+        
+        self.logger.info(f"🔁 Re-priced lot {lot.lot_id}: ${bid_request.bid_amount:.2f} -> ${bid_amount:.2f}")
+        return replace(bid_request, bid_amount=bid_amount)
+    
     def prioritize_bidding_opportunities(self, lots: List[PortfolioLot]) -> List[PortfolioLot]:
-        """Prioritize lots for bidding based on multiple factors"""
+        """Prioritize lots for bidding: lots funded by the budget allocation first, in
+        allocation order, then the rest by a weighted opportunity score"""
         
         def priority_score(lot: PortfolioLot) -> float:
             score = 0.0
@@ -465,31 +541,87 @@ class PortfolioManagementSystem:
             
             return score
         
-        return sorted(lots, key=priority_score, reverse=True)
+        allocation = self.allocate_bids(lots)
+        rank = {lot_id: i for i, lot_id in enumerate(allocation.bids)}
+        funded = sorted((lot for lot in lots if lot.lot_id in rank), key=lambda lot: rank[lot.lot_id])
+        unfunded = [lot for lot in lots if lot.lot_id not in allocation.bids]
+        
+        return funded + sorted(unfunded, key=priority_score, reverse=True)
     
     def calculate_optimal_bid(self, lot: PortfolioLot) -> float:
-        """Calculate optimal bid amount for a lot"""
-        
-        # Base bid: current price + small increment
-        base_bid = lot.current_price + 1.0
-        
-        # Factor in predicted final price
-        predicted_bid = lot.predicted_final_price * 0.8  # Bid 80% of predicted final
-        
-        # Factor in confidence
-        confidence_adjusted = predicted_bid * (lot.confidence_score / 100)
-        
-        # Choose conservative approach
-        optimal_bid = min(base_bid, predicted_bid, confidence_adjusted, lot.max_bid_amount)
-        
-        # Ensure minimum increment
-        optimal_bid = max(optimal_bid, lot.current_price + 0.50)
+        """Calculate optimal bid amount for a lot (0.0 means do not bid).
+        
+        A lot funded by the last portfolio solve keeps its allocated bid; any other lot
+        is priced from its cached curve against the budget that solve left uncommitted,
+        without disturbing the allocator's candidate set.
+        """
+        allocation = self.last_allocation
+        if allocation is not None and lot.lot_id in allocation.bids:
+            return allocation.bids[lot.lot_id]
+        
+        committed = allocation.committed if allocation is not None else 0.0
+        return self.budget_allocator.best_bid(lot, max(0.0, self.get_bidding_budget() - committed))
+    
+    def calculate_optimal_bids(self, lots: List[PortfolioLot]) -> Dict[int, float]:
+        """Calculate expected-value-maximizing bids for many lots under the portfolio budget"""
+        allocation = self.allocate_bids(lots)
+        return {lot.lot_id: allocation.bids.get(lot.lot_id, 0.0) for lot in lots}
+    
+    def allocation_constraints(self) -> AllocationConstraints:
+        """Allocator limits from the portfolio config, net of bids already in flight"""
+        in_flight = sum(1 for lot in self.portfolio_lots.values() if lot.status == "BIDDING")
+        return AllocationConstraints(
+            budget=self.get_bidding_budget(),
+            max_bids=max(0, self.config.max_concurrent_bids - in_flight),
+            max_per_auction=self.config.max_lots_per_auction,
+            max_category_share=self.config.max_category_share,
+            risk_budget_shares=self.config.risk_budget_shares
+        )
+    
+    def allocate_bids(self, lots: List[PortfolioLot]) -> Allocation:
+        """Solve budget-constrained expected-profit maximization over ``lots``.
+        
+        The allocator keeps each lot's bid curve between calls, so only lots whose
+        prices changed since the last solve are re-priced.
+        """
+        self.budget_allocator.set_lots(lots)
+        allocation = self.budget_allocator.solve(self.allocation_constraints())
+        self.last_allocation = allocation
+        
+        self.logger.info(f"💼 Allocated ${allocation.committed:.2f} across {len(allocation.bids)}/{len(lots)} lots "
+                         f"(expected profit ${allocation.expected_value:.2f}, {allocation.solve_seconds * 1000:.0f} ms)")
+        return allocation
+    
+    def update_lot_prices(self, prices: Dict[int, float]) -> Allocation:
+        """Apply current prices seen by a monitoring pass and re-solve the allocation"""
+        for lot_id, price in prices.items():
+            if lot_id in self.portfolio_lots:
+                self.portfolio_lots[lot_id].current_price = price
         
-        return round(optimal_bid, 2)
+        self.budget_allocator.update_prices(prices)
+        active_lots = [lot for lot in self.portfolio_lots.values() if lot.status == "ACTIVE"]
+        return self.allocate_bids(active_lots)
+    
+    def get_bidding_budget(self) -> float:
+        """Budget that new bids may commit, limited by both total and daily budgets"""
+        total_remaining = self.config.total_budget - self.budget_tracker['total_spent']
+        daily_remaining = self.config.daily_budget - self.budget_tracker['daily_spent']
+        return max(0.0, min(total_remaining, daily_remaining))
     
     def determine_timing_strategy(self, lot: PortfolioLot) -> str:
         """Determine optimal timing strategy for a lot"""
         
+        # An actual close time beats the display string; without one the bidding
+        # system can't time a snipe and bids immediately anyway
+        close_time = parse_close_time(lot.expected_close_date)
+        if close_time is not None:
+            seconds_left = close_time - time.time()
+            if seconds_left < 3600:
+                return "SNIPE"
+            elif seconds_left < 86400:
+                return "LAST_MINUTE"
+            return "IMMEDIATE"
+        
         time_remaining = lot.time_remaining.lower()
         
         if 'minute' in time_remaining:
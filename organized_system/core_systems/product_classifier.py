@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+🏷️ Product Classifier - Shared compiled brand/category keyword tables
+Every module's brand and category keyword table is compiled once at import into a single
+regex, so classifying a lot is one scan of its title instead of a loop over keywords
+"""
+
+import re
+import random
+import time
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Optional
+
+def trie_pattern(keywords: List[str]) -> str:
+    """Regex alternation shaped as a character trie, e.g. ``ip(?:ad|hone)``."""
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node):
+        if '' in node and len(node) == 1:
+            return ''
+
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        pattern = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{pattern})?" if '' in node else pattern
+
+    return build(trie)
+
+class KeywordClassifier:
+    """First-match keyword table compiled into one regex.
+
+    ``table`` maps label -> keywords and is matched the same way as the nested loops it
+    replaces: the first label (in table order) with any keyword occurring as a substring
+    of the title wins, i.e. the lowest label index over every keyword occurrence.
+    """
+
+    def __init__(self, table: Dict[str, List[str]], default: str = 'Other',
+                 empty: Optional[str] = None, ignore_case: bool = True):
+        self.labels = list(table)
+        self.default = default
+        self.empty = default if empty is None else empty
+        self.ignore_case = ignore_case
+
+        self.keyword_labels = {}
+        for index, keywords in enumerate(table.values()):
+            for keyword in keywords:
+                keyword = keyword.lower() if ignore_case else keyword
+                self.keyword_labels.setdefault(keyword, index)
+
+        # The trie regex is greedy, so at each position it reports the longest keyword
+        # starting there; a match also implies every keyword contained in it occurs
+        self.best_label = {
+            keyword: min(index for other, index in self.keyword_labels.items() if other in keyword)
+            for keyword in self.keyword_labels
+        }
+
+        alternatives = trie_pattern(list(self.keyword_labels))
+        self.first_match = re.compile(alternatives)
+        self.all_matches = re.compile(f'(?=({alternatives}))')
+
+    def classify(self, text: Optional[str]) -> str:
+        """Label for one title."""
+        if not text:
+            return self.empty
+        if self.ignore_case:
+            text = text.lower()
+
+        match = self.first_match.search(text)
+        if match is None:
+            return self.default
+
+        best = len(self.labels)
+        for match in self.all_matches.finditer(text, match.start()):
+            index = self.best_label[match.group(1)]
+            if index < best:
+                best = index
+                if best == 0:
+                    break
+
+        return self.labels[best]
+
+    def classify_batch(self, texts: Iterable[Optional[str]]) -> List[str]:
+        """Labels for many titles at once.
+
+        The titles are joined into one buffer and each keyword is located with C-level
+        ``str.find`` over the whole batch. Keywords are visited in label order, so the
+        first keyword found in a title fixes its label and the scan skips to the next title.
+        """
+        texts = list(texts)
+        unknown = len(self.labels)
+        best = [unknown] * len(texts)
+
+        # Lowercase before measuring: some characters ('İ') change length when lowered
+        folded = [(text or '').lower() if self.ignore_case else (text or '') for text in texts]
+
+        starts = []
+        offset = 0
+        for text in folded:
+            starts.append(offset)
+            offset += len(text) + 1
+        starts.append(offset)
+
+        buffer = '\n'.join(folded)
+
+        for keyword, index in self.keyword_labels.items():
+            position = buffer.find(keyword)
+            while position != -1:
+                row = bisect_right(starts, position) - 1
+                if best[row] > index:
+                    best[row] = index
+                position = buffer.find(keyword, starts[row + 1])
+
+        return [self.labels[index] if index < unknown else (self.default if text else self.empty)
+                for text, index in zip(texts, best)]
+
+# Brand tables
+
+SCANNER_BRANDS = {
+    'Apple': ['apple', 'macbook', 'iphone', 'ipad', 'imac'],
+    'Samsung': ['samsung'],
+    'Sony': ['sony'],
+    'LG': ['lg'],
+    'Dyson': ['dyson'],
+    'KitchenAid': ['kitchenaid'],
+    'DeWalt': ['dewalt'],
+    'Milwaukee': ['milwaukee'],
+    'Nintendo': ['nintendo'],
+    'Canon': ['canon'],
+    'Bose': ['bose'],
+    'Rolex': ['rolex'],
+    'Peloton': ['peloton']
+}
+
+LOT_SCANNER_BRANDS = {
+    'Apple': ['apple', 'macbook', 'iphone', 'ipad', 'imac'],
+    'Sony': ['sony'],
+    'Samsung': ['samsung'],
+    'Lg': ['lg'],
+    'Dyson': ['dyson'],
+    'Kitchenaid': ['kitchenaid'],
+    'Dewalt': ['dewalt'],
+    'Milwaukee': ['milwaukee'],
+    'Makita': ['makita'],
+    'Nintendo': ['nintendo'],
+    'Xbox': ['xbox', 'microsoft'],
+    'Playstation': ['playstation', 'ps4', 'ps5'],
+    'Canon': ['canon'],
+    'Nikon': ['nikon'],
+    'Bose': ['bose'],
+    'Beats': ['beats'],
+    'Rolex': ['rolex'],
+    'Omega': ['omega'],
+    'Cartier': ['cartier'],
+    'Tiffany': ['tiffany']
+}
+
+MARKET_BRANDS = {brand.title(): [brand] for brand in [
+    'apple', 'sony', 'samsung', 'nintendo', 'dyson', 'bose',
+    'lg', 'canon', 'nikon', 'dewalt', 'milwaukee', 'makita'
+]}
+
+PRICING_BRANDS = {brand: [brand] for brand in [
+    'APPLE', 'SONY', 'SAMSUNG', 'NINTENDO', 'DYSON', 'BOSE',
+    'DEWALT', 'MILWAUKEE', 'ECOVACS', 'ROOMBA', 'SHARK', 'BISSELL'
+]}
+
+INTELLIGENCE_BRANDS = {brand: [brand] for brand in [
+    'Apple', 'Samsung', 'Sony', 'LG', 'Dell', 'HP', 'Nintendo', 'Xbox', 'PlayStation',
+    'Dyson', 'Bose', 'Beats', 'JBL', 'Canon', 'Nikon', 'DeWalt', 'Milwaukee'
+]}
+
+NEXTJS_BRANDS = {brand: [brand] for brand in [
+    'Apple', 'Sony', 'Samsung', 'Nintendo', 'Dyson', 'Bose', 'DeWalt', 'Milwaukee', 'ECOVACS'
+]}
+
+PERSONAL_BRANDS = {brand: [brand] for brand in [
+    'Apple', 'Sony', 'Samsung', 'Nintendo', 'Microsoft', 'Bose', 'Beats',
+    'Turtle Beach', 'Logitech', 'Razer', 'SteelSeries', 'HyperX', 'Corsair',
+    'Dell', 'HP', 'Lenovo', 'ASUS', 'MSI', 'Alienware', 'MacBook', 'iPad',
+    'iPhone', 'AirPods', 'PlayStation', 'Xbox', 'Switch'
+]}
+
+EXTRACTOR_BRANDS = {brand: [brand] for brand in [
+    'Apple', 'Samsung', 'Sony', 'LG', 'Dell', 'HP', 'Canon', 'Nikon',
+    'Nintendo', 'Microsoft', 'Dyson', 'Bose', 'DeWalt', 'Milwaukee'
+]}
+
+EXTENDED_BRANDS = {brand: [brand] for brand in [
+    'Apple', 'Samsung', 'Sony', 'LG', 'Dell', 'HP', 'Canon', 'Nikon',
+    'Nintendo', 'Microsoft', 'Dyson', 'Bose', 'DeWalt', 'Milwaukee',
+    'Makita', 'Ryobi', 'Black+Decker', 'Craftsman', 'Stanley', 'Husky',
+    'KitchenAid', 'Cuisinart', 'Hamilton Beach', 'Ninja', 'Vitamix',
+    'Instant Pot', 'Keurig', 'Nespresso', 'Breville', 'All-Clad'
+]}
+
+# Category tables
+
+MARKET_CATEGORIES = {
+    'Electronics': ['laptop', 'computer', 'tablet', 'phone', 'iphone', 'ipad'],
+    'Audio': ['headphones', 'speaker', 'audio', 'sound', 'airpods'],
+    'Gaming': ['gaming', 'game', 'console', 'xbox', 'playstation', 'nintendo'],
+    'Appliances': ['vacuum', 'kitchen', 'appliance', 'dyson'],
+    'Tools': ['drill', 'saw', 'tool', 'dewalt', 'milwaukee'],
+    'Photography': ['camera', 'lens', 'canon', 'nikon']
+}
+
+PRICING_CATEGORIES = {
+    'ELECTRONICS': ['IPHONE', 'IPAD', 'MACBOOK', 'TV', 'SPEAKER', 'HEADPHONE', 'CAMERA'],
+    'GAMING': ['NINTENDO', 'XBOX', 'PLAYSTATION', 'SWITCH', 'GAME'],
+    'APPLIANCES': ['VACUUM', 'CLEANER', 'ROBOT', 'DYSON', 'SHARK', 'BISSELL'],
+    'TOOLS': ['DEWALT', 'MILWAUKEE', 'DRILL', 'SAW', 'TOOL'],
+    'AUDIO': ['SPEAKER', 'HEADPHONE', 'BOSE', 'SONY', 'BEATS']
+}
+
+PERSONAL_CATEGORIES = {
+    'Audio': ['headphone', 'headset', 'earphone', 'earbud', 'airpods', 'speaker', 'soundbar', 'audio'],
+    'Mobile': ['iphone', 'phone', 'smartphone', 'mobile'],
+    'Computing': ['laptop', 'macbook', 'computer', 'pc', 'desktop'],
+    'Gaming': ['gaming', 'xbox', 'playstation', 'nintendo', 'switch', 'ps5', 'ps4'],
+    'Tablet': ['tablet', 'ipad'],
+    'Display': ['tv', 'television', 'monitor', 'display']
+}
+
+LOCATION_CATEGORIES = {
+    'Electronics': ['iphone', 'ipad', 'laptop', 'computer', 'tv', 'phone', 'tablet', 'gaming'],
+    'Clothing': ['clothing', 'apparel', 'shirt', 'pants', 'dress', 'shoes', 'fashion'],
+    'Home': ['furniture', 'home', 'kitchen', 'appliance', 'decor', 'bedding'],
+    'Tools': ['tools', 'hardware', 'drill', 'saw', 'equipment'],
+    'Automotive': ['car', 'auto', 'vehicle', 'parts', 'tire'],
+    'Sports': ['sports', 'fitness', 'exercise', 'bike', 'golf'],
+    'Jewelry': ['jewelry', 'watch', 'ring', 'necklace', 'gold', 'silver'],
+    'Collectibles': ['collectible', 'antique', 'vintage', 'art']
+}
+
+# Compiled once at import and shared by every module
+
+scanner_brand_classifier = KeywordClassifier(SCANNER_BRANDS, 'Other', empty='Unknown')
+lot_scanner_brand_classifier = KeywordClassifier(LOT_SCANNER_BRANDS, 'Other', empty='Unknown')
+market_brand_classifier = KeywordClassifier(MARKET_BRANDS, 'Unknown')
+market_category_classifier = KeywordClassifier(MARKET_CATEGORIES, 'Other', empty='Unknown')
+pricing_brand_classifier = KeywordClassifier(PRICING_BRANDS, 'OTHER', ignore_case=False)
+pricing_category_classifier = KeywordClassifier(PRICING_CATEGORIES, 'OTHER', ignore_case=False)
+intelligence_brand_classifier = KeywordClassifier(INTELLIGENCE_BRANDS, 'Unknown')
+nextjs_brand_classifier = KeywordClassifier(NEXTJS_BRANDS, 'Unknown')
+personal_brand_classifier = KeywordClassifier(PERSONAL_BRANDS, 'Other')
+personal_category_classifier = KeywordClassifier(PERSONAL_CATEGORIES, 'Electronics')
+location_category_classifier = KeywordClassifier(LOCATION_CATEGORIES, 'General', empty='Unknown')
+extractor_brand_classifier = KeywordClassifier(EXTRACTOR_BRANDS, '')
+extended_brand_classifier = KeywordClassifier(EXTENDED_BRANDS, '')
+
+def loop_classify(table, text, default='Other'):
+    """Reference nested-loop classification, as the modules did it before."""
+    text_lower = text.lower()
+    for label, keywords in table.items():
+        for keyword in keywords:
+            if keyword in text_lower:
+                return label
+    return default
+
+def synthetic_titles(count=37000, seed=42):
+    """Lot-like titles mixing brand/category keywords with filler words."""
+    rng = random.Random(seed)
+    keywords = sorted({keyword for table in (SCANNER_BRANDS, LOT_SCANNER_BRANDS, MARKET_CATEGORIES,
+                                             PERSONAL_CATEGORIES, LOCATION_CATEGORIES)
+                       for keywords in table.values() for keyword in keywords})
+    filler = ['new', 'open', 'box', 'black', 'white', 'pack', 'set', 'of', '2', 'pro', 'max',
+              'wireless', 'portable', 'stainless', 'steel', 'inch', 'cordless', 'premium', 'mini',
+              'kit', 'bundle', 'edition', 'series', 'plus', 'ultra', 'case', 'cover', 'cable']
+
+    titles = []
+    for _ in range(count):
+        words = rng.sample(filler, rng.randint(4, 9))
+        for _ in range(rng.choice([0, 0, 1, 1, 2])):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(keywords))
+        titles.append(' '.join(words).title())
+    return titles
+
+def benchmark(title_count=37000):
+    """Compare compiled classifiers against the per-module loops on synthetic titles."""
+    titles = synthetic_titles(title_count)
+    tables = {
+        'scanner brands': (SCANNER_BRANDS, scanner_brand_classifier),
+        'lot scanner brands': (LOT_SCANNER_BRANDS, lot_scanner_brand_classifier),
+        'market categories': (MARKET_CATEGORIES, market_category_classifier),
+        'personal categories': (PERSONAL_CATEGORIES, personal_category_classifier),
+        'location categories': (LOCATION_CATEGORIES, location_category_classifier),
+        'extended brands': (EXTENDED_BRANDS, extended_brand_classifier)
+    }
+
+    print(f"🏷️ PRODUCT CLASSIFIER BENCHMARK ({len(titles):,} titles)")
+    print("=" * 60)
+
+    for name, (table, classifier) in tables.items():
+        lowered = {label: [keyword.lower() for keyword in keywords] for label, keywords in table.items()}
+
+        start = time.perf_counter()
+        expected = [loop_classify(lowered, title, classifier.default) for title in titles]
+        loop_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        labels = [classifier.classify(title) for title in titles]
+        compiled_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch_labels = classifier.classify_batch(titles)
+        batch_seconds = time.perf_counter() - start
+
+        status = "✅" if labels == expected and batch_labels == expected else "❌ MISMATCH"
+        print(f"{status} {name:<20} loops {loop_seconds * 1000:6.1f} ms | "
+              f"compiled {compiled_seconds * 1000:6.1f} ms ({loop_seconds / compiled_seconds:3.1f}x) | "
+              f"batch {batch_seconds * 1000:6.1f} ms ({loop_seconds / batch_seconds:3.1f}x)")
+
+def main():
+    benchmark()
+
+if __name__ == "__main__":
+    main()
@@ -11,9 +11,13 @@ import time
 import sqlite3
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core_systems.snipe_scheduler import SnipeScheduler, parse_close_time
 
 @dataclass
 class BidRequest:
@@ -26,6 +30,7 @@ class BidRequest:
     customer_id: int = 2710619
     notes: str = ""
     created_at: str = ""
+    expected_close_date: str = ""  # ISO close time; SNIPE/LAST_MINUTE bids are timed against it
     
     def __post_init__(self):
         if not self.created_at:
@@ -44,11 +49,19 @@ class BidResult:
     execution_time: float = 0.0
 
 class RealBiddingSystem:
-    def __init__(self, dry_run: bool = True):
+    def __init__(self, dry_run: bool = True, base_url: str = "https://www.mac.bid",
+                 snipe_offsets: Dict[str, float] = None):
         self.dry_run = dry_run
-        self.base_url = "https://www.mac.bid"
+        self.base_url = base_url
         self.customer_id = 2710619
         
+        # Seconds before close at which timed bids fire; other strategies bid immediately
+        self.snipe_offsets = snipe_offsets or {"SNIPE": 3.0, "LAST_MINUTE": 45.0}
+        self.bid_spacing = 1.0  # Pause between immediate bids to avoid rate limiting
+        self.http_session: Optional[aiohttp.ClientSession] = None
+        self.snipe_scheduler: Optional[SnipeScheduler] = None
+        self.scheduled_bids: Dict[int, asyncio.Future] = {}  # lot_id -> future of a timed bid
+        
         # Setup logging
         logging.basicConfig(
             level=logging.INFO,
@@ -268,6 +281,27 @@ class RealBiddingSystem:
         ''', (endpoint, method, status_code, response_time, datetime.now().isoformat()))
         self.conn.commit()
     
+    async def get_http_session(self) -> aiohttp.ClientSession:
+        """Keep-alive session shared by API bids and the snipe scheduler's warm-up"""
+        if self.http_session is None or self.http_session.closed:
+            self.http_session = aiohttp.ClientSession(
+                headers=self.session_headers,
+                cookies=self.session_cookies,
+                connector=aiohttp.TCPConnector(limit=20, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=15)
+            )
+        return self.http_session
+    
+    async def get_snipe_scheduler(self) -> SnipeScheduler:
+        """Scheduler for timed bids; calibrates against the live site unless in dry-run"""
+        if self.snipe_scheduler is None:
+            self.snipe_scheduler = SnipeScheduler(
+                session=await self.get_http_session(),
+                warm_url=None if self.dry_run else f"{self.base_url}/"
+            )
+        await self.snipe_scheduler.start()
+        return self.snipe_scheduler
+    
     async def attempt_api_bid(self, bid_request: BidRequest) -> BidResult:
         """Attempt to place bid using API endpoints"""
         
@@ -304,80 +338,76 @@ class RealBiddingSystem:
             if discovered:
                 endpoints = [(ep["endpoint"], ep["method"]) for ep in discovered]
         
-        # Try each endpoint
-        async with aiohttp.ClientSession(
-            headers=self.session_headers,
-            cookies=self.session_cookies,
-            timeout=aiohttp.ClientTimeout(total=15)
-        ) as session:
-            
-            for endpoint, method in endpoints:
-                try:
-                    # Prepare bid data
+        # Try each endpoint over the shared keep-alive session
+        session = await self.get_http_session()
+        
+        for endpoint, method in endpoints:
+            try:
+                # Prepare bid data
+                bid_data = {
+                    "lot_id": bid_request.lot_id,
+                    "auction_id": bid_request.auction_id,
+                    "bid_amount": bid_request.bid_amount,
+                    "customer_id": bid_request.customer_id,
+                    "max_bid": bid_request.max_bid
+                }
+                
+                if endpoint.endswith("/graphql"):
+                    # GraphQL mutation
                     bid_data = {
-                        "lot_id": bid_request.lot_id,
-                        "auction_id": bid_request.auction_id,
-                        "bid_amount": bid_request.bid_amount,
-                        "customer_id": bid_request.customer_id,
-                        "max_bid": bid_request.max_bid
-                    }
-                    
-                    if endpoint.endswith("/graphql"):
-                        # GraphQL mutation
-                        bid_data = {
-                            "query": f"""
-                            mutation {{
-                                placeBid(
-                                    lotId: {bid_request.lot_id},
-                                    amount: {bid_request.bid_amount},
-                                    customerId: {bid_request.customer_id}
-                                ) {{
-                                    success
-                                    message
-                                    bidId
-                                }}
+                        "query": f"""
+                        mutation {{
+                            placeBid(
+                                lotId: {bid_request.lot_id},
+                                amount: {bid_request.bid_amount},
+                                customerId: {bid_request.customer_id}
+                            ) {{
+                                success
+                                message
+                                bidId
                             }}
-                            """
-                        }
-                    
-                    url = f"{self.base_url}{endpoint}"
+                        }}
+                        """
+                    }
+                
+                url = f"{self.base_url}{endpoint}"
+                
+                async with session.post(url, json=bid_data) as response:
+                    response_text = await response.text()
+                    execution_time = time.time() - start_time
                     
-                    async with session.post(url, json=bid_data) as response:
-                        response_text = await response.text()
-                        execution_time = time.time() - start_time
+                    if response.status in [200, 201, 202]:
+                        try:
+                            response_data = await response.json()
+                        except:
+                            response_data = {"raw_response": response_text}
                         
-                        if response.status in [200, 201, 202]:
-                            try:
-                                response_data = await response.json()
-                            except:
-                                response_data = {"raw_response": response_text}
-                            
-                            # Check if bid was actually successful
-                            success_indicators = ["success", "placed", "confirmed", "accepted"]
-                            is_successful = any(indicator in response_text.lower() for indicator in success_indicators)
-                            
-                            if is_successful:
-                                self.session_stats['bids_successful'] += 1
-                                self.session_stats['total_amount_bid'] += bid_request.bid_amount
-                                
-                                return BidResult(
-                                    success=True,
-                                    lot_id=bid_request.lot_id,
-                                    bid_amount=bid_request.bid_amount,
-                                    timestamp=datetime.now().isoformat(),
-                                    method="API",
-                                    message=f"Bid placed successfully via {endpoint}",
-                                    response_data=response_data,
-                                    execution_time=execution_time
-                                )
+                        # Check if bid was actually successful
+                        success_indicators = ["success", "placed", "confirmed", "accepted"]
+                        is_successful = any(indicator in response_text.lower() for indicator in success_indicators)
                         
-                        # Log the attempt for learning
-                        self.logger.debug(f"API attempt {endpoint}: {response.status} - {response_text[:100]}")
-                
-                except Exception as e:
-                    self.logger.debug(f"API error {endpoint}: {str(e)}")
-                    continue
-        
+                        if is_successful:
+                            self.session_stats['bids_successful'] += 1
+                            self.session_stats['total_amount_bid'] += bid_request.bid_amount
+                            
+                            return BidResult(
+                                success=True,
+                                lot_id=bid_request.lot_id,
+                                bid_amount=bid_request.bid_amount,
+                                timestamp=datetime.now().isoformat(),
+                                method="API",
+                                message=f"Bid placed successfully via {endpoint}",
+                                response_data=response_data,
+                                execution_time=execution_time
+                            )
+                    
+                    # Log the attempt for learning
+                    self.logger.debug(f"API attempt {endpoint}: {response.status} - {response_text[:100]}")
+            
+            except Exception as e:
+                self.logger.debug(f"API error {endpoint}: {str(e)}")
+                continue
+    
         execution_time = time.time() - start_time
         return BidResult(
             success=False,
@@ -497,40 +527,122 @@ class RealBiddingSystem:
         ))
         self.conn.commit()
     
-    async def execute_bidding_queue(self, bid_requests: List[BidRequest]) -> List[BidResult]:
-        """Execute multiple bids with intelligent timing"""
+    async def execute_bidding_queue(self, bid_requests: List[BidRequest],
+                                    reprice: Optional[Callable[[BidRequest], Awaitable[Optional[BidRequest]]]] = None,
+                                    on_timed_result: Optional[Callable[[BidResult], None]] = None) -> List[BidResult]:
+        """Execute multiple bids with intelligent timing
+        
+        SNIPE and LAST_MINUTE bids with a close time are scheduled to fire at their
+        ``snipe_offsets`` before close on the server's clock, and the call returns without
+        waiting for them; their futures are kept in ``scheduled_bids``. When a timed bid
+        fires, ``reprice`` gets its request and returns a refreshed one (or None to skip
+        the bid), and the result goes to ``on_timed_result``. Returns the results of the
+        bids placed right away.
+        """
         
         self.logger.info(f"🎯 Executing bidding queue: {len(bid_requests)} bids")
         
-        results = []
-        
         # Sort by priority and timing strategy
         sorted_requests = sorted(bid_requests, key=lambda x: (
             {"HIGH": 0, "MEDIUM": 1, "LOW": 2}[x.priority],
             {"SNIPE": 0, "LAST_MINUTE": 1, "IMMEDIATE": 2}[x.timing_strategy]
         ))
         
+        immediate_bids = []
         for i, bid_request in enumerate(sorted_requests):
-            self.logger.info(f"Processing bid {i+1}/{len(sorted_requests)}")
+            offset = self.snipe_offsets.get(bid_request.timing_strategy)
+            close_time = parse_close_time(bid_request.expected_close_date)
+            
+            if offset is None or close_time is None:
+                immediate_bids.append(i)
+                continue
+            
+            scheduler = await self.get_snipe_scheduler()
+            if close_time <= scheduler.clock.server_now():
+                immediate_bids.append(i)  # Already closed by the server's clock; let the API report it
+                continue
+            
+            future = scheduler.schedule(
+                close_time - offset,
+                lambda bid_request=bid_request: self.fire_timed_bid(bid_request, reprice),
+                label=f"lot {bid_request.lot_id}"
+            )
+            future.add_done_callback(
+                lambda done, bid_request=bid_request: self.finish_timed_bid(bid_request, done, on_timed_result)
+            )
+            self.scheduled_bids[bid_request.lot_id] = future
+            self.logger.info(f"⏱️ Scheduled {bid_request.timing_strategy} bid on lot {bid_request.lot_id} "
+                             f"{offset:.0f}s before close ({bid_request.expected_close_date})")
+        
+        results = []
+        for n, i in enumerate(immediate_bids):
+            self.logger.info(f"Processing bid {n+1}/{len(immediate_bids)}")
             
             # Execute bid
-            result = await self.place_bid(bid_request)
+            result = await self.place_bid(sorted_requests[i])
+            self.log_bid_result(result)
             results.append(result)
             
-            # Log result
-            if result.success:
-                self.logger.info(f"✅ Bid successful: ${result.bid_amount} on lot {result.lot_id} via {result.method}")
-            else:
-                self.logger.error(f"❌ Bid failed: {result.message}")
-            
             # Wait between bids to avoid rate limiting
-            await asyncio.sleep(1)
+            if n < len(immediate_bids) - 1:
+                await asyncio.sleep(self.bid_spacing)
         
         # Generate session report
         self.generate_session_report(results)
         
         return results
     
+    async def fire_timed_bid(self, bid_request: BidRequest,
+                             reprice: Optional[Callable[[BidRequest], Awaitable[Optional[BidRequest]]]]) -> BidResult:
+        """Place a timed bid, re-pricing it first so the amount reflects the lot at close"""
+        if reprice is not None:
+            refreshed = await reprice(bid_request)
+            if refreshed is None:
+                return BidResult(
+                    success=False,
+                    lot_id=bid_request.lot_id,
+                    bid_amount=0.0,
+                    timestamp=datetime.now().isoformat(),
+                    method="SKIPPED",
+                    message="Lot no longer worth bidding on at close"
+                )
+            bid_request = refreshed
+        return await self.place_bid(bid_request)
+    
+    def finish_timed_bid(self, bid_request: BidRequest, future: asyncio.Future,
+                         on_timed_result: Optional[Callable[[BidResult], None]]):
+        if self.scheduled_bids.get(bid_request.lot_id) is future:
+            del self.scheduled_bids[bid_request.lot_id]
+        
+        if future.cancelled() or future.exception() is not None:
+            result = BidResult(
+                success=False,
+                lot_id=bid_request.lot_id,
+                bid_amount=bid_request.bid_amount,
+                timestamp=datetime.now().isoformat(),
+                method="FAILED",
+                message="Scheduled bid was cancelled" if future.cancelled() else "Scheduled bid raised an error",
+                error=None if future.cancelled() else str(future.exception())
+            )
+        else:
+            result = future.result()
+        
+        self.log_bid_result(result)
+        if on_timed_result is not None:
+            on_timed_result(result)
+    
+    async def wait_for_scheduled_bids(self) -> List[BidResult]:
+        """Wait for every timed bid still scheduled; their results, in no particular order"""
+        outcomes = await asyncio.gather(*self.scheduled_bids.values(), return_exceptions=True)
+        # Errors and cancellations are reported by finish_timed_bid
+        return [outcome for outcome in outcomes if isinstance(outcome, BidResult)]
+    
+    def log_bid_result(self, result: BidResult):
+        if result.success:
+            self.logger.info(f"✅ Bid successful: ${result.bid_amount} on lot {result.lot_id} via {result.method}")
+        else:
+            self.logger.error(f"❌ Bid failed: {result.message}")
+    
     def generate_session_report(self, results: List[BidResult]) -> Dict:
         """Generate comprehensive session report"""
         
@@ -552,6 +664,7 @@ class RealBiddingSystem:
                 'average_execution_time': sum(r.execution_time for r in results) / len(results) if results else 0,
                 'total_amount_bid': sum(r.bid_amount for r in results if r.success)
             },
+            'snipe_timing': self.snipe_scheduler.jitter_report() if self.snipe_scheduler else {},
             'bid_results': [asdict(result) for result in results]
         }
         
@@ -568,12 +681,32 @@ class RealBiddingSystem:
         self.logger.info(f"   Browser Success: {report['performance_metrics']['browser_success_rate']:.1f}%")
         self.logger.info(f"   Avg Execution: {report['performance_metrics']['average_execution_time']:.2f}s")
         self.logger.info(f"   Total Amount: ${report['performance_metrics']['total_amount_bid']:.2f}")
+        if report['snipe_timing'].get('fires'):
+            self.logger.info(f"   Snipe Jitter: p50 {report['snipe_timing']['p50_jitter_ms']:.1f} ms, "
+                             f"p95 {report['snipe_timing']['p95_jitter_ms']:.1f} ms")
         self.logger.info(f"   Report: {report_path}")
         
         return report
     
+    async def close_connections(self):
+        """Cancel pending timed bids, stop the snipe scheduler and close the keep-alive session"""
+        for future in list(self.scheduled_bids.values()):
+            future.timer.cancel()
+            future.cancel()
+        
+        if self.snipe_scheduler is not None:
+            await self.snipe_scheduler.close()
+            self.snipe_scheduler = None
+        if self.http_session is not None and not self.http_session.closed:
+            await self.http_session.close()
+    
     def cleanup(self):
         """Clean up resources"""
+        if self.http_session is not None and not self.http_session.closed:
+            try:
+                asyncio.get_running_loop().create_task(self.close_connections())
+            except RuntimeError:
+                pass  # No loop left to close on; the process is exiting
         if hasattr(self, 'conn'):
             self.conn.close()
         self.logger.info("🧹 Real bidding system cleanup complete")
@@ -624,6 +757,7 @@ async def main():
             print(f"   Bid {i}: {'SUCCESS' if result.success else 'FAILED'} - {result.message}")
             
     finally:
+        await bidding_system.close_connections()
         bidding_system.cleanup()
 
 if __name__ == "__main__":
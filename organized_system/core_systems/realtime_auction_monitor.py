@@ -13,9 +13,13 @@ from datetime import datetime, timedelta
 import threading
 import queue
 import os
+import sys
 from typing import Dict, List, Optional
 import logging
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core_systems.alert_throttle import get_alert_throttle
+
 class RealTimeAuctionMonitor:
     def __init__(self):
         self.db_path = "databases/realtime_auction_monitor.db"
@@ -25,6 +29,8 @@ class RealTimeAuctionMonitor:
         # Configuration
         self.monitor_interval = 30  # seconds between checks
         self.max_concurrent_requests = 10
+        self.alert_repeat_interval = 300  # seconds before the same lot/alert type fires again
+        self.alert_throttle = get_alert_throttle(self.db_path)
         self.active_lots = {}  # lot_id -> lot_data
         self.bid_alerts_queue = queue.Queue()
         self.price_alerts_queue = queue.Queue()
@@ -256,20 +262,27 @@ class RealTimeAuctionMonitor:
     
     def save_alert(self, alert: Dict):
         """Save alert to database"""
+        self.save_alerts([alert])
+    
+    def save_alerts(self, alerts: List[Dict]):
+        """Save a batch of alerts to database in one transaction"""
+        if not alerts:
+            return
+        
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
-        cursor.execute('''
+        cursor.executemany('''
             INSERT INTO price_alerts 
             (lot_id, auction_id, alert_type, current_price, message, triggered_date)
             VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-        ''', (
+        ''', [(
             alert.get('lot_id'),
             alert.get('auction_id', 0),
             alert.get('type'),
             alert.get('current_price', 0),
             json.dumps(alert)
-        ))
+        ) for alert in alerts])
         
         conn.commit()
         conn.close()
@@ -292,6 +305,7 @@ class RealTimeAuctionMonitor:
                 tasks.append(task)
             
             results = await asyncio.gather(*tasks, return_exceptions=True)
+            batch_alerts = []
             
             for i, result in enumerate(results):
                 if isinstance(result, Exception):
@@ -309,16 +323,20 @@ class RealTimeAuctionMonitor:
                             self.logger.info(f"Bid change detected: {change}")
                             self.bid_alerts_queue.put(change)
                     
-                    # Check for price alerts
-                    alerts = self.check_price_alerts(result)
+                    # Check for price alerts, skipping ones already raised for this lot recently
+                    alerts = self.alert_throttle.filter_alerts(
+                        self.check_price_alerts(result), ('type', 'lot_id'), self.alert_repeat_interval
+                    )
                     for alert in alerts:
                         self.logger.info(f"Price alert triggered: {alert}")
                         self.price_alerts_queue.put(alert)
-                        self.save_alert(alert)
+                    batch_alerts.extend(alerts)
                     
                     # Update stored data
                     self.active_lots[lot_id] = result
                     self.save_lot_update(result)
+            
+            self.save_alerts(batch_alerts)
     
     def add_lot_to_monitor(self, auction_id: int, lot_id: str, priority: int = 1):
         """Add a lot to the monitoring list"""
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+🚦 Search Gateway - Shared async front door to the Mac.bid search API
+Runs term queries concurrently under one process-wide rate limit, coalesces identical
+in-flight requests and briefly caches responses so parallel tools share results
+"""
+
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
+
+SEARCH_URL = "https://api.macdiscount.com/search"
+
+class SearchGateway:
+    """Single-flight, rate-limited, briefly cached term search.
+
+    Every tool in the process shares one gateway (see ``get_search_gateway``), so the
+    rate limit is global rather than per tool, and a term fetched by one tool is served
+    to the others from the in-flight request or the cache.
+    """
+
+    def __init__(self, requests_per_second: float = 5.0, max_concurrency: int = 8,
+                 cache_ttl: float = 60.0):
+        self.min_interval = 1.0 / requests_per_second
+        self.max_concurrency = max_concurrency
+        self.cache_ttl = cache_ttl
+
+        self.cache: Dict[str, Tuple[float, int, List[Dict]]] = {}
+        self.in_flight: Dict[Tuple[str, int], asyncio.Future] = {}
+        self.stats = {'requests': 0, 'cache_hits': 0, 'coalesced': 0, 'errors': 0}
+
+        self._loop = None
+        self._rate_lock = None
+        self._semaphore = None
+        self._next_slot = 0.0
+
+    def _bind_loop(self):
+        """(Re)create asyncio primitives when called from a new event loop."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._rate_lock = asyncio.Lock()
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self.in_flight = {}
+
+    async def _wait_for_slot(self):
+        """Space request starts at least ``min_interval`` apart across all callers."""
+        async with self._rate_lock:
+            now = time.monotonic()
+            delay = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.min_interval
+
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _cached(self, term: str, limit: int) -> Optional[List[Dict]]:
+        """Cached hits for ``term`` if fresh and fetched with at least ``limit``."""
+        entry = self.cache.get(term)
+        if not entry:
+            return None
+
+        fetched_at, cached_limit, hits = entry
+        if time.monotonic() - fetched_at > self.cache_ttl:
+            del self.cache[term]
+            return None
+        if cached_limit < limit and len(hits) >= cached_limit:
+            return None
+        return hits[:limit]
+
+    async def _fetch(self, session, key: str, term: str, limit: int) -> List[Dict]:
+        await self._wait_for_slot()
+
+        async with self._semaphore:
+            self.stats['requests'] += 1
+            async with session.get(SEARCH_URL, params={'q': term, 'limit': limit}) as response:
+                if response.status != 200:
+                    raise RuntimeError(f"Search for '{term}' returned HTTP {response.status}")
+                data = await response.json()
+
+        hits = data.get('hits', [])
+        self.cache[key] = (time.monotonic(), limit, hits)
+        return hits
+
+    async def search(self, session, term: str, limit: int = 100) -> List[Dict]:
+        """Raw API hits for ``term``; raises on HTTP or network errors.
+
+        Each caller gets its own copies of the hit dicts, so tools can annotate results
+        without leaking into each other.
+        """
+        self._bind_loop()
+        key = term.lower().strip()
+
+        hits = self._cached(key, limit)
+        if hits is not None:
+            self.stats['cache_hits'] += 1
+            return [dict(hit) for hit in hits]
+
+        # Join an identical request that is already running
+        for (flight_term, flight_limit), future in self.in_flight.items():
+            if flight_term == key and flight_limit >= limit:
+                self.stats['coalesced'] += 1
+                hits = await asyncio.shield(future)
+                return [dict(hit) for hit in hits[:limit]]
+
+        future = self._loop.create_future()
+        self.in_flight[(key, limit)] = future
+
+        try:
+            hits = await self._fetch(session, key, term, limit)
+            future.set_result(hits)
+        except Exception as e:
+            self.stats['errors'] += 1
+            future.set_exception(e)
+            # Mark retrieved so an unawaited failure isn't logged at shutdown
+            future.exception()
+            raise
+        finally:
+            if not future.done():
+                # This caller was cancelled mid-fetch; fail joined callers with an ordinary
+                # error rather than cancelling them too
+                future.set_exception(RuntimeError(f"Search for '{term}' was abandoned by its initiating caller"))
+                future.exception()
+            self.in_flight.pop((key, limit), None)
+
+        return [dict(hit) for hit in hits]
+
+_gateway: Optional[SearchGateway] = None
+
+def get_search_gateway() -> SearchGateway:
+    """Process-wide gateway shared by every term-search tool."""
+    global _gateway
+    if _gateway is None:
+        _gateway = SearchGateway()
+    return _gateway
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Snipe Scheduler - Deadline-driven bid timing
+Fires each bid at a fixed offset before its lot closes, corrected for server clock skew
+and network latency, over keep-alive connections warmed up ahead of time
+"""
+
+import asyncio
+import aiohttp
+import math
+import statistics
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, List, Optional
+
+def parse_close_time(value) -> Optional[float]:
+    """Epoch seconds for an ISO close date such as '2025-06-15T18:30:20.000Z'."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+class ServerClock:
+    """Offset between the server's clock and ours, plus the round-trip time to it.
+
+    Uses the HTTP ``Date`` header NTP-style: the server stamped the response somewhere
+    between sending and receiving, so its time is compared with the request midpoint.
+    ``Date`` only has one-second resolution, so the coarse median is refined by probing
+    around the moment the server's second ticks over, first every 50 ms, then every 5 ms.
+    """
+
+    def __init__(self):
+        self.offset = 0.0  # server time minus local time, seconds
+        self.rtt = 0.0
+        self.calibrated_at: Optional[float] = None
+
+    async def probe(self, session: aiohttp.ClientSession, url: str):
+        """(local request midpoint, server Date in epoch seconds, rtt) or None."""
+        try:
+            sent = time.time()
+            async with session.head(url, allow_redirects=False) as response:
+                received = time.time()
+                date = response.headers.get('Date')
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return None
+
+        if not date:
+            return None
+        return (sent + received) / 2, parsedate_to_datetime(date).timestamp(), received - sent
+
+    async def calibrate(self, session: aiohttp.ClientSession, url: str, samples: int = 5,
+                        refine: bool = True) -> bool:
+        offsets, rtts = [], []
+
+        for _ in range(samples):
+            sample = await self.probe(session, url)
+            if sample is not None:
+                midpoint, server_time, rtt = sample
+                offsets.append(server_time + 0.5 - midpoint)
+                rtts.append(rtt)
+
+        if not offsets:
+            return False
+
+        self.offset = statistics.median(offsets)
+        self.rtt = min(rtts)
+        if refine:
+            for step, span in ((0.05, 0.6), (0.005, 0.06)):
+                await self.refine_offset(session, url, step, span)
+        self.calibrated_at = time.monotonic()
+        return True
+
+    async def refine_offset(self, session: aiohttp.ClientSession, url: str, step: float, span: float):
+        """Probe every ``step`` seconds within ``span`` of the next server second boundary."""
+        boundary = math.ceil(self.server_now() + span + 0.05)
+        boundary_local = boundary - self.offset
+        before = after = None
+
+        moment = boundary_local - span
+        while moment <= boundary_local + span:
+            await asyncio.sleep(max(0.0, moment - time.time()))
+            moment += step
+
+            sample = await self.probe(session, url)
+            if sample is None:
+                continue
+            midpoint, server_time, _ = sample
+            if server_time < boundary:
+                before = midpoint
+            else:
+                after = midpoint
+                break
+
+        # The server clock read ``boundary`` between the last old and first new stamp
+        if before is not None and after is not None:
+            self.offset = boundary - (before + after) / 2
+
+    def server_now(self) -> float:
+        return time.time() + self.offset
+
+    def to_monotonic(self, server_time: float) -> float:
+        """Local monotonic deadline at which the server clock reads ``server_time``."""
+        return time.monotonic() + (server_time - self.server_now())
+
+class TimerHandle:
+    __slots__ = ('deadline', 'callback', 'tick', 'cancelled')
+
+    def __init__(self, deadline: float, callback: Callable[[], None], tick: int):
+        self.deadline = deadline
+        self.callback = callback
+        self.tick = tick
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+class TimerWheel:
+    """Hashed timer wheel on the running event loop.
+
+    Timers land in slot ``tick % slots``; each tick only that slot is scanned, so
+    scheduling and expiry stay O(1) however many bids are pending. A due timer
+    sleeps off the sub-tick remainder before firing, so accuracy is bounded by the
+    event loop, not by ``tick``.
+    """
+
+    def __init__(self, tick: float = 0.05, slots: int = 512):
+        self.tick = tick
+        self.slots: List[List[TimerHandle]] = [[] for _ in range(slots)]
+        self.origin = time.monotonic()
+        self.current_tick = 0
+        self.pending = 0
+        self.wakeup = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+    def tick_for(self, moment: float) -> int:
+        return int((moment - self.origin) / self.tick)
+
+    def schedule(self, deadline: float, callback: Callable[[], None]) -> TimerHandle:
+        if self.task is None or self.task.done():
+            self.task = asyncio.get_running_loop().create_task(self.run())
+
+        handle = TimerHandle(deadline, callback, max(self.tick_for(deadline), self.current_tick + 1))
+        self.slots[handle.tick % len(self.slots)].append(handle)
+        self.pending += 1
+        self.wakeup.set()
+        return handle
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        self.current_tick = self.tick_for(time.monotonic())
+
+        while True:
+            if not self.pending:
+                self.wakeup.clear()
+                await self.wakeup.wait()
+
+            next_boundary = self.origin + (self.current_tick + 1) * self.tick
+            await asyncio.sleep(max(0.0, next_boundary - time.monotonic()))
+
+            now_tick = self.tick_for(time.monotonic())
+            # After a long stall every slot may hold due timers; scan each once
+            for tick in range(self.current_tick + 1, min(now_tick, self.current_tick + len(self.slots)) + 1):
+                slot = self.slots[tick % len(self.slots)]
+                due = [handle for handle in slot if handle.tick <= now_tick]
+                if not due:
+                    continue
+                slot[:] = [handle for handle in slot if handle.tick > now_tick]
+                self.pending -= len(due)
+                for handle in due:
+                    if not handle.cancelled:
+                        loop.create_task(self.fire(handle))
+            self.current_tick = now_tick
+
+    async def fire(self, handle: TimerHandle):
+        remaining = handle.deadline - time.monotonic()
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+        if not handle.cancelled:
+            handle.callback()
+
+class SnipeScheduler:
+    """Schedules bid coroutines against lot close times on the server's clock.
+
+    ``schedule`` returns a future for the bid's result. Bids fire ``rtt / 2`` before
+    their target so they arrive on time, connections to ``warm_url`` are opened
+    ``warm_ahead`` seconds before each fire, and every fire records its jitter
+    (actual minus planned fire time) for ``jitter_report``.
+    """
+
+    def __init__(self, session: aiohttp.ClientSession = None, warm_url: str = None,
+                 headers: Dict = None, cookies: Dict = None, connections: int = 4,
+                 warm_ahead: float = 10.0, calibration_ttl: float = 300.0, tick: float = 0.05):
+        self.session = session
+        self.owns_session = session is None
+        self.warm_url = warm_url
+        self.headers = headers
+        self.cookies = cookies
+        self.connections = connections
+        self.warm_ahead = warm_ahead
+        self.calibration_ttl = calibration_ttl
+
+        self.clock = ServerClock()
+        self.wheel = TimerWheel(tick=tick)
+        self.fires: List[Dict] = []
+
+    async def start(self):
+        """Open the keep-alive session and calibrate the clock if it's stale."""
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                headers=self.headers,
+                cookies=self.cookies,
+                connector=aiohttp.TCPConnector(limit=self.connections * 2, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=15)
+            )
+            self.owns_session = True
+
+        stale = (self.clock.calibrated_at is None or
+                 time.monotonic() - self.clock.calibrated_at > self.calibration_ttl)
+        if self.warm_url and stale:
+            await self.clock.calibrate(self.session, self.warm_url)
+
+    async def warm(self):
+        """Open ``connections`` pooled sockets to ``warm_url`` so bids skip TCP/TLS setup."""
+        if not self.warm_url:
+            return
+
+        async def touch():
+            try:
+                async with self.session.head(self.warm_url, allow_redirects=False) as response:
+                    await response.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                pass
+
+        await asyncio.gather(*(touch() for _ in range(self.connections)))
+
+    def schedule(self, target_time: float, fire: Callable[[], Awaitable], label: str = "") -> asyncio.Future:
+        """Run ``fire()`` so it reaches the server at ``target_time`` (server epoch seconds)."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        deadline = self.clock.to_monotonic(target_time) - self.clock.rtt / 2
+
+        if self.warm_url and deadline - self.warm_ahead > time.monotonic():
+            self.wheel.schedule(deadline - self.warm_ahead, lambda: loop.create_task(self.warm()))
+
+        def on_deadline():
+            fired_at = time.monotonic()
+            self.fires.append({
+                'label': label,
+                'target': datetime.fromtimestamp(target_time, timezone.utc).isoformat(),
+                'jitter_ms': (fired_at - deadline) * 1000
+            })
+            loop.create_task(self.run_fire(fire, future))
+
+        future.timer = self.wheel.schedule(deadline, on_deadline)
+        return future
+
+    async def run_fire(self, fire: Callable[[], Awaitable], future: asyncio.Future):
+        try:
+            result = await fire()
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+        if not future.done():
+            future.set_result(result)
+
+    def jitter_report(self) -> Dict:
+        jitters = sorted(entry['jitter_ms'] for entry in self.fires)
+        report = {
+            'fires': len(jitters),
+            'clock_offset_ms': self.clock.offset * 1000,
+            'rtt_ms': self.clock.rtt * 1000
+        }
+        if jitters:
+            report.update({
+                'mean_jitter_ms': statistics.fmean(jitters),
+                'p50_jitter_ms': jitters[len(jitters) // 2],
+                'p95_jitter_ms': jitters[min(len(jitters) - 1, int(len(jitters) * 0.95))],
+                'max_jitter_ms': max(jitters, key=abs)
+            })
+        return report
+
+    async def close(self):
+        if self.wheel.task is not None:
+            self.wheel.task.cancel()
+        if self.owns_session and self.session is not None and not self.session.closed:
+            await self.session.close()
+
+async def main():
+    """Fire snipes against a local stub server whose clock runs 2.5s ahead"""
+    from aiohttp import web
+    from email.utils import formatdate
+
+    skew = 2.5
+    arrivals = []
+
+    async def handle_head(request):
+        return web.Response(headers={'Date': formatdate(time.time() + skew, usegmt=True)})
+
+    async def handle_bid(request):
+        body = await request.json()
+        arrivals.append((body['target'], time.time() + skew))
+        return web.json_response({'success': True})
+
+    app = web.Application()
+    app.router.add_route('HEAD', '/', handle_head)
+    app.router.add_post('/bid', handle_bid)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    base_url = f"http://127.0.0.1:{port}"
+
+    print("⏱️ SNIPE SCHEDULER STUB TEST")
+    print("=" * 50)
+
+    scheduler = SnipeScheduler(warm_url=f"{base_url}/", warm_ahead=0.5)
+    await scheduler.start()
+    print(f"Measured clock offset: {scheduler.clock.offset:+.3f}s (true {skew:+.3f}s), RTT {scheduler.clock.rtt * 1000:.2f} ms")
+
+    async def bid(target):
+        async with scheduler.session.post(f"{base_url}/bid", json={'target': target}) as response:
+            return response.status == 200
+
+    # Twenty lots closing 1-3s apart on the server's clock
+    now = scheduler.clock.server_now()
+    futures = [scheduler.schedule(now + 1 + i * 0.1, lambda t=now + 1 + i * 0.1: bid(t), label=f"lot {i}")
+               for i in range(20)]
+    results = await asyncio.gather(*futures)
+
+    errors = [(arrived - target) * 1000 for target, arrived in arrivals]
+    report = scheduler.jitter_report()
+    print(f"Bids fired: {sum(results)}/{len(results)}")
+    print(f"Fire jitter: p50 {report['p50_jitter_ms']:.2f} ms, p95 {report['p95_jitter_ms']:.2f} ms, "
+          f"max {report['max_jitter_ms']:.2f} ms")
+    print(f"Arrival vs. server target: mean {statistics.fmean(errors):+.1f} ms "
+          f"(fire jitter plus clock calibration error)")
+
+    await scheduler.close()
+    await runner.cleanup()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -25,6 +25,7 @@ from core_systems.nextjs_integration_system import NextJSIntegrationSystem
 from ml_prediction.enhanced_ml_models import EnhancedMLModels
 from core_systems.real_bidding_system import RealBiddingSystem, BidRequest
 from core_systems.portfolio_management_system import PortfolioManagementSystem, PortfolioConfig
+from core_systems.product_classifier import intelligence_brand_classifier
 
 @dataclass
 class UltimateOpportunity:
@@ -504,13 +505,7 @@ class UltimateAuctionIntelligenceSystem:
     # Helper methods
     def extract_brand(self, product_name: str) -> str:
         """Extract brand from product name"""
-        brands = ['Apple', 'Samsung', 'Sony', 'LG', 'Dell', 'HP', 'Nintendo', 'Xbox', 'PlayStation', 
-                 'Dyson', 'Bose', 'Beats', 'JBL', 'Canon', 'Nikon', 'DeWalt', 'Milwaukee']
-        
-        for brand in brands:
-            if brand.lower() in product_name.lower():
-                return brand
-        return "Unknown"
+        return intelligence_brand_classifier.classify(product_name)
     
     def calculate_roi(self, opportunity: UltimateOpportunity) -> float:
         """Calculate predicted ROI"""
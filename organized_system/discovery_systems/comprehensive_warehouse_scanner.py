@@ -13,7 +13,8 @@ import ssl
 from typing import List, Dict, Optional
 
 class ComprehensiveWarehouseScanner:
-    def __init__(self):
+    def __init__(self, session_factory=None):
+        self.session_factory = session_factory  # e.g. auth_manager.aiohttp_session, for a shared pool
         self.sc_locations = ['Spartanburg', 'Greenville', 'Rock Hill', 'Gastonia', 'Anderson']
         
         # Comprehensive search terms covering all major categories
@@ -113,12 +114,18 @@ class ComprehensiveWarehouseScanner:
         print(f"• {', '.join(self.sc_locations)}")
         print()
         
-        try:
-            async with aiohttp.ClientSession(
+        if self.session_factory:
+            client_session = self.session_factory(headers=headers, verify_ssl=False,
+                                                  timeout=aiohttp.ClientTimeout(total=30))
+        else:
+            client_session = aiohttp.ClientSession(
                 connector=aiohttp.TCPConnector(ssl=ssl_context),
                 headers=headers,
                 timeout=aiohttp.ClientTimeout(total=30)
-            ) as session:
+            )
+        
+        try:
+            async with client_session as session:
                 
                 total_searches = sum(len(terms) for terms in self.search_categories.values())
                 current_search = 0
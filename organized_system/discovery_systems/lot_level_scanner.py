@@ -8,14 +8,23 @@ import asyncio
 import aiohttp
 import ssl
 import json
+import os
+import sys
 import sqlite3
 from datetime import datetime, timedelta
 from collections import defaultdict, Counter
 import statistics
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core_systems.lot_index import LotIndex
+from core_systems.search_gateway import get_search_gateway
+from core_systems.product_classifier import lot_scanner_brand_classifier
+
 class LotLevelScanner:
     def __init__(self):
         self.session = None
+        self.lot_index = LotIndex()
+        self.search_gateway = get_search_gateway()
         self.sc_locations = ["Spartanburg", "Greenville", "Rock Hill", "Gastonia", "Anderson"]
         self.db_file = "lot_analytics.db"
         self.init_database()
@@ -126,64 +135,29 @@ class LotLevelScanner:
             await asyncio.sleep(0.25)
             
     async def search_for_term(self, term, limit=200):
-        """Search for a specific term with higher limit."""
-        url = f"https://api.macdiscount.com/search?q={term}&limit={limit}"
-        
+        """Search for a specific term with higher limit, answering from the local lot index when it is fresh."""
+        indexed_hits = self.lot_index.lookup(term, limit, self.sc_locations)
+        if indexed_hits is not None:
+            return indexed_hits
+            
         try:
-            async with self.session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    hits = data.get('hits', [])
-                    
-                    # Filter to SC locations only
-                    sc_hits = []
-                    for hit in hits:
-                        if hit.get('auction_location') in self.sc_locations:
-                            sc_hits.append(hit)
-                            
-                    return sc_hits
-                else:
-                    return []
+            hits = await self.search_gateway.search(self.session, term, limit)
         except Exception as e:
             return []
             
+        self.lot_index.add_lots(hits, term=term)
+        
+        # Filter to SC locations only
+        sc_hits = []
+        for hit in hits:
+            if hit.get('auction_location') in self.sc_locations:
+                sc_hits.append(hit)
+                
+        return sc_hits
+            
     def extract_brand(self, product_name):
         """Extract brand from product name."""
-        if not product_name:
-            return "Unknown"
-            
-        product_lower = product_name.lower()
-        
-        # Common brands to look for
-        brands = {
-            'apple': ['apple', 'macbook', 'iphone', 'ipad', 'imac'],
-            'sony': ['sony'],
-            'samsung': ['samsung'],
-            'lg': ['lg'],
-            'dyson': ['dyson'],
-            'kitchenaid': ['kitchenaid'],
-            'dewalt': ['dewalt'],
-            'milwaukee': ['milwaukee'],
-            'makita': ['makita'],
-            'nintendo': ['nintendo'],
-            'xbox': ['xbox', 'microsoft'],
-            'playstation': ['playstation', 'ps4', 'ps5'],
-            'canon': ['canon'],
-            'nikon': ['nikon'],
-            'bose': ['bose'],
-            'beats': ['beats'],
-            'rolex': ['rolex'],
-            'omega': ['omega'],
-            'cartier': ['cartier'],
-            'tiffany': ['tiffany']
-        }
-        
-        for brand, keywords in brands.items():
-            for keyword in keywords:
-                if keyword in product_lower:
-                    return brand.title()
-                    
-        return "Other"
+        return lot_scanner_brand_classifier.classify(product_name)
         
     def calculate_value_score(self, item):
         """Calculate a value score for ranking items."""
@@ -257,7 +231,6 @@ class LotLevelScanner:
             all_items.extend(new_results)
             print(f"        Found {len(results)} total, {len(new_results)} unique | Running total: {len(all_items)}")
             
-            await asyncio.sleep(0.15)  # Rate limiting
             
         return all_items
         
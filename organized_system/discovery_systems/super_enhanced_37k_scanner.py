@@ -6,12 +6,17 @@ Combines all proven techniques to maximize lot discovery beyond 37k+
 
 import asyncio
 import json
+import os
+import sys
 import sqlite3
 from datetime import datetime
 import aiohttp
 import ssl
 from collections import defaultdict
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core_systems.product_classifier import scanner_brand_classifier
+
 class SuperEnhanced37KScanner:
     def __init__(self):
         self.sc_locations = ['Spartanburg', 'Greenville', 'Rock Hill', 'Gastonia', 'Anderson']
@@ -112,33 +117,7 @@ class SuperEnhanced37KScanner:
     
     def extract_brand(self, product_name):
         """Extract brand from product name."""
-        if not product_name:
-            return "Unknown"
-            
-        product_lower = product_name.lower()
-        
-        brands = {
-            'Apple': ['apple', 'macbook', 'iphone', 'ipad', 'imac'],
-            'Samsung': ['samsung'],
-            'Sony': ['sony'],
-            'LG': ['lg'],
-            'Dyson': ['dyson'],
-            'KitchenAid': ['kitchenaid'],
-            'DeWalt': ['dewalt'],
-            'Milwaukee': ['milwaukee'],
-            'Nintendo': ['nintendo'],
-            'Canon': ['canon'],
-            'Bose': ['bose'],
-            'Rolex': ['rolex'],
-            'Peloton': ['peloton']
-        }
-        
-        for brand, keywords in brands.items():
-            for keyword in keywords:
-                if keyword in product_lower:
-                    return brand
-                    
-        return "Other"
+        return scanner_brand_classifier.classify(product_name)
     
     def calculate_scores(self, lot):
         """Calculate opportunity scores."""
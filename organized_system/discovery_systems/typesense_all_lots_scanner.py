@@ -8,15 +8,22 @@ import asyncio
 import aiohttp
 import ssl
 import json
+import os
+import sys
 import sqlite3
 from datetime import datetime
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core_systems.lot_index import LotIndex
+
 class TypesenseAllLotsScanner:
-    def __init__(self):
+    def __init__(self, session_factory=None):
+        self.session_factory = session_factory  # e.g. auth_manager.aiohttp_session(authenticated=False), for a shared pool
         self.sc_locations = ['Anderson', 'Gastonia', 'Greenville', 'Rock Hill', 'Spartanburg']
         self.discovered_lots = {}
         self.seen_lot_ids = set()
         self.session = None
+        self.lot_index = LotIndex()
         
         # REAL TYPESENSE API (discovered by user)
         self.api_endpoint = "https://xczkhpt94lod37gqp.a1.typesense.net/multi_search"
@@ -202,20 +209,25 @@ class TypesenseAllLotsScanner:
         ssl_context.check_hostname = False
         ssl_context.verify_mode = ssl.CERT_NONE
         
-        connector = aiohttp.TCPConnector(ssl=ssl_context, limit=20)
         timeout = aiohttp.ClientTimeout(total=60)
+        headers = {
+            'Accept': 'application/json, text/plain, */*',
+            'Accept-Language': 'en-US,en;q=0.6',
+            'Content-Type': 'text/plain',
+            'Origin': 'https://www.mac.bid',
+            'Referer': 'https://www.mac.bid/',
+            'User-Agent': 'Mozilla/5.0 (Linux; Android 6.0; Nexus 5 Build/MRA58N) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Mobile Safari/537.36'
+        }
+        
+        if self.session_factory:
+            self.session = self.session_factory(headers=headers, verify_ssl=False, timeout=timeout)
+            return
         
+        connector = aiohttp.TCPConnector(ssl=ssl_context, limit=20)
         self.session = aiohttp.ClientSession(
             connector=connector,
             timeout=timeout,
-            headers={
-                'Accept': 'application/json, text/plain, */*',
-                'Accept-Language': 'en-US,en;q=0.6',
-                'Content-Type': 'text/plain',
-                'Origin': 'https://www.mac.bid',
-                'Referer': 'https://www.mac.bid/',
-                'User-Agent': 'Mozilla/5.0 (Linux; Android 6.0; Nexus 5 Build/MRA58N) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Mobile Safari/537.36'
-            }
+            headers=headers
         )
     
     def calculate_scores(self, lot):
@@ -421,6 +433,9 @@ class TypesenseAllLotsScanner:
             for lot in self.discovered_lots.values():
                 self.store_lot(lot)
             print("✅ All lots stored successfully")
+            
+            swept = self.lot_index.record_sweep(self.discovered_lots.values())
+            print(f"🗂️  Recorded sweep of {swept:,} lots in the local lot index stats")
         
         # Generate comprehensive report
         self.generate_typesense_report()
@@ -10,6 +10,7 @@ import numpy as np
 from datetime import datetime, timedelta
 import json
 import os
+import sys
 from typing import Dict, List, Tuple, Optional
 import pickle
 import warnings
@@ -27,6 +28,9 @@ except ImportError:
     print("⚠️  Scikit-learn not available. Install with: pip install scikit-learn")
     ML_AVAILABLE = False
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core_systems.product_classifier import pricing_brand_classifier, pricing_category_classifier
+
 class PredictivePricingModel:
     def __init__(self):
         self.db_path = "databases/predictive_pricing.db"
@@ -196,28 +200,11 @@ class PredictivePricingModel:
     
     def extract_brand(self, product_name: str) -> str:
         """Extract brand from product name"""
-        brands = ['APPLE', 'SONY', 'SAMSUNG', 'NINTENDO', 'DYSON', 'BOSE', 
-                 'DEWALT', 'MILWAUKEE', 'ECOVACS', 'ROOMBA', 'SHARK', 'BISSELL']
-        
-        for brand in brands:
-            if brand in product_name:
-                return brand
-        return 'OTHER'
+        return pricing_brand_classifier.classify(product_name)
     
     def extract_category(self, product_name: str) -> str:
         """Extract category from product name"""
-        categories = {
-            'ELECTRONICS': ['IPHONE', 'IPAD', 'MACBOOK', 'TV', 'SPEAKER', 'HEADPHONE', 'CAMERA'],
-            'GAMING': ['NINTENDO', 'XBOX', 'PLAYSTATION', 'SWITCH', 'GAME'],
-            'APPLIANCES': ['VACUUM', 'CLEANER', 'ROBOT', 'DYSON', 'SHARK', 'BISSELL'],
-            'TOOLS': ['DEWALT', 'MILWAUKEE', 'DRILL', 'SAW', 'TOOL'],
-            'AUDIO': ['SPEAKER', 'HEADPHONE', 'BOSE', 'SONY', 'BEATS']
-        }
-        
-        for category, keywords in categories.items():
-            if any(keyword in product_name for keyword in keywords):
-                return category
-        return 'OTHER'
+        return pricing_category_classifier.classify(product_name)
     
     def prepare_training_data(self) -> Tuple[pd.DataFrame, pd.Series]:
         """Prepare training data from historical auctions"""
@@ -11,6 +11,10 @@ import sqlite3
 from datetime import datetime
 from personalized_analytics import PersonalizedAnalytics
 import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core_systems.product_classifier import personal_brand_classifier, personal_category_classifier
 
 class PersonalRealtimeMonitor:
     def __init__(self):
@@ -143,35 +147,11 @@ class PersonalRealtimeMonitor:
     
     def extract_brand(self, product_name):
         """Extract brand from product name."""
-        brands = ['Apple', 'Sony', 'Samsung', 'Nintendo', 'Microsoft', 'Bose', 'Beats', 
-                 'Turtle Beach', 'Logitech', 'Razer', 'SteelSeries', 'HyperX', 'Corsair',
-                 'Dell', 'HP', 'Lenovo', 'ASUS', 'MSI', 'Alienware', 'MacBook', 'iPad',
-                 'iPhone', 'AirPods', 'PlayStation', 'Xbox', 'Switch']
-        
-        product_upper = product_name.upper()
-        for brand in brands:
-            if brand.upper() in product_upper:
-                return brand
-        return 'Other'
+        return personal_brand_classifier.classify(product_name)
     
     def categorize_item(self, product_name):
         """Categorize item based on product name."""
-        product_lower = product_name.lower()
-        
-        if any(word in product_lower for word in ['headphone', 'headset', 'earphone', 'earbud', 'airpods', 'speaker', 'soundbar', 'audio']):
-            return 'Audio'
-        elif any(word in product_lower for word in ['iphone', 'phone', 'smartphone', 'mobile']):
-            return 'Mobile'
-        elif any(word in product_lower for word in ['laptop', 'macbook', 'computer', 'pc', 'desktop']):
-            return 'Computing'
-        elif any(word in product_lower for word in ['gaming', 'xbox', 'playstation', 'nintendo', 'switch', 'ps5', 'ps4']):
-            return 'Gaming'
-        elif any(word in product_lower for word in ['tablet', 'ipad']):
-            return 'Tablet'
-        elif any(word in product_lower for word in ['tv', 'television', 'monitor', 'display']):
-            return 'Display'
-        else:
-            return 'Electronics'
+        return personal_category_classifier.classify(product_name)
     
     async def monitor_for_opportunities(self):
         """Monitor auctions for personalized opportunities."""
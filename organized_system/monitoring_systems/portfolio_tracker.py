@@ -11,6 +11,35 @@ import statistics
 from collections import defaultdict
 import argparse
 
+# Per-bid contribution to portfolio_daily_summary; {row} is NEW, OLD or bids
+SUMMARY_MEASURES = {
+    'bids': "1",
+    'wins': "COALESCE({row}.won_auction, 0)",
+    'spent': "CASE WHEN {row}.won_auction = 1 THEN COALESCE({row}.final_price_paid, 0) ELSE 0 END",
+    'retail_value': "CASE WHEN {row}.won_auction = 1 THEN COALESCE({row}.retail_price, 0) ELSE 0 END",
+    'savings': "CASE WHEN {row}.won_auction = 1 THEN COALESCE({row}.savings_amount, 0) ELSE 0 END",
+    'savings_percent_sum': "CASE WHEN {row}.won_auction = 1 THEN COALESCE({row}.savings_percent, 0) ELSE 0 END",
+    'savings_percent_count': "CASE WHEN {row}.won_auction = 1 AND {row}.savings_percent IS NOT NULL THEN 1 ELSE 0 END",
+    'accuracy_sum': "COALESCE({row}.recommendation_accuracy, 0)",
+    'accuracy_count': "CASE WHEN {row}.recommendation_accuracy IS NOT NULL THEN 1 ELSE 0 END",
+    'followed': "COALESCE({row}.followed_recommendation, 0)",
+}
+
+SUMMARY_COUNTS = {'bids', 'wins', 'savings_percent_count', 'accuracy_count', 'followed'}
+
+SUMMARY_KEY = "COALESCE(date({row}.bid_placed_date), ''), COALESCE({row}.category, 'Unknown'), COALESCE({row}.brand, 'Unknown')"
+
+def summary_upsert(row, sign):
+    """SQL adding (sign '+') or retracting (sign '-') one bid row's contribution."""
+    columns = ', '.join(SUMMARY_MEASURES)
+    values = ', '.join(f"{sign}({expression.format(row=row)})" for expression in SUMMARY_MEASURES.values())
+    updates = ', '.join(f"{column} = {column} + excluded.{column}" for column in SUMMARY_MEASURES)
+    return f'''
+        INSERT INTO portfolio_daily_summary (summary_date, category, brand, {columns})
+        VALUES ({SUMMARY_KEY.format(row=row)}, {values})
+        ON CONFLICT (summary_date, category, brand) DO UPDATE SET {updates};
+    '''
+
 class PortfolioTracker:
     def __init__(self, db_path="portfolio_tracker.db"):
         self.db_path = db_path
@@ -119,9 +148,69 @@ class PortfolioTracker:
             )
         ''')
         
+        self.setup_summary_table(cursor)
+        
         conn.commit()
         conn.close()
+    
+    def setup_summary_table(self, cursor):
+        """Create the per day/category/brand summary, kept current by triggers on bids."""
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'portfolio_daily_summary'")
+        exists = cursor.fetchone() is not None
+        
+        measure_columns = ',\n'.join(
+            f"                {column} {'INTEGER' if column in SUMMARY_COUNTS else 'REAL'} DEFAULT 0"
+            for column in SUMMARY_MEASURES
+        )
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS portfolio_daily_summary (
+                summary_date TEXT,
+                category TEXT,
+                brand TEXT,
+{measure_columns},
+                PRIMARY KEY (summary_date, category, brand)
+            )
+        ''')
+        
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS bids_summary_insert AFTER INSERT ON bids
+            BEGIN
+                {summary_upsert('NEW', '+')}
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS bids_summary_update AFTER UPDATE ON bids
+            BEGIN
+                {summary_upsert('OLD', '-')}
+                {summary_upsert('NEW', '+')}
+                DELETE FROM portfolio_daily_summary WHERE bids <= 0;
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS bids_summary_delete AFTER DELETE ON bids
+            BEGIN
+                {summary_upsert('OLD', '-')}
+                DELETE FROM portfolio_daily_summary WHERE bids <= 0;
+            END
+        ''')
         
+        # Databases created before the summary existed get backfilled once
+        if not exists:
+            self.rebuild_summary(cursor)
+    
+    def rebuild_summary(self, cursor):
+        """Recompute portfolio_daily_summary from the full bids table."""
+        columns = ', '.join(SUMMARY_MEASURES)
+        sums = ', '.join(f"SUM({expression.format(row='bids')})" for expression in SUMMARY_MEASURES.values())
+        
+        cursor.execute('DELETE FROM portfolio_daily_summary')
+        cursor.execute(f'''
+            INSERT INTO portfolio_daily_summary (summary_date, category, brand, {columns})
+            SELECT {SUMMARY_KEY.format(row='bids')}, {sums}
+            FROM bids
+            GROUP BY 1, 2, 3
+        ''')
+    
     def add_bid(self, lot_id, product_name, brand, category, auction_location,
                 retail_price, instant_win_price, my_bid_amount, 
                 predicted_winning_bid=None, suggested_bid_min=None, suggested_bid_max=None,
@@ -169,54 +258,94 @@ class PortfolioTracker:
         
     def update_bid_result(self, lot_id, won_auction, winning_bid_amount, final_price_paid=None):
         """Update bid result after auction ends."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Get bid details
-        cursor.execute('''
-            SELECT retail_price, instant_win_price, my_bid_amount, 
-                   predicted_winning_bid, followed_recommendation
-            FROM bids WHERE lot_id = ?
-        ''', (lot_id,))
+        outcomes = self.update_bid_results([(lot_id, won_auction, winning_bid_amount, final_price_paid)])
         
-        result = cursor.fetchone()
-        if not result:
+        if lot_id not in outcomes:
             print(f"⚠️ No bid found for lot {lot_id}")
-            conn.close()
             return False
             
-        retail_price, instant_win_price, my_bid_amount, predicted_winning_bid, followed_recommendation = result
+        final_price_paid, savings_amount, savings_percent = outcomes[lot_id]
         
-        # Calculate performance metrics
-        if final_price_paid is None:
-            final_price_paid = winning_bid_amount if won_auction else 0
+        if won_auction:
+            print(f"🎉 Won auction for lot {lot_id}! Paid ${final_price_paid}, saved ${savings_amount:.2f} ({savings_percent:.1f}%)")
+        else:
+            print(f"😞 Lost auction for lot {lot_id}. Winning bid: ${winning_bid_amount}")
             
-        savings_amount = 0
-        savings_percent = 0
-        roi_percent = 0
-        
-        if won_auction and final_price_paid > 0:
-            if retail_price > 0:
-                savings_amount = retail_price - final_price_paid
-                savings_percent = (savings_amount / retail_price) * 100
-                roi_percent = ((retail_price - final_price_paid) / final_price_paid) * 100
+        return True
+        
+    def update_bid_results(self, results):
+        """Record several auction results in one transaction.
+        
+        ``results`` holds (lot_id, won_auction, winning_bid_amount, final_price_paid)
+        tuples; final_price_paid may be None. Returns {lot_id: (final_price_paid,
+        savings_amount, savings_percent)} for the lots that were found.
+        """
+        results = list(results)
+        if not results:
+            return {}
+            
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        # Get bid details for every lot up front
+        details = {}
+        lot_ids = [result[0] for result in results]
+        for start in range(0, len(lot_ids), 500):
+            chunk = lot_ids[start:start + 500]
+            cursor.execute(f'''
+                SELECT lot_id, retail_price, instant_win_price, my_bid_amount, 
+                       predicted_winning_bid, followed_recommendation
+                FROM bids WHERE lot_id IN ({', '.join('?' * len(chunk))})
+            ''', chunk)
+            for row in cursor.fetchall():
+                details[row[0]] = row[1:]
+                
+        updates = []
+        outcomes = {}
+        
+        for lot_id, won_auction, winning_bid_amount, final_price_paid in results:
+            if lot_id not in details:
+                continue
                 
-        # Calculate recommendation accuracy
-        recommendation_accuracy = None
-        if predicted_winning_bid and winning_bid_amount:
-            accuracy = 100 - abs((predicted_winning_bid - winning_bid_amount) / winning_bid_amount * 100)
-            recommendation_accuracy = max(0, accuracy)
+            retail_price, instant_win_price, my_bid_amount, predicted_winning_bid, followed_recommendation = details[lot_id]
             
-        # Determine bid status
-        if won_auction:
-            bid_status = 'WON'
-        elif my_bid_amount < winning_bid_amount:
-            bid_status = 'OUTBID'
-        else:
-            bid_status = 'LOST'
+            # Calculate performance metrics
+            if final_price_paid is None:
+                final_price_paid = winning_bid_amount if won_auction else 0
+                
+            savings_amount = 0
+            savings_percent = 0
+            roi_percent = 0
             
-        # Update bid record
-        cursor.execute('''
+            if won_auction and final_price_paid > 0:
+                if retail_price > 0:
+                    savings_amount = retail_price - final_price_paid
+                    savings_percent = (savings_amount / retail_price) * 100
+                    roi_percent = ((retail_price - final_price_paid) / final_price_paid) * 100
+                    
+            # Calculate recommendation accuracy
+            recommendation_accuracy = None
+            if predicted_winning_bid and winning_bid_amount:
+                accuracy = 100 - abs((predicted_winning_bid - winning_bid_amount) / winning_bid_amount * 100)
+                recommendation_accuracy = max(0, accuracy)
+                
+            # Determine bid status
+            if won_auction:
+                bid_status = 'WON'
+            elif my_bid_amount < winning_bid_amount:
+                bid_status = 'OUTBID'
+            else:
+                bid_status = 'LOST'
+                
+            updates.append((
+                winning_bid_amount, final_price_paid, 1 if won_auction else 0,
+                bid_status, savings_amount, savings_percent, roi_percent,
+                recommendation_accuracy, lot_id
+            ))
+            outcomes[lot_id] = (final_price_paid, savings_amount, savings_percent)
+            
+        # Update bid records; triggers keep portfolio_daily_summary in step
+        cursor.executemany('''
             UPDATE bids SET
                 winning_bid_amount = ?,
                 final_price_paid = ?,
@@ -228,21 +357,12 @@ class PortfolioTracker:
                 recommendation_accuracy = ?,
                 result_recorded_date = CURRENT_TIMESTAMP
             WHERE lot_id = ?
-        ''', (
-            winning_bid_amount, final_price_paid, 1 if won_auction else 0,
-            bid_status, savings_amount, savings_percent, roi_percent,
-            recommendation_accuracy, lot_id
-        ))
+        ''', updates)
         
         conn.commit()
         conn.close()
         
-        if won_auction:
-            print(f"🎉 Won auction for lot {lot_id}! Paid ${final_price_paid}, saved ${savings_amount:.2f} ({savings_percent:.1f}%)")
-        else:
-            print(f"😞 Lost auction for lot {lot_id}. Winning bid: ${winning_bid_amount}")
-            
-        return True
+        return outcomes
         
     def add_to_watchlist(self, lot_id, product_name, brand, category, auction_location,
                         retail_price, instant_win_price, predicted_winning_bid=None,
@@ -278,25 +398,25 @@ class PortfolioTracker:
             conn.close()
             
     def get_portfolio_performance(self, days=30):
-        """Get portfolio performance summary."""
+        """Get portfolio performance summary from the daily summary table."""
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
-        since_date = datetime.now() - timedelta(days=days)
+        since_date = (datetime.now() - timedelta(days=days)).date()
         
         # Overall statistics
         cursor.execute('''
             SELECT 
-                COUNT(*) as total_bids,
-                0 as total_wins,
-                0 as avg_savings_percent,
-                0 as total_spent,
-                0 as total_retail_value,
-                0 as total_savings,
-                0 as avg_recommendation_accuracy,
-                0 as recommendations_followed
-            FROM bids 
-            WHERE bid_placed_date > ?
+                SUM(bids) as total_bids,
+                SUM(wins) as total_wins,
+                SUM(savings_percent_sum) / NULLIF(SUM(savings_percent_count), 0) as avg_savings_percent,
+                SUM(spent) as total_spent,
+                SUM(retail_value) as total_retail_value,
+                SUM(savings) as total_savings,
+                SUM(accuracy_sum) / NULLIF(SUM(accuracy_count), 0) as avg_recommendation_accuracy,
+                SUM(followed) as recommendations_followed
+            FROM portfolio_daily_summary 
+            WHERE summary_date >= ?
         ''', (since_date.isoformat(),))
         
         stats = cursor.fetchone()
@@ -305,11 +425,11 @@ class PortfolioTracker:
         cursor.execute('''
             SELECT 
                 category,
-                COUNT(*) as bids,
-                0 as wins,
-                0 as avg_savings
-            FROM bids 
-            WHERE bid_placed_date > ?
+                SUM(bids) as bids,
+                SUM(wins) as wins,
+                SUM(savings_percent_sum) / NULLIF(SUM(savings_percent_count), 0) as avg_savings
+            FROM portfolio_daily_summary 
+            WHERE summary_date >= ?
             GROUP BY category
             ORDER BY bids DESC
         ''', (since_date.isoformat(),))
@@ -320,11 +440,11 @@ class PortfolioTracker:
         cursor.execute('''
             SELECT 
                 brand,
-                COUNT(*) as bids,
-                0 as wins,
-                0 as avg_savings
-            FROM bids 
-            WHERE bid_placed_date > ? AND brand != 'Unknown'
+                SUM(bids) as bids,
+                SUM(wins) as wins,
+                SUM(savings_percent_sum) / NULLIF(SUM(savings_percent_count), 0) as avg_savings
+            FROM portfolio_daily_summary 
+            WHERE summary_date >= ? AND brand != 'Unknown'
             GROUP BY brand
             ORDER BY bids DESC
         ''', (since_date.isoformat(),))
@@ -336,8 +456,8 @@ class PortfolioTracker:
         # Calculate derived metrics
         total_bids, total_wins, avg_savings_percent, total_spent, total_retail_value, total_savings, avg_recommendation_accuracy, recommendations_followed = stats
         
-        win_rate = (total_wins / total_bids * 100) if total_bids > 0 else 0
-        roi_percent = (total_savings / total_spent * 100) if total_spent > 0 else 0
+        win_rate = (total_wins / total_bids * 100) if total_bids else 0
+        roi_percent = (total_savings / total_spent * 100) if total_spent else 0
         
         return {
             'period_days': days,
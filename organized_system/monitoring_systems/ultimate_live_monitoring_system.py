@@ -8,7 +8,10 @@ import asyncio
 import aiohttp
 import ssl
 import json
+import os
+import sys
 import sqlite3
+from collections import deque
 from datetime import datetime, timedelta
 from pathlib import Path
 from playwright.async_api import async_playwright
@@ -19,6 +22,9 @@ from email.mime.multipart import MimeMultipart
 import logging
 from typing import Dict, List, Optional
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core_systems.alert_throttle import get_alert_throttle
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -36,6 +42,8 @@ class UltimateLiveMonitoringSystem:
         self.setup_session_config()
         self.setup_database()
         self.setup_alert_config()
+        self.recent_bids = self.load_recent_bids()
+        self.alert_throttle = get_alert_throttle(self.db_path)
         
         self.sc_locations = ['Spartanburg', 'Greenville', 'Rock Hill', 'Gastonia', 'Anderson']
         self.premium_brands = ['Apple', 'Sony', 'Samsung', 'Nintendo', 'Dyson', 'Bose', 'DeWalt', 'Milwaukee']
@@ -164,8 +172,30 @@ class UltimateLiveMonitoringSystem:
             'closing_soon_hours': 24,  # Alert if closing within 24 hours
             'high_value_threshold': 500.0,  # Alert for items over $500 retail
             'discount_threshold': 70.0,  # Alert if discount > 70%
+            'repeat_alert_interval': 3600,  # Suppress identical alerts for an hour
         }
     
+    def load_recent_bids(self) -> Dict[str, deque]:
+        """Load the last two recorded bids per lot so alert checks don't query history."""
+        recent_bids = {}
+        
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT lot_id, current_bid FROM (
+                    SELECT lot_id, current_bid, timestamp,
+                           ROW_NUMBER() OVER (PARTITION BY lot_id ORDER BY timestamp DESC) AS recency
+                    FROM bid_history
+                )
+                WHERE recency <= 2
+                ORDER BY lot_id, timestamp
+            ''')
+            
+            for lot_id, current_bid in cursor.fetchall():
+                recent_bids.setdefault(lot_id, deque(maxlen=2)).append(current_bid)
+        
+        return recent_bids
+    
     async def discover_lots_at_scale(self, session: aiohttp.ClientSession) -> List[Dict]:
         """Discover lots at scale using multiple search terms and categories."""
         logger.info("🔍 Discovering lots at scale...")
@@ -368,54 +398,49 @@ class UltimateLiveMonitoringSystem:
             ))
             
             conn.commit()
+        
+        self.recent_bids.setdefault(lot_id, deque(maxlen=2)).append(bid_data['current_bid'])
     
     def check_for_alerts(self, lot_id: str, current_bid: float, lot_data: Dict) -> List[Dict]:
         """Check if any alerts should be triggered."""
         alerts = []
         
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Get previous bid data
-            cursor.execute('''
-                SELECT current_bid FROM bid_history 
-                WHERE lot_id = ? 
-                ORDER BY timestamp DESC 
-                LIMIT 2
-            ''', (lot_id,))
-            
-            bid_history = cursor.fetchall()
+        # Most recent first, matching the bid_history ordering
+        bid_history = list(reversed(self.recent_bids.get(lot_id, ())))
+        
+        # New bid alert
+        if len(bid_history) == 1 and current_bid > 0:  # First bid
+            alerts.append({
+                'type': 'first_bid',
+                'message': f"🎯 FIRST BID: ${current_bid:.2f} on {lot_data.get('product_name', 'Unknown')}"
+            })
+        
+        # Bid increase alert
+        elif len(bid_history) >= 2:
+            previous_bid = bid_history[1]
+            increase = current_bid - previous_bid
             
-            # New bid alert
-            if len(bid_history) == 1 and current_bid > 0:  # First bid
+            if increase >= self.alert_config['bid_increase_threshold']:
                 alerts.append({
-                    'type': 'first_bid',
-                    'message': f"🎯 FIRST BID: ${current_bid:.2f} on {lot_data.get('product_name', 'Unknown')}"
+                    'type': 'bid_increase',
+                    'message': f"📈 BID INCREASE: +${increase:.2f} (${previous_bid:.2f} → ${current_bid:.2f}) on {lot_data.get('product_name', 'Unknown')}"
                 })
+        
+        # High value / discount alerts
+        retail_price = float(lot_data.get('retail_price', 0))
+        if retail_price > self.alert_config['high_value_threshold'] and current_bid > 0:
+            discount = ((retail_price - current_bid) / retail_price) * 100
             
-            # Bid increase alert
-            elif len(bid_history) >= 2:
-                previous_bid = bid_history[1][0]
-                increase = current_bid - previous_bid
-                
-                if increase >= self.alert_config['bid_increase_threshold']:
-                    alerts.append({
-                        'type': 'bid_increase',
-                        'message': f"📈 BID INCREASE: +${increase:.2f} (${previous_bid:.2f} → ${current_bid:.2f}) on {lot_data.get('product_name', 'Unknown')}"
-                    })
-            
-            # High value / discount alerts
-            retail_price = float(lot_data.get('retail_price', 0))
-            if retail_price > self.alert_config['high_value_threshold'] and current_bid > 0:
-                discount = ((retail_price - current_bid) / retail_price) * 100
-                
-                if discount >= self.alert_config['discount_threshold']:
-                    alerts.append({
-                        'type': 'high_discount',
-                        'message': f"💰 HIGH DISCOUNT: {discount:.1f}% off ${retail_price:.2f} retail (current bid: ${current_bid:.2f}) on {lot_data.get('product_name', 'Unknown')}"
-                    })
+            if discount >= self.alert_config['discount_threshold']:
+                alerts.append({
+                    'type': 'high_discount',
+                    'message': f"💰 HIGH DISCOUNT: {discount:.1f}% off ${retail_price:.2f} retail (current bid: ${current_bid:.2f}) on {lot_data.get('product_name', 'Unknown')}"
+                })
         
-        return alerts
+        # Drop alerts identical to one already raised for this lot within the repeat window
+        return [alert for alert in alerts
+                if not self.alert_throttle.should_throttle(f"{lot_id}_{alert['type']}_{alert['message']}",
+                                                           self.alert_config['repeat_alert_interval'])]
     
     def store_alerts(self, lot_id: str, alerts: List[Dict]):
         """Store alerts in database."""
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+📬 Alert Dispatcher - Batched background delivery for email and webhook alerts
+Per-channel bounded queues drained on a background event loop; alerts arriving within
+a short window are coalesced into one digest per channel over persistent connections
+"""
+
+import atexit
+import asyncio
+import smtplib
+import threading
+import concurrent.futures
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+from typing import Callable, Dict, List, Optional, Tuple
+
+import aiohttp
+
+class WebhookChannel:
+    """POSTs digests over one keep-alive HTTP session.
+
+    ``build_payloads`` turns a batch of queued items into one or more JSON payloads
+    (more than one when the receiver has a size limit).
+    """
+
+    def __init__(self, url: str, build_payloads: Callable[[List], List[Dict]],
+                 headers: Optional[Dict] = None, ok_statuses: Tuple[int, ...] = (200,),
+                 timeout: float = 10):
+        self.url = url
+        self.build_payloads = build_payloads
+        self.headers = headers or {}
+        self.ok_statuses = ok_statuses
+        self.timeout = timeout
+        self.session = None
+
+    async def send_batch(self, items: List) -> bool:
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+
+        success = True
+        for payload in self.build_payloads(items):
+            async with self.session.post(self.url, json=payload) as response:
+                if response.status not in self.ok_statuses:
+                    print(f"⚠️ Webhook {self.url} returned HTTP {response.status}")
+                    success = False
+        return success
+
+    async def close(self):
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+
+class SmtpChannel:
+    """Sends digests over one SMTP connection, reconnecting when the server drops it.
+
+    ``settings`` uses the notification config keys (smtp_server, smtp_port, username,
+    password, from_email, to_emails, optional use_tls). ``build_message`` returns the
+    subject and plain-text body for a batch.
+    """
+
+    def __init__(self, settings: Dict, build_message: Callable[[List], Tuple[str, str]]):
+        self.settings = settings
+        self.build_message = build_message
+        self.server = None
+
+    def connect(self):
+        server = smtplib.SMTP(self.settings["smtp_server"], self.settings["smtp_port"], timeout=30)
+        if self.settings.get("use_tls", True):
+            server.starttls()
+        if self.settings.get("username"):
+            server.login(self.settings["username"], self.settings["password"])
+        self.server = server
+
+    def send_sync(self, items: List) -> bool:
+        subject, body = self.build_message(items)
+
+        msg = MIMEMultipart()
+        msg['From'] = self.settings["from_email"]
+        msg['To'] = ", ".join(self.settings["to_emails"])
+        msg['Subject'] = subject
+        msg.attach(MIMEText(body, 'plain'))
+
+        # One retry covers a connection the server closed while idle
+        for attempt in range(2):
+            try:
+                if self.server is None:
+                    self.connect()
+                self.server.sendmail(self.settings["from_email"], self.settings["to_emails"], msg.as_string())
+                return True
+            except (smtplib.SMTPServerDisconnected, ConnectionError):
+                self.server = None
+                if attempt:
+                    raise
+        return False
+
+    async def send_batch(self, items: List) -> bool:
+        # smtplib blocks; keep it off the loop so webhook channels keep flowing
+        return await asyncio.get_running_loop().run_in_executor(None, self.send_sync, items)
+
+    async def close(self):
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self.server = None
+
+class AlertDispatcher:
+    """Coalescing, bounded, fire-and-forget delivery on a background event loop.
+
+    ``submit`` never blocks the caller: it hands the item to the dispatcher thread and
+    returns a future that resolves to the delivery result of the digest the item ended
+    up in. When a channel's queue is full the oldest queued item is dropped (its future
+    resolves to False) so a slow or dead endpoint can't back up a monitoring cycle.
+    """
+
+    def __init__(self, coalesce_window: float = 2.0, max_batch: int = 25, max_queue: int = 200):
+        self.coalesce_window = coalesce_window
+        self.max_batch = max_batch
+        self.max_queue = max_queue
+
+        self.channels: Dict[str, Tuple[object, asyncio.Queue]] = {}
+        self.workers: Dict[str, asyncio.Task] = {}
+        self.stats: Dict[str, Dict[str, int]] = {}
+        self.closed = False
+
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.run_loop, name="alert-dispatcher", daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def add_channel(self, name: str, channel) -> bool:
+        """Register a channel; returns False if ``name`` is already registered."""
+        if name in self.channels:
+            return False
+        return asyncio.run_coroutine_threadsafe(self._add_channel(name, channel), self.loop).result()
+
+    async def _add_channel(self, name: str, channel) -> bool:
+        if name in self.channels:
+            return False
+        queue = asyncio.Queue()
+        self.channels[name] = (channel, queue)
+        self.stats[name] = {'queued': 0, 'dropped': 0, 'digests': 0, 'delivered': 0, 'failed': 0}
+        self.workers[name] = self.loop.create_task(self.worker(name, channel, queue))
+        return True
+
+    def submit(self, name: str, item) -> concurrent.futures.Future:
+        """Queue ``item`` on channel ``name`` without waiting for delivery."""
+        future = concurrent.futures.Future()
+        if self.closed or name not in self.channels:
+            future.set_result(False)
+            return future
+
+        self.loop.call_soon_threadsafe(self.enqueue, name, item, future)
+        return future
+
+    def enqueue(self, name: str, item, future: concurrent.futures.Future):
+        channel, queue = self.channels[name]
+        stats = self.stats[name]
+
+        if queue.qsize() >= self.max_queue:
+            _, dropped = queue.get_nowait()
+            queue.task_done()
+            dropped.set_result(False)
+            stats['dropped'] += 1
+
+        queue.put_nowait((item, future))
+        stats['queued'] += 1
+
+    async def collect_batch(self, queue: asyncio.Queue) -> List:
+        """First queued entry plus whatever arrives within the coalescing window."""
+        batch = [await queue.get()]
+        deadline = self.loop.time() + self.coalesce_window
+
+        while len(batch) < self.max_batch:
+            if not queue.empty():
+                batch.append(queue.get_nowait())
+                continue
+
+            remaining = deadline - self.loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def worker(self, name: str, channel, queue: asyncio.Queue):
+        stats = self.stats[name]
+
+        while True:
+            batch = await self.collect_batch(queue)
+            items = [item for item, _ in batch]
+
+            try:
+                success = await channel.send_batch(items)
+            except Exception as e:
+                print(f"⚠️ Alert channel {name} failed to send {len(items)} alert(s): {e}")
+                success = False
+
+            stats['digests'] += 1
+            stats['delivered' if success else 'failed'] += len(items)
+
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(success)
+                queue.task_done()
+
+    def flush(self, timeout: float = 30) -> bool:
+        """Block until every queued alert has been attempted; False on timeout."""
+        if self.closed:
+            return True
+
+        async def drain():
+            await asyncio.gather(*(queue.join() for _, queue in self.channels.values()))
+
+        try:
+            asyncio.run_coroutine_threadsafe(drain(), self.loop).result(timeout)
+            return True
+        except concurrent.futures.TimeoutError:
+            return False
+
+    def close(self, timeout: float = 30):
+        """Flush pending digests, close connections and stop the loop."""
+        if self.closed:
+            return
+        self.flush(timeout)
+        self.closed = True
+
+        async def shutdown():
+            for task in self.workers.values():
+                task.cancel()
+            await asyncio.gather(*self.workers.values(), return_exceptions=True)
+            for channel, _ in self.channels.values():
+                await channel.close()
+
+        try:
+            asyncio.run_coroutine_threadsafe(shutdown(), self.loop).result(timeout)
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join(timeout)
+
+_dispatcher: Optional[AlertDispatcher] = None
+_dispatcher_lock = threading.Lock()
+
+def get_alert_dispatcher() -> AlertDispatcher:
+    """Process-wide dispatcher shared by every notifier."""
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None or _dispatcher.closed:
+            _dispatcher = AlertDispatcher()
+        return _dispatcher
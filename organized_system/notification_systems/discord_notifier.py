@@ -5,13 +5,18 @@ Sends real-time alerts for high-value auction opportunities.
 """
 
 import asyncio
-import aiohttp
 import json
 import os
+import sys
 import logging
 from datetime import datetime
 from typing import List, Dict, Optional
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from notification_systems.alert_dispatcher import WebhookChannel, get_alert_dispatcher
+
+DISCORD_MESSAGE_LIMIT = 2000
+
 class DiscordNotifier:
     def __init__(self, webhook_url: Optional[str] = None):
         self.webhook_url = webhook_url or os.getenv('DISCORD_WEBHOOK_URL', '')
@@ -22,6 +27,14 @@ class DiscordNotifier:
         self.min_opportunity_score = 0.8  # 80%+ opportunity score
         self.max_notifications_per_run = 10  # Limit spam
         
+        # Messages sent close together share one webhook post over a keep-alive session
+        self.dispatcher = get_alert_dispatcher()
+        self.channel_name = f"discord:{self.webhook_url}"
+        if self.webhook_url:
+            self.dispatcher.add_channel(self.channel_name, WebhookChannel(
+                self.webhook_url, self.build_payloads, ok_statuses=(200, 204)
+            ))
+        
     def setup_logging(self):
         """Setup logging"""
         logging.basicConfig(level=logging.INFO)
@@ -55,8 +68,24 @@ class DiscordNotifier:
         
         return message
         
+    def build_payloads(self, messages: List[str]) -> List[Dict]:
+        """Pack queued messages into as few posts as Discord's length limit allows"""
+        contents = []
+        for message in messages:
+            message = message[:DISCORD_MESSAGE_LIMIT]
+            if contents and len(contents[-1]) + 2 + len(message) <= DISCORD_MESSAGE_LIMIT:
+                contents[-1] += "\n\n" + message
+            else:
+                contents.append(message)
+                
+        return [{
+            "content": content,
+            "username": "Mac.bid Opportunity Bot",
+            "avatar_url": "https://mac.bid/favicon.ico"
+        } for content in contents]
+        
     async def send_notification(self, message: str) -> bool:
-        """Send Discord notification"""
+        """Queue Discord notification; returns once queued, delivery is logged when the digest posts"""
         if not self.webhook_url:
             self.logger.warning("⚠️ No Discord webhook URL configured")
             return False
@@ -65,25 +94,19 @@ class DiscordNotifier:
             self.logger.info("ℹ️ No high-priority opportunities to notify")
             return True
             
+        queued = self.dispatcher.submit(self.channel_name, message)
+        queued.add_done_callback(self.log_delivery)
+        return not (queued.done() and not queued.result())
+        
+    def log_delivery(self, delivered):
+        """Log the outcome of a queued notification (runs on the dispatcher thread)"""
         try:
-            async with aiohttp.ClientSession() as session:
-                payload = {
-                    "content": message[:2000],  # Discord 2000 char limit
-                    "username": "Mac.bid Opportunity Bot",
-                    "avatar_url": "https://mac.bid/favicon.ico"
-                }
-                
-                async with session.post(self.webhook_url, json=payload) as response:
-                    if response.status == 204:
-                        self.logger.info("✅ Discord notification sent successfully")
-                        return True
-                    else:
-                        self.logger.error(f"❌ Discord notification failed: {response.status}")
-                        return False
-                        
+            if delivered.result():
+                self.logger.info("✅ Discord notification sent successfully")
+            else:
+                self.logger.error("❌ Discord notification failed")
         except Exception as e:
             self.logger.error(f"❌ Discord notification error: {e}")
-            return False
             
     async def send_opportunities(self, opportunities: List[Dict]) -> bool:
         """Send opportunities notification"""
@@ -136,8 +159,9 @@ def main():
     ]
     
     async def test():
-        success = await notifier.send_opportunities(test_opportunities)
-        print(f"Test notification {'sent' if success else 'failed'}")
+        queued = await notifier.send_opportunities(test_opportunities)
+        await asyncio.to_thread(notifier.dispatcher.flush)
+        print(f"Test notification {'queued' if queued else 'failed'}")
         
     asyncio.run(test())
 
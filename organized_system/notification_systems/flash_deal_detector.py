@@ -8,13 +8,21 @@ import asyncio
 import aiohttp
 import ssl
 import json
+import os
+import sys
 import sqlite3
 from datetime import datetime, timedelta
 from collections import defaultdict
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core_systems.lot_index import LotIndex
+from core_systems.search_gateway import get_search_gateway
+
 class FlashDealDetector:
     def __init__(self):
         self.session = None
+        self.lot_index = LotIndex()
+        self.search_gateway = get_search_gateway()
         self.sc_locations = ["Spartanburg", "Greenville", "Rock Hill", "Gastonia", "Anderson"]
         self.db_file = "flash_deals.db"
         self.init_database()
@@ -103,27 +111,26 @@ class FlashDealDetector:
             await asyncio.sleep(0.25)
             
     async def search_for_term(self, term, limit=150):
-        """Search for a specific term."""
-        url = f"https://api.macdiscount.com/search?q={term}&limit={limit}"
-        
+        """Search for a specific term, answering from the local lot index when it is fresh."""
+        indexed_hits = self.lot_index.lookup(term, limit, self.sc_locations)
+        if indexed_hits is not None:
+            return indexed_hits
+            
         try:
-            async with self.session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    hits = data.get('hits', [])
-                    
-                    # Filter to SC locations only
-                    sc_hits = []
-                    for hit in hits:
-                        if hit.get('auction_location') in self.sc_locations:
-                            sc_hits.append(hit)
-                            
-                    return sc_hits
-                else:
-                    return []
+            hits = await self.search_gateway.search(self.session, term, limit)
         except Exception as e:
             return []
             
+        self.lot_index.add_lots(hits, term=term)
+        
+        # Filter to SC locations only
+        sc_hits = []
+        for hit in hits:
+            if hit.get('auction_location') in self.sc_locations:
+                sc_hits.append(hit)
+                
+        return sc_hits
+            
     def calculate_flash_score(self, item):
         """Calculate flash deal score based on savings and value."""
         retail_price = item.get('retail_price', 0)
@@ -194,7 +201,6 @@ class FlashDealDetector:
             all_deals.extend(flash_deals)
             print(f"      Found {len(results)} items, {len(flash_deals)} flash deals")
             
-            await asyncio.sleep(0.2)  # Rate limiting
             
         return all_deals
         
@@ -5,6 +5,8 @@ Supports email, Discord, Slack, SMS, and console notifications with intelligent
 """
 
 import json
+import os
+import sys
 import sqlite3
 import smtplib
 import requests
@@ -15,12 +17,16 @@ from email.mime.multipart import MIMEMultipart
 import asyncio
 import aiohttp
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core_systems.alert_throttle import get_alert_throttle
+
 class NotificationSystem:
     def __init__(self, config_file="notification_config.json"):
         self.config_file = config_file
         self.db_path = "notifications.db"
         self.config = self.load_config()
         self.setup_database()
+        self.throttle = get_alert_throttle(self.db_path)
         
     def load_config(self):
         """Load notification configuration."""
@@ -127,45 +133,10 @@ class NotificationSystem:
         """Check if alert should be throttled."""
         # Create hash for similar alerts
         alert_hash = f"{alert['type']}_{alert['category']}_{alert.get('lot_id', 'unknown')}"
+        min_interval = self.config['preferences']['min_alert_interval']
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Check last sent time
-        cursor.execute('''
-            SELECT last_sent, send_count FROM alert_throttling 
-            WHERE alert_hash = ?
-        ''', (alert_hash,))
-        
-        result = cursor.fetchone()
-        
-        if result:
-            last_sent_str, send_count = result
-            last_sent = datetime.fromisoformat(last_sent_str)
-            time_diff = (datetime.now() - last_sent).total_seconds()
-            
-            min_interval = self.config['preferences']['min_alert_interval']
-            
-            if time_diff < min_interval:
-                conn.close()
-                return True  # Throttle
-                
-            # Update throttling record
-            cursor.execute('''
-                UPDATE alert_throttling 
-                SET last_sent = CURRENT_TIMESTAMP, send_count = send_count + 1
-                WHERE alert_hash = ?
-            ''', (alert_hash,))
-        else:
-            # First time seeing this alert
-            cursor.execute('''
-                INSERT INTO alert_throttling (alert_hash, last_sent)
-                VALUES (?, CURRENT_TIMESTAMP)
-            ''', (alert_hash,))
-            
-        conn.commit()
-        conn.close()
-        return False
+        # Answered from memory; send times are checkpointed to alert_throttling
+        return self.throttle.should_throttle(alert_hash, min_interval)
         
     def should_send_alert(self, alert):
         """Determine if alert should be sent based on all filters."""
@@ -5,20 +5,29 @@ Send alerts via multiple channels for high-priority auction opportunities
 """
 
 import json
+import os
+import re
+import sys
 import sqlite3
-import smtplib
-import requests
 from datetime import datetime
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 import argparse
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core_systems.product_classifier import trie_pattern
+from notification_systems.alert_dispatcher import SmtpChannel, WebhookChannel, get_alert_dispatcher
+
 class SmartAlerts:
     def __init__(self):
         self.db_path = "smart_alerts.db"
         self.config_path = "alert_config.json"
+        
+        # Compiled rules, rebuilt only when the alert_rules version counter moves
+        self.rules_version = None
+        self.compiled_rules = None
+        
         self.setup_database()
         self.load_config()
+        self.setup_channels()
         
     def setup_database(self):
         """Setup database for alert tracking"""
@@ -52,6 +61,24 @@ class SmartAlerts:
             )
         ''')
         
+        # Version counter bumped by triggers on any alert_rules change
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS alert_rules_version (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                version INTEGER DEFAULT 0
+            )
+        ''')
+        cursor.execute('INSERT OR IGNORE INTO alert_rules_version (id, version) VALUES (1, 0)')
+        
+        for event in ('INSERT', 'UPDATE', 'DELETE'):
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS alert_rules_{event.lower()}_version
+                AFTER {event} ON alert_rules
+                BEGIN
+                    UPDATE alert_rules_version SET version = version + 1 WHERE id = 1;
+                END
+            ''')
+        
         # Insert default alert rules
         default_rules = [
             ("pricing_error", "PRICING", '{"discount": 100, "min_value": 100}', "CRITICAL", "console,webhook", 1),
@@ -101,6 +128,21 @@ class SmartAlerts:
             }
             self.save_config()
             
+    def setup_channels(self):
+        """Register email/webhook delivery with the shared background dispatcher"""
+        self.dispatcher = get_alert_dispatcher()
+        self.email_channel = f"smart_alerts:email:{self.config_path}"
+        self.webhook_channel = f"smart_alerts:webhook:{self.config_path}"
+        
+        if self.config["email"]["enabled"]:
+            self.dispatcher.add_channel(self.email_channel, SmtpChannel(self.config["email"], self.build_email_digest))
+        if self.config["webhook"]["enabled"]:
+            self.dispatcher.add_channel(self.webhook_channel, WebhookChannel(
+                self.config["webhook"]["url"],
+                self.build_webhook_payloads,
+                headers=self.config["webhook"]["headers"]
+            ))
+            
     def save_config(self):
         """Save alert configuration"""
         try:
@@ -109,94 +151,147 @@ class SmartAlerts:
         except Exception as e:
             print(f"Error saving config: {e}")
             
-    def check_alert_rules(self, item_data):
-        """Check if item matches any alert rules"""
+    def load_compiled_rules(self):
+        """Enabled rules compiled into predicates, recompiled only when alert_rules changes"""
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
-        cursor.execute('SELECT * FROM alert_rules WHERE enabled = 1')
-        rules = cursor.fetchall()
+        cursor.execute('SELECT version FROM alert_rules_version WHERE id = 1')
+        version = cursor.fetchone()[0]
+        
+        if version != self.rules_version:
+            cursor.execute('SELECT * FROM alert_rules WHERE enabled = 1 ORDER BY id')
+            self.compiled_rules = self.compile_rules(cursor.fetchall())
+            self.rules_version = version
+            
         conn.close()
+        return self.compiled_rules
         
-        triggered_alerts = []
+    def compile_rules(self, rules):
+        """Compile rule rows into predicate closures plus a brand keyword index"""
+        compiled = {
+            "rules": [],
+            "general": [],  # Positions of rules every item is checked against
+            "brand_rules": {},  # Lowercased brand keyword -> positions of BRAND rules
+            "brand_pattern": None
+        }
         
         for rule in rules:
             rule_id, rule_name, rule_type, conditions_str, priority, channels, enabled, created_at = rule
             
             try:
                 conditions = json.loads(conditions_str)
+                predicate = self.compile_predicate(rule_type, conditions)
+            except Exception as e:
+                print(f"Error compiling rule {rule_name}: {e}")
+                continue
+                
+            if predicate is None:
+                continue
+                
+            position = len(compiled["rules"])
+            compiled["rules"].append({
+                "rule_name": rule_name,
+                "rule_type": rule_type,
+                "priority": priority,
+                "channels": channels.split(','),
+                "conditions": conditions,
+                "predicate": predicate
+            })
+            
+            if rule_type == "BRAND":
+                for brand in conditions.get("brands", []):
+                    compiled["brand_rules"].setdefault(brand.lower(), []).append(position)
+            else:
+                compiled["general"].append(position)
                 
-                if self.evaluate_rule(item_data, rule_type, conditions):
+        if compiled["brand_rules"]:
+            # The lookahead trie reports only the longest keyword at each position, so a match
+            # stands for every keyword it contains (e.g. "samsung galaxy" also fires "samsung")
+            brand_rules = compiled["brand_rules"]
+            compiled["brand_rules"] = {
+                keyword: sorted({position for other, positions in brand_rules.items() if other in keyword
+                                 for position in positions})
+                for keyword in brand_rules
+            }
+            compiled["brand_pattern"] = re.compile(f'(?=({trie_pattern(list(brand_rules))}))')
+            
+        return compiled
+        
+    def compile_predicate(self, rule_type, conditions):
+        """Build the item predicate for a rule; None for rules that can never fire"""
+        if rule_type == "PRICING":
+            # Check for pricing errors (100% discount)
+            discount = conditions.get("discount", 100)
+            min_value = conditions.get("min_value", 0)
+            
+            return lambda item: (item.get("discount_percent", 0) >= discount and
+                                 item.get("retail_price", 0) >= min_value)
+            
+        elif rule_type == "DISCOUNT":
+            # Check for high discounts
+            discount = conditions.get("discount", 50)
+            min_value = conditions.get("min_value", 100)
+            
+            return lambda item: (item.get("discount_percent", 0) >= discount and
+                                 item.get("retail_price", 0) >= min_value)
+            
+        elif rule_type == "BRAND":
+            # Brand keywords are matched through the brand index; only the discount is left
+            min_discount = conditions.get("discount", 0)
+            
+            return lambda item: item.get("discount_percent", 0) >= min_discount
+            
+        elif rule_type == "NO_BID":
+            # Check for no-bid high-value items
+            min_value = conditions.get("min_value", 500)
+            
+            return lambda item: (not item.get("current_bid", 0) > 0 and
+                                 item.get("retail_price", 0) >= min_value)
+            
+        # TIMING would need closing time parsing; like unknown types it never fires
+        return None
+        
+    def match_compiled_rules(self, item_data, compiled):
+        """Alerts triggered by one item against already compiled rules"""
+        candidates = set(compiled["general"])
+        
+        if compiled["brand_pattern"] is not None:
+            try:
+                product_name = item_data.get("product_name", "").lower()
+                for match in compiled["brand_pattern"].finditer(product_name):
+                    candidates.update(compiled["brand_rules"][match.group(1)])
+            except Exception as e:
+                print(f"Error in rule evaluation: {e}")
+                
+        triggered_alerts = []
+        
+        for position in sorted(candidates):
+            rule = compiled["rules"][position]
+            
+            try:
+                if rule["predicate"](item_data):
                     triggered_alerts.append({
-                        "rule_name": rule_name,
-                        "rule_type": rule_type,
-                        "priority": priority,
-                        "channels": channels.split(','),
-                        "conditions": conditions,
+                        "rule_name": rule["rule_name"],
+                        "rule_type": rule["rule_type"],
+                        "priority": rule["priority"],
+                        "channels": rule["channels"],
+                        "conditions": rule["conditions"],
                         "item": item_data
                     })
-                    
             except Exception as e:
-                print(f"Error evaluating rule {rule_name}: {e}")
+                print(f"Error in rule evaluation: {e}")
                 
         return triggered_alerts
         
-    def evaluate_rule(self, item, rule_type, conditions):
-        """Evaluate if item matches rule conditions"""
-        try:
-            if rule_type == "PRICING":
-                # Check for pricing errors (100% discount)
-                discount = conditions.get("discount", 100)
-                min_value = conditions.get("min_value", 0)
-                
-                item_discount = item.get("discount_percent", 0)
-                item_value = item.get("retail_price", 0)
-                
-                return item_discount >= discount and item_value >= min_value
-                
-            elif rule_type == "DISCOUNT":
-                # Check for high discounts
-                discount = conditions.get("discount", 50)
-                min_value = conditions.get("min_value", 100)
-                
-                item_discount = item.get("discount_percent", 0)
-                item_value = item.get("retail_price", 0)
-                
-                return item_discount >= discount and item_value >= min_value
-                
-            elif rule_type == "BRAND":
-                # Check for specific brands
-                brands = conditions.get("brands", [])
-                min_discount = conditions.get("discount", 0)
-                
-                product_name = item.get("product_name", "").lower()
-                item_discount = item.get("discount_percent", 0)
-                
-                brand_match = any(brand.lower() in product_name for brand in brands)
-                return brand_match and item_discount >= min_discount
-                
-            elif rule_type == "NO_BID":
-                # Check for no-bid high-value items
-                min_value = conditions.get("min_value", 500)
-                
-                has_bids = item.get("current_bid", 0) > 0
-                item_value = item.get("retail_price", 0)
-                
-                return not has_bids and item_value >= min_value
-                
-            elif rule_type == "TIMING":
-                # Check for items ending soon
-                hours = conditions.get("hours", 24)
-                min_value = conditions.get("min_value", 100)
-                
-                # This would need closing time parsing
-                # For now, return False
-                return False
-                
-        except Exception as e:
-            print(f"Error in rule evaluation: {e}")
-            
-        return False
+    def check_alert_rules(self, item_data):
+        """Check if item matches any alert rules"""
+        return self.match_compiled_rules(item_data, self.load_compiled_rules())
+        
+    def check_alert_rules_batch(self, items):
+        """Check a batch of items, loading and compiling the rules once"""
+        compiled = self.load_compiled_rules()
+        return [self.match_compiled_rules(item, compiled) for item in items]
         
     def send_console_alert(self, alert):
         """Send console alert"""
@@ -222,18 +317,9 @@ class SmartAlerts:
         
         return True
         
-    def send_email_alert(self, alert):
-        """Send email alert"""
-        if not self.config["email"]["enabled"]:
-            return False
-            
-        try:
-            msg = MIMEMultipart()
-            msg['From'] = self.config["email"]["from_email"]
-            msg['To'] = ", ".join(self.config["email"]["to_emails"])
-            msg['Subject'] = f"🚨 {alert['priority']} Auction Alert - {alert['rule_name']}"
-            
-            body = f"""
+    def format_email_body(self, alert):
+        """Plain-text email section for one alert"""
+        return f"""
             New auction opportunity detected!
             
             Product: {alert['item']['product_name']}
@@ -247,49 +333,56 @@ class SmartAlerts:
             
             Act fast - this opportunity won't last long!
             """
+        
+    def build_email_digest(self, alerts):
+        """Subject and body for one email covering a batch of alerts"""
+        if len(alerts) == 1:
+            alert = alerts[0]
+            return f"🚨 {alert['priority']} Auction Alert - {alert['rule_name']}", self.format_email_body(alert)
             
-            msg.attach(MIMEText(body, 'plain'))
-            
-            server = smtplib.SMTP(self.config["email"]["smtp_server"], self.config["email"]["smtp_port"])
-            server.starttls()
-            server.login(self.config["email"]["username"], self.config["email"]["password"])
-            
-            text = msg.as_string()
-            server.sendmail(self.config["email"]["from_email"], self.config["email"]["to_emails"], text)
-            server.quit()
-            
-            return True
+        priorities = [alert['priority'] for alert in alerts]
+        top_priority = next((p for p in ("CRITICAL", "HIGH", "MEDIUM", "LOW") if p in priorities), priorities[0])
+        subject = f"🚨 {len(alerts)} Auction Alerts - {top_priority} priority"
+        return subject, "\n".join(self.format_email_body(alert) for alert in alerts)
+        
+    def webhook_payload(self, alert):
+        """Webhook JSON for one alert"""
+        return {
+            "alert_type": alert["rule_name"],
+            "priority": alert["priority"],
+            "timestamp": datetime.now().isoformat(),
+            "item": alert["item"],
+            "message": f"🚨 {alert['priority']} Alert: {alert['item']['product_name']} - {alert['item']['discount_percent']:.1f}% off"
+        }
+        
+    def build_webhook_payloads(self, alerts):
+        """One payload per batch; single alerts keep the original payload shape"""
+        if len(alerts) == 1:
+            return [self.webhook_payload(alerts[0])]
             
-        except Exception as e:
-            print(f"Error sending email: {e}")
+        payloads = [self.webhook_payload(alert) for alert in alerts]
+        return [{
+            "alert_type": "digest",
+            "timestamp": datetime.now().isoformat(),
+            "alerts": payloads,
+            "message": f"🚨 {len(payloads)} alerts: " + "; ".join(p["message"][2:] for p in payloads)
+        }]
+        
+    def send_email_alert(self, alert):
+        """Queue email alert; nearby alerts are sent together as one digest"""
+        if not self.config["email"]["enabled"]:
             return False
             
+        queued = self.dispatcher.submit(self.email_channel, alert)
+        return not (queued.done() and not queued.result())
+            
     def send_webhook_alert(self, alert):
-        """Send webhook alert"""
+        """Queue webhook alert; nearby alerts are posted together as one digest"""
         if not self.config["webhook"]["enabled"]:
             return False
             
-        try:
-            payload = {
-                "alert_type": alert["rule_name"],
-                "priority": alert["priority"],
-                "timestamp": datetime.now().isoformat(),
-                "item": alert["item"],
-                "message": f"🚨 {alert['priority']} Alert: {alert['item']['product_name']} - {alert['item']['discount_percent']:.1f}% off"
-            }
-            
-            response = requests.post(
-                self.config["webhook"]["url"],
-                json=payload,
-                headers=self.config["webhook"]["headers"],
-                timeout=10
-            )
-            
-            return response.status_code == 200
-            
-        except Exception as e:
-            print(f"Error sending webhook: {e}")
-            return False
+        queued = self.dispatcher.submit(self.webhook_channel, alert)
+        return not (queued.done() and not queued.result())
             
     def send_alert(self, alert):
         """Send alert via configured channels"""
@@ -345,9 +438,7 @@ class SmartAlerts:
         """Process list of items and send alerts"""
         total_alerts = 0
         
-        for item in items:
-            alerts = self.check_alert_rules(item)
-            
+        for alerts in self.check_alert_rules_batch(items):
             for alert in alerts:
                 if self.send_alert(alert):
                     total_alerts += 1
@@ -408,6 +499,19 @@ class SmartAlerts:
         ]
         
         print("🧪 Testing alert system...")
+        
+        # Overlapping brand keywords must all fire, not just the longest one
+        overlap_rules = self.compile_rules([
+            (1, "Samsung", "BRAND", json.dumps({"brands": ["samsung"]}), "MEDIUM", "console", 1, ""),
+            (2, "Galaxy", "BRAND", json.dumps({"brands": ["samsung galaxy"]}), "MEDIUM", "console", 1, "")
+        ])
+        fired = [alert["rule_name"] for alert in
+                 self.match_compiled_rules({"product_name": "Samsung Galaxy S21"}, overlap_rules)]
+        if fired == ["Samsung", "Galaxy"]:
+            print("✅ Overlapping brand rules: both fired")
+        else:
+            print(f"❌ Overlapping brand rules: expected ['Samsung', 'Galaxy'], got {fired}")
+            
         alerts_sent = self.process_items(test_items)
         print(f"✅ Test complete: {alerts_sent} alerts sent")
 
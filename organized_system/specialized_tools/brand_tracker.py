@@ -8,13 +8,21 @@ import asyncio
 import aiohttp
 import ssl
 import json
+import os
+import sys
 import sqlite3
 from datetime import datetime, timedelta
 from collections import defaultdict
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core_systems.lot_index import LotIndex
+from core_systems.search_gateway import get_search_gateway
+
 class BrandTracker:
     def __init__(self):
         self.session = None
+        self.lot_index = LotIndex()
+        self.search_gateway = get_search_gateway()
         self.sc_locations = ["Spartanburg", "Greenville", "Rock Hill", "Gastonia", "Anderson"]
         self.db_file = "brand_tracking.db"
         self.init_database()
@@ -144,27 +152,26 @@ class BrandTracker:
             await asyncio.sleep(0.25)
             
     async def search_for_term(self, term, limit=100):
-        """Search for a specific term."""
-        url = f"https://api.macdiscount.com/search?q={term}&limit={limit}"
-        
+        """Search for a specific term, answering from the local lot index when it is fresh."""
+        indexed_hits = self.lot_index.lookup(term, limit, self.sc_locations)
+        if indexed_hits is not None:
+            return indexed_hits
+            
         try:
-            async with self.session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    hits = data.get('hits', [])
-                    
-                    # Filter to SC locations only
-                    sc_hits = []
-                    for hit in hits:
-                        if hit.get('auction_location') in self.sc_locations:
-                            sc_hits.append(hit)
-                            
-                    return sc_hits
-                else:
-                    return []
+            hits = await self.search_gateway.search(self.session, term, limit)
         except Exception as e:
             return []
             
+        self.lot_index.add_lots(hits, term=term)
+        
+        # Filter to SC locations only
+        sc_hits = []
+        for hit in hits:
+            if hit.get('auction_location') in self.sc_locations:
+                sc_hits.append(hit)
+                
+        return sc_hits
+            
     async def track_brand(self, brand_name):
         """Track all items for a specific brand."""
         brand_info = self.brands.get(brand_name)
@@ -172,6 +179,9 @@ class BrandTracker:
             print(f"❌ Unknown brand: {brand_name}")
             return []
             
+        # Search all of the brand's terms at once; lots matching several terms are deduplicated below
+        term_results = await asyncio.gather(*(self.search_for_term(term) for term in brand_info['terms']))
+        
         print(f"🏷️ Tracking {brand_name} ({brand_info['priority']} priority)")
         print(f"📝 Search terms: {', '.join(brand_info['terms'])}")
         print()
@@ -179,11 +189,9 @@ class BrandTracker:
         all_items = []
         seen_lot_ids = set()
         
-        for i, term in enumerate(brand_info['terms'], 1):
+        for i, (term, results) in enumerate(zip(brand_info['terms'], term_results), 1):
             print(f"  {i:2d}/{len(brand_info['terms'])} - Searching '{term}'...")
             
-            results = await self.search_for_term(term)
-            
             # Process and deduplicate
             new_results = []
             for result in results:
@@ -211,8 +219,6 @@ class BrandTracker:
             all_items.extend(new_results)
             print(f"      Found {len(results)} total, {len(new_results)} new items")
             
-            await asyncio.sleep(0.2)  # Rate limiting
-            
         return all_items
         
     async def track_all_brands(self):
@@ -223,11 +229,13 @@ class BrandTracker:
         
         all_brand_items = {}
         
-        for brand_name in self.brands.keys():
-            items = await self.track_brand(brand_name)
+        brand_names = list(self.brands.keys())
+        brand_results = await asyncio.gather(*(self.track_brand(brand_name) for brand_name in brand_names))
+        
+        for brand_name, items in zip(brand_names, brand_results):
             all_brand_items[brand_name] = items
             print(f"✅ {brand_name}: {len(items)} items found")
-            print()
+        print()
             
         return all_brand_items
         
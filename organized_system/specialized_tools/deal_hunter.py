@@ -8,12 +8,20 @@ import asyncio
 import aiohttp
 import ssl
 import json
+import os
+import sys
 from datetime import datetime
 from collections import defaultdict
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core_systems.lot_index import LotIndex
+from core_systems.search_gateway import get_search_gateway
+
 class DealHunter:
     def __init__(self):
         self.session = None
+        self.lot_index = LotIndex()
+        self.search_gateway = get_search_gateway()
         self.sc_locations = ["Spartanburg", "Greenville", "Rock Hill", "Gastonia", "Anderson"]
         
         # High-value search terms for premium items
@@ -63,27 +71,26 @@ class DealHunter:
             await asyncio.sleep(0.25)
             
     async def search_for_term(self, term, limit=100):
-        """Search for a specific term."""
-        url = f"https://api.macdiscount.com/search?q={term}&limit={limit}"
-        
+        """Search for a specific term, answering from the local lot index when it is fresh."""
+        indexed_hits = self.lot_index.lookup(term, limit, self.sc_locations)
+        if indexed_hits is not None:
+            return indexed_hits
+            
         try:
-            async with self.session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    hits = data.get('hits', [])
-                    
-                    # Filter to SC locations only
-                    sc_hits = []
-                    for hit in hits:
-                        if hit.get('auction_location') in self.sc_locations:
-                            sc_hits.append(hit)
-                            
-                    return sc_hits
-                else:
-                    return []
+            hits = await self.search_gateway.search(self.session, term, limit)
         except Exception as e:
             return []
             
+        self.lot_index.add_lots(hits, term=term)
+        
+        # Filter to SC locations only
+        sc_hits = []
+        for hit in hits:
+            if hit.get('auction_location') in self.sc_locations:
+                sc_hits.append(hit)
+                
+        return sc_hits
+            
     async def hunt_deals(self, min_savings_percent=30, min_retail_value=100):
         """Hunt for the best deals."""
         print(f"🏹 DEAL HUNTER - Scanning for Premium Deals")
@@ -94,11 +101,12 @@ class DealHunter:
         all_items = []
         seen_lot_ids = set()
         
-        for i, term in enumerate(self.premium_terms, 1):
+        # Request every premium term up front; the loop below only filters the results
+        term_results = await asyncio.gather(*(self.search_for_term(term) for term in self.premium_terms))
+        
+        for i, (term, results) in enumerate(zip(self.premium_terms, term_results), 1):
             print(f"  {i:2d}/{len(self.premium_terms)} - Scanning '{term}'...")
             
-            results = await self.search_for_term(term)
-            
             # Filter for good deals and deduplicate
             good_deals = []
             for result in results:
@@ -120,8 +128,6 @@ class DealHunter:
             all_items.extend(good_deals)
             print(f"      Found {len(results)} items, {len(good_deals)} great deals")
             
-            await asyncio.sleep(0.2)  # Rate limiting
-            
         return all_items
         
     def display_deals(self, deals):
@@ -8,11 +8,16 @@ import asyncio
 import aiohttp
 import ssl
 import json
+import os
+import sys
 import sqlite3
 from datetime import datetime, timedelta
 from collections import defaultdict
 import statistics
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core_systems.product_classifier import location_category_classifier
+
 class LocationScraper:
     def __init__(self, db_path="location_inventory.db"):
         self.db_path = db_path
@@ -151,27 +156,7 @@ class LocationScraper:
         
     def categorize_item(self, title):
         """Categorize item based on title."""
-        if not title:
-            return "Unknown"
-            
-        title_lower = title.lower()
-        
-        categories = {
-            "Electronics": ["iphone", "ipad", "laptop", "computer", "tv", "phone", "tablet", "gaming"],
-            "Clothing": ["clothing", "apparel", "shirt", "pants", "dress", "shoes", "fashion"],
-            "Home": ["furniture", "home", "kitchen", "appliance", "decor", "bedding"],
-            "Tools": ["tools", "hardware", "drill", "saw", "equipment"],
-            "Automotive": ["car", "auto", "vehicle", "parts", "tire"],
-            "Sports": ["sports", "fitness", "exercise", "bike", "golf"],
-            "Jewelry": ["jewelry", "watch", "ring", "necklace", "gold", "silver"],
-            "Collectibles": ["collectible", "antique", "vintage", "art"]
-        }
-        
-        for category, keywords in categories.items():
-            if any(keyword in title_lower for keyword in keywords):
-                return category
-                
-        return "General"
+        return location_category_classifier.classify(title)
         
     def estimate_item_value(self, title, category):
         """Estimate item value based on title and category."""
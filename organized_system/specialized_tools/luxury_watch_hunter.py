@@ -8,12 +8,20 @@ import asyncio
 import aiohttp
 import ssl
 import json
+import os
+import sys
 from datetime import datetime
 from collections import defaultdict
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core_systems.lot_index import LotIndex
+from core_systems.search_gateway import get_search_gateway
+
 class LuxuryWatchHunter:
     def __init__(self):
         self.session = None
+        self.lot_index = LotIndex()
+        self.search_gateway = get_search_gateway()
         self.sc_locations = ["Spartanburg", "Greenville", "Rock Hill", "Gastonia", "Anderson"]
         
         # Luxury watch brands and their search terms
@@ -107,27 +115,26 @@ class LuxuryWatchHunter:
             await asyncio.sleep(0.25)
             
     async def search_for_term(self, term, limit=100):
-        """Search for a specific term."""
-        url = f"https://api.macdiscount.com/search?q={term}&limit={limit}"
-        
+        """Search for a specific term, answering from the local lot index when it is fresh."""
+        indexed_hits = self.lot_index.lookup(term, limit, self.sc_locations)
+        if indexed_hits is not None:
+            return indexed_hits
+            
         try:
-            async with self.session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    hits = data.get('hits', [])
-                    
-                    # Filter to SC locations only
-                    sc_hits = []
-                    for hit in hits:
-                        if hit.get('auction_location') in self.sc_locations:
-                            sc_hits.append(hit)
-                            
-                    return sc_hits
-                else:
-                    return []
+            hits = await self.search_gateway.search(self.session, term, limit)
         except Exception as e:
             return []
             
+        self.lot_index.add_lots(hits, term=term)
+        
+        # Filter to SC locations only
+        sc_hits = []
+        for hit in hits:
+            if hit.get('auction_location') in self.sc_locations:
+                sc_hits.append(hit)
+                
+        return sc_hits
+            
     def identify_watch_brand(self, product_name):
         """Identify watch brand from product name."""
         if not product_name:
@@ -253,7 +260,6 @@ class LuxuryWatchHunter:
                             all_watches.append(result)
                             seen_lot_ids.add(lot_id)
                             
-                await asyncio.sleep(0.2)  # Rate limiting
                 
         # Search general watch terms for unknown brands
         print(f"🔍 Searching general watch terms...")
@@ -292,7 +298,6 @@ class LuxuryWatchHunter:
                             all_watches.append(result)
                             seen_lot_ids.add(lot_id)
                             
-            await asyncio.sleep(0.2)  # Rate limiting
             
         return all_watches
         
@@ -74,6 +74,12 @@ class Config:
                     'browser_type': 'chromium',
                     'viewport': {'width': 1920, 'height': 1080},
                     'wait_for_load': 3.0
+                },
+                'capture': {
+                    'url_patterns': [],
+                    'max_records': 2000,
+                    'max_body_chars': 65536,
+                    'output_dir': None
                 }
             },
             'extraction': {
@@ -1,8 +1,10 @@
 """Web scraper module for fetching and analyzing web content."""
 
 import asyncio
+import sys
 import time
 import logging
+from pathlib import Path
 from typing import Dict, List, Optional, Any, Union
 from urllib.parse import urljoin, urlparse
 from dataclasses import dataclass
@@ -16,6 +18,9 @@ from urllib.robotparser import RobotFileParser
 
 from ..config import config
 
+sys.path.append(str(Path(__file__).resolve().parents[2] / 'core_systems'))
+from capture_sink import CaptureSink, capture_file
+
 logger = logging.getLogger(__name__)
 
 
@@ -180,6 +185,21 @@ class DynamicScraper(BaseScraper):
             else:
                 raise ValueError(f"Unsupported browser type: {browser_type}")
     
+    def _create_capture_sink(self, url: str) -> CaptureSink:
+        """Bounded capture for one page, optionally streamed to compressed NDJSON."""
+        output_dir = config.get('scraping.capture.output_dir')
+        output_path = None
+        if output_dir:
+            host = urlparse(url).netloc.replace(':', '_') or 'page'
+            output_path = capture_file(f"network_capture_{host}", output_dir)
+        
+        return CaptureSink(
+            output_path=output_path,
+            url_patterns=config.get('scraping.capture.url_patterns', []),
+            capacity=config.get('scraping.capture.max_records', 2000),
+            max_body_chars=config.get('scraping.capture.max_body_chars', 65536)
+        )
+    
     async def _cleanup(self):
         """Clean up browser resources."""
         if self.browser:
@@ -203,7 +223,7 @@ class DynamicScraper(BaseScraper):
         await self.rate_limiter.wait()
         
         start_time = time.time()
-        network_requests = []
+        capture = self._create_capture_sink(url)
         
         try:
             # Create a new page
@@ -223,15 +243,17 @@ class DynamicScraper(BaseScraper):
                 else:
                     logger.info("Authentication successful")
             
-            # Monitor network requests
+            # Monitor network requests (filtered before anything is copied)
             async def handle_request(request):
-                network_requests.append({
+                if not capture.wants(request.url):
+                    return
+                capture.add({
                     'url': request.url,
                     'method': request.method,
                     'headers': dict(request.headers),
-                    'post_data': request.post_data,
+                    'post_data': capture.trim_body(request.post_data),
                     'resource_type': request.resource_type
-                })
+                }, pending=False)
             
             page.on('request', handle_request)
             
@@ -286,7 +308,7 @@ class DynamicScraper(BaseScraper):
                 status_code=response.status if response else 200,
                 headers=dict(response.headers) if response else {},
                 javascript_content=javascript_content,
-                network_requests=network_requests,
+                network_requests=capture.records(),
                 cookies=cookie_dict,
                 response_time=response_time,
                 final_url=page.url
@@ -300,6 +322,9 @@ class DynamicScraper(BaseScraper):
                 response_time=time.time() - start_time, final_url=url,
                 error=str(e)
             )
+        
+        finally:
+            capture.close()
 
 
 class RateLimiter:
@@ -23,6 +23,8 @@ import plotly.express as px
 from plotly.utils import PlotlyJSONEncoder
 import threading
 import time
+from capture_metrics import CaptureMetricsAggregator, file_signature
+from health_timeseries import HealthTimeSeries
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -38,6 +40,13 @@ class PerformanceAnalyticsDashboard:
         self.breakdown_file = Path("breakdown.json")
         self.auth_config_file = Path("auth_config.json")
         
+        # Capture files are tailed incrementally; the legacy breakdown.json is read whole
+        self.capture_metrics = CaptureMetricsAggregator(extra_sources=[self.breakdown_file])
+        self._file_cache = {}  # name -> (cache key, value) for auth config and DB lookups
+        self._payload_cache = {}  # route -> (etag, serialized JSON)
+        self._health_series = None  # created once the monitor's database exists
+        self.chart_points = 300  # points per time-series chart, whatever the history length
+        
         # Dashboard data cache
         self.dashboard_data = {}
         self.last_update = None
@@ -60,7 +69,7 @@ class PerformanceAnalyticsDashboard:
             
         @self.app.route('/api/performance')
         def api_performance():
-            return jsonify(self.get_performance_metrics())
+            return self._conditional_json('performance', self.performance_etag(), self.get_performance_metrics)
             
         @self.app.route('/api/intelligence')
         def api_intelligence():
@@ -72,12 +81,48 @@ class PerformanceAnalyticsDashboard:
             
         @self.app.route('/api/charts/performance')
         def api_charts_performance():
-            return jsonify(self.generate_performance_charts())
+            self.capture_metrics.refresh()
+            return self._conditional_json('charts_performance', self.capture_metrics.etag, self.generate_performance_charts)
             
         @self.app.route('/api/realtime')
         def api_realtime():
             return jsonify(self.get_realtime_data())
             
+    def _conditional_json(self, name: str, etag: str, builder):
+        """Serve a cached JSON payload, or 304 if the client already has this version"""
+        if request.if_none_match.contains(etag):
+            response = self.app.response_class(status=304)
+            response.set_etag(etag)
+            return response
+            
+        cached = self._payload_cache.get(name)
+        if not cached or cached[0] != etag:
+            cached = (etag, json.dumps(builder(), default=str))
+            self._payload_cache[name] = cached
+            
+        response = self.app.response_class(cached[1], mimetype='application/json')
+        response.set_etag(etag)
+        return response
+        
+    def performance_etag(self) -> str:
+        """Changes when captures, the auth config or the processing DB change (or each minute,
+        since processing stats cover a rolling 24h window)"""
+        self.capture_metrics.refresh()
+        return "{}-{:x}".format(self.capture_metrics.etag, hash((
+            file_signature(self.auth_config_file),
+            file_signature(self.intelligence_db),
+            int(time.time() // 60)
+        )) & 0xffffffff)
+        
+    def _cached_by_file(self, name: str, key, loader):
+        """Value of loader(), recomputed only when key (a file signature) changes"""
+        cached = self._file_cache.get(name)
+        if cached and cached[0] == key:
+            return cached[1]
+        value = loader()
+        self._file_cache[name] = (key, value)
+        return value
+        
     def get_health_metrics(self) -> Dict:
         """Get current session health metrics"""
         try:
@@ -176,46 +221,31 @@ class PerformanceAnalyticsDashboard:
                 'browser_sessions_active': 0
             }
             
-            # Check breakdown file for latest capture data
-            if self.breakdown_file.exists():
-                with open(self.breakdown_file, 'r') as f:
-                    breakdown_data = json.load(f)
-                    
-                performance_data['total_requests_captured'] = len(breakdown_data)
-                
-                # Calculate success rate from status codes
-                successful_requests = 0
-                total_with_status = 0
-                
-                for request_data in breakdown_data.values():
-                    if isinstance(request_data, dict) and 'status_code' in request_data:
-                        total_with_status += 1
-                        if request_data['status_code'] < 400:
-                            successful_requests += 1
-                            
-                if total_with_status > 0:
-                    performance_data['capture_success_rate'] = (successful_requests / total_with_status) * 100
-                    
+            # Running capture counters, only new lines are read
+            self.capture_metrics.refresh()
+            captures = self.capture_metrics.snapshot()
+            performance_data['total_requests_captured'] = captures['total_requests']
+            performance_data['capture_success_rate'] = captures['success_rate']
+            performance_data['response_time_histogram'] = captures['response_time_histogram']
+            
             # Check auth config for session info
             if self.auth_config_file.exists():
-                with open(self.auth_config_file, 'r') as f:
-                    auth_data = json.load(f)
-                    
+                auth_data = self._cached_by_file(
+                    'auth_config', file_signature(self.auth_config_file), self._load_auth_config
+                )
                 performance_data['last_session_capture'] = auth_data.get('timestamp', 'unknown')
                 
             # Check intelligence database for processing metrics
             if self.intelligence_db.exists():
-                with sqlite3.connect(self.intelligence_db) as conn:
-                    cursor = conn.execute("""
-                        SELECT AVG(processing_time), COUNT(*)
-                        FROM processing_metrics 
-                        WHERE timestamp > datetime('now', '-24 hours')
-                    """)
-                    processing_stats = cursor.fetchone()
-                    
-                    if processing_stats and processing_stats[0]:
-                        performance_data['average_processing_time'] = processing_stats[0]
-                        performance_data['processing_runs_24h'] = processing_stats[1]
+                processing_stats = self._cached_by_file(
+                    'processing_stats',
+                    (file_signature(self.intelligence_db), int(time.time() // 60)),
+                    self._load_processing_stats
+                )
+                
+                if processing_stats and processing_stats[0]:
+                    performance_data['average_processing_time'] = processing_stats[0]
+                    performance_data['processing_runs_24h'] = processing_stats[1]
                         
             return performance_data
             
@@ -223,6 +253,19 @@ class PerformanceAnalyticsDashboard:
             logger.error(f"❌ Error getting performance metrics: {e}")
             return {'error': str(e)}
             
+    def _load_auth_config(self) -> Dict:
+        with open(self.auth_config_file, 'r') as f:
+            return json.load(f)
+            
+    def _load_processing_stats(self) -> Optional[Tuple]:
+        with sqlite3.connect(self.intelligence_db) as conn:
+            cursor = conn.execute("""
+                SELECT AVG(processing_time), COUNT(*)
+                FROM processing_metrics 
+                WHERE timestamp > datetime('now', '-24 hours')
+            """)
+            return cursor.fetchone()
+            
     def get_intelligence_metrics(self) -> Dict:
         """Get market intelligence metrics"""
         try:
@@ -285,19 +328,18 @@ class PerformanceAnalyticsDashboard:
             if not self.health_db.exists():
                 return {'error': 'Health database not found'}
                 
+            # Health timelines come from the rollup tiers, downsampled to a fixed size
+            health_series = self.get_health_series()
+            health_series.rollup()
+            timelines = health_series.query(since=datetime.now() - timedelta(hours=24),
+                                            max_points=self.chart_points)['series']
+            
             with sqlite3.connect(self.health_db) as conn:
-                # Health score over time
-                df_health = pd.read_sql_query("""
-                    SELECT timestamp, health_score, success_rate, response_time
-                    FROM session_health 
-                    WHERE timestamp > datetime('now', '-24 hours')
-                    ORDER BY timestamp
-                """, conn)
-                
                 charts = {}
                 
-                if not df_health.empty:
+                if timelines['health_score']:
                     # Health score timeline
+                    df_health = pd.DataFrame(timelines['health_score'], columns=['timestamp', 'health_score'])
                     fig_health = px.line(
                         df_health, 
                         x='timestamp', 
@@ -309,9 +351,11 @@ class PerformanceAnalyticsDashboard:
                                         annotation_text="Healthy Threshold")
                     charts['health_timeline'] = json.loads(json.dumps(fig_health, cls=PlotlyJSONEncoder))
                     
+                if timelines['success_rate']:
                     # Success rate chart
+                    df_success = pd.DataFrame(timelines['success_rate'], columns=['timestamp', 'success_rate'])
                     fig_success = px.line(
-                        df_health, 
+                        df_success, 
                         x='timestamp', 
                         y='success_rate',
                         title='Success Rate (24h)',
@@ -319,9 +363,11 @@ class PerformanceAnalyticsDashboard:
                     )
                     charts['success_timeline'] = json.loads(json.dumps(fig_success, cls=PlotlyJSONEncoder))
                     
+                if timelines['response_time']:
                     # Response time chart
+                    df_response = pd.DataFrame(timelines['response_time'], columns=['timestamp', 'response_time'])
                     fig_response = px.line(
-                        df_health, 
+                        df_response, 
                         x='timestamp', 
                         y='response_time',
                         title='Response Time (24h)',
@@ -353,42 +399,24 @@ class PerformanceAnalyticsDashboard:
             logger.error(f"❌ Error generating health charts: {e}")
             return {'error': str(e)}
             
+    def get_health_series(self) -> HealthTimeSeries:
+        """Rollup/downsampling layer over the health monitor's database"""
+        if self._health_series is None:
+            self._health_series = HealthTimeSeries(self.health_db)
+        return self._health_series
+        
     def generate_performance_charts(self) -> Dict:
         """Generate performance monitoring charts"""
         try:
             charts = {}
             
             # Request capture analysis
-            if self.breakdown_file.exists():
-                with open(self.breakdown_file, 'r') as f:
-                    breakdown_data = json.load(f)
-                    
+            self.capture_metrics.refresh()
+            captures = self.capture_metrics.snapshot()
+            if captures['total_requests']:
                 # Endpoint frequency chart
-                endpoint_counts = {}
-                status_counts = {}
-                
-                for request_data in breakdown_data.values():
-                    if isinstance(request_data, dict):
-                        url = request_data.get('url', '')
-                        status = request_data.get('status_code', 0)
-                        
-                        # Categorize endpoint
-                        if 'analytics.google.com' in url:
-                            endpoint = 'Google Analytics'
-                        elif 'doubleclick.net' in url:
-                            endpoint = 'DoubleClick'
-                        elif 'facebook.com' in url:
-                            endpoint = 'Facebook'
-                        elif 'mac.bid' in url:
-                            endpoint = 'Mac.bid'
-                        else:
-                            endpoint = 'Other'
-                            
-                        endpoint_counts[endpoint] = endpoint_counts.get(endpoint, 0) + 1
-                        
-                        # Status code distribution
-                        status_range = f"{status//100}xx" if status > 0 else 'Unknown'
-                        status_counts[status_range] = status_counts.get(status_range, 0) + 1
+                endpoint_counts = captures['endpoint_groups']
+                status_counts = captures['status_ranges']
                         
                 # Endpoint distribution pie chart
                 if endpoint_counts:
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+🔗 URL NORMALIZER
+=================
+Shared URL classification for the processing pipeline and dashboards.
+One precompiled rule table maps a captured request URL to its endpoint pattern,
+dashboard group, location and path template. Results are memoized per
+query-stripped URL, since query strings are mostly cache-busters and tracking ids.
+"""
+
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+# Fine-grained endpoint patterns, first match wins
+ENDPOINT_RULES = [
+    ('google_analytics', r'analytics\.google\.com'),
+    ('advertising_doubleclick', r'doubleclick\.net'),
+    ('facebook_pixel', r'facebook\.com/tr'),
+    ('youtube_api', r'youtube\.com/api'),
+    ('nextjs_static', r'mac\.bid/_next/static'),
+    ('macbid_api', r'mac\.bid/api'),
+    ('auctions_page', r'mac\.bid/auctions'),
+    ('location_page', r'mac\.bid/locations'),
+    ('typesense_search', r'typesense\.net'),
+    ('ab_testing', r'visualwebsiteoptimizer\.com'),
+    ('advertising_stack', r'stackadapt\.com'),
+    ('bing_tracking', r'bing\.com/action'),
+]
+
+# Coarse buckets shown on the dashboards, first match wins
+GROUP_RULES = [
+    ('Google Analytics', r'analytics\.google\.com'),
+    ('DoubleClick', r'doubleclick\.net'),
+    ('Facebook', r'facebook\.com'),
+    ('Mac.bid', r'mac\.bid'),
+]
+
+LOCATIONS = ['spartanburg', 'greenville', 'rock-hill', 'gastonia', 'anderson']
+
+# Path segments that vary per lot/auction/build and collapse to a placeholder
+TEMPLATE_RULES = [
+    (r'^\d+$', '{id}'),
+    (r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', '{uuid}'),
+    (r'^[0-9a-f]{12,}$', '{hash}'),
+    (r'^(?=.*\d)[A-Za-z0-9_-]{20,}$', '{token}'),
+]
+
+_ENDPOINT_TABLE = [(name, re.compile(pattern, re.IGNORECASE)) for name, pattern in ENDPOINT_RULES]
+_GROUP_TABLE = [(name, re.compile(pattern, re.IGNORECASE)) for name, pattern in GROUP_RULES]
+_TEMPLATE_TABLE = [(re.compile(pattern, re.IGNORECASE), placeholder) for pattern, placeholder in TEMPLATE_RULES]
+_URL_RE = re.compile(r'^(?:(?P<scheme>[a-z][a-z0-9+.-]*)://)?(?P<host>[^/?#]*)(?P<path>[^?#]*)', re.IGNORECASE)
+
+class UrlClassification(NamedTuple):
+    template: str
+    endpoint: str
+    group: str
+    location: Optional[str]
+
+def _first_match(table, text: str, default: str) -> str:
+    for name, regex in table:
+        if regex.search(text):
+            return name
+    return default
+
+def _template(base_url: str) -> str:
+    """host/path with variable segments replaced, e.g. mac.bid/auctions/{id}"""
+    match = _URL_RE.match(base_url)
+    host = match.group('host').lower()
+    segments = []
+    for segment in match.group('path').split('/'):
+        for regex, placeholder in _TEMPLATE_TABLE:
+            if regex.match(segment):
+                segment = placeholder
+                break
+        segments.append(segment)
+    return host + '/'.join(segments)
+
+def _location(text: str) -> Optional[str]:
+    # Plain substring scans beat a regex alternation over long tracking query strings
+    lowered = text.lower()
+    for location in LOCATIONS:
+        if location in lowered:
+            return location.replace('-', ' ').title()
+    return None
+
+@lru_cache(maxsize=8192)
+def _classify_base(base_url: str) -> UrlClassification:
+    return UrlClassification(
+        template=_template(base_url),
+        endpoint=_first_match(_ENDPOINT_TABLE, base_url, 'other'),
+        group=_first_match(_GROUP_TABLE, base_url, 'Other'),
+        location=_location(base_url)
+    )
+
+def classify_url(url: str) -> UrlClassification:
+    """Template, endpoint pattern, dashboard group and location for a request URL"""
+    if not url:
+        return UrlClassification('', 'unknown', 'Other', None)
+
+    base_url, _, query = url.strip().partition('?')
+    classification = _classify_base(base_url)
+
+    # Tracking pixels carry the page URL (and so the location) in the query string
+    if classification.location is None and query:
+        location = _location(query)
+        if location:
+            return classification._replace(location=location)
+    return classification
+
+def endpoint_pattern(url: str) -> str:
+    return classify_url(url).endpoint
+
+def endpoint_group(url: str) -> str:
+    return classify_url(url).group
+
+def url_location(url: str) -> Optional[str]:
+    return classify_url(url).location
+
+def cache_info():
+    """Hit/miss counters of the per-URL memo"""
+    return _classify_base.cache_info()